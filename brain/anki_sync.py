@@ -28,6 +28,7 @@ SCRIPT_DIR = Path(__file__).resolve().parent
 if str(SCRIPT_DIR) not in sys.path:
     sys.path.insert(0, str(SCRIPT_DIR))
 
+from card_dedupe import refresh_card_index
 from db_setup import get_connection, init_database
 
 # ---------------------------------------------------------------------------
@@ -404,6 +405,7 @@ def update_card_status(
         """, (status, card_id))
     
     conn.commit()
+    refresh_card_index(conn)
     conn.close()
     return True
 
@@ -509,6 +511,7 @@ def create_card_draft(
     
     card_id = cursor.lastrowid
     conn.commit()
+    refresh_card_index(conn)
     conn.close()
     return card_id
 
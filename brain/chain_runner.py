@@ -15,7 +15,9 @@ from datetime import datetime
 from typing import Any
 
 from config import DB_PATH
+from card_dedupe import refresh_card_index
 from db_setup import get_connection
+from session_rollups import sync_after_session_write
 from llm_provider import call_llm
 from chain_prompts import get_step_prompt
 
@@ -62,6 +64,7 @@ def run_chain(
             prompt["user"],
             provider="openrouter",
             timeout=STEP_TIMEOUT,
+            cache="chain_step",
         )
 
         duration_ms = int((time.time() - step_start) * 1000)
@@ -332,6 +335,7 @@ def _create_session(
     )
     session_id = cursor.lastrowid
     conn.commit()
+    sync_after_session_write(conn)
     conn.close()
     return session_id
 
@@ -387,6 +391,7 @@ def _extract_and_save_cards(
             )
             card_ids.append(cursor.lastrowid)
         conn.commit()
+        refresh_card_index(conn)
         conn.close()
 
     return card_ids
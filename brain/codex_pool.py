@@ -0,0 +1,328 @@
+"""
+Managed pool of Codex CLI workers.
+
+`codex exec` is one-shot: it reads a prompt on stdin, answers and exits.
+Every caller used to spawn its own process with no shared concurrency limit,
+write its own temp prompt/output files, and isolated calls leaked a mkdtemp
+directory.
+
+CodexPool runs a fixed number of worker threads, sized from
+multi_agent.max_concurrency in scholar/inputs/audit_manifest.json, so chat
+endpoints and Scholar multi-agent runs share one concurrency cap. Jobs queue
+until a worker is free. Each worker owns one scratch directory (an isolated
+working dir plus the --output-last-message file) that is emptied between
+jobs and removed on shutdown.
+
+A process is only spawned once its job is taken off the queue, and the
+prompt is written to it straight away; no `codex exec` is ever left waiting
+on stdin. Pass log= (an open file) to stream a job's stdout and stderr into
+it while it runs instead of collecting them in the result.
+
+    from codex_pool import OUTPUT, WORK_DIR, get_codex_pool
+
+    argv = [codex, "exec", "--cd", WORK_DIR, "--output-last-message", OUTPUT, "-"]
+    job = get_codex_pool().submit(argv, prompt, timeout=60, isolated=True)
+    result = job.result()      # job.cancel() dequeues it or kills the process
+
+WORK_DIR and OUTPUT are placeholders replaced with the worker's paths.
+"""
+
+import atexit
+import json
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import IO, Optional, Sequence
+
+WORK_DIR = "{codex_work_dir}"
+OUTPUT = "{codex_output}"
+
+DEFAULT_POOL_SIZE = 4
+MAX_POOL_SIZE = 6  # same clamp as the Scholar multi-agent runner
+
+_MANIFEST_PATH = Path(__file__).resolve().parent.parent / "scholar" / "inputs" / "audit_manifest.json"
+
+
+def manifest_concurrency(path: Optional[Path] = None) -> int:
+    """multi_agent.max_concurrency from the audit manifest, clamped to 1..MAX_POOL_SIZE."""
+    try:
+        with open(path or _MANIFEST_PATH, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        size = int((manifest.get("multi_agent") or {}).get("max_concurrency", DEFAULT_POOL_SIZE))
+    except (OSError, ValueError, TypeError, AttributeError):
+        size = DEFAULT_POOL_SIZE
+    return max(1, min(size, MAX_POOL_SIZE))
+
+
+def _kill(proc: subprocess.Popen) -> None:
+    if proc.poll() is not None:
+        return
+    try:
+        if os.name == "nt":
+            # codex is usually a .cmd shim; kill() would only stop cmd.exe
+            # and leave node running, so take down the whole tree.
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(proc.pid)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        if proc.poll() is None:
+            proc.kill()
+    except OSError:
+        pass
+
+
+def _result(**kwargs) -> dict:
+    result = {
+        "returncode": None,
+        "stdout": "",
+        "stderr": "",
+        "output": None,
+        "timed_out": False,
+        "cancelled": False,
+        "error": None,
+        "queued_ms": 0.0,
+        "run_ms": 0.0,
+    }
+    result.update(kwargs)
+    return result
+
+
+class CodexJob:
+    """Handle for a queued or running prompt."""
+
+    def __init__(self, argv: Sequence[str], prompt: str, timeout: Optional[float],
+                 isolated: bool, cwd: Optional[str], log: Optional[IO] = None):
+        self.argv = list(argv)
+        self.prompt = prompt
+        self.timeout = timeout
+        self.isolated = isolated
+        self.cwd = cwd
+        self.log = log
+        self.submitted = time.perf_counter()
+        self.cancelled = False
+        self._started = False
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._result: Optional[dict] = None
+
+    def cancel(self) -> bool:
+        """Drop the job if still queued, or kill its process. False if already done."""
+        with self._lock:
+            if self._done.is_set():
+                return False
+            self.cancelled = True
+            started, proc = self._started, self._proc
+            if not started:
+                self._finish(_result(cancelled=True, error="Cancelled before start"))
+                return True
+        if proc is not None:
+            _kill(proc)
+        return True
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def result(self, timeout: Optional[float] = None) -> dict:
+        if not self._done.wait(timeout):
+            raise TimeoutError("Codex job still running")
+        return self._result
+
+    def _finish(self, result: dict) -> None:
+        self._result = result
+        self._done.set()
+
+
+class _Worker:
+    def __init__(self):
+        self.root = Path(tempfile.mkdtemp(prefix="codex_worker_"))
+        self.work_dir = self.root / "work"
+        self.output = self.root / "last_message.md"
+        self.reset()
+
+    def reset(self) -> None:
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            self.output.unlink()
+        except FileNotFoundError:
+            pass
+
+    def spawn(self, job: CodexJob) -> subprocess.Popen:
+        args = [
+            a.replace(WORK_DIR, str(self.work_dir)).replace(OUTPUT, str(self.output))
+            for a in job.argv
+        ]
+        if job.log is not None:
+            job.log.flush()
+        return subprocess.Popen(
+            args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE if job.log is None else job.log,
+            stderr=subprocess.PIPE if job.log is None else subprocess.STDOUT,
+            cwd=str(self.work_dir) if job.isolated else job.cwd,
+        )
+
+    def close(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+class CodexPool:
+    """Fixed set of Codex workers fed from one FIFO queue."""
+
+    def __init__(self, size: Optional[int] = None):
+        self.size = size or manifest_concurrency()
+        self._queue: "queue.Queue[Optional[CodexJob]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._busy = 0
+        self.counters = {
+            "submitted": 0, "completed": 0, "timeouts": 0, "cancelled": 0, "errors": 0,
+        }
+        self._threads = [
+            threading.Thread(target=self._loop, name=f"codex-worker-{i}", daemon=True)
+            for i in range(self.size)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, argv: Sequence[str], prompt: str, timeout: Optional[float] = None,
+               isolated: bool = False, cwd: Optional[str] = None,
+               log: Optional[IO] = None) -> CodexJob:
+        job = CodexJob(argv, prompt, timeout, isolated, cwd, log)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Codex pool is shut down")
+            self.counters["submitted"] += 1
+        self._queue.put(job)
+        return job
+
+    def run(self, argv: Sequence[str], prompt: str, timeout: Optional[float] = None,
+            isolated: bool = False, cwd: Optional[str] = None,
+            log: Optional[IO] = None) -> dict:
+        """Submit and wait for the result."""
+        return self.submit(argv, prompt, timeout, isolated, cwd, log).result()
+
+    def _loop(self) -> None:
+        worker = _Worker()
+        try:
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    return
+                self._execute(worker, job)
+        finally:
+            worker.close()
+
+    def _count(self, name: str, delta: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += delta
+
+    def _execute(self, worker: _Worker, job: CodexJob) -> None:
+        with job._lock:
+            if job._done.is_set():  # cancelled while queued
+                self._count("cancelled")
+                return
+            job._started = True
+        queued_ms = (time.perf_counter() - job.submitted) * 1000
+        with self._lock:
+            self._busy += 1
+        started = time.perf_counter()
+        try:
+            result = self._communicate(worker, job)
+        except Exception as e:
+            result = _result(error=str(e))
+        finally:
+            with self._lock:
+                self._busy -= 1
+        result["queued_ms"] = round(queued_ms, 2)
+        result["run_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+        worker.reset()
+        if result["cancelled"]:
+            self._count("cancelled")
+        elif result["timed_out"]:
+            self._count("timeouts")
+        elif result["error"]:
+            self._count("errors")
+        self._count("completed")
+        job._finish(result)
+
+    def _communicate(self, worker: _Worker, job: CodexJob) -> dict:
+        proc = worker.spawn(job)
+        with job._lock:
+            job._proc = proc
+            cancelled = job.cancelled
+        if cancelled:
+            _kill(proc)
+
+        timed_out = False
+        try:
+            stdout, stderr = proc.communicate(job.prompt.encode("utf-8"), timeout=job.timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            _kill(proc)
+            stdout, stderr = proc.communicate()
+
+        output = None
+        if worker.output.exists():
+            output = worker.output.read_text(encoding="utf-8", errors="replace")
+        error = None
+        if job.cancelled:
+            error = "Cancelled"
+        elif timed_out:
+            error = f"Timed out after {job.timeout} seconds"
+        return _result(
+            returncode=proc.returncode,
+            stdout=(stdout or b"").decode("utf-8", errors="replace"),
+            stderr=(stderr or b"").decode("utf-8", errors="replace"),
+            output=output,
+            timed_out=timed_out,
+            cancelled=job.cancelled,
+            error=error,
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(
+                self.counters, size=self.size, busy=self._busy, queued=self._queue.qsize(),
+            )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Cancel queued jobs, stop the workers and remove their scratch dirs."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job.cancel()
+        for _ in self._threads:
+            self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
+_pool: Optional[CodexPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_codex_pool() -> CodexPool:
+    """Process-wide pool shared by chat endpoints and Scholar runs."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = CodexPool()
+            atexit.register(_pool.shutdown, False)
+        return _pool
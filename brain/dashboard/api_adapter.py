@@ -1,11 +1,10 @@
-from flask import Blueprint, jsonify, request
-from datetime import datetime, timedelta
+from flask import Blueprint, Response, jsonify, request
+from datetime import datetime, timedelta, timezone
 import sqlite3
 import json
 import os
 import logging
 import re
-import requests
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
@@ -56,6 +55,8 @@ def _obsidian_api_key() -> str:
 
 def obsidian_health_check() -> dict:
     """Check if Obsidian Local REST API is running."""
+    import requests
+
     try:
         resp = requests.get(
             f"{OBSIDIAN_API_URL}/",
@@ -82,6 +83,8 @@ def obsidian_health_check() -> dict:
 
 def obsidian_append(path: str, content: str) -> dict:
     """Append content to a file in Obsidian vault using Local REST API."""
+    import requests
+
     try:
         # Local REST API uses POST to append content
         resp = requests.post(
@@ -105,6 +108,8 @@ def obsidian_append(path: str, content: str) -> dict:
 
 def obsidian_list_files(folder: str = "") -> dict:
     """List files in Obsidian vault folder."""
+    import requests
+
     try:
         url = (
             f"{OBSIDIAN_API_URL}/vault/"
@@ -171,6 +176,8 @@ def obsidian_list_files(folder: str = "") -> dict:
 
 def obsidian_get_file(path: str) -> dict:
     """Get content of a file from Obsidian vault."""
+    import requests
+
     try:
         resp = requests.get(
             f"{OBSIDIAN_API_URL}/vault/{path}",
@@ -190,6 +197,8 @@ def obsidian_get_file(path: str) -> dict:
 
 def obsidian_save_file(path: str, content: str) -> dict:
     """Save/overwrite a file in Obsidian vault."""
+    import requests
+
     try:
         resp = requests.put(
             f"{OBSIDIAN_API_URL}/vault/{path}",
@@ -503,6 +512,18 @@ def db_health():
 # ==============================================================================
 
 
+def _sync_session_rollups(conn):
+    """Apply queued dashboard rollup and term-count updates after a sessions write."""
+    from session_rollups import sync_rollups
+    from session_terms import sync_terms
+
+    try:
+        sync_rollups(conn)
+        sync_terms(conn)
+    except sqlite3.OperationalError as e:
+        logger.warning("Dashboard rollups not updated: %s", e)
+
+
 def serialize_session_row(row):
     raw_date = row["session_date"] if "session_date" in row.keys() else None
     raw_time = row["session_time"] if "session_time" in row.keys() else None
@@ -767,6 +788,7 @@ def create_session():
         )
         conn.commit()
         new_id = cursor.lastrowid
+        _sync_session_rollups(conn)
     except Exception as e:
         conn.rollback()
         return jsonify({"error": str(e)}), 500
@@ -943,6 +965,7 @@ def ingest_session_json():
         sql = f"UPDATE sessions SET {', '.join(fields)} WHERE id = ?"
         cur.execute(sql, values)
         conn.commit()
+        _sync_session_rollups(conn)
 
         return jsonify({
             "ok": True,
@@ -1016,6 +1039,7 @@ def update_session(session_id):
             f"UPDATE sessions SET {', '.join(fields)} WHERE id = ?", tuple(values)
         )
         conn.commit()
+        _sync_session_rollups(conn)
         conn.row_factory = sqlite3.Row
         cur = conn.cursor()
         cur.execute(
@@ -1064,6 +1088,7 @@ def delete_session(session_id):
         cur = conn.cursor()
         cur.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
         conn.commit()
+        _sync_session_rollups(conn)
         conn.close()
         return jsonify({"success": True})
     except Exception as e:
@@ -1086,6 +1111,7 @@ def bulk_delete_sessions():
         cur.execute(f"DELETE FROM sessions WHERE id IN ({placeholders})", ids)
         deleted = cur.rowcount
         conn.commit()
+        _sync_session_rollups(conn)
         conn.close()
         return jsonify({"deleted": deleted})
     except Exception as e:
@@ -1113,25 +1139,6 @@ def safe_iso_date(date_val):
     return None
 
 
-def parse_json_array(value):
-    if value is None:
-        return []
-    if isinstance(value, list):
-        return [str(v) for v in value if v is not None]
-    if isinstance(value, str):
-        trimmed = value.strip()
-        if not trimmed:
-            return []
-        try:
-            parsed = json.loads(trimmed)
-            if isinstance(parsed, list):
-                return [str(v) for v in parsed if v is not None]
-        except Exception:
-            pass
-        return [v.strip() for v in trimmed.split(",") if v.strip()]
-    return [str(value)]
-
-
 def normalize_list_value(value):
     if value is None:
         return None
@@ -1194,8 +1201,6 @@ def get_events():
     Mimics: app.get("/api/events")
     Sources from 'course_events' table via syllabus.py helper.
     """
-    from brain.dashboard.syllabus import fetch_all_courses_and_events
-
     try:
         courses, events = fetch_all_courses_and_events()
         course_map = {c["id"]: c for c in courses}
@@ -2545,76 +2550,18 @@ def generate_planner_tasks():
     """Generate study_tasks from recent session weak_anchors using spacing heuristic.
 
     Reads sessions with weak_anchors, applies 1-3-7-21 day spacing,
-    and inserts review tasks into study_tasks.
+    and inserts review tasks into study_tasks (see spacing_planner).
+    Only sessions changed since the last run are scanned unless the body
+    has {"full": true}.
     """
+    from spacing_planner import generate_spacing_tasks
+
+    data = request.get_json(silent=True) or {}
     conn = None
     try:
         conn = get_connection()
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-
-        # Get planner settings
-        cur.execute("SELECT * FROM planner_settings WHERE id = 1")
-        settings = dict(cur.fetchone() or {})
-        default_minutes = settings.get("default_session_minutes", 45)
-        strategy = settings.get("spacing_strategy", "standard")
-
-        # Standard spacing intervals (days)
-        if strategy == "rsr-adaptive":
-            intervals = [1, 4, 9, 21]  # slightly longer gaps for RSR-adaptive
-        else:
-            intervals = [1, 3, 7, 21]
-
-        # Get recent sessions with weak_anchors (last 30 days)
-        cur.execute("""
-            SELECT id, session_date, weak_anchors, main_topic, topic
-            FROM sessions
-            WHERE weak_anchors IS NOT NULL AND weak_anchors != ''
-              AND session_date >= date('now', '-30 days')
-            ORDER BY session_date DESC
-        """)
-        sessions = cur.fetchall()
-
-        created = 0
-        for sess in sessions:
-            import re as _re
-            anchors = [a.strip() for a in _re.split(r"[;\n]", sess["weak_anchors"] or "") if a.strip()]
-            for anchor in anchors:
-                for i, days in enumerate(intervals):
-                    review_num = i + 1
-
-                    # Check if task already exists for this anchor + review number
-                    cur.execute("""
-                        SELECT id FROM study_tasks
-                        WHERE anchor_text = ? AND review_number = ?
-                          AND source = 'spacing'
-                    """, (anchor, review_num))
-                    if cur.fetchone():
-                        continue
-
-                    cur.execute("""
-                        INSERT INTO study_tasks (
-                            scheduled_date, planned_minutes,
-                            status, notes, source, priority, review_number,
-                            anchor_text, created_at
-                        ) VALUES (
-                            date(?, '+' || ? || ' days'), ?,
-                            'pending', ?, 'spacing', ?, ?,
-                            ?, datetime('now')
-                        )
-                    """, (
-                        sess["session_date"],
-                        str(days),
-                        default_minutes,
-                        f"Review R{review_num}: {anchor} (from {sess['session_date']})",
-                        4 - i,  # R1 = priority 3, R2 = 2, R3 = 1, R4 = 0
-                        review_num,
-                        anchor,
-                    ))
-                    created += 1
-
-        conn.commit()
-        return jsonify({"ok": True, "tasks_created": created})
+        result = generate_spacing_tasks(conn, incremental=not data.get("full"))
+        return jsonify({"ok": True, **result})
     except Exception as e:
         if conn:
             conn.rollback()
@@ -2755,10 +2702,11 @@ def scholar_overview():
     and the rest of the Scholar endpoints.
     """
     try:
-        # Opportunistic cleanup so stale pid markers don't wedge the UI.
+        # Opportunistic cleanup so stale pid markers don't wedge the UI
+        # (throttled: this endpoint is polled while the tab is open).
         try:
-            from dashboard.scholar import cleanup_stale_pids
-            cleanup_stale_pids()
+            from dashboard.scholar_cache import _cleanup_stale_pids_throttled
+            _cleanup_stale_pids_throttled()
         except Exception:
             pass
         return jsonify(_scholar_status_payload())
@@ -5242,6 +5190,7 @@ def complete_wheel_session():
         )
 
         conn.commit()
+        _sync_session_rollups(conn)
 
         # Get the new current course (now at position 0)
         cur.execute("""
@@ -5661,157 +5610,153 @@ def get_last_session_context():
 # ==============================================================================
 
 
+# Minutes per session: time_spent_minutes, falling back to duration_minutes
+# when it is blank (or 0 while a duration was logged).
+_SESSION_MINUTES_SQL = """
+    CASE
+        WHEN time_spent_minutes IS NULL OR time_spent_minutes = ''
+             OR (time_spent_minutes = 0 AND duration_minutes IS NOT NULL
+                 AND duration_minutes != '' AND duration_minutes != 0)
+        THEN COALESCE(NULLIF(duration_minutes, ''), 0)
+        ELSE time_spent_minutes
+    END
+"""
+
+
+def _brain_metrics_validators(conn):
+    """(changed_at, etag, last_modified) for the current sessions state.
+
+    sessions_changed_at is stamped by trigger on every sessions write. The
+    UTC date is folded in because staleTopics.daysSince moves at midnight.
+    """
+    import hashlib
+    from session_terms import TERMS_VERSION
+
+    row = conn.execute(
+        "SELECT value FROM session_rollup_meta WHERE name = 'sessions_changed_at'"
+    ).fetchone()
+    changed_at = row[0] if row else None
+    now = datetime.now().astimezone()
+    midnight = now.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    last_modified = midnight
+    if changed_at:
+        try:
+            last_modified = max(midnight, datetime.fromisoformat(changed_at).astimezone())
+        except ValueError:
+            pass
+    tag = f"{changed_at}|{midnight.date().isoformat()}|{TERMS_VERSION}"
+    etag = hashlib.sha1(tag.encode("utf-8")).hexdigest()[:16]
+    return changed_at, etag, last_modified
+
+
 @adapter_bp.route("/brain/metrics", methods=["GET"])
 def get_brain_metrics():
-    """Get aggregated brain analytics metrics."""
+    """Get aggregated brain analytics metrics.
+
+    Counts and minutes are grouped in SQL; term lists come from the
+    session_term_freq table, so no session text is read here. Responses
+    carry an ETag/Last-Modified and honour If-None-Match/If-Modified-Since.
+    ?since=<lastModified> returns {"changed": false} when no session was
+    written after that stamp.
+    """
+    from session_terms import top_terms
+
     try:
         conn = get_connection()
         conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
 
+        changed_at, etag, last_modified = _brain_metrics_validators(conn)
+
+        def with_validators(response):
+            response.set_etag(etag, weak=True)
+            response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            return response
+
+        since = request.args.get("since")
+        if since and changed_at and changed_at <= since:
+            conn.close()
+            return with_validators(jsonify({"changed": False, "lastModified": changed_at}))
+        if request.if_none_match or request.if_modified_since:
+            probe = with_validators(Response()).make_conditional(request)
+            if probe.status_code == 304:
+                conn.close()
+                return probe
+
+        cur = conn.cursor()
         cur.execute(
-            """
-            SELECT
-                session_date,
-                session_time,
-                main_topic,
-                topic,
-                study_mode,
-                time_spent_minutes,
-                duration_minutes,
-                anki_cards_count,
-                confusions,
-                weak_anchors,
-                concepts,
-                issues,
-                errors_conceptual,
-                gaps_identified,
-                subtopics,
-                what_needs_fixing
+            f"""
+            SELECT COUNT(*) AS sessions,
+                   COALESCE(SUM({_SESSION_MINUTES_SQL}), 0) AS minutes,
+                   COALESCE(SUM(COALESCE(anki_cards_count, 0)), 0) AS cards
             FROM sessions
         """
         )
-        rows = cur.fetchall()
-        conn.close()
-
-        sessions_per_course_map = {}
-        mode_map = {}
-        confusions_map = {}
-        weak_map = {}
-        concept_map = {}
-        issues_map = {}
-        total_minutes = 0
-        total_cards = 0
-
-        for row in rows:
-            course = row["main_topic"] or row["topic"] or "General"
-            minutes = row["time_spent_minutes"]
-            duration = row["duration_minutes"]
-            if minutes in (None, "") or (
-                minutes == 0 and duration not in (None, "", 0)
-            ):
-                minutes = duration
-            minutes = minutes or 0
-            total_minutes += minutes
-            total_cards += row["anki_cards_count"] or 0
-
-            # Sessions per course
-            if course not in sessions_per_course_map:
-                sessions_per_course_map[course] = {
-                    "course": course,
-                    "count": 0,
-                    "minutes": 0,
-                }
-            sessions_per_course_map[course]["count"] += 1
-            sessions_per_course_map[course]["minutes"] += minutes
-
-            # Mode distribution
-            mode = row["study_mode"] or "study"
-            if mode not in mode_map:
-                mode_map[mode] = {"mode": mode, "count": 0, "minutes": 0}
-            mode_map[mode]["count"] += 1
-            mode_map[mode]["minutes"] += minutes
-
-            # Confusions
-            confusions_val = (
-                row["confusions"] or row["errors_conceptual"] or row["gaps_identified"]
-            )
-            for item in parse_json_array(confusions_val):
-                key = item.lower().strip()
-                if not key:
-                    continue
-                if key in confusions_map:
-                    confusions_map[key]["count"] += 1
-                else:
-                    confusions_map[key] = {"text": item, "count": 1, "course": course}
-
-            # Weak anchors
-            for item in parse_json_array(row["weak_anchors"]):
-                key = item.lower().strip()
-                if not key:
-                    continue
-                if key in weak_map:
-                    weak_map[key]["count"] += 1
-                else:
-                    weak_map[key] = {"text": item, "count": 1, "course": course}
-
-            # Concepts
-            concepts_val = row["concepts"] or row["subtopics"]
-            for item in parse_json_array(concepts_val):
-                key = item.lower().strip()
-                if not key:
-                    continue
-                concept_map[key] = concept_map.get(key, 0) + 1
-
-            # Issues log
-            issues_val = row["issues"] or row["what_needs_fixing"]
-            for item in parse_json_array(issues_val):
-                key = item.lower().strip()
-                if not key:
-                    continue
-                if key in issues_map:
-                    issues_map[key]["count"] += 1
-                else:
-                    issues_map[key] = {"issue": item, "count": 1, "course": course}
+        totals = cur.fetchone()
 
-        sessions_per_course = sorted(
-            sessions_per_course_map.values(), key=lambda x: x["count"], reverse=True
+        # Ties keep the order a sessions scan first meets each group in.
+        cur.execute(
+            f"""
+            SELECT COALESCE(NULLIF(main_topic, ''), NULLIF(topic, ''), 'General') AS course,
+                   COUNT(*) AS count,
+                   SUM({_SESSION_MINUTES_SQL}) AS minutes
+            FROM sessions
+            GROUP BY course
+            ORDER BY count DESC, MIN(id)
+        """
         )
-        mode_dist = sorted(mode_map.values(), key=lambda x: x["count"], reverse=True)
-        recent_confusions = sorted(
-            confusions_map.values(), key=lambda x: x["count"], reverse=True
-        )[:10]
-        recent_weak = sorted(weak_map.values(), key=lambda x: x["count"], reverse=True)[
-            :10
+        sessions_per_course = [
+            {"course": r["course"], "count": r["count"], "minutes": r["minutes"]}
+            for r in cur.fetchall()
+        ]
+        cur.execute(
+            f"""
+            SELECT COALESCE(NULLIF(study_mode, ''), 'study') AS mode,
+                   COUNT(*) AS count,
+                   SUM({_SESSION_MINUTES_SQL}) AS minutes
+            FROM sessions
+            GROUP BY mode
+            ORDER BY count DESC, MIN(id)
+        """
+        )
+        mode_dist = [
+            {"mode": r["mode"], "count": r["count"], "minutes": r["minutes"]}
+            for r in cur.fetchall()
+        ]
+
+        recent_confusions = [
+            {"text": r["text"], "count": r["count"], "course": r["course"]}
+            for r in top_terms(conn, "confusion")
+        ]
+        recent_weak = [
+            {"text": r["text"], "count": r["count"], "course": r["course"]}
+            for r in top_terms(conn, "weak_anchor")
+        ]
+        concept_frequency = [
+            {"concept": r["key"], "count": r["count"]}
+            for r in top_terms(conn, "concept")
+        ]
+        issues_log = [
+            {"issue": r["text"], "count": r["count"], "course": r["course"]}
+            for r in top_terms(conn, "issue")
         ]
-        concept_frequency = sorted(
-            [{"concept": k, "count": v} for k, v in concept_map.items()],
-            key=lambda x: x["count"],
-            reverse=True,
-        )[:10]
-        issues_log = sorted(
-            issues_map.values(), key=lambda x: x["count"], reverse=True
-        )[:10]
 
         # --- Averages (understanding, retention) ---
-        conn2 = get_connection()
-        conn2.row_factory = sqlite3.Row
-        cur2 = conn2.cursor()
-        cur2.execute("""
+        cur.execute("""
             SELECT
                 AVG(CAST(understanding_level AS REAL)) AS avg_understanding,
                 AVG(CAST(retention_confidence AS REAL)) AS avg_retention
             FROM sessions
             WHERE understanding_level IS NOT NULL AND retention_confidence IS NOT NULL
         """)
-        avg_row = cur2.fetchone()
+        avg_row = cur.fetchone()
         averages = {
             "understanding": round(avg_row["avg_understanding"] or 0, 1),
             "retention": round(avg_row["avg_retention"] or 0, 1),
         }
 
         # --- Mastery: stale topics (not studied in 14+ days) ---
-        cur2.execute("""
+        cur.execute("""
             SELECT COALESCE(main_topic, topic) AS t,
                    COUNT(*) AS cnt,
                    MAX(session_date) AS last_studied,
@@ -5826,24 +5771,27 @@ def get_brain_metrics():
         """)
         stale_topics = [
             {"topic": r["t"], "count": r["cnt"], "lastStudied": r["last_studied"], "daysSince": r["days_since"]}
-            for r in cur2.fetchall()
+            for r in cur.fetchall()
         ]
-        conn2.close()
+        conn.close()
 
-        return jsonify(
-            {
-                "sessionsPerCourse": sessions_per_course,
-                "modeDistribution": mode_dist,
-                "recentConfusions": recent_confusions,
-                "recentWeakAnchors": recent_weak,
-                "conceptFrequency": concept_frequency,
-                "issuesLog": issues_log,
-                "totalMinutes": total_minutes,
-                "totalSessions": len(rows),
-                "totalCards": total_cards,
-                "averages": averages,
-                "staleTopics": stale_topics,
-            }
+        return with_validators(
+            jsonify(
+                {
+                    "sessionsPerCourse": sessions_per_course,
+                    "modeDistribution": mode_dist,
+                    "recentConfusions": recent_confusions,
+                    "recentWeakAnchors": recent_weak,
+                    "conceptFrequency": concept_frequency,
+                    "issuesLog": issues_log,
+                    "totalMinutes": totals["minutes"],
+                    "totalSessions": totals["sessions"],
+                    "totalCards": totals["cards"],
+                    "averages": averages,
+                    "staleTopics": stale_topics,
+                    "lastModified": changed_at,
+                }
+            )
         )
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -5851,7 +5799,10 @@ def get_brain_metrics():
 
 @adapter_bp.route("/brain/llm-status", methods=["GET"])
 def get_llm_status():
-    """Check whether an LLM API key is configured for chat endpoints."""
+    """Check whether an LLM API key is configured for chat endpoints.
+
+    Also reports LLM response-cache hit rates and keep-alive pool timings.
+    """
     try:
         config = load_api_config()
         api_provider = config.get("api_provider", "openrouter")
@@ -5862,12 +5813,17 @@ def get_llm_status():
         model = config.get("model", "openrouter/auto")
         connected = bool(api_key)
 
+        import http_pool
+        import llm_cache
+
         return jsonify(
             {
                 "connected": connected,
                 "model": model,
                 "status": "Connected" if connected else "Disconnected",
                 "error": None if connected else "No API key configured",
+                "cache": llm_cache.stats(),
+                "http_pools": http_pool.stats(),
             }
         )
     except Exception as e:
@@ -6215,6 +6171,7 @@ def brain_chat():
                             )
                             cards_created += 1
                     conn.commit()
+                    _refresh_card_index(conn)
                     conn.close()
 
                     # If mode is "anki", trigger immediate sync to Anki
@@ -6812,6 +6769,7 @@ IMPORTANT:
                     cards_created += 1
 
             conn.commit()
+            _refresh_card_index(conn)
             conn.close()
 
             # Cards stay pending - user reviews/approves in Anki Integration window
@@ -7012,16 +6970,14 @@ def brain_quick_chat():
     }
 
     def generate():
-        import urllib.request
-        import urllib.error
-        from llm_provider import OPENROUTER_API_KEY
+        import http_pool
+        from llm_provider import OPENROUTER_API_KEY, OPENROUTER_CHAT_URL
 
         api_key = OPENROUTER_API_KEY or os.environ.get("OPENROUTER_API_KEY")
         if not api_key:
             yield 'data: {"error": "OPENROUTER_API_KEY not set."}\n\n'
             return
 
-        url = "https://openrouter.ai/api/v1/chat/completions"
         headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {api_key}",
@@ -7037,10 +6993,14 @@ def brain_quick_chat():
         }
         try:
             req_data = json.dumps(payload).encode("utf-8")
-            req = urllib.request.Request(
-                url, data=req_data, headers=headers, method="POST"
-            )
-            with urllib.request.urlopen(req, timeout=120) as response:
+            with http_pool.request(
+                "POST", OPENROUTER_CHAT_URL, body=req_data, headers=headers, timeout=120
+            ) as response:
+                if response.status != 200:
+                    error = f"HTTP Error {response.status}: {response.reason}"
+                    response.read()
+                    yield f"data: {json.dumps({'error': error})}\n\n"
+                    return
                 for line in response:
                     decoded = line.decode("utf-8").strip()
                     if decoded.startswith("data: "):
@@ -7270,6 +7230,7 @@ def brain_ingest():
                     )
                     cards_created += 1
             conn.commit()
+            _refresh_card_index(conn)
             conn.close()
 
         return jsonify(
@@ -8042,14 +8003,19 @@ def get_scholar_questions():
 @adapter_bp.route("/scholar/chat", methods=["POST"])
 def scholar_chat():
     """Chat with Scholar about study data."""
-    from scholar.brain_reader import get_all_sessions, get_session_count
+    from itertools import islice
+
+    from scholar.brain_reader import BrainReader
 
     data = request.json
     message = data.get("message", "").lower()
 
-    # Get study data for context
-    session_count = get_session_count()
-    sessions = get_all_sessions()
+    # Get study data for context: a count and the newest few topics only
+    with BrainReader() as reader:
+        session_count = reader.get_session_count()
+        sessions = list(
+            islice(reader.iter_sessions(columns=("id", "main_topic", "topic")), 5)
+        )
 
     # Build contextual response
     if "session" in message or "study" in message:
@@ -8529,6 +8495,13 @@ def get_card_drafts():
         return jsonify({"error": str(e)}), 500
 
 
+def _refresh_card_index(conn):
+    """Hash card fronts queued by a card_drafts write for duplicate lookups."""
+    from card_dedupe import refresh_card_index
+
+    refresh_card_index(conn)
+
+
 @adapter_bp.route("/anki/drafts/<int:draft_id>/approve", methods=["POST"])
 def approve_card_draft(draft_id):
     """Approve a card draft for syncing to Anki."""
@@ -8540,6 +8513,7 @@ def approve_card_draft(draft_id):
             "UPDATE card_drafts SET status = 'approved' WHERE id = ?", (draft_id,)
         )
         conn.commit()
+        _refresh_card_index(conn)
         conn.close()
 
         return jsonify({"success": True, "id": draft_id, "status": "approved"})
@@ -8599,6 +8573,7 @@ def update_card_draft(draft_id):
         sql = f"UPDATE card_drafts SET {', '.join(updates)} WHERE id = ?"
         cur.execute(sql, values)
         conn.commit()
+        _refresh_card_index(conn)
 
         # Fetch updated record
         cur.execute(
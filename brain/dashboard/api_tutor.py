@@ -34,6 +34,7 @@ from flask import Blueprint, Response, jsonify, request
 
 from db_setup import DB_PATH, get_connection
 from paths import UPLOADS_DIR
+from tutor_session_store import get_session_store
 
 tutor_bp = Blueprint("tutor", __name__, url_prefix="/api/tutor")
 
@@ -298,8 +299,10 @@ def send_turn(session_id: str):
         conn.close()
         return jsonify({"error": "Session is not active"}), 400
 
-    # Load previous turns for chat history
-    turns = _get_session_turns(conn, session_id, limit=20)
+    # Rolling chat history (recent turns + summary), cached and persisted by the store
+    history = get_session_store().get(session_id)
+    history_turns = history.messages()
+    history_summary = history.summary_text()
 
     # Build chain/block context if method chain is active
     block_info = None
@@ -404,14 +407,14 @@ def send_turn(session_id: str):
         )
 
         # Build chat history for LangChain
-        from langchain_core.messages import HumanMessage, AIMessage
+        from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
         chat_history = []
-        for turn in turns:
-            if turn.get("question"):
-                chat_history.append(HumanMessage(content=turn["question"]))
-            if turn.get("answer"):
-                chat_history.append(AIMessage(content=turn["answer"]))
+        if history_summary:
+            chat_history.append(SystemMessage(content=f"Earlier in this session:\n{history_summary}"))
+        for turn in history_turns:
+            message_cls = HumanMessage if turn["role"] == "user" else AIMessage
+            chat_history.append(message_cls(content=turn["content"]))
 
         input_dict = {
             "question": question,
@@ -478,13 +481,14 @@ def send_turn(session_id: str):
                 )
 
                 # Limit history to last 6 turns, truncate answers for speed
-                recent_turns = turns[-6:] if len(turns) > 6 else turns
                 history_lines: list[str] = []
-                for t in recent_turns:
-                    if t.get("question"):
-                        history_lines.append(f"User: {t['question']}")
-                    if t.get("answer"):
-                        ans = t["answer"]
+                if history_summary:
+                    history_lines.append(f"Earlier: {'; '.join(history_summary.splitlines())}")
+                for t in history_turns[-12:]:
+                    if t["role"] == "user":
+                        history_lines.append(f"User: {t['content']}")
+                    else:
+                        ans = t["content"]
                         if len(ans) > 400:
                             ans = ans[:400] + "..."
                         history_lines.append(f"Assistant: {ans}")
@@ -622,6 +626,8 @@ Remember: cite source documents using [Source: filename] when you use them."""
 
             db_conn.commit()
             db_conn.close()
+
+            get_session_store().append_exchange(session_id, question, full_response)
         except Exception:
             pass
 
@@ -805,6 +811,10 @@ def end_session(session_id: str):
     )
 
     conn.commit()
+    if brain_session_id:
+        from session_rollups import sync_after_session_write
+
+        sync_after_session_write(conn)
     conn.close()
 
     return jsonify({
@@ -835,6 +845,7 @@ def delete_session(session_id: str):
     cur.execute("DELETE FROM tutor_sessions WHERE session_id = ?", (session_id,))
     conn.commit()
     conn.close()
+    get_session_store().drop(session_id)
 
     return jsonify({"deleted": True, "session_id": session_id})
 
@@ -884,6 +895,9 @@ def create_artifact(session_id: str):
         result["card_id"] = cur.lastrowid
         conn.commit()
 
+        from card_dedupe import refresh_card_index
+        refresh_card_index(conn)
+
     elif artifact_type == "note":
         result["content"] = content
         result["title"] = title
@@ -1083,6 +1097,9 @@ def upload_material():
     material_id = cur.lastrowid
     conn.commit()
 
+    from rag_notes import refresh_rag_chunks
+    refresh_rag_chunks(conn)
+
     # Attempt embedding (non-blocking — don't fail the upload if embedding fails)
     embedded = False
     if content and not extraction_error:
@@ -1344,3 +1361,16 @@ def trigger_embed():
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+# ---------------------------------------------------------------------------
+# GET /api/tutor/retrieval-cache — Retrieval / query-embedding cache stats
+# ---------------------------------------------------------------------------
+
+@tutor_bp.route("/retrieval-cache", methods=["GET"])
+def retrieval_cache():
+    try:
+        from tutor_rag import retrieval_cache_stats
+        return jsonify(retrieval_cache_stats())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
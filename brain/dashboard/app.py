@@ -30,11 +30,12 @@ def create_app():
     app.register_blueprint(dashboard_v3_api_bp)  # /api/v3/* - calendar data
     app.register_blueprint(dashboard_bp)  # Legacy routes (will be deprecated)
 
-    # DEBUG: Print all registered routes
-    print("\n=== REGISTERED ROUTES ===")
-    for rule in app.url_map.iter_rules():
-        print(f"  {rule.rule} -> {rule.endpoint} [{', '.join(rule.methods - {'OPTIONS', 'HEAD'})}]")
-    print("=========================\n")
+    # DEBUG: Print all registered routes (slow on the Windows console, so opt-in)
+    if os.environ.get("DASHBOARD_PRINT_ROUTES"):
+        print("\n=== REGISTERED ROUTES ===")
+        for rule in app.url_map.iter_rules():
+            print(f"  {rule.rule} -> {rule.endpoint} [{', '.join(rule.methods - {'OPTIONS', 'HEAD'})}]")
+        print("=========================\n")
 
     # Serve React App — use 404 handler so blueprint routes always take priority
     @app.errorhandler(404)
@@ -74,6 +75,16 @@ def create_app():
 
         return "Dashboard build not found", 404
 
+    # Optional background refresh of the Scholar tab cache
+    watch_seconds = os.environ.get("SCHOLAR_CACHE_WATCH_SECONDS")
+    if watch_seconds:
+        try:
+            from dashboard.scholar_cache import start_watcher
+
+            start_watcher(float(watch_seconds))
+        except ValueError:
+            print(f"[WARN] Ignoring SCHOLAR_CACHE_WATCH_SECONDS={watch_seconds!r}")
+
     # Hot reload disabled to prevent dev reload loops
 
     # Add cache-busting headers for all responses
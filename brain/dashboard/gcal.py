@@ -5,8 +5,12 @@ OAuth2 authentication + manual sync of calendar events
 
 import os
 import json
+import random
 import sqlite3
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
@@ -44,6 +48,14 @@ TOKEN_PATH = DATA_DIR / "gcal_token.json"
 CONFIG_PATH = API_CONFIG_PATH  # From paths
 # DB_PATH imported from config
 
+# Sync tuning: parallel calendar/task-list fetches, batch pushes (Google caps
+# a batch at 50 calls for Calendar), retries on 429/quota/5xx responses.
+GCAL_FETCH_WORKERS = 4
+GCAL_BATCH_SIZE = 50
+GCAL_MAX_ATTEMPTS = 5
+GCAL_BACKOFF_BASE_SEC = 1.0
+GCAL_BACKOFF_MAX_SEC = 32.0
+
 # OAuth scopes - read-only access to calendar and tasks
 SCOPES = [
     "https://www.googleapis.com/auth/calendar",
@@ -523,6 +535,239 @@ def fetch_calendar_events(
     return events, None
 
 
+def _http_status(exc: Exception) -> Optional[int]:
+    status = getattr(getattr(exc, "resp", None), "status", None)
+    if status is None:
+        status = getattr(exc, "status_code", None)
+    try:
+        return int(status)
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_sync_token_gone(exc: Exception) -> bool:
+    """True when Google rejected a syncToken (HTTP 410 Gone)."""
+    return _http_status(exc) == 410
+
+
+def _is_rate_limited(exc: Exception) -> bool:
+    """429s, quota 403s and transient 5xx are worth retrying."""
+    status = _http_status(exc)
+    if status in (429, 500, 502, 503, 504):
+        return True
+    if status == 403:
+        content = getattr(exc, "content", b"") or b""
+        if isinstance(content, bytes):
+            content = content.decode("utf-8", "replace")
+        return "rateLimitExceeded" in content or "userRateLimitExceeded" in content
+    return False
+
+
+def _backoff_delay(attempt: int, exc: Optional[Exception] = None) -> float:
+    """Honour Retry-After when Google sends it, else exponential + jitter."""
+    resp = getattr(exc, "resp", None)
+    retry_after = None
+    if resp is not None and hasattr(resp, "get"):
+        retry_after = resp.get("retry-after")
+    try:
+        if retry_after is not None:
+            return min(float(retry_after), GCAL_BACKOFF_MAX_SEC)
+    except (TypeError, ValueError):
+        pass
+    delay = GCAL_BACKOFF_BASE_SEC * (2 ** attempt)
+    return min(delay + random.uniform(0, GCAL_BACKOFF_BASE_SEC), GCAL_BACKOFF_MAX_SEC)
+
+
+def _execute_with_backoff(request, sleep=time.sleep):
+    """request.execute() with retries on rate limits / transient errors."""
+    for attempt in range(GCAL_MAX_ATTEMPTS):
+        try:
+            return request.execute()
+        except Exception as exc:
+            if attempt == GCAL_MAX_ATTEMPTS - 1 or not _is_rate_limited(exc):
+                raise
+            sleep(_backoff_delay(attempt, exc))
+
+
+def execute_batched(
+    service,
+    requests: List[Tuple[str, object]],
+    batch_size: int = GCAL_BATCH_SIZE,
+    sleep=time.sleep,
+) -> Dict[str, Tuple[Optional[Dict], Optional[str]]]:
+    """Run API requests through the batch endpoint, batch_size per round trip.
+
+    requests is [(request_id, unexecuted request)]; returns
+    {request_id: (response, error)}. Only items whose own response was rate
+    limited are retried, in a later batch with backoff, so a retry never
+    re-sends an insert Google already applied. A batch call that fails as a
+    whole is retried only when it was itself rate limited (nothing ran);
+    other failures are reported for the items that got no response.
+    Services without batch support fall back to one call per request.
+    """
+    results: Dict[str, Tuple[Optional[Dict], Optional[str]]] = {}
+    if not hasattr(service, "new_batch_http_request"):
+        for request_id, req in requests:
+            try:
+                results[request_id] = (_execute_with_backoff(req, sleep=sleep), None)
+            except Exception as exc:
+                results[request_id] = (None, str(exc))
+        return results
+
+    by_id = dict(requests)
+    pending = [request_id for request_id, _ in requests]
+    for attempt in range(GCAL_MAX_ATTEMPTS):
+        retry: List[str] = []
+        last_exc: Optional[Exception] = None
+        final_round = attempt == GCAL_MAX_ATTEMPTS - 1
+
+        def callback(request_id, response, exception):
+            nonlocal last_exc
+            if exception is None:
+                results[request_id] = (response, None)
+            elif not final_round and _is_rate_limited(exception):
+                retry.append(request_id)
+                last_exc = exception
+            else:
+                results[request_id] = (None, str(exception))
+
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            batch = service.new_batch_http_request(callback=callback)
+            for request_id in chunk:
+                batch.add(by_id[request_id], request_id=request_id)
+            try:
+                batch.execute()
+            except Exception as exc:
+                unanswered = [r for r in chunk if r not in results and r not in retry]
+                rejected = _is_rate_limited(exc) and _http_status(exc) in (403, 429)
+                if rejected and not final_round:
+                    retry.extend(unanswered)
+                    last_exc = exc
+                else:
+                    for request_id in unanswered:
+                        results[request_id] = (None, str(exc))
+
+        if not retry:
+            break
+        sleep(_backoff_delay(attempt, last_exc))
+        pending = retry
+    return results
+
+
+def _list_event_pages(service, calendar_id: str, **params) -> Tuple[List[Dict], Optional[str]]:
+    """Page through events.list; returns (items, nextSyncToken)."""
+    items: List[Dict] = []
+    page_token = None
+    while True:
+        result = _execute_with_backoff(
+            service.events().list(
+                calendarId=calendar_id,
+                maxResults=2500,
+                singleEvents=True,
+                pageToken=page_token,
+                **params,
+            )
+        )
+        items.extend(result.get("items", []))
+        page_token = result.get("nextPageToken")
+        if not page_token:
+            return items, result.get("nextSyncToken")
+
+
+def _run_parallel(fn, items: List, max_workers: int) -> List:
+    """Map fn over items on a bounded pool, preserving input order."""
+    if len(items) <= 1 or max_workers <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(items)), thread_name_prefix="gcal-fetch"
+    ) as pool:
+        return list(pool.map(fn, items))
+
+
+def fetch_calendar_changes(
+    calendar_ids: List[str],
+    calendar_meta: Dict[str, Dict],
+    sync_tokens: Dict[str, Optional[str]],
+    service=None,
+    days_ahead: int = 90,
+    max_workers: int = GCAL_FETCH_WORKERS,
+    timings: Optional[Dict[str, float]] = None,
+):
+    """Fetch events changed since each calendar's stored syncToken.
+
+    Calendars are fetched in parallel. Calendars without a token, or whose
+    token Google rejects with 410 Gone, get a full listing of the usual window
+    instead. Change listings include cancelled events. Without an explicit
+    service the token is loaded (and refreshed) once here and each worker
+    builds its own client from those credentials: API clients and their HTTP
+    connections are not thread-safe, and only this thread touches the token
+    file. Per-calendar milliseconds go into ``timings`` when given.
+    Returns (events, next_tokens, full_calendar_ids, error).
+    """
+    local = threading.local()
+    creds = None
+    if service is None:
+        creds = load_token() if GOOGLE_API_AVAILABLE and build is not None else None
+        if not ensure_valid_token(creds):
+            return [], {}, [], "Not authenticated"
+
+    now = datetime.utcnow()
+    time_min = now.isoformat() + "Z"
+    time_max = (now + timedelta(days=days_ahead)).isoformat() + "Z"
+
+    def fetch_one(calendar_id: str):
+        started = time.perf_counter()
+        client = service
+        if client is None:
+            client = getattr(local, "service", None)
+            if client is None:
+                assert build is not None
+                client = local.service = build("calendar", "v3", credentials=creds)
+        token = sync_tokens.get(calendar_id)
+        items = None
+        full = False
+        try:
+            if token:
+                try:
+                    items, next_token = _list_event_pages(client, calendar_id, syncToken=token)
+                except Exception as exc:
+                    if not _is_sync_token_gone(exc):
+                        raise
+                    print(f"[INFO] Sync token expired for {calendar_id}; running full resync")
+            if items is None:
+                # Same filters as the incremental request, minus the window
+                # (syncToken cannot be combined with timeMin/timeMax/orderBy).
+                items, next_token = _list_event_pages(
+                    client, calendar_id, timeMin=time_min, timeMax=time_max
+                )
+                full = True
+        except Exception as exc:
+            return calendar_id, None, None, False, str(exc), time.perf_counter() - started
+        return calendar_id, items, next_token, full, None, time.perf_counter() - started
+
+    results = _run_parallel(fetch_one, [cid for cid in calendar_ids if cid], max_workers)
+
+    events: List[Dict] = []
+    next_tokens: Dict[str, Optional[str]] = {}
+    full_ids: List[str] = []
+    for calendar_id, items, next_token, full, error, elapsed in results:
+        if timings is not None:
+            timings[calendar_id] = round(elapsed * 1000, 1)
+        if error:
+            return [], {}, [], error
+        calendar_name = calendar_meta.get(calendar_id, {}).get("name")
+        for item in items:
+            item["_calendar_id"] = calendar_id
+            item["_calendar_name"] = calendar_name
+            events.append(item)
+        next_tokens[calendar_id] = next_token
+        if full:
+            full_ids.append(calendar_id)
+
+    return events, next_tokens, full_ids, None
+
+
 def parse_gcal_event(gcal_event: Dict) -> Dict:
     """Parse Google Calendar event to Brain format."""
     start = gcal_event.get("start", {})
@@ -682,23 +927,20 @@ def upsert_gcal_event(
     if not payload:
         return None, "Missing date"
 
-    event_id = local_event.get("google_event_id")
     try:
-        if event_id:
-            updated = (
-                service.events()
-                .update(calendarId=calendar_id, eventId=event_id, body=payload)
-                .execute()
-            )
-        else:
-            updated = (
-                service.events().insert(calendarId=calendar_id, body=payload).execute()
-            )
-        return updated, None
+        return _upsert_request(service, calendar_id, local_event, payload).execute(), None
     except Exception as exc:
         return None, str(exc)
 
 
+def _upsert_request(service, calendar_id: str, local_event: Dict, payload: Dict):
+    """Unexecuted events.update / events.insert request for a local event."""
+    event_id = local_event.get("google_event_id")
+    if event_id:
+        return service.events().update(calendarId=calendar_id, eventId=event_id, body=payload)
+    return service.events().insert(calendarId=calendar_id, body=payload)
+
+
 def delete_gcal_event(google_event_id: str, calendar_id: str):
     service = get_calendar_service()
     if not service:
@@ -734,8 +976,100 @@ def ensure_calendar_course(cursor, calendar_name: Optional[str]) -> int:
     return cursor.lastrowid
 
 
-def sync_bidirectional(course_id=None, calendar_ids: Optional[List[str]] = None):
-    """Two-way sync between Google Calendar and local course_events."""
+_LOCAL_EVENT_COLUMNS = """
+    id, course_id, type, title, date, due_date, raw_text, status,
+    google_event_id, google_calendar_id, google_calendar_name,
+    google_updated_at, updated_at
+"""
+
+
+def _local_event_from_row(row) -> Dict:
+    return {
+        "id": row[0],
+        "course_id": row[1],
+        "type": row[2],
+        "title": row[3],
+        "date": row[4],
+        "due_date": row[5],
+        "raw_text": row[6],
+        "status": row[7],
+        "google_event_id": row[8],
+        "google_calendar_id": row[9],
+        "google_calendar_name": row[10],
+        "google_updated_at": row[11],
+        "updated_at": row[12],
+    }
+
+
+def load_gcal_sync_state(cursor, calendar_ids: List[str]) -> Dict[str, Dict]:
+    """Stored syncToken / local watermark per calendar (missing = never synced)."""
+    if not calendar_ids:
+        return {}
+    placeholders = ",".join("?" * len(calendar_ids))
+    cursor.execute(
+        f"""
+        SELECT calendar_id, sync_token, local_watermark, last_full_sync_at
+        FROM gcal_sync_state
+        WHERE calendar_id IN ({placeholders})
+        """,
+        list(calendar_ids),
+    )
+    return {
+        row[0]: {
+            "sync_token": row[1],
+            "local_watermark": row[2],
+            "last_full_sync_at": row[3],
+        }
+        for row in cursor.fetchall()
+    }
+
+
+def save_gcal_sync_state(
+    cursor,
+    calendar_id: str,
+    sync_token: Optional[str],
+    synced_at: str,
+    full_sync: bool,
+    local_watermark: Optional[str] = None,
+):
+    """Store the next syncToken; local_watermark=None keeps the stored one."""
+    cursor.execute(
+        """
+        INSERT INTO gcal_sync_state (
+            calendar_id, sync_token, local_watermark, last_full_sync_at, updated_at
+        )
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(calendar_id) DO UPDATE SET
+            sync_token = excluded.sync_token,
+            local_watermark = COALESCE(excluded.local_watermark, gcal_sync_state.local_watermark),
+            last_full_sync_at = COALESCE(excluded.last_full_sync_at, gcal_sync_state.last_full_sync_at),
+            updated_at = excluded.updated_at
+        """,
+        (
+            calendar_id,
+            sync_token,
+            local_watermark,
+            synced_at if full_sync else None,
+            synced_at,
+        ),
+    )
+
+
+def sync_bidirectional(
+    course_id=None,
+    calendar_ids: Optional[List[str]] = None,
+    incremental: bool = True,
+):
+    """Two-way sync between Google Calendar and local course_events.
+
+    Incremental mode (default) pulls only events changed since each calendar's
+    stored syncToken and pushes only local rows edited since the last sync.
+    Calendars without state, or whose token has expired, fall back to a full
+    listing; incremental=False forces that for every selected calendar.
+    Calendars are fetched in parallel and pushes go out in batches; the
+    result carries a millisecond timing breakdown.
+    """
+    started = time.perf_counter()
     if not GOOGLE_API_AVAILABLE:
         return {"success": False, "error": "Google API libraries not installed"}
 
@@ -751,9 +1085,15 @@ def sync_bidirectional(course_id=None, calendar_ids: Optional[List[str]] = None)
     if not service:
         return {"success": False, "error": "Not authenticated"}
 
+    def elapsed_ms(since: float) -> float:
+        return round((time.perf_counter() - since) * 1000, 1)
+
+    timings: Dict[str, object] = {}
+    phase = time.perf_counter()
     calendars, error = fetch_calendar_list()
     if error:
         return {"success": False, "error": error}
+    timings["calendar_list_ms"] = elapsed_ms(phase)
 
     selected_ids, default_calendar_id, sync_all, calendar_meta = (
         resolve_calendar_selection(config, calendars)
@@ -766,17 +1106,29 @@ def sync_bidirectional(course_id=None, calendar_ids: Optional[List[str]] = None)
     if not selected_ids:
         return {"success": False, "error": "No calendars selected"}
 
-    events, error = fetch_calendar_events(selected_ids, calendar_meta, service=service)
+    # Taken before fetching so edits made during the sync are seen next time.
+    now = datetime.now().isoformat(timespec="seconds")
+
+    init_database()
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    sync_state = load_gcal_sync_state(cursor, selected_ids) if incremental else {}
+    per_calendar_ms: Dict[str, float] = {}
+    phase = time.perf_counter()
+    events, next_tokens, full_ids, error = fetch_calendar_changes(
+        selected_ids,
+        calendar_meta,
+        {cal_id: state.get("sync_token") for cal_id, state in sync_state.items()},
+        timings=per_calendar_ms,
+    )
     if error:
+        conn.close()
         return {"success": False, "error": error}
+    timings["fetch_ms"] = elapsed_ms(phase)
+    timings["per_calendar_ms"] = per_calendar_ms
+    phase = time.perf_counter()
 
-    gcal_event_keys = {
-        (ev.get("_calendar_id"), ev.get("id"))
-        for ev in events
-        if ev.get("_calendar_id") and ev.get("id")
-    }
-
-    now = datetime.now().isoformat(timespec="seconds")
     imported = 0
     updated = 0
     pushed = 0
@@ -784,10 +1136,6 @@ def sync_bidirectional(course_id=None, calendar_ids: Optional[List[str]] = None)
     skipped = 0
     errors: List[str] = []
 
-    init_database()
-    conn = get_connection()
-    cursor = conn.cursor()
-
     course_by_calendar: Dict[str, int] = {}
 
     def resolve_course_id(calendar_name: Optional[str]) -> int:
@@ -800,20 +1148,34 @@ def sync_bidirectional(course_id=None, calendar_ids: Optional[List[str]] = None)
 
     local_to_push: List[Dict] = []
     local_to_push_ids: set = set()
+    gcal_event_keys = set()
 
     for event in events:
+        if event.get("status") == "cancelled":
+            # Only change listings carry cancellations; drop the local copy.
+            if event.get("id"):
+                cursor.execute(
+                    """
+                    DELETE FROM course_events
+                    WHERE google_event_id = ? AND google_calendar_id = ?
+                    """,
+                    (event["id"], event.get("_calendar_id")),
+                )
+                deleted += cursor.rowcount
+            continue
+
         parsed = parse_gcal_event(event)
         google_event_id = parsed.get("google_event_id")
         calendar_id = parsed.get("google_calendar_id")
+        if google_event_id and calendar_id:
+            gcal_event_keys.add((calendar_id, google_event_id))
         if not google_event_id or not parsed.get("date"):
             skipped += 1
             continue
 
         cursor.execute(
-            """
-            SELECT id, course_id, type, title, date, due_date, raw_text, status,
-                   google_event_id, google_calendar_id, google_calendar_name,
-                   google_updated_at, updated_at
+            f"""
+            SELECT {_LOCAL_EVENT_COLUMNS}
             FROM course_events
             WHERE google_event_id = ? AND (google_calendar_id = ? OR google_calendar_id IS NULL)
             """,
@@ -821,21 +1183,7 @@ def sync_bidirectional(course_id=None, calendar_ids: Optional[List[str]] = None)
         )
         row = cursor.fetchone()
         if row:
-            local_event = {
-                "id": row[0],
-                "course_id": row[1],
-                "type": row[2],
-                "title": row[3],
-                "date": row[4],
-                "due_date": row[5],
-                "raw_text": row[6],
-                "status": row[7],
-                "google_event_id": row[8],
-                "google_calendar_id": row[9],
-                "google_calendar_name": row[10],
-                "google_updated_at": row[11],
-                "updated_at": row[12],
-            }
+            local_event = _local_event_from_row(row)
 
             local_updated = parse_local_datetime(local_event.get("updated_at"))
             google_updated = parse_rfc3339(parsed.get("google_updated_at"))
@@ -901,47 +1249,42 @@ def sync_bidirectional(course_id=None, calendar_ids: Optional[List[str]] = None)
             )
             imported += 1
 
-    cursor.execute(
-        """
-        SELECT id, google_event_id, google_calendar_id
-        FROM course_events
-        WHERE google_event_id IS NOT NULL AND google_calendar_id IS NOT NULL
-        """
-    )
-    for row in cursor.fetchall():
-        local_id, google_event_id, calendar_id = row
-        if str(google_event_id).startswith("task_"):
-            continue
-        if calendar_id not in selected_ids:
-            continue
-        if (calendar_id, google_event_id) not in gcal_event_keys:
-            cursor.execute("DELETE FROM course_events WHERE id = ?", (local_id,))
-            deleted += 1
-
-    cursor.execute(
-        """
-        SELECT id, course_id, type, title, date, due_date, raw_text, status,
-               google_event_id, google_calendar_id, google_calendar_name,
-               google_updated_at, updated_at
-        FROM course_events
-        """
-    )
+    # A full listing is authoritative for its calendar: anything missing from
+    # it was deleted remotely. Incremental calendars got explicit cancellations.
+    if full_ids:
+        placeholders = ",".join("?" * len(full_ids))
+        cursor.execute(
+            f"""
+            SELECT id, google_event_id, google_calendar_id
+            FROM course_events
+            WHERE google_event_id IS NOT NULL AND google_calendar_id IN ({placeholders})
+            """,
+            full_ids,
+        )
+        for local_id, google_event_id, calendar_id in cursor.fetchall():
+            if str(google_event_id).startswith("task_"):
+                continue
+            if (calendar_id, google_event_id) not in gcal_event_keys:
+                cursor.execute("DELETE FROM course_events WHERE id = ?", (local_id,))
+                deleted += 1
+
+    # Local pushes: only rows touched since the oldest watermark of the
+    # selected calendars, plus rows never pushed. No watermark = full walk.
+    watermarks = [sync_state.get(cal_id, {}).get("local_watermark") for cal_id in selected_ids]
+    local_since = min(watermarks) if watermarks and all(watermarks) else None
+    if local_since:
+        cursor.execute(
+            f"""
+            SELECT {_LOCAL_EVENT_COLUMNS}
+            FROM course_events
+            WHERE google_event_id IS NULL OR updated_at >= ?
+            """,
+            (local_since,),
+        )
+    else:
+        cursor.execute(f"SELECT {_LOCAL_EVENT_COLUMNS} FROM course_events")
     for row in cursor.fetchall():
-        local_event = {
-            "id": row[0],
-            "course_id": row[1],
-            "type": row[2],
-            "title": row[3],
-            "date": row[4],
-            "due_date": row[5],
-            "raw_text": row[6],
-            "status": row[7],
-            "google_event_id": row[8],
-            "google_calendar_id": row[9],
-            "google_calendar_name": row[10],
-            "google_updated_at": row[11],
-            "updated_at": row[12],
-        }
+        local_event = _local_event_from_row(row)
         if course_id and local_event.get("course_id") != course_id:
             continue
         if str(local_event.get("google_event_id") or "").startswith("task_"):
@@ -961,6 +1304,12 @@ def sync_bidirectional(course_id=None, calendar_ids: Optional[List[str]] = None)
             local_to_push.append(local_event)
             local_to_push_ids.add(local_event["id"])
 
+    timings["apply_ms"] = elapsed_ms(phase)
+    phase = time.perf_counter()
+
+    push_requests = []
+    push_targets: Dict[str, Tuple[Dict, str]] = {}
+    failed_calendars = set()
     for local_event in local_to_push:
         calendar_id = local_event.get("google_calendar_id") or default_calendar_id
         if calendar_id not in selected_ids:
@@ -971,6 +1320,7 @@ def sync_bidirectional(course_id=None, calendar_ids: Optional[List[str]] = None)
             errors.append(
                 f"Calendar '{calendar_meta.get(calendar_id, {}).get('name')}' is read-only"
             )
+            failed_calendars.add(calendar_id)
             continue
 
         calendar_timezone = (
@@ -978,23 +1328,30 @@ def sync_bidirectional(course_id=None, calendar_ids: Optional[List[str]] = None)
             or config.get("timezone")
             or "UTC"
         )
-        updated_event, error = upsert_gcal_event(
-            service, calendar_id, local_event, calendar_timezone
+        payload = build_gcal_event_payload(local_event, calendar_timezone)
+        if not payload:
+            errors.append("Missing date")
+            failed_calendars.add(calendar_id)
+            continue
+        request_id = str(local_event["id"])
+        push_requests.append(
+            (request_id, _upsert_request(service, calendar_id, local_event, payload))
         )
+        push_targets[request_id] = (local_event, calendar_id)
+
+    push_results = execute_batched(service, push_requests)
+    synced_rows = []
+    for request_id, _ in push_requests:
+        local_event, calendar_id = push_targets[request_id]
+        updated_event, error = push_results.get(request_id, (None, "No response"))
         if error:
             errors.append(error)
+            failed_calendars.add(calendar_id)
             continue
         if not updated_event:
             skipped += 1
             continue
-
-        cursor.execute(
-            """
-            UPDATE course_events
-            SET google_event_id = ?, google_calendar_id = ?, google_calendar_name = ?,
-                google_updated_at = ?, google_synced_at = ?, updated_at = ?
-            WHERE id = ?
-            """,
+        synced_rows.append(
             (
                 updated_event.get("id"),
                 calendar_id,
@@ -1003,12 +1360,39 @@ def sync_bidirectional(course_id=None, calendar_ids: Optional[List[str]] = None)
                 now,
                 local_event.get("updated_at") or now,
                 local_event["id"],
-            ),
+            )
         )
-        pushed += 1
+    cursor.executemany(
+        """
+        UPDATE course_events
+        SET google_event_id = ?, google_calendar_id = ?, google_calendar_name = ?,
+            google_updated_at = ?, google_synced_at = ?, updated_at = ?
+        WHERE id = ?
+        """,
+        synced_rows,
+    )
+    pushed = len(synced_rows)
+    timings["push_ms"] = elapsed_ms(phase)
+    timings["push_requests"] = len(push_requests)
+
+    # A failed push leaves its row's updated_at below `now`, and a
+    # course-scoped sync skipped other courses' rows; in both cases keep the
+    # old watermark so the next incremental sync still selects them.
+    for cal_id in selected_ids:
+        if cal_id in next_tokens:
+            advance = not course_id and cal_id not in failed_calendars
+            save_gcal_sync_state(
+                cursor,
+                cal_id,
+                next_tokens[cal_id],
+                now,
+                full_sync=cal_id in full_ids,
+                local_watermark=now if advance else None,
+            )
 
     conn.commit()
     conn.close()
+    timings["total_ms"] = elapsed_ms(started)
 
     return {
         "success": True,
@@ -1024,10 +1408,12 @@ def sync_bidirectional(course_id=None, calendar_ids: Optional[List[str]] = None)
                 "id": cal_id,
                 "name": calendar_meta.get(cal_id, {}).get("name"),
                 "access_role": calendar_meta.get(cal_id, {}).get("access_role"),
+                "mode": "full" if cal_id in full_ids else "incremental",
             }
             for cal_id in selected_ids
         ],
         "sync_all": sync_all,
+        "timings": timings,
     }
 
 
@@ -1079,9 +1465,8 @@ def fetch_tasks(tasklist_id):
         items = []
         page_token = None
         while True:
-            result = (
-                service.tasks()
-                .list(
+            result = _execute_with_backoff(
+                service.tasks().list(
                     tasklist=tasklist_id,
                     showCompleted=True,
                     showDeleted=False,
@@ -1089,7 +1474,6 @@ def fetch_tasks(tasklist_id):
                     maxResults=100,
                     pageToken=page_token,
                 )
-                .execute()
             )
             items.extend(result.get("items", []))
             page_token = result.get("nextPageToken")
@@ -1125,7 +1509,8 @@ def parse_google_task(task, tasklist_title=None):
 
 
 def sync_tasks_to_database(course_id=None):
-    """Sync Google Tasks into course events"""
+    """Sync Google Tasks into course events (task lists fetched in parallel)"""
+    started = time.perf_counter()
     task_lists, error = fetch_task_lists()
     if error:
         return {"success": False, "error": error, "imported": 0, "skipped": 0}
@@ -1137,17 +1522,26 @@ def sync_tasks_to_database(course_id=None):
 
     imported = 0
     skipped = 0
+    timings: Dict[str, object] = {}
+
+    def fetch_list(tasklist):
+        list_started = time.perf_counter()
+        tasks, error = fetch_tasks(tasklist["id"])
+        return tasklist, tasks, error, round((time.perf_counter() - list_started) * 1000, 1)
+
+    phase = time.perf_counter()
+    fetched = _run_parallel(
+        fetch_list, [tl for tl in target_lists if tl.get("id")], GCAL_FETCH_WORKERS
+    )
+    timings["fetch_ms"] = round((time.perf_counter() - phase) * 1000, 1)
+    timings["per_list_ms"] = {tl["id"]: ms for tl, _, _, ms in fetched}
+    phase = time.perf_counter()
 
     init_database()
     conn = get_connection()
     cursor = conn.cursor()
 
-    for tasklist in target_lists:
-        tasklist_id = tasklist.get("id")
-        if not tasklist_id:
-            continue
-
-        tasks, error = fetch_tasks(tasklist_id)
+    for tasklist, tasks, error, _ in fetched:
         if error:
             conn.close()
             return {
@@ -1201,6 +1595,8 @@ def sync_tasks_to_database(course_id=None):
 
     conn.commit()
     conn.close()
+    timings["apply_ms"] = round((time.perf_counter() - phase) * 1000, 1)
+    timings["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
 
     return {
         "success": True,
@@ -1208,6 +1604,7 @@ def sync_tasks_to_database(course_id=None):
         "skipped": skipped,
         "source": "tasks",
         "lists": [tasklist.get("title") for tasklist in target_lists],
+        "timings": timings,
     }
 
 
@@ -40,40 +40,18 @@ from db_setup import (
     get_ingested_session_id,
 )
 
-# Use import directly for items in brain/ folder (root of execution)
-from ingest_session import parse_session_log, validate_session_data, insert_session
-from generate_resume import generate_resume
-from tutor_api_types import TutorQueryV1, TutorSourceSelector, TutorTurnResponse
-from tutor_engine import process_tutor_turn, log_tutor_turn, create_card_draft_from_turn
-from import_syllabus import upsert_course, import_events
-from rag_notes import (
-    ingest_document,
-    ingest_url_document,
-    sync_folder_to_rag,
-    sync_runtime_catalog,
-    index_repo_to_rag,
-    search_rag_docs,
-)
+# Brain modules with heavier import chains (ingest, syllabus import, Scholar
+# orchestration) are imported inside the handlers that use them so the
+# dashboard starts without loading them.
 
 # Dashboard modules
 from dashboard.utils import allowed_file, load_api_config, save_api_config
 from dashboard.stats import build_stats, get_mastery_stats
-from dashboard.scholar import (
-    build_scholar_stats,
-    generate_ai_answer,
-    run_scholar_orchestrator,
-    generate_weekly_digest,
-    generate_implementation_bundle,
-    get_latest_insights,
-    check_proposal_similarity,
-    build_ralph_summary,
-    load_proposal_running_sheet,
-    run_proposal_sheet_build,
-    MAX_CONTEXT_CHARS,
+from dashboard.scholar_cache import (
+    cache_stats as scholar_cache_stats,
+    cached_latest_insights,
+    cached_scholar_stats,
 )
-from dashboard.syllabus import fetch_all_courses_and_events, attach_event_analytics
-from dashboard.calendar import get_calendar_data
-from dashboard.cli import get_all_sessions
 
 dashboard_bp = Blueprint("dashboard", __name__)
 
@@ -92,6 +70,8 @@ def insert_session_data(data):
     Validate and insert using the v9.3 ingest pipeline.
     Returns (ok: bool, message: str).
     """
+    from ingest_session import validate_session_data, insert_session
+
     is_valid, error = validate_session_data(data)
     if not is_valid:
         return False, f"Validation failed: {error}"
@@ -145,7 +125,13 @@ def api_stats():
 
 @dashboard_bp.route("/api/scholar")
 def api_scholar():
-    return jsonify(build_scholar_stats())
+    return jsonify(cached_scholar_stats())
+
+
+@dashboard_bp.route("/api/scholar/cache-stats")
+def api_scholar_cache_stats():
+    """Age, rebuild time and hit counts of the cached Scholar tab data."""
+    return jsonify(scholar_cache_stats())
 
 
 @dashboard_bp.route("/api/scholar/digest")
@@ -211,25 +197,31 @@ def api_scholar_digest():
 @dashboard_bp.route("/api/scholar/insights")
 def api_scholar_insights():
     """Get key Scholar insights for dashboard overview display."""
-    result = get_latest_insights()
+    result = cached_latest_insights()
     return jsonify(result)
 
 
 @dashboard_bp.route("/api/scholar/ralph")
 def api_scholar_ralph():
     """Get Ralph run summary and progress details."""
+    from dashboard.scholar import build_ralph_summary
+
     return jsonify(build_ralph_summary())
 
 
 @dashboard_bp.route("/api/scholar/proposal-sheet", methods=["GET"])
 def api_scholar_proposal_sheet():
     """Get the proposal running sheet summary."""
+    from dashboard.scholar import load_proposal_running_sheet
+
     return jsonify(load_proposal_running_sheet())
 
 
 @dashboard_bp.route("/api/scholar/proposal-sheet/rebuild", methods=["POST"])
 def api_scholar_proposal_sheet_rebuild():
     """Rebuild the proposal running sheet for final check."""
+    from dashboard.scholar import run_proposal_sheet_build
+
     return jsonify(run_proposal_sheet_build())
 
 
@@ -404,6 +396,10 @@ def api_sync_resolve():
             )
 
         conn.commit()
+        if action == "approve":
+            from rag_notes import refresh_rag_chunks
+
+            refresh_rag_chunks(conn)
         return jsonify({"ok": True})
     except Exception as e:
         conn.rollback()
@@ -954,6 +950,8 @@ def api_scholar_clusters_list():
 @dashboard_bp.route("/api/scholar/implementation-bundle", methods=["POST"])
 def api_scholar_implementation_bundle():
     """Generate an implementation bundle from approved proposals with safety checks."""
+    from dashboard.scholar import generate_implementation_bundle
+
     result = generate_implementation_bundle()
     status_code = 200 if result.get("ok") else 400
     return jsonify(result), status_code
@@ -1176,7 +1174,11 @@ def gcal_sync():
     if calendar_ids is not None and not isinstance(calendar_ids, list):
         calendar_ids = None
     try:
-        result = sync_bidirectional(course_id=course_id, calendar_ids=calendar_ids)
+        result = sync_bidirectional(
+            course_id=course_id,
+            calendar_ids=calendar_ids,
+            incremental=not data.get("full"),
+        )
         return jsonify(result)
     except Exception as exc:
         return jsonify({"success": False, "error": str(exc)}), 500
@@ -1250,6 +1252,8 @@ def api_scraper_run():
 @dashboard_bp.route("/api/syllabus/import_bulk", methods=["POST"])
 def api_syllabus_import_bulk():
     """Import a full syllabus JSON (course + events) from ChatGPT output."""
+    from import_syllabus import upsert_course, import_events
+
     data = request.get_json()
     if not data:
         return jsonify({"ok": False, "message": "No JSON data provided"}), 400
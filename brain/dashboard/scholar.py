@@ -3,7 +3,6 @@ import os
 import re
 import json
 import sys
-import time
 import threading
 import subprocess
 from pathlib import Path
@@ -12,12 +11,11 @@ from typing import Optional, Tuple, Dict, List, Any
 from config import FRESH_DAYS
 from dashboard.utils import load_api_config
 
-# Check if requests library is available
-try:
-    import requests
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    REQUESTS_AVAILABLE = False
+from lazy_imports import module_available
+
+# Check if requests library is available; the functions that use it import
+# it themselves so the dashboard does not load it until a Scholar question
+REQUESTS_AVAILABLE = module_available("requests")
 
 # Maximum context size to send to API (approx 30k tokens = ~120k chars)
 MAX_CONTEXT_CHARS = 100000
@@ -75,62 +73,38 @@ def call_codex(prompt: str, system_prompt: str, timeout: int = 90) -> Tuple[Opti
 Respond with markdown formatting. Be concise and actionable.
 """
     
-    # Create a temp file for output (like --output-last-message in batch script)
-    import tempfile
-    output_file = None
-    
+    # Runs on the shared Codex worker pool, which owns the --output-last-message file
+    # codex exec --cd REPO --dangerously-bypass-approvals-and-sandbox --output-last-message OUT - < prompt
+    from codex_pool import OUTPUT, get_codex_pool
+
     try:
-        # Create temp file for output
-        fd, output_path = tempfile.mkstemp(suffix=".md", prefix="codex_digest_")
-        os.close(fd)
-        output_file = Path(output_path)
-        
-        # Run codex exec with stdin and output file (matches batch script pattern)
-        # codex exec --cd REPO --dangerously-bypass-approvals-and-sandbox --output-last-message OUT - < prompt
-        process = subprocess.Popen(
+        result = get_codex_pool().run(
             [
                 codex_cmd, "exec",
                 "--cd", str(repo_root),
                 "--dangerously-bypass-approvals-and-sandbox",
-                "--output-last-message", str(output_file),
+                "--output-last-message", OUTPUT,
                 "-"  # Read from stdin
             ],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+            full_prompt,
+            timeout=timeout,
             cwd=str(repo_root),
-            encoding="utf-8",
-            text=True,
         )
-        
-        # Write prompt to stdin
-        stdout, stderr = process.communicate(input=full_prompt, timeout=timeout)
-        
-        if process.returncode == 0:
-            # Read the output from the file
-            if output_file.exists():
-                response = output_file.read_text(encoding="utf-8").strip()
-                return response, None
-            else:
-                # Fall back to stdout if file wasn't created
-                return stdout.strip() if stdout else "No response generated", None
-        else:
-            error = stderr.strip() if stderr else f"Codex exited with code {process.returncode}"
-            return None, error
-            
-    except subprocess.TimeoutExpired:
-        if process:
-            process.kill()
-        return None, "Codex request timed out (90s)"
     except Exception as e:
         return None, f"Codex error: {str(e)}"
-    finally:
-        # Clean up temp file
-        if output_file and output_file.exists():
-            try:
-                output_file.unlink()
-            except:
-                pass
+
+    if result["timed_out"]:
+        return None, f"Codex request timed out ({timeout}s)"
+    if result["returncode"] is None:
+        return None, f"Codex error: {result['error']}"
+    if result["returncode"] == 0:
+        if result["output"] is not None:
+            return result["output"].strip(), None
+        # Fall back to stdout if file wasn't created
+        stdout = result["stdout"]
+        return stdout.strip() if stdout else "No response generated", None
+    stderr = result["stderr"]
+    return None, stderr.strip() if stderr else f"Codex exited with code {result['returncode']}"
 
 
 def cleanup_stale_pids() -> int:
@@ -371,6 +345,7 @@ def generate_ai_answer(question, context="", api_key_override=None, api_provider
     """
     if not REQUESTS_AVAILABLE:
         return None, "requests library not installed. Install with: pip install requests"
+    import requests
     
     config = load_api_config()
     api_provider = api_provider_override or config.get("api_provider", "openrouter")
@@ -419,7 +394,18 @@ Provide concise, actionable answers (2-4 sentences) that:
 {safe_context if safe_context else "Answer based on the PEIRRO/KWIK system design and learning science principles."}
 
 Provide a clear, concise answer (2-4 sentences) that addresses the question directly."""
-        
+
+        # Same question + context is answered from the LLM response cache; a key
+        # override is a connection test, so it always goes to the API.
+        import llm_cache
+
+        cache_key = None
+        if not api_key_override and llm_cache.policy_ttl("scholar_answer"):
+            cache_key = llm_cache.cache_key(api_provider, model, system_prompt, user_prompt, 0.7)
+            cached = llm_cache.lookup("scholar_answer", cache_key)
+            if cached is not None:
+                return cached, None
+
         headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
@@ -448,6 +434,8 @@ Provide a clear, concise answer (2-4 sentences) that addresses the question dire
         if response.status_code == 200:
             result = response.json()
             answer = result["choices"][0]["message"]["content"].strip()
+            if cache_key:
+                llm_cache.store("scholar_answer", cache_key, answer, api_provider, model)
             return answer, None
         else:
             error_msg = response.json().get("error", {}).get("message", "Unknown error")
@@ -460,16 +448,19 @@ Provide a clear, concise answer (2-4 sentences) that addresses the question dire
     except Exception as e:
         return None, f"Error: {str(e)}"
 
-def build_scholar_stats():
+def build_scholar_stats(cleanup_pids: bool = True):
     """
     Build Scholar status and progress data for dashboard.
     Reads from scholar/outputs/STATUS.md and related files.
+    The Scholar tab goes through dashboard.scholar_cache, which throttles the
+    PID sweep itself and passes cleanup_pids=False.
     """
     # Clean up stale PID files whenever Scholar tab loads
-    try:
-        cleanup_stale_pids()
-    except Exception:
-        pass
+    if cleanup_pids:
+        try:
+            cleanup_stale_pids()
+        except Exception:
+            pass
     
     # Assuming this file is brain/dashboard/scholar.py
     # Repo root is ../../
@@ -1296,64 +1287,43 @@ def run_scholar_orchestrator_multi(manifest: Dict[str, Any], mode: str = "brain"
                     for job in jobs:
                         job["context"].append(resolved_questions_block)
 
-                def _start_job(job):
+                # Agents run on the shared Codex worker pool; its size (max_concurrency)
+                # caps how many run at once alongside chat requests.
+                from codex_pool import OUTPUT, get_codex_pool
+
+                codex_pool = get_codex_pool()
+                agent_args = [
+                    codex_cmd, "exec",
+                    "--dangerously-bypass-approvals-and-sandbox",
+                    "-C", str(repo_root),
+                    "--output-last-message", OUTPUT,
+                    "-",
+                ]
+
+                # Agent stdout/stderr stream straight into their logs while they run.
+                def _save_agent_result(result, output_path, log):
+                    if result["error"]:
+                        log.write(f"\n[pool] {result['error']}\n")
+                    if result["output"] is not None:
+                        output_path.write_text(result["output"], encoding="utf-8")
+
+                submitted = []
+                for job in jobs:
                     log_file.write(f"[agent] start {job['name']} -> {job['output'].name}\n")
                     log_file.flush()
                     prompt = _compose_agent_prompt(job["template"], job["header"], job["context"])
                     agent_log = open(job["log"], "w", encoding="utf-8")
-                    proc = subprocess.Popen(
-                        [
-                            codex_cmd, "exec",
-                            "--dangerously-bypass-approvals-and-sandbox",
-                            "-C", str(repo_root),
-                            "--output-last-message", str(job["output"]),
-                            "-",
-                        ],
-                        stdin=subprocess.PIPE,
-                        stdout=agent_log,
-                        stderr=subprocess.STDOUT,
-                        cwd=str(repo_root),
-                        encoding="utf-8",
-                        text=True,
-                    )
-                    try:
-                        proc.stdin.write(prompt)
-                        proc.stdin.close()
-                    except Exception:
-                        pass
-                    return {"proc": proc, "log": agent_log, "job": job}
+                    handle = codex_pool.submit(agent_args, prompt, cwd=str(repo_root), log=agent_log)
+                    submitted.append((job, agent_log, handle))
 
-                running = []
                 completed = []
-                for job in jobs:
-                    while len(running) >= max_conc:
-                        still_running = []
-                        for item in running:
-                            if item["proc"].poll() is None:
-                                still_running.append(item)
-                            else:
-                                code = item["proc"].returncode
-                                item["log"].close()
-                                completed.append(item["job"]["name"])
-                                log_file.write(f"[agent] done {item['job']['name']} (exit {code})\n")
-                                log_file.flush()
-                        running = still_running
-                        time.sleep(0.5)
-                    running.append(_start_job(job))
-
-                while running:
-                    still_running = []
-                    for item in running:
-                        if item["proc"].poll() is None:
-                            still_running.append(item)
-                        else:
-                            code = item["proc"].returncode
-                            item["log"].close()
-                            completed.append(item["job"]["name"])
-                            log_file.write(f"[agent] done {item['job']['name']} (exit {code})\n")
-                            log_file.flush()
-                    running = still_running
-                    time.sleep(0.5)
+                for job, agent_log, handle in submitted:
+                    result = handle.result()
+                    with agent_log:
+                        _save_agent_result(result, job["output"], agent_log)
+                    completed.append(job["name"])
+                    log_file.write(f"[agent] done {job['name']} (exit {result['returncode']})\n")
+                    log_file.flush()
 
                 # Supervisor synthesis
                 agent_outputs = []
@@ -1375,28 +1345,9 @@ def run_scholar_orchestrator_multi(manifest: Dict[str, Any], mode: str = "brain"
 
                 log_file.write("[agent] start supervisor -> unattended_final\n")
                 log_file.flush()
-                proc = subprocess.Popen(
-                    [
-                        codex_cmd, "exec",
-                        "--dangerously-bypass-approvals-and-sandbox",
-                        "-C", str(repo_root),
-                        "--output-last-message", str(final_path),
-                        "-",
-                    ],
-                    stdin=subprocess.PIPE,
-                    stdout=log_file,
-                    stderr=subprocess.STDOUT,
-                    cwd=str(repo_root),
-                    encoding="utf-8",
-                    text=True,
-                )
-                try:
-                    proc.stdin.write(supervisor_prompt)
-                    proc.stdin.close()
-                except Exception:
-                    pass
-                proc.wait()
-                log_file.write(f"[agent] done supervisor (exit {proc.returncode})\n")
+                result = codex_pool.run(agent_args, supervisor_prompt, cwd=str(repo_root), log=log_file)
+                _save_agent_result(result, final_path, log_file)
+                log_file.write(f"[agent] done supervisor (exit {result['returncode']})\n")
 
                 # Extract questions from final output
                 final_text = _read_text_safe(final_path, limit=20000)
@@ -2892,7 +2843,9 @@ def run_scholar_orchestrator_tracking(save_outputs=True, triggered_by='ui', run_
         run_id = cur.lastrowid
     
     try:
-        digest_result = generate_weekly_digest(days=7)
+        from dashboard.scholar_cache import cached_weekly_digest
+
+        digest_result = cached_weekly_digest(days=7)
         
         if not digest_result.get('ok'):
             raise Exception(f"Digest generation failed: {digest_result.get('error', 'Unknown')}")
@@ -0,0 +1,334 @@
+"""
+File-state cache for the Scholar tab.
+
+build_scholar_stats(), get_latest_insights() and generate_weekly_digest()
+glob scholar/outputs, read markdown and reparse sections on every call,
+although their results only change when those files do. Each result is
+cached under a fingerprint of the (name, mtime, size) of every file in the
+folders it reads, plus today's date (several fields are "N days ago").
+
+Without the watcher, a call re-stats those folders (one scandir each) and
+rebuilds only if the fingerprint moved. With start_watcher() a daemon
+thread polls the fingerprints and rebuilds the tab's stats and insights in
+the background, so callers get the last result without touching the
+filesystem. The digest is always rebuilt lazily since it may call the LLM.
+Polling is used rather than inotify so the watcher behaves the same on
+Windows. Set SCHOLAR_CACHE_WATCH_SECONDS to start it with the dashboard.
+
+Not tracked: the Brain DB (method library counts in the weekly digest) and
+live process state; the stale-PID sweep is throttled separately.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+REPO_ROOT = Path(__file__).parent.parent.parent.resolve()
+SCHOLAR_OUTPUTS = REPO_ROOT / "scholar" / "outputs"
+
+# Folders/files each builder reads (non-recursive, like their globs).
+_RUNS = SCHOLAR_OUTPUTS / "orchestrator_runs"
+_QUEUE = SCHOLAR_OUTPUTS / "promotion_queue"
+_PROPOSALS = (SCHOLAR_OUTPUTS / "proposals" / "approved", SCHOLAR_OUTPUTS / "proposals" / "rejected")
+_NOTES = (
+    SCHOLAR_OUTPUTS / "research_notebook",
+    SCHOLAR_OUTPUTS / "gap_analysis",
+    SCHOLAR_OUTPUTS / "module_dossiers",
+)
+_SESSION_LOGS = REPO_ROOT / "brain" / "session_logs"
+
+STATS_PATHS = (
+    SCHOLAR_OUTPUTS / "STATUS.md",
+    REPO_ROOT / "scholar" / "inputs" / "audit_manifest.json",
+    _RUNS,
+    SCHOLAR_OUTPUTS / "system_map",
+    _QUEUE,
+    *_PROPOSALS,
+    *_NOTES,
+    _SESSION_LOGS,
+)
+INSIGHTS_PATHS = (SCHOLAR_OUTPUTS / "STATUS.md", _QUEUE, _RUNS)
+DIGEST_PATHS = (
+    _RUNS,
+    _QUEUE,
+    *_PROPOSALS,
+    *_NOTES,
+    SCHOLAR_OUTPUTS / "reports",
+    _SESSION_LOGS,
+)
+
+PID_CLEANUP_INTERVAL = 60.0  # seconds between stale-PID sweeps
+
+
+def fingerprint(paths: Sequence[Path]) -> Tuple:
+    """Snapshot of (name, mtime_ns, size) for the given files and folder entries."""
+    parts = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            parts.append((str(path), None))
+            continue
+        if not os.path.isdir(path):
+            parts.append((str(path), st.st_mtime_ns, st.st_size))
+            continue
+        entries = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        est = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((entry.name, est.st_mtime_ns, est.st_size))
+        except OSError:
+            pass
+        entries.sort()
+        parts.append((str(path), st.st_mtime_ns, tuple(entries)))
+    return tuple(parts)
+
+
+@dataclass
+class _Entry:
+    builder: Callable[[], Any]
+    paths: Sequence[Path]
+    extra_key: Callable[[], Hashable]
+    background: bool = True
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    key: Optional[Tuple] = None
+    value: Any = None
+    built_at: Optional[float] = None     # time.time() of last rebuild
+    rebuild_ms: Optional[float] = None
+    rebuilds: int = 0
+    hits: int = 0
+
+
+class FileStateCache:
+    """Named results, each rebuilt only when its files' fingerprint changes."""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._entries: Dict[str, _Entry] = {}
+        self._clock = clock
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.watch_interval: Optional[float] = None
+        self.last_poll_at: Optional[float] = None
+
+    def register(
+        self,
+        name: str,
+        builder: Callable[[], Any],
+        paths: Sequence[Path],
+        extra_key: Callable[[], Hashable] = lambda: None,
+        background: bool = True,
+    ) -> None:
+        """Register a builder; background=False keeps it out of watcher polls."""
+        self._entries[name] = _Entry(builder, tuple(paths), extra_key, background)
+
+    def _key(self, entry: _Entry) -> Tuple:
+        return (entry.extra_key(), fingerprint(entry.paths))
+
+    def _refresh(self, entry: _Entry) -> Any:
+        with entry.lock:
+            key = self._key(entry)
+            if key != entry.key:
+                start = time.perf_counter()
+                value = entry.builder()
+                entry.rebuild_ms = round((time.perf_counter() - start) * 1000, 2)
+                entry.key, entry.value = key, value
+                entry.built_at = self._clock()
+                entry.rebuilds += 1
+            return entry.value
+
+    def get(self, name: str) -> Any:
+        """Return the cached result, rebuilding first if its files changed."""
+        entry = self._entries[name]
+        if self.watching and entry.background and entry.key is not None:
+            # The watcher keeps entries fresh; skip the stat calls.
+            entry.hits += 1
+            return entry.value
+        before = entry.rebuilds
+        value = self._refresh(entry)
+        if entry.rebuilds == before:
+            entry.hits += 1
+        return value
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop one entry (or all) so the next get() rebuilds."""
+        for key, entry in self._entries.items():
+            if name is None or key == name:
+                with entry.lock:
+                    entry.key = None
+
+    # -- background watcher ------------------------------------------------
+
+    @property
+    def watching(self) -> bool:
+        return self._watcher is not None and self._watcher.is_alive()
+
+    def poll(self) -> None:
+        """Rebuild every background entry whose files changed."""
+        for entry in list(self._entries.values()):
+            if not entry.background:
+                continue
+            try:
+                self._refresh(entry)
+            except Exception as e:
+                print(f"[WARN] Scholar cache rebuild failed: {e}")
+        self.last_poll_at = self._clock()
+
+    def start_watcher(self, interval: float = 5.0, on_poll: Optional[Callable[[], None]] = None) -> None:
+        """Start a daemon thread that polls fingerprints every `interval` seconds."""
+        if self.watching:
+            return
+        self._stop.clear()
+        self.watch_interval = interval
+
+        def run():
+            while not self._stop.is_set():
+                if on_poll:
+                    try:
+                        on_poll()
+                    except Exception:
+                        pass
+                self.poll()
+                self._stop.wait(interval)
+
+        self._watcher = threading.Thread(target=run, name="scholar-cache-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+        self._watcher = None
+        self.watch_interval = None
+
+    def stats(self) -> Dict[str, Any]:
+        now = self._clock()
+        entries = {}
+        for name, e in self._entries.items():
+            entries[name] = {
+                "cached": e.key is not None,
+                "age_seconds": round(now - e.built_at, 3) if e.built_at else None,
+                "built_at": datetime.fromtimestamp(e.built_at).isoformat() if e.built_at else None,
+                "rebuild_ms": e.rebuild_ms,
+                "rebuilds": e.rebuilds,
+                "hits": e.hits,
+            }
+        return {
+            "watching": self.watching,
+            "watch_interval_seconds": self.watch_interval,
+            "last_poll_age_seconds": round(now - self.last_poll_at, 3) if self.last_poll_at else None,
+            "entries": entries,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Scholar tab cache
+# ---------------------------------------------------------------------------
+
+_cache = FileStateCache()
+_last_pid_cleanup = 0.0
+_pid_lock = threading.Lock()
+
+
+def _cleanup_stale_pids_throttled() -> None:
+    """Run cleanup_stale_pids() at most once per PID_CLEANUP_INTERVAL."""
+    global _last_pid_cleanup
+    with _pid_lock:
+        now = time.monotonic()
+        if _last_pid_cleanup and now - _last_pid_cleanup < PID_CLEANUP_INTERVAL:
+            return
+        _last_pid_cleanup = now
+    try:
+        from dashboard.scholar import cleanup_stale_pids
+
+        cleanup_stale_pids()
+    except Exception:
+        pass
+
+
+def _build_stats():
+    from dashboard.scholar import build_scholar_stats
+
+    return build_scholar_stats(cleanup_pids=False)
+
+
+def _build_insights():
+    from dashboard.scholar import get_latest_insights
+
+    return get_latest_insights()
+
+
+def _today():
+    return date.today().isoformat()
+
+
+_cache.register("scholar_stats", _build_stats, STATS_PATHS, _today)
+_cache.register("latest_insights", _build_insights, INSIGHTS_PATHS)
+
+
+def _digest_entry(days: int) -> str:
+    name = f"weekly_digest:{days}"
+    if name not in _cache._entries:
+        from config import API_CONFIG_PATH
+
+        def build():
+            from dashboard.scholar import generate_weekly_digest
+
+            return generate_weekly_digest(days=days)
+
+        # Lazy only: a rebuild may call the LLM, so the watcher never runs it.
+        _cache.register(
+            name, build, DIGEST_PATHS + (Path(API_CONFIG_PATH),), _today, background=False
+        )
+    return name
+
+
+def cached_scholar_stats() -> Dict[str, Any]:
+    """build_scholar_stats(), rebuilt only when the Scholar outputs change."""
+    if not _cache.watching:
+        # A sweep that removes files also moves the fingerprint.
+        _cleanup_stale_pids_throttled()
+    return _cache.get("scholar_stats")
+
+
+def cached_latest_insights() -> Dict[str, Any]:
+    """get_latest_insights(), rebuilt only when its files change."""
+    return _cache.get("latest_insights")
+
+
+def cached_weekly_digest(days: int = 7) -> Dict[str, Any]:
+    """generate_weekly_digest(days), rebuilt when outputs change or the day rolls over.
+
+    A failed digest (ok=False) is not kept, so the next call tries again.
+    """
+    name = _digest_entry(days)
+    result = _cache.get(name)
+    if not result.get("ok"):
+        _cache.invalidate(name)
+    return result
+
+
+def invalidate(name: Optional[str] = None) -> None:
+    _cache.invalidate(name)
+
+
+def start_watcher(interval: float = 5.0) -> None:
+    """Poll in the background and keep the Scholar tab results warm."""
+    _cache.start_watcher(interval, on_poll=_cleanup_stale_pids_throttled)
+
+
+def stop_watcher() -> None:
+    _cache.stop_watcher()
+
+
+def cache_stats() -> Dict[str, Any]:
+    return _cache.stats()
@@ -1,12 +1,13 @@
 
 import re
+import sqlite3
 from collections import Counter
 from datetime import datetime, timedelta
 from config import (
     WEAK_THRESHOLD,
     STRONG_THRESHOLD,
 )
-from dashboard.cli import get_all_sessions
+from session_rollups import WRAP_FIELDS
 
 def analyze_sessions(sessions):
     """
@@ -89,16 +90,13 @@ def analyze_sessions(sessions):
     }
 
 
-def build_stats():
-    raw_sessions = get_all_sessions()
-
+def build_stats_from_sessions(raw_sessions):
+    """
+    Reference implementation of build_stats over an in-memory session list.
+    Kept for parity checks against the SQL engine; the dashboard uses build_stats().
+    """
     # Normalize field names to UI expectations
-    sessions = []
-    for s in raw_sessions:
-        d = dict(s)
-        d["topic"] = d.get("main_topic") or d.get("topic") or ""
-        d["time_spent_minutes"] = d.get("duration_minutes") or d.get("time_spent_minutes") or 0
-        sessions.append(d)
+    sessions = [_normalize_session(s) for s in raw_sessions]
 
     analysis = analyze_sessions(sessions) if sessions else None
 
@@ -195,6 +193,172 @@ def build_stats():
     }
 
 
+# SQL stats engine: reads the session_rollup_* tables (see session_rollups.py),
+# so the work is O(days + topics + modes) rather than O(sessions). Only the
+# newest few sessions are read from the sessions table itself. Session writers
+# keep the rollups current, so these readers never write.
+_NEWEST_FIRST = "ORDER BY session_date DESC, session_time DESC"
+
+
+def _normalize_session(row):
+    d = dict(row)
+    d["topic"] = d.get("main_topic") or d.get("topic") or ""
+    d["time_spent_minutes"] = d.get("duration_minutes") or d.get("time_spent_minutes") or 0
+    return d
+
+
+def build_stats_sql(conn):
+    """
+    Compute the dashboard stats payload on an open connection.
+    Same JSON shape as build_stats_from_sessions().
+    """
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    thirty_days_ago = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+
+    cursor.execute(
+        """
+        SELECT
+            COALESCE(SUM(sessions), 0) AS sessions,
+            COALESCE(SUM(minutes), 0) AS total_minutes,
+            COALESCE(SUM(anki_cards), 0) AS anki_cards,
+            COALESCE(SUM(CASE WHEN session_date >= :cutoff THEN sessions END), 0) AS sessions_30d,
+            COALESCE(SUM(CASE WHEN session_date >= :cutoff THEN minutes END), 0) AS recent_minutes,
+            COUNT(CASE WHEN session_date >= :cutoff AND session_date != '' THEN 1 END) AS recent_days,
+            MIN(session_date) AS first_date,
+            MAX(session_date) AS last_date,
+            SUM(understanding_sum) AS understanding_sum,
+            SUM(understanding_n) AS understanding_n,
+            SUM(retention_sum) AS retention_sum,
+            SUM(retention_n) AS retention_n,
+            SUM(performance_sum) AS performance_sum,
+            SUM(performance_n) AS performance_n,
+            SUM(wrap_filled) AS wrap_filled,
+            SUM(sessions_with_errors) AS sessions_with_errors,
+            SUM(spaced_reviews_filled) AS sessions_with_spaced_reviews,
+            SUM(glossary_terms) AS glossary_terms
+        FROM session_rollup_daily
+        WHERE sessions > 0
+        """,
+        {"cutoff": thirty_days_ago},
+    )
+    totals = cursor.fetchone()
+    total_sessions = totals["sessions"]
+    if not total_sessions:
+        return build_stats_from_sessions([])
+
+    # Per-topic rows, in first-seen order of a newest-first session listing
+    cursor.execute("SELECT * FROM session_rollup_topic WHERE sessions > 0 ORDER BY latest_key DESC")
+    topic_rows = cursor.fetchall()
+    named_topics = [r for r in topic_rows if r["topic"]]
+    topics_covered = sorted(
+        ({"topic": r["topic"], "date": r["last_date"]} for r in named_topics),
+        key=lambda x: x["date"],
+        reverse=True,
+    )
+    weak = []
+    strong = []
+    for r in named_topics:
+        if not r["understanding_n"]:
+            continue
+        avg_u = r["understanding_sum"] / r["understanding_n"]
+        entry = {"topic": r["topic"], "understanding": round(avg_u, 2), "date": r["last_rated_date"]}
+        if avg_u < WEAK_THRESHOLD:
+            weak.append(entry)
+        if avg_u >= STRONG_THRESHOLD:
+            strong.append(entry)
+    weak = sorted(weak, key=lambda x: x["understanding"])
+    strong = sorted(strong, key=lambda x: x["understanding"], reverse=True)
+
+    cursor.execute("SELECT study_mode, sessions FROM session_rollup_mode WHERE sessions > 0 ORDER BY latest_key DESC")
+    mode_counts = {r["study_mode"]: r["sessions"] for r in cursor.fetchall()}
+    total_mode_count = sum(mode_counts.values())
+    mode_percentages = (
+        {k: round((v / total_mode_count) * 100) for k, v in mode_counts.items()} if total_mode_count else {}
+    )
+
+    cursor.execute(
+        """
+        SELECT framework, SUM(uses) AS uses
+        FROM session_rollup_framework
+        GROUP BY framework
+        ORDER BY uses DESC, MAX(latest_key) DESC
+        LIMIT 5
+        """
+    )
+    frameworks = [(r["framework"], r["uses"]) for r in cursor.fetchall()]
+
+    def first_texts(column, n=3):
+        cursor.execute(
+            f"SELECT {column} FROM sessions WHERE {column} IS NOT NULL AND {column} != '' {_NEWEST_FIRST} LIMIT ?",
+            (n,),
+        )
+        return [r[0] for r in cursor.fetchall()]
+
+    what_worked = first_texts("what_worked")
+    common_issues = first_texts("what_needs_fixing")
+
+    cursor.execute(f"SELECT * FROM sessions {_NEWEST_FIRST} LIMIT 5")
+    recent_sessions = [_normalize_session(r) for r in cursor.fetchall()]
+
+    def avg(total, n):
+        return round(total / n, 2) if n and total else 0
+
+    avg_u = avg(totals["understanding_sum"], totals["understanding_n"])
+    avg_r = avg(totals["retention_sum"], totals["retention_n"])
+    avg_p = avg(totals["performance_sum"], totals["performance_n"])
+    recent_days = totals["recent_days"]
+    spaced = totals["sessions_with_spaced_reviews"]
+
+    return {
+        "counts": {
+            "sessions": total_sessions,
+            "sessions_30d": totals["sessions_30d"],
+            "topics": len(topic_rows),
+            "anki_cards": totals["anki_cards"],
+            "total_minutes": totals["total_minutes"],
+            "avg_daily_minutes": totals["recent_minutes"] // recent_days if recent_days else 0,
+            "glossary_terms": totals["glossary_terms"],
+            "sessions_with_errors": totals["sessions_with_errors"],
+            "sessions_with_spaced_reviews": spaced,
+        },
+        "wrap_metrics": {
+            "avg_completeness": round(totals["wrap_filled"] * 100 / len(WRAP_FIELDS) / total_sessions, 1),
+            "spaced_review_compliance": round((spaced / total_sessions) * 100, 1),
+        },
+        "range": {
+            "first_date": totals["first_date"],
+            "last_date": totals["last_date"],
+        },
+        "averages": {
+            "understanding": avg_u,
+            "retention": avg_r,
+            "performance": avg_p,
+            "overall": round(((avg_u + avg_r + avg_p) / 15) * 100, 1),
+        },
+        "modes": mode_counts,
+        "mode_percentages": mode_percentages,
+        "frameworks": frameworks,
+        "recent_topics": topics_covered[:10],
+        "weak_areas": weak[:5],
+        "strong_areas": strong[:5],
+        "what_worked": what_worked,
+        "common_issues": common_issues,
+        "recent_sessions": recent_sessions,
+        "thresholds": {"weak": WEAK_THRESHOLD, "strong": STRONG_THRESHOLD},
+    }
+
+
+def build_stats():
+    from db_setup import get_connection
+
+    conn = get_connection()
+    try:
+        return build_stats_sql(conn)
+    finally:
+        conn.close()
+
+
 def get_mastery_stats():
     """
     Get topic mastery statistics for identifying weak areas and relearning needs.
@@ -206,9 +370,9 @@ def get_mastery_stats():
         - stale_topics: Topics not studied in 14+ days
     """
     import sqlite3
-    from db_setup import DB_PATH
+    from db_setup import get_connection
     
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_connection(readonly=True)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -307,9 +471,9 @@ def get_trend_data(days=30):
     Legacy aliases are kept for the chart helper: understanding, retention, session_count, duration_avg.
     """
     import sqlite3
-    from db_setup import DB_PATH
+    from db_setup import get_connection
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_connection()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
 
@@ -328,15 +492,14 @@ def get_trend_data(days=30):
     try:
         cursor.execute(
             """
-            SELECT 
+            SELECT
                 session_date,
-                COUNT(*) AS session_count,
-                AVG(understanding_level) AS avg_understanding,
-                AVG(retention_confidence) AS avg_retention,
-                AVG(COALESCE(duration_minutes, time_spent_minutes, 0)) AS avg_duration
-            FROM sessions
-            WHERE session_date >= ?
-            GROUP BY session_date
+                sessions AS session_count,
+                CAST(understanding_sum AS REAL) / NULLIF(understanding_n, 0) AS avg_understanding,
+                CAST(retention_sum AS REAL) / NULLIF(retention_n, 0) AS avg_retention,
+                CAST(duration_sum AS REAL) / sessions AS avg_duration
+            FROM session_rollup_daily
+            WHERE session_date >= ? AND sessions > 0
             ORDER BY session_date ASC
             """,
             (cutoff_date,)
@@ -403,9 +566,9 @@ def get_wrap_analytics():
         - spaced_review_stats: Compliance metrics
     """
     import sqlite3
-    from db_setup import DB_PATH
+    from db_setup import get_connection
     
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_connection()
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -438,35 +601,45 @@ def get_wrap_analytics():
         },
     }
     
-    wrap_fields = ["anki_cards_text", "glossary_entries", "wrap_watchlist", "clinical_links", "spaced_reviews"]
-    
     try:
-        # Fetch all sessions with WRAP fields
+        fill_sums = ", ".join(f"COALESCE(SUM({f}_filled), 0) AS {f}_filled" for f in WRAP_FIELDS)
         cursor.execute(
-            """
-            SELECT id, session_date, main_topic,
-                   anki_cards_text, glossary_entries, wrap_watchlist,
-                   clinical_links, spaced_reviews,
-                   errors_conceptual, errors_discrimination, errors_recall
-            FROM sessions
-            ORDER BY session_date DESC
+            f"""
+            SELECT COALESCE(SUM(sessions), 0) AS sessions,
+                   COALESCE(SUM(wrap_filled), 0) AS wrap_filled,
+                   COALESCE(SUM(wrap_full), 0) AS wrap_full,
+                   COALESCE(SUM(wrap_empty), 0) AS wrap_empty,
+                   COALESCE(SUM(glossary_terms), 0) AS glossary_terms,
+                   {fill_sums}
+            FROM session_rollup_daily
             """
         )
-        rows = cursor.fetchall()
-        total_sessions = len(rows)
+        totals = cursor.fetchone()
+        total_sessions = totals["sessions"]
         results["error_tracking"]["total_sessions"] = total_sessions
         
-        if not rows:
+        if not total_sessions:
             return results
         
-        # Error tracking
+        # Error tracking: only sessions that logged an error need their text
+        cursor.execute(
+            """
+            SELECT session_date, main_topic,
+                   errors_conceptual, errors_discrimination, errors_recall
+            FROM sessions
+            WHERE COALESCE(errors_conceptual, '') != ''
+               OR COALESCE(errors_discrimination, '') != ''
+               OR COALESCE(errors_recall, '') != ''
+            ORDER BY session_date DESC
+            """
+        )
         sessions_with_errors = 0
         all_error_terms = Counter()
         conceptual_list = []
         discrimination_list = []
         recall_list = []
         
-        for row in rows:
+        for row in cursor:
             has_error = False
             for error_field, error_list in [
                 ("errors_conceptual", conceptual_list),
@@ -491,68 +664,39 @@ def get_wrap_analytics():
                 sessions_with_errors += 1
         
         results["error_tracking"]["sessions_with_errors"] = sessions_with_errors
-        results["error_tracking"]["error_rate"] = round((sessions_with_errors / total_sessions) * 100, 1) if total_sessions else 0
+        results["error_tracking"]["error_rate"] = round((sessions_with_errors / total_sessions) * 100, 1)
         results["error_tracking"]["conceptual_errors"] = conceptual_list[:10]
         results["error_tracking"]["discrimination_errors"] = discrimination_list[:10]
         results["error_tracking"]["recall_errors"] = recall_list[:10]
         results["error_tracking"]["recurring_terms"] = all_error_terms.most_common(10)
         
-        # WRAP completeness scoring
-        completeness_scores = []
-        field_fill_counts = {f: 0 for f in wrap_fields}
-        fully_complete = 0
-        partially_complete = 0
-        empty = 0
-        
-        for row in rows:
-            filled = 0
-            for field in wrap_fields:
-                if row[field] and str(row[field]).strip():
-                    filled += 1
-                    field_fill_counts[field] += 1
-            
-            score = (filled / len(wrap_fields)) * 100
-            completeness_scores.append(score)
-            
-            if filled == len(wrap_fields):
-                fully_complete += 1
-            elif filled > 0:
-                partially_complete += 1
-            else:
-                empty += 1
-        
-        results["wrap_completeness"]["avg_completeness"] = round(sum(completeness_scores) / len(completeness_scores), 1) if completeness_scores else 0
+        # WRAP completeness scoring (from rollup fill counts)
+        fully_complete = totals["wrap_full"]
+        empty = totals["wrap_empty"]
+        results["wrap_completeness"]["avg_completeness"] = round(totals["wrap_filled"] * 100 / len(WRAP_FIELDS) / total_sessions, 1)
         results["wrap_completeness"]["fully_complete"] = fully_complete
-        results["wrap_completeness"]["partially_complete"] = partially_complete
+        results["wrap_completeness"]["partially_complete"] = total_sessions - fully_complete - empty
         results["wrap_completeness"]["empty"] = empty
         results["wrap_completeness"]["field_fill_rates"] = {
-            field: round((count / total_sessions) * 100, 1) if total_sessions else 0
-            for field, count in field_fill_counts.items()
+            field: round((totals[f"{field}_filled"] / total_sessions) * 100, 1)
+            for field in WRAP_FIELDS
         }
         
         # Glossary stats
-        total_glossary_terms = 0
-        sessions_with_glossary = 0
-        
-        for row in rows:
-            glossary = row["glossary_entries"] or ""
-            if glossary.strip():
-                sessions_with_glossary += 1
-                entries = re.split(r"[;\n]", glossary)
-                term_count = sum(1 for e in entries if e.strip() and not e.strip().startswith("#"))
-                total_glossary_terms += term_count
+        total_glossary_terms = totals["glossary_terms"]
+        sessions_with_glossary = totals["glossary_entries_filled"]
         
         results["glossary_stats"]["total_terms"] = total_glossary_terms
         results["glossary_stats"]["sessions_with_glossary"] = sessions_with_glossary
         results["glossary_stats"]["avg_terms_per_session"] = round(total_glossary_terms / sessions_with_glossary, 1) if sessions_with_glossary else 0
         
         # Spaced review compliance
-        sessions_scheduled = sum(1 for row in rows if row["spaced_reviews"] and row["spaced_reviews"].strip())
+        sessions_scheduled = totals["spaced_reviews_filled"]
         sessions_not_scheduled = total_sessions - sessions_scheduled
         
         results["spaced_review_stats"]["sessions_scheduled"] = sessions_scheduled
         results["spaced_review_stats"]["sessions_not_scheduled"] = sessions_not_scheduled
-        results["spaced_review_stats"]["compliance_rate"] = round((sessions_scheduled / total_sessions) * 100, 1) if total_sessions else 0
+        results["spaced_review_stats"]["compliance_rate"] = round((sessions_scheduled / total_sessions) * 100, 1)
         
     except Exception as e:
         print(f"[WARN] Error fetching WRAP analytics: {e}")
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Pooled SQLite connections for the Brain DB.
+
+Every API handler used to open a fresh sqlite3 connection (and re-run
+per-connection setup) for each query. Connections here are opened once,
+configured once and reused:
+
+  - the database is switched to WAL journal mode the first time a path is
+    opened (journal_mode is persistent in the file), so readers no longer
+    block behind a writer
+  - each connection gets synchronous=NORMAL, a memory-mapped read window,
+    a larger page cache and a busy timeout when it is created
+  - write and read handles are pooled separately; read handles run with
+    query_only=ON
+
+A connection is checked out by one thread at a time. Its close() returns it
+to the pool instead of closing it (rolling back anything left uncommitted,
+like a real close would) and resets row_factory/trace callbacks, so existing
+`conn = get_connection() ... conn.close()` code works unchanged. The Flask
+dev server runs each request on a new thread, so the pool is shared by the
+process rather than kept in thread-locals.
+
+Schema creation is not done here; db_setup.get_connection() runs it once
+per process before handing out connections.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+MMAP_SIZE = 256 * 1024 * 1024
+CACHE_SIZE_KB = 20000
+BUSY_TIMEOUT_MS = 5000
+MAX_IDLE = 8  # idle connections kept per path and mode
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3.Connection whose close() hands it back to its pool."""
+
+    _pool: Optional["ConnectionPool"] = None
+    _readonly = False
+    _released = False
+
+    def close(self) -> None:
+        # Closing twice must not close a handle that is already idle in the pool.
+        if self._released:
+            return
+        pool, self._pool = self._pool, None
+        if pool is None:
+            super().close()
+        else:
+            self._released = True
+            pool.release(self)
+
+    def discard(self) -> None:
+        """Close for real."""
+        self._pool = None
+        super().close()
+
+
+def _file_id(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+class ConnectionPool:
+    """Idle write and read connections for one database file."""
+
+    def __init__(self, path: str, max_idle: int = MAX_IDLE):
+        self.path = path
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle: Dict[bool, List[PooledConnection]] = {False: [], True: []}
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._wal_checked = False
+        self.opened = 0
+        self.reused = 0
+
+    def _open(self, readonly: bool) -> PooledConnection:
+        conn = sqlite3.connect(
+            self.path, timeout=15, check_same_thread=False, factory=PooledConnection
+        )
+        conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        if not self._wal_checked:
+            try:
+                conn.execute("PRAGMA journal_mode = WAL")
+            except sqlite3.OperationalError as e:
+                print(f"[WARN] Could not enable WAL for {self.path}: {e}")
+            self._wal_checked = True
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+        if readonly:
+            conn.execute("PRAGMA query_only = ON")
+        conn._readonly = readonly
+        self.opened += 1
+        return conn
+
+    def acquire(self, readonly: bool = False) -> PooledConnection:
+        file_id = _file_id(self.path)
+        with self._lock:
+            if file_id != self._file_id:
+                # File replaced or deleted: idle handles point at the old inode.
+                self._drain()
+                self._file_id = file_id
+                self._wal_checked = False
+            idle = self._idle[readonly]
+            conn = idle.pop() if idle else None
+            if conn is not None:
+                self.reused += 1
+        if conn is None:
+            conn = self._open(readonly)
+        conn._pool = self
+        conn._released = False
+        return conn
+
+    def release(self, conn: PooledConnection) -> None:
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+            conn.text_factory = str
+            conn.set_trace_callback(None)
+        except sqlite3.Error:
+            conn.discard()
+            return
+        with self._lock:
+            idle = self._idle[conn._readonly]
+            if _file_id(self.path) == self._file_id and len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.discard()
+
+    def _drain(self) -> None:
+        for idle in self._idle.values():
+            while idle:
+                idle.pop().discard()
+
+    def close_all(self) -> None:
+        with self._lock:
+            self._drain()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "opened": self.opened,
+                "reused": self.reused,
+                "idle_write": len(self._idle[False]),
+                "idle_read": len(self._idle[True]),
+            }
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(path: str) -> ConnectionPool:
+    key = os.path.abspath(str(path))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(key)
+        return pool
+
+
+def connect(path: str, readonly: bool = False) -> PooledConnection:
+    """Check out a configured connection to `path` (returned by close())."""
+    return get_pool(path).acquire(readonly)
+
+
+def close_all() -> None:
+    """Close every idle pooled connection (checked-out ones are unaffected)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
+
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    with _pools_lock:
+        pools = dict(_pools)
+    return {path: pool.stats() for path, pool in pools.items()}
@@ -6,22 +6,28 @@ Database setup and schema initialization for PT Study Brain v9.4.
 import sqlite3
 import os
 import sys
+import threading
 from pathlib import Path
 
 from config import DB_PATH
 
+# Paths whose schema init_database() has already run in this process.
+_schema_ready = set()
+_schema_lock = threading.Lock()
 
-def init_database():
+
+def init_database(db_path=None):
     """
     Initialize the SQLite database with the sessions table (v9.3 schema)
     plus additive planning/RAG tables.
     """
+    db_path = db_path or DB_PATH
     # Ensure data directory exists
-    data_dir = os.path.dirname(DB_PATH)
-    if not os.path.exists(data_dir):
+    data_dir = os.path.dirname(db_path)
+    if data_dir and not os.path.exists(data_dir):
         os.makedirs(data_dir)
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
     # ------------------------------------------------------------------
@@ -248,6 +254,8 @@ def init_database():
         "spacing_algorithm": "TEXT",
         "rsr_adaptive_adjustment": "TEXT",
         "adaptive_multipliers": "TEXT",
+        # Change stamp for incremental Scholar checks
+        "updated_at": "TEXT",
     }
 
     # Add missing columns (skip id and constraints that can't be added via ALTER TABLE)
@@ -489,6 +497,11 @@ def init_database():
     cursor.execute(
         "INSERT OR IGNORE INTO planner_settings (id, updated_at) VALUES (1, datetime('now'))"
     )
+    # Newest session change stamp the spacing planner has already scanned
+    try:
+        cursor.execute("ALTER TABLE planner_settings ADD COLUMN spacing_watermark TEXT")
+    except sqlite3.OperationalError:
+        pass
 
     cursor.execute(
         """
@@ -524,6 +537,17 @@ def init_database():
     """
     )
 
+    # Additive migration for ingested_files: stat fingerprint so bulk
+    # ingestion can skip unchanged files without re-hashing them
+    cursor.execute("PRAGMA table_info(ingested_files)")
+    ingested_cols = {col[1] for col in cursor.fetchall()}
+    for col_name, col_type in [("file_mtime", "REAL"), ("file_size", "INTEGER")]:
+        if col_name not in ingested_cols:
+            try:
+                cursor.execute(f"ALTER TABLE ingested_files ADD COLUMN {col_name} {col_type}")
+            except sqlite3.OperationalError:
+                pass
+
     # Additive migration for courses table (color column for UI)
     cursor.execute("PRAGMA table_info(courses)")
     course_cols = {col[1] for col in cursor.fetchall()}
@@ -596,8 +620,8 @@ def init_database():
 
     # Backfill corpus/enabled defaults for older rows.
     try:
-        cursor.execute("UPDATE rag_docs SET corpus = COALESCE(corpus, 'runtime')")
-        cursor.execute("UPDATE rag_docs SET enabled = COALESCE(enabled, 1)")
+        cursor.execute("UPDATE rag_docs SET corpus = 'runtime' WHERE corpus IS NULL")
+        cursor.execute("UPDATE rag_docs SET enabled = 1 WHERE enabled IS NULL")
     except sqlite3.OperationalError:
         # Column might not exist in some edge cases; ignore.
         pass
@@ -652,6 +676,278 @@ def init_database():
     """
     )
 
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_session_topic
+        ON sessions(topic)
+    """
+    )
+
+    # Dashboard rollups (see session_rollups.py). Triggers queue the touched
+    # day/topic/mode keys; sync_rollups() recomputes them after writes.
+    try:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS session_rollup_daily (
+                session_date TEXT PRIMARY KEY,
+                sessions INTEGER NOT NULL DEFAULT 0,
+                minutes INTEGER NOT NULL DEFAULT 0,
+                duration_sum INTEGER NOT NULL DEFAULT 0,
+                anki_cards INTEGER NOT NULL DEFAULT 0,
+                understanding_sum INTEGER NOT NULL DEFAULT 0,
+                understanding_n INTEGER NOT NULL DEFAULT 0,
+                retention_sum INTEGER NOT NULL DEFAULT 0,
+                retention_n INTEGER NOT NULL DEFAULT 0,
+                performance_sum INTEGER NOT NULL DEFAULT 0,
+                performance_n INTEGER NOT NULL DEFAULT 0,
+                wrap_filled INTEGER NOT NULL DEFAULT 0,
+                wrap_full INTEGER NOT NULL DEFAULT 0,
+                wrap_empty INTEGER NOT NULL DEFAULT 0,
+                sessions_with_errors INTEGER NOT NULL DEFAULT 0,
+                glossary_terms INTEGER NOT NULL DEFAULT 0,
+                anki_cards_text_filled INTEGER NOT NULL DEFAULT 0,
+                glossary_entries_filled INTEGER NOT NULL DEFAULT 0,
+                wrap_watchlist_filled INTEGER NOT NULL DEFAULT 0,
+                clinical_links_filled INTEGER NOT NULL DEFAULT 0,
+                spaced_reviews_filled INTEGER NOT NULL DEFAULT 0
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS session_rollup_topic (
+                topic TEXT PRIMARY KEY,
+                sessions INTEGER NOT NULL DEFAULT 0,
+                last_date TEXT,
+                latest_key TEXT,
+                understanding_sum INTEGER NOT NULL DEFAULT 0,
+                understanding_n INTEGER NOT NULL DEFAULT 0,
+                last_rated_date TEXT
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS session_rollup_mode (
+                study_mode TEXT PRIMARY KEY,
+                sessions INTEGER NOT NULL DEFAULT 0,
+                latest_key TEXT
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS session_rollup_framework (
+                session_date TEXT NOT NULL,
+                framework TEXT NOT NULL,
+                uses INTEGER NOT NULL DEFAULT 0,
+                latest_key TEXT,
+                PRIMARY KEY (session_date, framework)
+            ) WITHOUT ROWID
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS session_rollup_meta (
+                name TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS session_rollup_queue (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (kind, key)
+            ) WITHOUT ROWID
+        """
+        )
+
+        def enqueue(ref):
+            return f"""
+                INSERT OR IGNORE INTO session_rollup_queue(kind, key) VALUES
+                    ('day', {ref}.session_date),
+                    ('topic', COALESCE(NULLIF({ref}.main_topic, ''), NULLIF({ref}.topic, ''), ''));
+                INSERT OR IGNORE INTO session_rollup_queue(kind, key)
+                    SELECT 'mode', {ref}.study_mode WHERE COALESCE({ref}.study_mode, '') != '';
+            """
+
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS sessions_rollup_ai
+            AFTER INSERT ON sessions
+            BEGIN
+                {enqueue("new")}
+            END;
+        """
+        )
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS sessions_rollup_au
+            AFTER UPDATE ON sessions
+            BEGIN
+                {enqueue("old")}
+                {enqueue("new")}
+            END;
+        """
+        )
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS sessions_rollup_ad
+            AFTER DELETE ON sessions
+            BEGIN
+                {enqueue("old")}
+            END;
+        """
+        )
+        # No version stamp yet: the sync at the end of init_database does a full build.
+    except sqlite3.OperationalError:
+        pass
+
+    # sessions.updated_at lets Scholar's friction alerts re-check only rows
+    # changed since its last run. Stamped by trigger so every writer is covered.
+    try:
+        cursor.execute(
+            "UPDATE sessions SET updated_at = created_at WHERE updated_at IS NULL"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions(updated_at)"
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS sessions_touch_ai
+            AFTER INSERT ON sessions
+            WHEN NEW.updated_at IS NULL
+            BEGIN
+                UPDATE sessions
+                SET updated_at = strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')
+                WHERE id = NEW.id;
+            END;
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS sessions_touch_au
+            AFTER UPDATE ON sessions
+            WHEN NEW.updated_at IS OLD.updated_at
+            BEGIN
+                UPDATE sessions
+                SET updated_at = strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')
+                WHERE id = NEW.id;
+            END;
+        """
+        )
+    except sqlite3.OperationalError:
+        pass
+
+    # Brain metrics term counts (see session_terms.py). Triggers queue session
+    # ids whose list-ish text columns changed; sync_terms() re-parses them.
+    # Every sessions write also stamps sessions_changed_at, which the metrics
+    # endpoint uses for its ETag/Last-Modified.
+    try:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS session_term_postings (
+                session_id INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                pos INTEGER NOT NULL,
+                key TEXT NOT NULL,
+                text TEXT,
+                course TEXT,
+                PRIMARY KEY (session_id, kind, pos)
+            ) WITHOUT ROWID
+        """
+        )
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_session_term_postings_key
+            ON session_term_postings(kind, key)
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS session_term_freq (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                first_session_id INTEGER,
+                first_pos INTEGER,
+                text TEXT,
+                course TEXT,
+                PRIMARY KEY (kind, key)
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_session_term_freq_rank
+            ON session_term_freq(kind, count DESC, first_session_id, first_pos)
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS session_term_queue (
+                session_id INTEGER PRIMARY KEY
+            )
+        """
+        )
+        text_columns = (
+            "confusions, errors_conceptual, gaps_identified, weak_anchors, "
+            "concepts, subtopics, issues, what_needs_fixing, main_topic, topic"
+        )
+        changed = """
+            INSERT OR REPLACE INTO session_rollup_meta (name, value)
+            VALUES ('sessions_changed_at', strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime'));
+        """
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS sessions_terms_ai
+            AFTER INSERT ON sessions
+            BEGIN
+                INSERT OR IGNORE INTO session_term_queue(session_id) VALUES (NEW.id);
+                {changed}
+            END;
+        """
+        )
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS sessions_terms_au
+            AFTER UPDATE OF id, {text_columns} ON sessions
+            BEGIN
+                INSERT OR IGNORE INTO session_term_queue(session_id) VALUES (OLD.id), (NEW.id);
+            END;
+        """
+        )
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS sessions_changed_au
+            AFTER UPDATE ON sessions
+            BEGIN
+                {changed}
+            END;
+        """
+        )
+        cursor.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS sessions_terms_ad
+            AFTER DELETE ON sessions
+            BEGIN
+                INSERT OR IGNORE INTO session_term_queue(session_id) VALUES (OLD.id);
+                {changed}
+            END;
+        """
+        )
+        cursor.execute(
+            """
+            INSERT OR IGNORE INTO session_rollup_meta (name, value)
+            VALUES ('sessions_changed_at', strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime'))
+        """
+        )
+        # No terms_version stamp yet: the sync at the end of init_database does a full build.
+    except sqlite3.OperationalError:
+        pass
+
     # Indexes for planning and RAG tables
     cursor.execute(
         """
@@ -677,6 +973,32 @@ def init_database():
         ON study_tasks(scheduled_date, status)
     """
     )
+    # One task per anchor/review/source; the spacing planner inserts with
+    # ON CONFLICT DO NOTHING against it. Older databases may already hold
+    # duplicates: keep the first row of each before creating the index.
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_study_tasks_anchor_review'"
+    )
+    if cursor.fetchone() is None:
+        cursor.execute(
+            """
+            DELETE FROM study_tasks
+            WHERE anchor_text IS NOT NULL AND review_number IS NOT NULL AND source IS NOT NULL
+              AND id NOT IN (
+                SELECT MIN(id) FROM study_tasks
+                WHERE anchor_text IS NOT NULL AND review_number IS NOT NULL AND source IS NOT NULL
+                GROUP BY anchor_text, review_number, source
+              )
+        """
+        )
+        if cursor.rowcount:
+            print(f"[INFO] Removed {cursor.rowcount} duplicate study_tasks anchor rows")
+    cursor.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_study_tasks_anchor_review
+        ON study_tasks(anchor_text, review_number, source)
+    """
+    )
     cursor.execute(
         """
         CREATE INDEX IF NOT EXISTS idx_rag_docs_path
@@ -713,6 +1035,163 @@ def init_database():
     """
     )
 
+    # ------------------------------------------------------------------
+    # Full-text index over rag_docs (FTS5 external-content table, BM25)
+    # ------------------------------------------------------------------
+    try:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rag_docs_fts'"
+        )
+        fts_existed = cursor.fetchone() is not None
+        cursor.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS rag_docs_fts USING fts5(
+                content,
+                topic_tags,
+                source_path,
+                content='rag_docs',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """
+        )
+        # Keep the index in sync with every write path that touches rag_docs.
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS rag_docs_fts_ai
+            AFTER INSERT ON rag_docs
+            BEGIN
+                INSERT INTO rag_docs_fts(rowid, content, topic_tags, source_path)
+                VALUES (new.id, new.content, new.topic_tags, new.source_path);
+            END;
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS rag_docs_fts_ad
+            AFTER DELETE ON rag_docs
+            BEGIN
+                INSERT INTO rag_docs_fts(rag_docs_fts, rowid, content, topic_tags, source_path)
+                VALUES ('delete', old.id, old.content, old.topic_tags, old.source_path);
+            END;
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS rag_docs_fts_au
+            AFTER UPDATE OF content, topic_tags, source_path ON rag_docs
+            BEGIN
+                INSERT INTO rag_docs_fts(rag_docs_fts, rowid, content, topic_tags, source_path)
+                VALUES ('delete', old.id, old.content, old.topic_tags, old.source_path);
+                INSERT INTO rag_docs_fts(rowid, content, topic_tags, source_path)
+                VALUES (new.id, new.content, new.topic_tags, new.source_path);
+            END;
+        """
+        )
+        if not fts_existed:
+            # Backfill rows that predate the index.
+            cursor.execute("INSERT INTO rag_docs_fts(rag_docs_fts) VALUES ('rebuild')")
+            print("[INFO] Built rag_docs_fts full-text index")
+    except sqlite3.OperationalError:
+        # SQLite compiled without FTS5; keyword search falls back to LIKE scans.
+        pass
+
+    # ------------------------------------------------------------------
+    # Passage-level keyword index (rag_chunks + FTS5)
+    # ------------------------------------------------------------------
+    # Every rag_docs row is split into ~1000-char passages with character
+    # offsets so keyword retrieval returns the matching passage instead of the
+    # head of the document. Writes to rag_docs only enqueue the doc id; the
+    # Python chunker drains rag_chunk_queue (rag_notes.sync_rag_chunks).
+    try:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rag_chunks'"
+        )
+        chunks_existed = cursor.fetchone() is not None
+        cursor.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS rag_chunks_fts USING fts5(
+                chunk_text,
+                content='rag_chunks',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rag_chunks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                rag_doc_id INTEGER NOT NULL,
+                chunk_index INTEGER NOT NULL,
+                char_start INTEGER NOT NULL,
+                char_end INTEGER NOT NULL,
+                chunk_text TEXT NOT NULL,
+                FOREIGN KEY(rag_doc_id) REFERENCES rag_docs(id),
+                UNIQUE(rag_doc_id, chunk_index)
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rag_chunk_queue (
+                rag_doc_id INTEGER PRIMARY KEY
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS rag_chunks_fts_ai
+            AFTER INSERT ON rag_chunks
+            BEGIN
+                INSERT INTO rag_chunks_fts(rowid, chunk_text) VALUES (new.id, new.chunk_text);
+            END;
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS rag_chunks_fts_ad
+            AFTER DELETE ON rag_chunks
+            BEGIN
+                INSERT INTO rag_chunks_fts(rag_chunks_fts, rowid, chunk_text)
+                VALUES ('delete', old.id, old.chunk_text);
+            END;
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS rag_docs_chunk_queue_ai
+            AFTER INSERT ON rag_docs
+            BEGIN
+                INSERT OR IGNORE INTO rag_chunk_queue(rag_doc_id) VALUES (new.id);
+            END;
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS rag_docs_chunk_queue_au
+            AFTER UPDATE OF content ON rag_docs
+            BEGIN
+                INSERT OR IGNORE INTO rag_chunk_queue(rag_doc_id) VALUES (new.id);
+            END;
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS rag_docs_chunks_ad
+            AFTER DELETE ON rag_docs
+            BEGIN
+                DELETE FROM rag_chunks WHERE rag_doc_id = old.id;
+                DELETE FROM rag_chunk_queue WHERE rag_doc_id = old.id;
+            END;
+        """
+        )
+        if not chunks_existed:
+            # Existing documents are chunked at the end of init_database.
+            cursor.execute("INSERT OR IGNORE INTO rag_chunk_queue(rag_doc_id) SELECT id FROM rag_docs")
+    except sqlite3.OperationalError:
+        pass
+
     # ------------------------------------------------------------------
     # Tutor turns table (tracks individual Q&A within a Tutor session)
     # ------------------------------------------------------------------
@@ -837,6 +1316,41 @@ def init_database():
     """
     )
 
+    # Rating sums/counts let the sessions triggers (see topic_mastery.py) apply
+    # exact deltas on insert, update and delete instead of a running average.
+    cursor.execute("PRAGMA table_info(topic_mastery)")
+    mastery_cols = {col[1] for col in cursor.fetchall()}
+    for col_name, col_type in [
+        ("understanding_sum", "REAL NOT NULL DEFAULT 0"),
+        ("understanding_n", "INTEGER NOT NULL DEFAULT 0"),
+        ("retention_sum", "REAL NOT NULL DEFAULT 0"),
+        ("retention_n", "INTEGER NOT NULL DEFAULT 0"),
+    ]:
+        if col_name not in mastery_cols:
+            try:
+                cursor.execute(f"ALTER TABLE topic_mastery ADD COLUMN {col_name} {col_type}")
+            except sqlite3.OperationalError:
+                pass
+
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_topic_mastery_understanding
+        ON topic_mastery(avg_understanding)
+    """
+    )
+
+    try:
+        from topic_mastery import MASTERY_VERSION, create_mastery_triggers, recompute_topic_mastery
+
+        create_mastery_triggers(cursor)
+        cursor.execute("SELECT value FROM session_rollup_meta WHERE name = 'mastery_version'")
+        row = cursor.fetchone()
+        if not row or row[0] != MASTERY_VERSION:
+            topics = recompute_topic_mastery(conn, commit=False)
+            print(f"[INFO] Recomputed topic_mastery ({topics} topics)")
+    except sqlite3.OperationalError as e:
+        print(f"[WARN] topic_mastery triggers not installed: {e}")
+
     # ------------------------------------------------------------------
     # Anki Card Drafts table (for Tutor WRAP phase)
     # ------------------------------------------------------------------
@@ -884,6 +1398,74 @@ def init_database():
     """
     )
 
+    # ------------------------------------------------------------------
+    # Near-duplicate index for card fronts (MinHash LSH buckets)
+    # ------------------------------------------------------------------
+    # One row per (LSH band bucket, card). Inserts, front edits and status
+    # changes only enqueue the card id; writers call
+    # card_dedupe.refresh_card_index after committing to hash queued fronts,
+    # and duplicate lookups treat still-queued cards as candidates.
+    try:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'card_minhash_bands'"
+        )
+        minhash_existed = cursor.fetchone() is not None
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS card_minhash_bands (
+                bucket INTEGER NOT NULL,
+                card_id INTEGER NOT NULL,
+                PRIMARY KEY (bucket, card_id)
+            ) WITHOUT ROWID
+        """
+        )
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_card_minhash_bands_card
+            ON card_minhash_bands(card_id)
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS card_minhash_queue (
+                card_id INTEGER PRIMARY KEY
+            )
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS card_drafts_minhash_ai
+            AFTER INSERT ON card_drafts
+            BEGIN
+                INSERT OR IGNORE INTO card_minhash_queue(card_id) VALUES (new.id);
+            END;
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS card_drafts_minhash_au
+            AFTER UPDATE OF front, status ON card_drafts
+            BEGIN
+                INSERT OR IGNORE INTO card_minhash_queue(card_id) VALUES (new.id);
+            END;
+        """
+        )
+        cursor.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS card_drafts_minhash_ad
+            AFTER DELETE ON card_drafts
+            BEGIN
+                DELETE FROM card_minhash_bands WHERE card_id = old.id;
+                DELETE FROM card_minhash_queue WHERE card_id = old.id;
+            END;
+        """
+        )
+        if not minhash_existed:
+            # Existing drafts are hashed lazily on the next duplicate check.
+            cursor.execute("INSERT OR IGNORE INTO card_minhash_queue(card_id) SELECT id FROM card_drafts")
+    except sqlite3.OperationalError:
+        pass
+
     # Add google_event_id to course_events if not exists (for GCal sync)
     cursor.execute("PRAGMA table_info(course_events)")
     ce_columns = {col[1] for col in cursor.fetchall()}
@@ -968,6 +1550,21 @@ def init_database():
     cursor.execute(
         "CREATE INDEX IF NOT EXISTS idx_course_events_google_lookup ON course_events(google_event_id, google_calendar_id)"
     )
+    # Incremental GCal sync: local pushes scan rows edited since the watermark
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_course_events_updated ON course_events(updated_at)"
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS gcal_sync_state (
+            calendar_id TEXT PRIMARY KEY,
+            sync_token TEXT,            -- Google nextSyncToken for events.list
+            local_watermark TEXT,       -- course_events.updated_at cutoff for pushes
+            last_full_sync_at TEXT,
+            updated_at TEXT
+        )
+    """
+    )
 
     # Add time and end_time columns if not exist (for event times)
     if "time" not in ce_columns:
@@ -1365,6 +1962,29 @@ def init_database():
         ON rag_embeddings(rag_doc_id)
     """)
 
+    # ------------------------------------------------------------------
+    # Adaptive Tutor: corpus generation counter (retrieval cache invalidation)
+    # ------------------------------------------------------------------
+    # Bumped by trigger on every rag_docs / rag_embeddings write, so cached
+    # tutor retrieval results keyed on the generation can never go stale,
+    # whichever code path (upload, delete, embed, folder sync) changed them.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS rag_corpus_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            generation INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO rag_corpus_state (id, generation) VALUES (1, 0)")
+    for table in ("rag_docs", "rag_embeddings"):
+        for event, suffix in (("INSERT", "ai"), ("UPDATE", "au"), ("DELETE", "ad")):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_generation_{suffix}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE rag_corpus_state SET generation = generation + 1 WHERE id = 1;
+                END;
+            """)
+
     # ------------------------------------------------------------------
     # Adaptive Tutor: column migrations
     # ------------------------------------------------------------------
@@ -1389,6 +2009,16 @@ def init_database():
         except sqlite3.OperationalError:
             pass
 
+    # rag_embeddings: add content_hash (sha256 of chunk_text, for incremental re-embeds)
+    cursor.execute("PRAGMA table_info(rag_embeddings)")
+    re_cols = {col[1] for col in cursor.fetchall()}
+    if "content_hash" not in re_cols:
+        try:
+            cursor.execute("ALTER TABLE rag_embeddings ADD COLUMN content_hash TEXT")
+            print("[INFO] Added 'content_hash' column to rag_embeddings table")
+        except sqlite3.OperationalError:
+            pass
+
     # ------------------------------------------------------------------
     # 3-Layer Tutor: add method_chain_id + current_block_index to tutor_sessions
     # ------------------------------------------------------------------
@@ -1428,10 +2058,58 @@ def init_database():
         ON tutor_block_transitions(tutor_session_id)
     """)
 
+    # ------------------------------------------------------------------
+    # Tutor: tutor_session_context (rolling chat history per session,
+    # written through by tutor_session_store)
+    # ------------------------------------------------------------------
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tutor_session_context (
+            session_id TEXT PRIMARY KEY,
+            turns_json TEXT NOT NULL DEFAULT '[]',
+            summary_json TEXT NOT NULL DEFAULT '[]',
+            turn_count INTEGER NOT NULL DEFAULT 0,
+            token_estimate INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT NOT NULL
+        )
+    """)
+
+    # ------------------------------------------------------------------
+    # LLM response cache (content-addressed, see llm_cache.py)
+    # ------------------------------------------------------------------
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS llm_response_cache (
+            key TEXT PRIMARY KEY,
+            site TEXT NOT NULL,
+            provider TEXT,
+            model TEXT,
+            content TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            accessed_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_llm_response_cache_accessed ON llm_response_cache(accessed_at)"
+    )
+
     conn.commit()
+
+    # Chunk any documents queued by the rag_chunks migration or by writers
+    # that bypassed rag_notes, hash queued card fronts, and bring the
+    # dashboard rollups up to date; the read paths never write.
+    from card_dedupe import refresh_card_index
+    from rag_notes import refresh_rag_chunks
+    from session_rollups import sync_after_session_write
+
+    refresh_rag_chunks(conn)
+    refresh_card_index(conn)
+    sync_after_session_write(conn)
     conn.close()
+    _schema_ready.add(os.path.abspath(db_path))
 
-    print(f"[OK] Database initialized at: {DB_PATH}")
+    print(f"[OK] Database initialized at: {db_path}")
     print("[OK] Schema version: 9.4 + planning/RAG/methods/chain-runs/tutor extensions")
 
 
@@ -1532,28 +2210,23 @@ def migrate_from_v8():
     conn.close()
 
 
-def get_connection():
-    """
-    Get a database connection.
+def get_connection(db_path=None, readonly=False):
     """
-    # Ensure the database schema exists so API handlers and tests don't depend on
-    # a pre-existing local DB file.
-    if not os.path.exists(DB_PATH):
-        init_database()
-
-    conn = sqlite3.connect(DB_PATH, timeout=15)
-    conn.execute("PRAGMA busy_timeout = 5000")
+    Get a pooled database connection (see db_pool.py).
 
-    try:
-        conn.execute("SELECT 1 FROM sessions LIMIT 1")
-    except sqlite3.OperationalError:
-        # Likely a brand-new DB file with no schema yet.
-        conn.close()
-        init_database()
-        conn = sqlite3.connect(DB_PATH, timeout=15)
-        conn.execute("PRAGMA busy_timeout = 5000")
+    The schema is initialized the first time a path is used in this process
+    (or again if the file was deleted). close() returns the connection to
+    the pool. readonly=True hands out a query_only handle.
+    """
+    from db_pool import connect
 
-    return conn
+    db_path = db_path or DB_PATH
+    key = os.path.abspath(db_path)
+    if key not in _schema_ready or not os.path.exists(db_path):
+        with _schema_lock:
+            if key not in _schema_ready or not os.path.exists(db_path):
+                init_database(db_path)
+    return connect(db_path, readonly=readonly)
 
 
 # ------------------------------------------------------------------
@@ -1589,25 +2262,45 @@ def is_file_ingested(conn, filepath: str, checksum: str) -> tuple:
     return False, None
 
 
-def mark_file_ingested(conn, filepath: str, checksum: str, session_id: int = None):
+def mark_file_ingested(
+    conn,
+    filepath: str,
+    checksum: str,
+    session_id: int = None,
+    mtime: float = None,
+    size: int = None,
+    commit: bool = True,
+):
     """
     Mark a file as ingested. Updates if filepath exists, inserts otherwise.
+    mtime/size record the file's stat fingerprint; commit=False lets bulk
+    ingestion batch many files into one transaction.
     """
     from datetime import datetime
 
+    if mtime is None or size is None:
+        try:
+            st = os.stat(filepath)
+            mtime, size = st.st_mtime, st.st_size
+        except OSError:
+            pass
+
     cursor = conn.cursor()
     cursor.execute(
         """
-        INSERT INTO ingested_files (filepath, checksum, session_id, ingested_at)
-        VALUES (?, ?, ?, ?)
+        INSERT INTO ingested_files (filepath, checksum, session_id, ingested_at, file_mtime, file_size)
+        VALUES (?, ?, ?, ?, ?, ?)
         ON CONFLICT(filepath) DO UPDATE SET
             checksum = excluded.checksum,
             session_id = excluded.session_id,
-            ingested_at = excluded.ingested_at
+            ingested_at = excluded.ingested_at,
+            file_mtime = excluded.file_mtime,
+            file_size = excluded.file_size
         """,
-        (filepath, checksum, session_id, datetime.now().isoformat()),
+        (filepath, checksum, session_id, datetime.now().isoformat(), mtime, size),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
 
 
 def remove_ingested_file(conn, filepath: str):
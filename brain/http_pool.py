@@ -0,0 +1,258 @@
+"""
+Keep-alive HTTP connection pools for LLM provider calls.
+
+Every provider call used to open a fresh connection (TCP + TLS handshake)
+through urllib or a one-off http.client.HTTPSConnection. Chain runs and
+WRAP processing make many sequential calls to the same few hosts, so this
+module keeps a small pool of persistent HTTP/1.1 connections per
+(scheme, host, port) and reuses them while the server allows keep-alive.
+
+    from http_pool import request
+
+    with request("POST", url, body=data, headers=headers, timeout=30) as resp:
+        status, payload = resp.status, resp.read()
+
+The response must be used as a context manager (or .release()d): a fully
+read response hands its connection back to the pool, anything else closes
+it. A request that fails on a reused connection before any response arrives
+(the server dropped the idle socket) is retried once on a new connection.
+
+Each call records connect / TTFB / total timings, available on the response
+(resp.timings) and aggregated per host by stats().
+
+Pool size: LLM_HTTP_POOL_SIZE (default 4 idle connections per host).
+"""
+
+import http.client
+import os
+import ssl
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_POOL_SIZE = int(os.environ.get("LLM_HTTP_POOL_SIZE", "4") or 4)
+DEFAULT_TIMEOUT = 60
+RECENT_TIMINGS = 100
+
+# Raised when a kept-alive socket turns out to be dead on reuse.
+_STALE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+)
+
+
+class PooledResponse:
+    """http.client.HTTPResponse wrapper that returns its connection on release."""
+
+    def __init__(self, pool: "HTTPPool", conn, response, timings: dict, started: float):
+        self._pool = pool
+        self._conn = conn
+        self._response = response
+        self._started = started
+        self.timings = timings
+        self.status = response.status
+        self.reason = response.reason
+        self.headers = response.headers
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._response.read(amt)
+
+    def readline(self) -> bytes:
+        return self._response.readline()
+
+    def __iter__(self):
+        while True:
+            line = self._response.readline()
+            if not line:
+                return
+            yield line
+
+    def release(self) -> None:
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        reusable = self._response.isclosed() and not self._response.will_close
+        if not reusable:
+            # Unread body or server asked to close: the socket can't be reused.
+            self._response.close()
+        self.timings["total_ms"] = (time.perf_counter() - self._started) * 1000
+        self._pool._finish(conn, reusable, self.timings)
+
+    def __enter__(self) -> "PooledResponse":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class HTTPPool:
+    """Thread-safe LIFO pool of keep-alive connections to one host."""
+
+    def __init__(
+        self,
+        scheme: str,
+        host: str,
+        port: Optional[int] = None,
+        maxsize: int = DEFAULT_POOL_SIZE,
+        context: Optional[ssl.SSLContext] = None,
+    ):
+        if scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported scheme: {scheme}")
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.maxsize = maxsize
+        self._context = context
+        self._idle: list = []
+        self._lock = threading.Lock()
+        self._recent: deque = deque(maxlen=RECENT_TIMINGS)
+        self.counters = {"requests": 0, "reused": 0, "connects": 0, "retries": 0, "errors": 0}
+
+    def _new_connection(self, timeout: float):
+        if self.scheme == "https":
+            if self._context is None:
+                self._context = ssl.create_default_context()
+            return http.client.HTTPSConnection(
+                self.host, self.port, timeout=timeout, context=self._context
+            )
+        return http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+
+    def _checkout(self, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+        return self._new_connection(timeout), False
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body=None,
+        headers: Optional[dict] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> PooledResponse:
+        headers = dict(headers or {})
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        for attempt in (0, 1):
+            started = time.perf_counter()
+            conn, reused = self._checkout(timeout)
+            timings = {"reused": reused, "connect_ms": 0.0, "ttfb_ms": None, "total_ms": None}
+            try:
+                if not reused:
+                    conn.connect()
+                    timings["connect_ms"] = (time.perf_counter() - started) * 1000
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+            except _STALE_ERRORS:
+                conn.close()
+                if reused and attempt == 0:
+                    with self._lock:
+                        self.counters["retries"] += 1
+                    continue
+                self._count_error()
+                raise
+            except Exception:
+                conn.close()
+                self._count_error()
+                raise
+            timings["ttfb_ms"] = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self.counters["requests"] += 1
+                self.counters["reused" if reused else "connects"] += 1
+            return PooledResponse(self, conn, response, timings, started)
+        raise AssertionError("unreachable")
+
+    def _count_error(self) -> None:
+        with self._lock:
+            self.counters["errors"] += 1
+
+    def _finish(self, conn, reusable: bool, timings: dict) -> None:
+        with self._lock:
+            self._recent.append(timings)
+            if reusable and len(self._idle) < self.maxsize:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            recent = list(self._recent)
+            out = dict(self.counters, idle=len(self._idle), maxsize=self.maxsize)
+
+        def avg(key):
+            values = [t[key] for t in recent if t.get(key) is not None]
+            return round(sum(values) / len(values), 2) if values else None
+
+        new = [t["connect_ms"] for t in recent if not t["reused"]]
+        out["avg_connect_ms"] = round(sum(new) / len(new), 2) if new else None
+        out["avg_ttfb_ms"] = avg("ttfb_ms")
+        out["avg_total_ms"] = avg("total_ms")
+        return out
+
+
+_pools: Dict[Tuple[str, str, Optional[int]], HTTPPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(url: str, maxsize: Optional[int] = None) -> HTTPPool:
+    """The shared pool for a URL's scheme/host/port."""
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.hostname, parts.port)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = HTTPPool(
+                parts.scheme, parts.hostname, parts.port, maxsize or DEFAULT_POOL_SIZE
+            )
+        elif maxsize:
+            pool.maxsize = maxsize
+        return pool
+
+
+def request(
+    method: str,
+    url: str,
+    body=None,
+    headers: Optional[dict] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> PooledResponse:
+    """Send a request over the shared pool for `url`'s host."""
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    return get_pool(url).request(method, path, body=body, headers=headers, timeout=timeout)
+
+
+def stats() -> dict:
+    """Per-host counters and recent average timings."""
+    with _pools_lock:
+        pools = list(_pools.items())
+    return {
+        f"{scheme}://{host}" + (f":{port}" if port else ""): pool.stats()
+        for (scheme, host, port), pool in pools
+    }
+
+
+def close_all() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -16,6 +16,8 @@ from db_setup import (
     DB_PATH, compute_file_checksum, is_file_ingested, 
     mark_file_ingested, remove_ingested_file, get_ingested_session_id
 )
+from session_rollups import sync_rollups
+from session_terms import sync_terms
 
 def parse_markdown_session(filepath):
     """
@@ -464,84 +466,6 @@ def normalize_topic_name(topic):
     return topic.strip().lower()
 
 
-def update_topic_mastery(topic, understanding, retention, session_date):
-    """
-    Update topic_mastery table after a session is ingested.
-    Uses UPSERT pattern to increment study_count and recalculate averages.
-    
-    Args:
-        topic: The main topic studied (will be normalized)
-        understanding: Understanding level (1-5) or None
-        retention: Retention confidence (1-5) or None  
-        session_date: ISO date string (YYYY-MM-DD)
-    """
-    normalized_topic = normalize_topic_name(topic)
-    if not normalized_topic:
-        return
-    
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    try:
-        # Check if topic exists
-        cursor.execute(
-            "SELECT study_count, avg_understanding, avg_retention, first_studied FROM topic_mastery WHERE topic = ?",
-            (normalized_topic,)
-        )
-        existing = cursor.fetchone()
-        
-        if existing:
-            old_count, old_avg_u, old_avg_r, first_studied = existing
-            new_count = old_count + 1
-            
-            # Recalculate running averages (handle None values)
-            if understanding is not None:
-                if old_avg_u is not None:
-                    new_avg_u = (old_avg_u * old_count + understanding) / new_count
-                else:
-                    new_avg_u = float(understanding)
-            else:
-                new_avg_u = old_avg_u
-            
-            if retention is not None:
-                if old_avg_r is not None:
-                    new_avg_r = (old_avg_r * old_count + retention) / new_count
-                else:
-                    new_avg_r = float(retention)
-            else:
-                new_avg_r = old_avg_r
-            
-            cursor.execute(
-                """
-                UPDATE topic_mastery 
-                SET study_count = ?, last_studied = ?, avg_understanding = ?, avg_retention = ?
-                WHERE topic = ?
-                """,
-                (new_count, session_date, new_avg_u, new_avg_r, normalized_topic)
-            )
-        else:
-            # New topic - insert
-            cursor.execute(
-                """
-                INSERT INTO topic_mastery (topic, study_count, last_studied, first_studied, avg_understanding, avg_retention)
-                VALUES (?, 1, ?, ?, ?, ?)
-                """,
-                (
-                    normalized_topic,
-                    session_date,
-                    session_date,
-                    float(understanding) if understanding is not None else None,
-                    float(retention) if retention is not None else None
-                )
-            )
-        
-        conn.commit()
-    except Exception as e:
-        print(f"[WARN] Failed to update topic mastery: {e}")
-    finally:
-        conn.close()
-
-
 def validate_session_data(data):
     """
     Validate required fields are present.
@@ -642,137 +566,153 @@ def validate_session_data_verbose(data: dict) -> tuple:
     return len(errors) == 0, errors
 
 
-def insert_session(data):
-    """
-    Insert a session record into the database.
-    Returns (success, message).
-    """
+SESSION_COLUMNS = [
+    'session_date', 'session_time', 'time_spent_minutes', 'duration_minutes', 'study_mode',
+    'target_exam', 'source_lock', 'plan_of_attack',
+    'topic', 'main_topic', 'subtopics',
+    'frameworks_used', 'sop_modules_used', 'engines_used', 'core_learning_modules_used', 'gated_platter_triggered', 'wrap_phase_reached', 'anki_cards_count',
+    'off_source_drift', 'source_snippets_used', 'prompt_drift', 'prompt_drift_notes',
+    'region_covered', 'landmarks_mastered', 'muscles_attached', 'oian_completed_for',
+    'rollback_events', 'drawing_used', 'drawings_completed',
+    'understanding_level', 'retention_confidence', 'system_performance', 'calibration_check',
+    'anchors_locked', 'weak_anchors', 'anchors_mastery',
+    'what_worked', 'what_needs_fixing', 'gaps_identified', 'notes_insights',
+    'next_topic', 'next_focus', 'next_materials',
+    'created_at', 'schema_version', 'source_path', 'raw_input',
+    # WRAP v9.2 fields
+    'anki_cards_text', 'glossary_entries', 'wrap_watchlist', 'clinical_links',
+    'next_session_plan', 'spaced_reviews', 'runtime_notes',
+    'errors_conceptual', 'errors_discrimination', 'errors_recall',
+    # Logging Schema v9.3 fields
+    'calibration_gap', 'rsr_percent', 'cognitive_load', 'transfer_check',
+    'buckets', 'confusables_interleaved', 'exit_ticket_blurt', 'exit_ticket_muddiest',
+    'exit_ticket_next_action', 'retrospective_status', 'tracker_json', 'enhanced_json'
+]
+
+
+def _session_values(data: dict) -> tuple:
+    """Row values for SESSION_COLUMNS, with the ingest defaults applied."""
+    return (
+        data.get('session_date'),
+        data.get('session_time', ''),
+        data.get('time_spent_minutes', data.get('duration_minutes', 0)),
+        data.get('duration_minutes', data.get('time_spent_minutes', 0)),
+        data.get('study_mode'),
+        data.get('target_exam', ''),
+        data.get('source_lock', ''),
+        data.get('plan_of_attack', ''),
+        data.get('topic'),
+        data.get('main_topic'),
+        data.get('subtopics', ''),
+        data.get('frameworks_used', ''),
+        data.get('sop_modules_used', ''),
+        data.get('engines_used', ''),
+        data.get('core_learning_modules_used', ''),
+        data.get('gated_platter_triggered', ''),
+        data.get('wrap_phase_reached', ''),
+        data.get('anki_cards_count', 0),
+        data.get('off_source_drift', ''),
+        data.get('source_snippets_used', ''),
+        data.get('prompt_drift', ''),
+        data.get('prompt_drift_notes', ''),
+        data.get('region_covered', ''),
+        data.get('landmarks_mastered', ''),
+        data.get('muscles_attached', ''),
+        data.get('oian_completed_for', ''),
+        data.get('rollback_events', ''),
+        data.get('drawing_used', ''),
+        data.get('drawings_completed', ''),
+        data.get('understanding_level'),
+        data.get('retention_confidence'),
+        data.get('system_performance'),
+        data.get('calibration_check', ''),
+        data.get('anchors_locked', ''),
+        data.get('weak_anchors', ''),
+        data.get('anchors_mastery', ''),
+        data.get('what_worked', ''),
+        data.get('what_needs_fixing', ''),
+        data.get('gaps_identified', ''),
+        data.get('notes_insights', ''),
+        data.get('next_topic', ''),
+        data.get('next_focus', ''),
+        data.get('next_materials', ''),
+        data.get('created_at'),
+        data.get('schema_version', V93_SCHEMA_VERSION),
+        data.get('source_path', ''),
+        data.get('raw_input'),
+        # WRAP v9.2 fields
+        data.get('anki_cards_text'),
+        data.get('glossary_entries'),
+        data.get('wrap_watchlist'),
+        data.get('clinical_links'),
+        data.get('next_session_plan'),
+        data.get('spaced_reviews'),
+        data.get('runtime_notes'),
+        data.get('errors_conceptual'),
+        data.get('errors_discrimination'),
+        data.get('errors_recall'),
+        # Logging Schema v9.3 fields
+        data.get('calibration_gap'),
+        data.get('rsr_percent'),
+        data.get('cognitive_load', ''),
+        data.get('transfer_check', ''),
+        data.get('buckets', ''),
+        data.get('confusables_interleaved', ''),
+        data.get('exit_ticket_blurt'),
+        data.get('exit_ticket_muddiest'),
+        data.get('exit_ticket_next_action'),
+        data.get('retrospective_status'),
+        data.get('tracker_json'),
+        data.get('enhanced_json')
+    )
+
+
+def _insert_session_row(cursor, data: dict) -> int:
+    """INSERT one parsed session on an open cursor and return its id (no commit)."""
+    placeholders = ", ".join(["?"] * len(SESSION_COLUMNS))
+    cursor.execute(
+        f"INSERT INTO sessions ({', '.join(SESSION_COLUMNS)}) VALUES ({placeholders})",
+        _session_values(data),
+    )
+    return cursor.lastrowid
+
+
+def _insert_session(data):
+    """insert_session() that also returns the new session id (None on failure)."""
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
     try:
-        columns = [
-            'session_date', 'session_time', 'time_spent_minutes', 'duration_minutes', 'study_mode',
-            'target_exam', 'source_lock', 'plan_of_attack',
-            'topic', 'main_topic', 'subtopics',
-            'frameworks_used', 'sop_modules_used', 'engines_used', 'core_learning_modules_used', 'gated_platter_triggered', 'wrap_phase_reached', 'anki_cards_count',
-            'off_source_drift', 'source_snippets_used', 'prompt_drift', 'prompt_drift_notes',
-            'region_covered', 'landmarks_mastered', 'muscles_attached', 'oian_completed_for',
-            'rollback_events', 'drawing_used', 'drawings_completed',
-            'understanding_level', 'retention_confidence', 'system_performance', 'calibration_check',
-            'anchors_locked', 'weak_anchors', 'anchors_mastery',
-            'what_worked', 'what_needs_fixing', 'gaps_identified', 'notes_insights',
-            'next_topic', 'next_focus', 'next_materials',
-            'created_at', 'schema_version', 'source_path', 'raw_input',
-            # WRAP v9.2 fields
-            'anki_cards_text', 'glossary_entries', 'wrap_watchlist', 'clinical_links',
-            'next_session_plan', 'spaced_reviews', 'runtime_notes',
-            'errors_conceptual', 'errors_discrimination', 'errors_recall',
-            # Logging Schema v9.3 fields
-            'calibration_gap', 'rsr_percent', 'cognitive_load', 'transfer_check',
-            'buckets', 'confusables_interleaved', 'exit_ticket_blurt', 'exit_ticket_muddiest',
-            'exit_ticket_next_action', 'retrospective_status', 'tracker_json', 'enhanced_json'
-        ]
-        placeholders = ", ".join(["?"] * len(columns))
-        values = (
-            data.get('session_date'),
-            data.get('session_time', ''),
-            data.get('time_spent_minutes', data.get('duration_minutes', 0)),
-            data.get('duration_minutes', data.get('time_spent_minutes', 0)),
-            data.get('study_mode'),
-            data.get('target_exam', ''),
-            data.get('source_lock', ''),
-            data.get('plan_of_attack', ''),
-            data.get('topic'),
-            data.get('main_topic'),
-            data.get('subtopics', ''),
-            data.get('frameworks_used', ''),
-            data.get('sop_modules_used', ''),
-            data.get('engines_used', ''),
-            data.get('core_learning_modules_used', ''),
-            data.get('gated_platter_triggered', ''),
-            data.get('wrap_phase_reached', ''),
-            data.get('anki_cards_count', 0),
-            data.get('off_source_drift', ''),
-            data.get('source_snippets_used', ''),
-            data.get('prompt_drift', ''),
-            data.get('prompt_drift_notes', ''),
-            data.get('region_covered', ''),
-            data.get('landmarks_mastered', ''),
-            data.get('muscles_attached', ''),
-            data.get('oian_completed_for', ''),
-            data.get('rollback_events', ''),
-            data.get('drawing_used', ''),
-            data.get('drawings_completed', ''),
-            data.get('understanding_level'),
-            data.get('retention_confidence'),
-            data.get('system_performance'),
-            data.get('calibration_check', ''),
-            data.get('anchors_locked', ''),
-            data.get('weak_anchors', ''),
-            data.get('anchors_mastery', ''),
-            data.get('what_worked', ''),
-            data.get('what_needs_fixing', ''),
-            data.get('gaps_identified', ''),
-            data.get('notes_insights', ''),
-            data.get('next_topic', ''),
-            data.get('next_focus', ''),
-            data.get('next_materials', ''),
-            data.get('created_at'),
-            data.get('schema_version', V93_SCHEMA_VERSION),
-            data.get('source_path', ''),
-            data.get('raw_input'),
-            # WRAP v9.2 fields
-            data.get('anki_cards_text'),
-            data.get('glossary_entries'),
-            data.get('wrap_watchlist'),
-            data.get('clinical_links'),
-            data.get('next_session_plan'),
-            data.get('spaced_reviews'),
-            data.get('runtime_notes'),
-            data.get('errors_conceptual'),
-            data.get('errors_discrimination'),
-            data.get('errors_recall'),
-            # Logging Schema v9.3 fields
-            data.get('calibration_gap'),
-            data.get('rsr_percent'),
-            data.get('cognitive_load', ''),
-            data.get('transfer_check', ''),
-            data.get('buckets', ''),
-            data.get('confusables_interleaved', ''),
-            data.get('exit_ticket_blurt'),
-            data.get('exit_ticket_muddiest'),
-            data.get('exit_ticket_next_action'),
-            data.get('retrospective_status'),
-            data.get('tracker_json'),
-            data.get('enhanced_json')
-        )
-        cursor.execute(f'''INSERT INTO sessions ({", ".join(columns)}) VALUES ({placeholders})''', values)
-        
+        # topic_mastery is updated by triggers in this same transaction
+        # (see topic_mastery.py), so a session and its mastery delta commit together.
+        session_id = _insert_session_row(cursor, data)
         conn.commit()
-        session_id = cursor.lastrowid
+        try:
+            sync_rollups(conn)
+            sync_terms(conn)
+        except sqlite3.OperationalError as e:
+            print(f"[WARN] Dashboard rollups not updated: {e}")
         conn.close()
         
-        # Update topic mastery tracking
-        topic = data.get('main_topic') or data.get('topic')
-        if topic:
-            update_topic_mastery(
-                topic=topic,
-                understanding=data.get('understanding_level'),
-                retention=data.get('retention_confidence'),
-                session_date=data.get('session_date')
-            )
-        
-        return True, f"Session ingested successfully (ID: {session_id})"
+        return True, f"Session ingested successfully (ID: {session_id})", session_id
         
     except sqlite3.IntegrityError as e:
         conn.close()
         if 'UNIQUE constraint' in str(e):
-            return True, "Session already exists (skipped duplicate)"
-        return False, f"Database error: {e}"
+            return True, "Session already exists (skipped duplicate)", None
+        return False, f"Database error: {e}", None
     except Exception as e:
         conn.close()
-        return False, f"Error: {e}"
+        return False, f"Error: {e}", None
+
+
+def insert_session(data):
+    """
+    Insert a session record into the database.
+    Returns (success, message).
+    """
+    success, message, _ = _insert_session(data)
+    return success, message
 
 def ingest_file(filepath, force=False):
     """
@@ -853,18 +793,11 @@ def ingest_file(filepath, force=False):
         print(f"       Landmarks: {data['landmarks_mastered'][:50]}...")
     
     # Insert
-    success, message = insert_session(data)
+    success, message, session_id = _insert_session(data)
     if success:
         print(f"[OK] {message}")
         # Mark file as ingested for future runs
         conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT id FROM sessions WHERE session_date = ? AND main_topic = ? ORDER BY id DESC LIMIT 1",
-            (data['session_date'], data['main_topic'])
-        )
-        result = cursor.fetchone()
-        session_id = result[0] if result else None
         mark_file_ingested(conn, filepath, checksum, session_id)
         conn.close()
     else:
@@ -872,13 +805,214 @@ def ingest_file(filepath, force=False):
     
     return success
 
+
+# -----------------------------------------------------------------------------
+# Bulk ingestion (directories / globs)
+# -----------------------------------------------------------------------------
+
+DEFAULT_BATCH_SIZE = 50
+
+
+def collect_session_files(targets) -> list:
+    """
+    Expand files, directories (their *.md files) and glob patterns into a
+    sorted list of absolute paths. TEMPLATE files are skipped.
+    """
+    import glob
+
+    found = set()
+    for target in targets:
+        if os.path.isdir(target):
+            matches = glob.glob(os.path.join(target, "*.md"))
+        elif glob.has_magic(target):
+            matches = glob.glob(target, recursive=True)
+        else:
+            matches = [target]
+        for path in matches:
+            if os.path.basename(path).upper().startswith("TEMPLATE"):
+                continue
+            found.add(os.path.abspath(path))
+    return sorted(found)
+
+
+def _prepare_file(job):
+    """
+    Checksum, parse and validate one file. Runs in a worker process, so it
+    only returns plain data. job = (filepath, known_checksum); a file whose
+    checksum matches known_checksum is not parsed at all.
+    """
+    filepath, known_checksum = job
+    result = {"filepath": filepath, "checksum": None, "data": None, "status": None, "message": ""}
+    try:
+        result["checksum"] = compute_file_checksum(filepath)
+    except OSError as e:
+        result["status"], result["message"] = "error", f"Unreadable: {e}"
+        return result
+    if result["checksum"] == known_checksum:
+        result["status"] = "unchanged"
+        return result
+    try:
+        data = parse_session_log(filepath)
+    except Exception as e:
+        result["status"], result["message"] = "error", f"Failed to parse file: {e}"
+        return result
+    data['source_path'] = filepath
+    is_valid, error = validate_session_data(data)
+    if not is_valid:
+        result["status"], result["message"] = "invalid", f"Validation failed: {error}"
+        return result
+    result["data"] = data
+    return result
+
+
+def _prepare_all(jobs, workers):
+    if workers == 1 or len(jobs) < 2:
+        return [_prepare_file(job) for job in jobs]
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_prepare_file, jobs, chunksize=chunksize))
+
+
+def ingest_paths(targets, force=False, workers=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Ingest every session log under the given files/directories/globs.
+
+    1. stat() each file and skip those whose mtime+size match ingested_files
+       (unless force)
+    2. checksum + parse + validate the rest in a process pool; files whose
+       checksum still matches are only re-stamped
+    3. write sessions in batched transactions, taking ids from lastrowid;
+       a modified file replaces the session it produced before
+
+    Returns a per-file report: [{"file", "status", "session_id", "message"}],
+    status being ingested / reingested / unchanged / duplicate / invalid / error.
+    """
+    from db_setup import get_connection
+
+    files = collect_session_files(targets)
+    conn = get_connection(DB_PATH)
+    try:
+        tracked = {
+            row[0]: row[1:]
+            for row in conn.execute(
+                "SELECT filepath, checksum, session_id, file_mtime, file_size FROM ingested_files"
+            )
+        }
+
+        report = []
+        jobs, stats = [], {}
+        for path in files:
+            try:
+                st = os.stat(path)
+            except OSError as e:
+                report.append({"file": path, "status": "error", "session_id": None, "message": str(e)})
+                continue
+            known = tracked.get(path)
+            if not force and known and known[2] == st.st_mtime and known[3] == st.st_size:
+                report.append({"file": path, "status": "unchanged", "session_id": known[1], "message": ""})
+                continue
+            stats[path] = (st.st_mtime, st.st_size)
+            jobs.append((path, known[0] if known and not force else None))
+
+        prepared = _prepare_all(jobs, workers)
+
+        for start in range(0, len(prepared), batch_size):
+            cursor = conn.cursor()
+            for item in prepared[start:start + batch_size]:
+                path, checksum = item["filepath"], item["checksum"]
+                mtime, size = stats[path]
+                old_session_id = tracked.get(path, (None, None))[1]
+                entry = {"file": path, "status": item["status"], "session_id": None, "message": item["message"]}
+                report.append(entry)
+
+                if item["status"] == "error":
+                    continue
+                if item["status"] == "unchanged":
+                    # Touched but identical: refresh the stat fingerprint only.
+                    entry["session_id"] = old_session_id
+                    mark_file_ingested(conn, path, checksum, old_session_id, mtime, size, commit=False)
+                    continue
+                if old_session_id:
+                    cursor.execute("DELETE FROM sessions WHERE id = ?", (old_session_id,))
+                if item["status"] == "invalid":
+                    mark_file_ingested(conn, path, checksum, None, mtime, size, commit=False)
+                    continue
+
+                data = item["data"]
+                try:
+                    session_id = _insert_session_row(cursor, data)
+                except sqlite3.IntegrityError as e:
+                    if 'UNIQUE constraint' not in str(e):
+                        entry["status"], entry["message"] = "error", f"Database error: {e}"
+                        continue
+                    entry["status"], session_id = "duplicate", None
+                else:
+                    entry["status"] = "reingested" if old_session_id else "ingested"
+                entry["session_id"] = session_id
+                mark_file_ingested(conn, path, checksum, session_id, mtime, size, commit=False)
+            conn.commit()
+
+        if prepared:
+            try:
+                sync_rollups(conn)
+                sync_terms(conn)
+            except sqlite3.OperationalError as e:
+                print(f"[WARN] Dashboard rollups not updated: {e}")
+        return report
+    finally:
+        conn.close()
+
+
+def print_ingest_report(report, elapsed=None):
+    """Print one line per file plus a status summary."""
+    from collections import Counter
+
+    labels = {
+        "ingested": "[OK]", "reingested": "[OK]", "unchanged": "[SKIP]",
+        "duplicate": "[SKIP]", "invalid": "[ERROR]", "error": "[ERROR]",
+    }
+    for entry in report:
+        line = f"{labels[entry['status']]} {os.path.basename(entry['file'])}: {entry['status']}"
+        if entry["session_id"] and entry["status"] in ("ingested", "reingested"):
+            line += f" (ID: {entry['session_id']})"
+        if entry["message"]:
+            line += f" - {entry['message']}"
+        print(line)
+    counts = Counter(entry["status"] for entry in report)
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+    took = f" in {elapsed:.2f}s" if elapsed is not None else ""
+    print(f"\n[INFO] {len(report)} files{took}: {summary or 'nothing to do'}")
+
+
 if __name__ == '__main__':
     import argparse
+    import time
     parser = argparse.ArgumentParser(description='Ingest session log files')
-    parser.add_argument('filepath', help='Path to the session log markdown file')
+    parser.add_argument('paths', nargs='+',
+                        help='Session log file(s), directories or glob patterns')
     parser.add_argument('--force', '-f', action='store_true', 
                         help='Force re-ingestion, bypassing checksum tracking')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Parser processes for bulk mode (default: CPU count, 1 = inline)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Sessions per transaction in bulk mode')
+    parser.add_argument('--report', metavar='PATH',
+                        help='Write the bulk per-file report as JSON')
     args = parser.parse_args()
     
-    success = ingest_file(args.filepath, force=args.force)
-    sys.exit(0 if success else 1)
+    single = args.paths[0]
+    if len(args.paths) == 1 and os.path.isfile(single) and not args.report:
+        success = ingest_file(single, force=args.force)
+        sys.exit(0 if success else 1)
+
+    t0 = time.perf_counter()
+    report = ingest_paths(args.paths, force=args.force, workers=args.workers,
+                          batch_size=args.batch_size)
+    print_ingest_report(report, time.perf_counter() - t0)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    sys.exit(0 if all(e["status"] not in ("invalid", "error") for e in report) else 1)
@@ -0,0 +1,32 @@
+"""
+Helpers for keeping slow or optional dependencies out of dashboard startup.
+
+The dashboard imports every blueprint module at startup, so anything those
+modules import at top level is paid before the first request. Modules that
+only need a dependency inside a few handlers import it inside those
+functions, which is what most of the code base does already, and check
+availability up front without importing it:
+
+    REQUESTS_AVAILABLE = module_available("requests")
+
+    def call_api(...):
+        import requests
+"""
+
+import importlib.util
+import sys
+
+
+def module_available(name: str) -> bool:
+    """True if `name` can be imported; does not run the module."""
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def is_loaded(name: str) -> bool:
+    """True once `name` has been imported in this process."""
+    return name in sys.modules
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for deterministic LLM pipeline calls.
+
+Several pipeline prompts are pure functions of their input: WRAP section
+extraction and issue classification, Obsidian concept linking and semantic
+merge, chain-runner steps, Scholar question answering. Re-ingesting the same
+WRAP or re-running a chain on the same topic used to pay for every one of
+them again.
+
+A cached response is keyed on sha256(provider, model, system prompt, user
+prompt, temperature) and stored in llm_response_cache (created in
+db_setup.init_database). Caching is opt-in per call site: callers pass a
+site name (call_llm(..., cache="wrap_classify")) and POLICIES gives that
+site's TTL. Unknown sites and a TTL of 0 bypass the cache; LLM_CACHE=0
+turns it off entirely. Only successful responses are stored.
+
+The table is bounded to LLM_CACHE_MAX_BYTES (default 16 MB) of response
+text: after each write, expired rows are dropped and then the least recently
+used rows beyond the budget. Hit/miss counters per site are kept in-process
+and reported by stats() (exposed on /brain/llm-status).
+
+Usage:
+    python llm_cache.py stats
+    python llm_cache.py clear [--site wrap_classify]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+DAY = 24 * 60 * 60
+
+# Call site -> TTL in seconds (0 disables caching for that site).
+POLICIES: Dict[str, int] = {
+    "wrap_sections": 30 * DAY,
+    "wrap_classify": 30 * DAY,
+    "concept_links": 7 * DAY,
+    "semantic_merge": 7 * DAY,
+    "chain_step": 1 * DAY,
+    "scholar_answer": 7 * DAY,
+}
+
+MAX_BYTES = int(os.environ.get("LLM_CACHE_MAX_BYTES", str(16 * 1024 * 1024)) or 0)
+ENABLED = os.environ.get("LLM_CACHE", "1") != "0"
+
+_lock = threading.Lock()
+_counters: Dict[str, Dict[str, int]] = {}
+
+
+def cache_key(provider: str, model: str, system_prompt: str, user_prompt: str,
+              temperature: float) -> str:
+    payload = json.dumps(
+        [provider, model, system_prompt, user_prompt, round(float(temperature), 4)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def policy_ttl(site: Optional[str]) -> int:
+    """TTL for a call site; 0 when the site is unknown or caching is off."""
+    if not ENABLED or not site:
+        return 0
+    return POLICIES.get(site, 0)
+
+
+def _count(site: str, name: str) -> None:
+    with _lock:
+        counters = _counters.setdefault(site, {"hits": 0, "misses": 0, "stores": 0, "errors": 0})
+        counters[name] += 1
+
+
+def _connect(db_path: Optional[str] = None):
+    from db_setup import DB_PATH, get_connection
+
+    return get_connection(db_path or DB_PATH)
+
+
+def lookup(site: str, key: str, db_path: Optional[str] = None) -> Optional[str]:
+    """Cached content for key, or None. Counts a hit or miss for site."""
+    try:
+        conn = _connect(db_path)
+        try:
+            now = time.time()
+            row = conn.execute(
+                "SELECT content FROM llm_response_cache WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE llm_response_cache SET accessed_at = ?, hits = hits + 1 WHERE key = ?",
+                    (now, key),
+                )
+                conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"[WARN] LLM cache lookup failed: {e}")
+        _count(site, "errors")
+        return None
+    _count(site, "hits" if row is not None else "misses")
+    return row[0] if row is not None else None
+
+
+def store(site: str, key: str, content: str, provider: str, model: str,
+          ttl_seconds: Optional[int] = None, db_path: Optional[str] = None) -> None:
+    """Insert or refresh a response, then trim the table to MAX_BYTES."""
+    ttl = policy_ttl(site) if ttl_seconds is None else ttl_seconds
+    if ttl <= 0 or content is None:
+        return
+    now = time.time()
+    try:
+        conn = _connect(db_path)
+        try:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_response_cache
+                    (key, site, provider, model, content, size_bytes,
+                     created_at, accessed_at, expires_at, hits)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+                """,
+                (key, site, provider, model, content, len(content.encode("utf-8")),
+                 now, now, now + ttl),
+            )
+            _evict(conn, now)
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"[WARN] LLM cache store failed: {e}")
+        _count(site, "errors")
+        return
+    _count(site, "stores")
+
+
+def _evict(conn: sqlite3.Connection, now: float) -> None:
+    conn.execute("DELETE FROM llm_response_cache WHERE expires_at <= ?", (now,))
+    if MAX_BYTES <= 0:
+        return
+    # Keep the most recently used rows whose running size fits the budget.
+    conn.execute(
+        """
+        DELETE FROM llm_response_cache WHERE key IN (
+            SELECT key FROM (
+                SELECT key, SUM(size_bytes) OVER (ORDER BY accessed_at DESC, key) AS running
+                FROM llm_response_cache
+            ) WHERE running > ?
+        )
+        """,
+        (MAX_BYTES,),
+    )
+
+
+def clear(site: Optional[str] = None, db_path: Optional[str] = None) -> int:
+    conn = _connect(db_path)
+    try:
+        if site:
+            cur = conn.execute("DELETE FROM llm_response_cache WHERE site = ?", (site,))
+        else:
+            cur = conn.execute("DELETE FROM llm_response_cache")
+        conn.commit()
+        return cur.rowcount
+    finally:
+        conn.close()
+
+
+def stats(db_path: Optional[str] = None) -> dict:
+    """Per-site hit rates (this process) plus stored entries and bytes."""
+    with _lock:
+        counters = {site: dict(c) for site, c in _counters.items()}
+    stored: Dict[str, dict] = {}
+    try:
+        conn = _connect(db_path)
+        try:
+            for site, entries, size, hits in conn.execute(
+                "SELECT site, COUNT(*), COALESCE(SUM(size_bytes), 0), COALESCE(SUM(hits), 0) "
+                "FROM llm_response_cache WHERE expires_at > ? GROUP BY site",
+                (time.time(),),
+            ):
+                stored[site] = {"entries": entries, "bytes": size, "lifetime_hits": hits}
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass
+
+    sites = {}
+    for site in sorted(set(POLICIES) | set(counters) | set(stored)):
+        c = counters.get(site, {"hits": 0, "misses": 0, "stores": 0, "errors": 0})
+        lookups = c["hits"] + c["misses"]
+        sites[site] = {
+            "ttl_seconds": POLICIES.get(site, 0),
+            **c,
+            "hit_rate": round(c["hits"] / lookups, 4) if lookups else 0.0,
+            **stored.get(site, {"entries": 0, "bytes": 0, "lifetime_hits": 0}),
+        }
+    hits = sum(s["hits"] for s in sites.values())
+    lookups = hits + sum(s["misses"] for s in sites.values())
+    return {
+        "enabled": ENABLED,
+        "max_bytes": MAX_BYTES,
+        "entries": sum(s["entries"] for s in sites.values()),
+        "bytes": sum(s["bytes"] for s in sites.values()),
+        "hits": hits,
+        "misses": lookups - hits,
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        "sites": sites,
+    }
+
+
+def reset_counters() -> None:
+    with _lock:
+        _counters.clear()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="LLM response cache maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Show stored entries per call site")
+    clear_parser = sub.add_parser("clear", help="Delete cached responses")
+    clear_parser.add_argument("--site", help="Only this call site")
+    args = parser.parse_args(argv)
+
+    if args.command == "clear":
+        print(f"[OK] {clear(args.site)} cached response(s) deleted")
+        return 0
+    print(json.dumps(stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
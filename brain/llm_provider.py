@@ -3,10 +3,6 @@ import sys
 import json
 import time
 import subprocess
-import tempfile
-import shutil
-import http.client
-import ssl
 import uuid as _uuid
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Union
@@ -15,6 +11,9 @@ from typing import Dict, Any, Optional, List, Union
 from config import load_env
 load_env()
 
+import http_pool
+from codex_pool import OUTPUT, WORK_DIR, get_codex_pool
+
 # Configuration
 DEFAULT_TIMEOUT_SECONDS = 60
 OPENAI_API_TIMEOUT = 30
@@ -41,23 +40,38 @@ def find_codex_cli() -> Optional[str]:
     return None
 
 
+def _codex_prefix(codex_cmd: str) -> List[str]:
+    # Windows: if `codex_cmd` is a .cmd/.bat shim, execute via cmd.exe explicitly.
+    if os.name == "nt" and Path(codex_cmd).suffix.lower() in (".cmd", ".bat"):
+        return ["cmd.exe", "/c", codex_cmd]
+    return [codex_cmd]
+
+
 # OpenRouter API key (from env or .env)
 OPENROUTER_API_KEY = os.environ.get("OPENROUTER_API_KEY", "")
 
+OPENROUTER_CHAT_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
+
+def _post_json(url: str, payload: dict, headers: dict, timeout: float) -> tuple:
+    """POST a JSON body over the shared keep-alive pool; returns (status, body text)."""
+    body = json.dumps(payload).encode("utf-8")
+    with http_pool.request("POST", url, body=body, headers=headers, timeout=timeout) as resp:
+        return resp.status, resp.read().decode("utf-8", errors="replace")
+
 
 def _call_openrouter_api(
     system_prompt: str,
     user_prompt: str,
     model: str = "google/gemini-2.0-flash-001",
     timeout: int = OPENAI_API_TIMEOUT,
+    temperature: float = 0.7,
 ) -> Dict[str, Any]:
     """
     Call OpenRouter API directly.
     Uses hardcoded OPENROUTER_API_KEY or falls back to environment variable.
     """
-    import urllib.request
-    import urllib.error
-
     api_key = OPENROUTER_API_KEY or os.environ.get("OPENROUTER_API_KEY")
     if not api_key:
         return {
@@ -67,7 +81,6 @@ def _call_openrouter_api(
             "fallback_available": False,
         }
 
-    url = "https://openrouter.ai/api/v1/chat/completions"
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {api_key}",
@@ -81,31 +94,27 @@ def _call_openrouter_api(
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt},
         ],
-        "temperature": 0.7,
+        "temperature": temperature,
         "max_tokens": 4000,
     }
 
     try:
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(url, data=data, headers=headers, method="POST")
-
-        with urllib.request.urlopen(req, timeout=timeout) as response:
-            result = json.loads(response.read().decode("utf-8"))
-            content = result["choices"][0]["message"]["content"]
-            return {"success": True, "content": content, "error": None}
+        status, text = _post_json(OPENROUTER_CHAT_URL, payload, headers, timeout)
+        if status != 200:
+            return {
+                "success": False,
+                "error": f"OpenRouter API error ({status}): {text}",
+                "content": None,
+                "fallback_available": False,
+            }
+        result = json.loads(text)
+        content = result["choices"][0]["message"]["content"]
+        return {"success": True, "content": content, "error": None}
 
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode("utf-8") if e.fp else str(e)
-        return {
-            "success": False,
-            "error": f"OpenRouter API error ({e.code}): {error_body}",
-            "content": None,
-            "fallback_available": False,
-        }
-    except urllib.error.URLError as e:
+    except OSError as e:
         return {
             "success": False,
-            "error": f"Network error: {e.reason}",
+            "error": f"Network error: {e}",
             "content": None,
             "fallback_available": False,
         }
@@ -126,14 +135,10 @@ def _call_openrouter_chat(
     """
     Call OpenRouter with a full messages array (supports vision/image_url content).
     """
-    import urllib.request
-    import urllib.error
-
     api_key = OPENROUTER_API_KEY or os.environ.get("OPENROUTER_API_KEY")
     if not api_key:
         return {"success": False, "error": "OPENROUTER_API_KEY not set.", "content": None}
 
-    url = "https://openrouter.ai/api/v1/chat/completions"
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {api_key}",
@@ -148,15 +153,12 @@ def _call_openrouter_chat(
     }
 
     try:
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(url, data=data, headers=headers, method="POST")
-        with urllib.request.urlopen(req, timeout=timeout) as response:
-            result = json.loads(response.read().decode("utf-8"))
-            content = result["choices"][0]["message"]["content"]
-            return {"success": True, "content": content, "error": None}
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode("utf-8") if e.fp else str(e)
-        return {"success": False, "error": f"OpenRouter API error ({e.code}): {error_body}", "content": None}
+        status, text = _post_json(OPENROUTER_CHAT_URL, payload, headers, timeout)
+        if status != 200:
+            return {"success": False, "error": f"OpenRouter API error ({status}): {text}", "content": None}
+        result = json.loads(text)
+        content = result["choices"][0]["message"]["content"]
+        return {"success": True, "content": content, "error": None}
     except Exception as e:
         return {"success": False, "error": f"Exception calling OpenRouter chat: {str(e)}", "content": None}
 
@@ -166,14 +168,12 @@ def _call_openai_api(
     user_prompt: str,
     model: str = "gpt-4o-mini",
     timeout: int = OPENAI_API_TIMEOUT,
+    temperature: float = 0.7,
 ) -> Dict[str, Any]:
     """
-    Call OpenAI API directly using requests (no SDK dependency).
+    Call OpenAI API directly over the keep-alive pool (no SDK dependency).
     Requires OPENAI_API_KEY environment variable.
     """
-    import urllib.request
-    import urllib.error
-
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
         return {
@@ -184,7 +184,6 @@ def _call_openai_api(
             "fallback_models": ["codex"],
         }
 
-    url = "https://api.openai.com/v1/chat/completions"
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {api_key}",
@@ -196,32 +195,28 @@ def _call_openai_api(
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt},
         ],
-        "temperature": 0.7,
+        "temperature": temperature,
         "max_tokens": 1000,
     }
 
     try:
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(url, data=data, headers=headers, method="POST")
-
-        with urllib.request.urlopen(req, timeout=timeout) as response:
-            result = json.loads(response.read().decode("utf-8"))
-            content = result["choices"][0]["message"]["content"]
-            return {"success": True, "content": content, "error": None}
+        status, text = _post_json(OPENAI_CHAT_URL, payload, headers, timeout)
+        if status != 200:
+            return {
+                "success": False,
+                "error": f"OpenAI API error ({status}): {text}",
+                "content": None,
+                "fallback_available": True,
+                "fallback_models": ["codex"],
+            }
+        result = json.loads(text)
+        content = result["choices"][0]["message"]["content"]
+        return {"success": True, "content": content, "error": None}
 
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode("utf-8") if e.fp else str(e)
+    except OSError as e:
         return {
             "success": False,
-            "error": f"OpenAI API error ({e.code}): {error_body}",
-            "content": None,
-            "fallback_available": True,
-            "fallback_models": ["codex"],
-        }
-    except urllib.error.URLError as e:
-        return {
-            "success": False,
-            "error": f"Network error: {e.reason}",
+            "error": f"Network error: {e}",
             "content": None,
             "fallback_available": True,
             "fallback_models": ["codex"],
@@ -243,6 +238,8 @@ def call_llm(
     model: str = "default",
     timeout: int = DEFAULT_TIMEOUT_SECONDS,
     isolated: bool = False,
+    temperature: float = 0.7,
+    cache: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Centralized LLM Caller.
@@ -255,6 +252,10 @@ def call_llm(
     Args:
         isolated: If True and using codex, run in empty temp directory.
                   If True and provider not specified, prefer openrouter for speed.
+        temperature: Sampling temperature for the API providers (Codex ignores it).
+        cache: Call-site name for the response cache (see llm_cache.POLICIES).
+               Only deterministic pipeline calls should pass one; a repeat of the
+               same provider/model/prompts/temperature is then served from SQLite.
 
     Returns a dictionary:
     {
@@ -262,7 +263,8 @@ def call_llm(
         "content": str (if success),
         "error": str (if failed),
         "fallback_available": bool,
-        "fallback_models": List[str]
+        "fallback_models": List[str],
+        "cached": True (only when served from the cache)
     }
     """
 
@@ -273,14 +275,49 @@ def call_llm(
 
     if provider == "openrouter":
         actual_model = "google/gemini-2.0-flash-001" if model == "default" else model
+    elif provider == "openai":
+        actual_model = "gpt-4o-mini" if model == "default" else model
+    else:
+        actual_model = model
+
+    ttl = 0
+    if cache:
+        import llm_cache
+
+        ttl = llm_cache.policy_ttl(cache)
+    if ttl:
+        key = llm_cache.cache_key(provider, actual_model, system_prompt, user_prompt, temperature)
+        content = llm_cache.lookup(cache, key)
+        if content is not None:
+            return {"success": True, "content": content, "error": None, "cached": True}
+
+    result = _dispatch_llm(
+        system_prompt, user_prompt, provider, actual_model, timeout, isolated, temperature
+    )
+    if ttl and result.get("success"):
+        llm_cache.store(cache, key, result["content"], provider, actual_model, ttl)
+    return result
+
+
+def _dispatch_llm(
+    system_prompt: str,
+    user_prompt: str,
+    provider: str,
+    actual_model: str,
+    timeout: int,
+    isolated: bool,
+    temperature: float,
+) -> Dict[str, Any]:
+    if provider == "openrouter":
         return _call_openrouter_api(
-            system_prompt, user_prompt, model=actual_model, timeout=timeout
+            system_prompt, user_prompt, model=actual_model, timeout=timeout,
+            temperature=temperature,
         )
 
     if provider == "openai":
-        actual_model = "gpt-4o-mini" if model == "default" else model
         return _call_openai_api(
-            system_prompt, user_prompt, model=actual_model, timeout=timeout
+            system_prompt, user_prompt, model=actual_model, timeout=timeout,
+            temperature=temperature,
         )
 
     if provider == "codex":
@@ -308,118 +345,49 @@ def _call_codex(
             "fallback_models": ["gpt-4o-mini", "gpt-4.1-mini", "openrouter/auto"],
         }
 
-    # If isolated, run in empty temp directory (no file access)
+    # If isolated, run in the worker's empty scratch directory (no file access)
     # Otherwise, run in repo root for full context
-    if isolated:
-        work_dir = tempfile.mkdtemp(prefix="codex_isolated_")
-    else:
-        work_dir = str(Path(__file__).parent.parent.resolve())
+    work_dir = WORK_DIR if isolated else str(Path(__file__).parent.parent.resolve())
 
     full_prompt = f"""System: {system_prompt}
 
 Human: {user_prompt}
 """
+    fallback = {
+        "content": None,
+        "fallback_available": True,
+        "fallback_models": ["gpt-4o-mini", "gpt-4.1-mini", "openrouter/auto"],
+    }
 
-    try:
-        # Create temp file for output
-        fd, output_path = tempfile.mkstemp(suffix=".md", prefix="codex_resp_")
-        os.close(fd)
-        output_file = Path(output_path)
-
-        # Build command args
-        cmd_prefix: list[str]
-        if os.name == "nt" and Path(codex_cmd).suffix.lower() in (".cmd", ".bat"):
-            cmd_prefix = ["cmd.exe", "/c", codex_cmd]
-        else:
-            cmd_prefix = [codex_cmd]
-
-        cmd_args = cmd_prefix + [
-            "exec",
-            "--cd",
-            work_dir,
-            "--dangerously-bypass-approvals-and-sandbox",
-            "--output-last-message",
-            str(output_file),
-        ]
-
-        # Add skip-git-repo-check for isolated mode (temp directories are not git repos)
-        if isolated:
-            cmd_args.append("--skip-git-repo-check")
-
-        cmd_args.append("-")  # stdin
-
-        # Write prompt to temp file to avoid Windows cmd.exe encoding issues
-        prompt_file = tempfile.NamedTemporaryFile(
-            mode="w", suffix=".txt", encoding="utf-8", delete=False
-        )
-        prompt_file.write(full_prompt)
-        prompt_file.close()
-        prompt_stdin = open(prompt_file.name, "rb")
-
-        process = subprocess.Popen(
-            cmd_args,
-            stdin=prompt_stdin,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-
-        try:
-            stdout_bytes, stderr_bytes = process.communicate(timeout=timeout)
-            stdout = stdout_bytes.decode("utf-8", errors="replace")
-            stderr = stderr_bytes.decode("utf-8", errors="replace")
-        finally:
-            prompt_stdin.close()
-            try:
-                os.remove(prompt_file.name)
-            except OSError:
-                pass
-
-        try:
-            stdout, stderr = stdout, stderr  # already decoded above
-        except subprocess.TimeoutExpired:
-            process.kill()
-            return {
-                "success": False,
-                "error": f"Codex timed out after {timeout} seconds.",
-                "content": None,
-                "fallback_available": True,
-                "fallback_models": ["gpt-4o-mini", "gpt-4.1-mini", "openrouter/auto"],
-            }
+    cmd_args = _codex_prefix(codex_cmd) + [
+        "exec",
+        "--cd",
+        work_dir,
+        "--dangerously-bypass-approvals-and-sandbox",
+        "--output-last-message",
+        OUTPUT,
+    ]
 
-        if process.returncode != 0:
-            return {
-                "success": False,
-                "error": f"Codex process failed: {stderr}",
-                "content": None,
-                "fallback_available": True,
-                "fallback_models": ["gpt-4o-mini", "gpt-4.1-mini", "openrouter/auto"],
-            }
+    # Add skip-git-repo-check for isolated mode (temp directories are not git repos)
+    if isolated:
+        cmd_args.append("--skip-git-repo-check")
 
-        # Read output
-        if output_file.exists():
-            content = output_file.read_text(encoding="utf-8")
-            try:
-                os.remove(output_path)
-            except:
-                pass
-            return {"success": True, "content": content, "error": None}
-        else:
-            return {
-                "success": False,
-                "error": "No output file created by Codex.",
-                "content": None,
-                "fallback_available": True,
-                "fallback_models": ["gpt-4o-mini", "gpt-4.1-mini", "openrouter/auto"],
-            }
+    cmd_args.append("-")  # stdin
 
+    try:
+        result = get_codex_pool().run(cmd_args, full_prompt, timeout=timeout, isolated=isolated)
     except Exception as e:
-        return {
-            "success": False,
-            "error": f"Exception calling Codex: {str(e)}",
-            "content": None,
-            "fallback_available": True,
-            "fallback_models": ["gpt-4o-mini", "gpt-4.1-mini", "openrouter/auto"],
-        }
+        return {"success": False, "error": f"Exception calling Codex: {str(e)}", **fallback}
+
+    if result["timed_out"]:
+        return {"success": False, "error": f"Codex timed out after {timeout} seconds.", **fallback}
+    if result["returncode"] is None:
+        return {"success": False, "error": f"Exception calling Codex: {result['error']}", **fallback}
+    if result["returncode"] != 0:
+        return {"success": False, "error": f"Codex process failed: {result['stderr']}", **fallback}
+    if result["output"] is None:
+        return {"success": False, "error": "No output file created by Codex.", **fallback}
+    return {"success": True, "content": result["output"], "error": None}
 
 
 def _codex_exec_json(
@@ -449,20 +417,11 @@ def _codex_exec_json(
             "content": None,
         }
 
-    # If isolated, run in an empty temp directory (avoid repo file reads by default).
-    # Otherwise, run in repo root for full context.
-    work_dir = tempfile.mkdtemp(prefix="codex_isolated_") if isolated else str(
-        Path(__file__).parent.parent.resolve()
-    )
-
-    # Windows: if `codex_cmd` is a .cmd/.bat shim, execute via cmd.exe explicitly.
-    cmd_prefix: list[str]
-    if os.name == "nt" and Path(codex_cmd).suffix.lower() in (".cmd", ".bat"):
-        cmd_prefix = ["cmd.exe", "/c", codex_cmd]
-    else:
-        cmd_prefix = [codex_cmd]
+    # If isolated, run in the worker's empty scratch directory (avoid repo file reads
+    # by default). Otherwise, run in repo root for full context.
+    work_dir = WORK_DIR if isolated else str(Path(__file__).parent.parent.resolve())
 
-    cmd_args: list[str] = [
+    cmd_args: list[str] = _codex_prefix(codex_cmd) + [
         "-a",
         "untrusted",
         "exec",
@@ -474,8 +433,6 @@ def _codex_exec_json(
         work_dir,
     ]
 
-    cmd_args = cmd_prefix + cmd_args
-
     if isolated:
         cmd_args.append("--skip-git-repo-check")
 
@@ -484,38 +441,22 @@ def _codex_exec_json(
 
     cmd_args.append("-")  # stdin prompt
 
-    # Write prompt to temp file to avoid Windows cmd.exe encoding issues
-    prompt_file = tempfile.NamedTemporaryFile(
-        mode="w", suffix=".txt", encoding="utf-8", delete=False
-    )
-    prompt_file.write(prompt)
-    prompt_file.close()
-
     try:
-        with open(prompt_file.name, "rb") as prompt_stdin:
-            result = subprocess.run(
-                cmd_args,
-                stdin=prompt_stdin,
-                capture_output=True,
-                timeout=timeout,
-            )
-        stdout_text = result.stdout.decode("utf-8", errors="replace") if result.stdout else ""
-        stderr_text = result.stderr.decode("utf-8", errors="replace") if result.stderr else ""
-    except subprocess.TimeoutExpired:
+        result = get_codex_pool().run(cmd_args, prompt, timeout=timeout, isolated=isolated)
+    except Exception as e:
+        return {"success": False, "error": f"Codex error: {e}", "content": None}
+    if result["timed_out"]:
         return {
             "success": False,
             "error": f"Codex timed out after {timeout} seconds.",
             "content": None,
         }
-    finally:
-        if isolated:
-            shutil.rmtree(work_dir, ignore_errors=True)
-        try:
-            os.remove(prompt_file.name)
-        except OSError:
-            pass
+    if result["returncode"] is None:
+        return {"success": False, "error": f"Codex error: {result['error']}", "content": None}
+    stdout_text = result["stdout"]
+    stderr_text = result["stderr"]
 
-    if result.returncode != 0:
+    if result["returncode"] != 0:
         err = stderr_text.strip() or stdout_text.strip()
         return {
             "success": False,
@@ -586,9 +527,11 @@ User: {user_prompt}
 # ---------------------------------------------------------------------------
 
 _CHATGPT_BASE = "chatgpt.com"
+_CHATGPT_RESPONSES_URL = f"https://{_CHATGPT_BASE}/backend-api/codex/responses"
 _CODEX_CLIENT_ID = "app_EMoamEEZ73f0CkXaXp7hrann"
 _TOKEN_URL_HOST = "auth.openai.com"
 _TOKEN_URL_PATH = "/oauth/token"
+_TOKEN_URL = f"https://{_TOKEN_URL_HOST}{_TOKEN_URL_PATH}"
 _AUTH_CACHE: Dict[str, Any] = {}
 
 
@@ -664,14 +607,12 @@ def _refresh_codex_token(refresh_token: str) -> Optional[Dict[str, str]]:
             "refresh_token": refresh_token,
             "client_id": _CODEX_CLIENT_ID,
         })
-        ctx = ssl.create_default_context()
-        conn = http.client.HTTPSConnection(_TOKEN_URL_HOST, context=ctx, timeout=10)
-        conn.request("POST", _TOKEN_URL_PATH, body=body, headers={
+        with http_pool.request("POST", _TOKEN_URL, body=body, headers={
             "Content-Type": "application/json",
-        })
-        resp = conn.getresponse()
-        if resp.status == 200:
-            data = json.loads(resp.read().decode("utf-8"))
+        }, timeout=10) as resp:
+            status, text = resp.status, resp.read().decode("utf-8")
+        if status == 200:
+            data = json.loads(text)
             new_token = data.get("access_token")
             if new_token:
                 _AUTH_CACHE["access_token"] = new_token
@@ -685,7 +626,6 @@ def _refresh_codex_token(refresh_token: str) -> Optional[Dict[str, str]]:
                 except Exception:
                     pass
                 return {"access_token": new_token, "account_id": _AUTH_CACHE.get("account_id", "")}
-        conn.close()
     except Exception:
         pass
     return None
@@ -751,41 +691,34 @@ def call_chatgpt_responses(
         headers["chatgpt-account-id"] = auth["account_id"]
 
     try:
-        ctx = ssl.create_default_context()
-        conn = http.client.HTTPSConnection(_CHATGPT_BASE, context=ctx, timeout=timeout)
-        conn.request("POST", "/backend-api/codex/responses", body=body, headers=headers)
-        resp = conn.getresponse()
-
-        if resp.status != 200:
-            err_body = resp.read().decode("utf-8", errors="replace")[:500]
-            return {"success": False, "error": f"ChatGPT API {resp.status}: {err_body}", "content": None}
-
-        full_text = ""
-        usage = None
-
-        while True:
-            line = resp.readline()
-            if not line:
-                break
-            line = line.decode("utf-8", errors="replace").strip()
-            if not line.startswith("data: "):
-                continue
-            data_str = line[6:]
-            if data_str == "[DONE]":
-                break
-            try:
-                evt = json.loads(data_str)
-            except json.JSONDecodeError:
-                continue
-
-            evt_type = evt.get("type", "")
-            if evt_type == "response.output_text.delta":
-                full_text += evt.get("delta", "")
-            elif evt_type == "response.completed":
-                r = evt.get("response", {})
-                usage = r.get("usage")
-
-        conn.close()
+        with http_pool.request(
+            "POST", _CHATGPT_RESPONSES_URL, body=body, headers=headers, timeout=timeout
+        ) as resp:
+            if resp.status != 200:
+                err_body = resp.read().decode("utf-8", errors="replace")[:500]
+                return {"success": False, "error": f"ChatGPT API {resp.status}: {err_body}", "content": None}
+
+            full_text = ""
+            usage = None
+
+            for line in resp:
+                line = line.decode("utf-8", errors="replace").strip()
+                if not line.startswith("data: "):
+                    continue
+                data_str = line[6:]
+                if data_str == "[DONE]":
+                    break
+                try:
+                    evt = json.loads(data_str)
+                except json.JSONDecodeError:
+                    continue
+
+                evt_type = evt.get("type", "")
+                if evt_type == "response.output_text.delta":
+                    full_text += evt.get("delta", "")
+                elif evt_type == "response.completed":
+                    r = evt.get("response", {})
+                    usage = r.get("usage")
 
         if not full_text.strip():
             return {"success": False, "error": "ChatGPT API returned empty response", "content": None, "usage": usage}
@@ -841,53 +774,49 @@ def stream_chatgpt_responses(
         headers["chatgpt-account-id"] = auth["account_id"]
 
     try:
-        ctx = ssl.create_default_context()
-        conn = http.client.HTTPSConnection(_CHATGPT_BASE, context=ctx, timeout=timeout)
-        conn.request("POST", "/backend-api/codex/responses", body=body, headers=headers)
-        resp = conn.getresponse()
-
-        if resp.status != 200:
-            err_body = resp.read().decode("utf-8", errors="replace")[:500]
-            yield {"type": "error", "error": f"ChatGPT API {resp.status}: {err_body}"}
-            return
-
-        usage = None
-
-        while True:
-            line = resp.readline()
-            if not line:
-                break
-            line = line.decode("utf-8", errors="replace").strip()
-            if not line.startswith("data: "):
-                continue
-            data_str = line[6:]
-            if data_str == "[DONE]":
-                break
-            try:
-                evt = json.loads(data_str)
-            except json.JSONDecodeError:
-                continue
-
-            evt_type = evt.get("type", "")
-            if evt_type == "response.output_text.delta":
-                delta = evt.get("delta", "")
-                if delta:
-                    yield {"type": "delta", "text": delta}
-            elif evt_type in (
-                "response.web_search_call.in_progress",
-                "response.web_search_call.searching",
-            ):
-                yield {"type": "web_search", "status": "searching"}
-            elif evt_type == "response.web_search_call.completed":
-                yield {"type": "web_search", "status": "completed"}
-            elif evt_type == "response.completed":
-                r = evt.get("response", {})
-                usage = r.get("usage")
-                model_id = r.get("model")
-                # Extract URL citations from output annotations
-                url_citations = _extract_url_citations(r)
-
-        conn.close()
+        with http_pool.request(
+            "POST", _CHATGPT_RESPONSES_URL, body=body, headers=headers, timeout=timeout
+        ) as resp:
+            if resp.status != 200:
+                err_body = resp.read().decode("utf-8", errors="replace")[:500]
+                yield {"type": "error", "error": f"ChatGPT API {resp.status}: {err_body}"}
+                return
+
+            usage = None
+            model_id = None
+            url_citations: list[dict] = []
+
+            for line in resp:
+                line = line.decode("utf-8", errors="replace").strip()
+                if not line.startswith("data: "):
+                    continue
+                data_str = line[6:]
+                if data_str == "[DONE]":
+                    break
+                try:
+                    evt = json.loads(data_str)
+                except json.JSONDecodeError:
+                    continue
+
+                evt_type = evt.get("type", "")
+                if evt_type == "response.output_text.delta":
+                    delta = evt.get("delta", "")
+                    if delta:
+                        yield {"type": "delta", "text": delta}
+                elif evt_type in (
+                    "response.web_search_call.in_progress",
+                    "response.web_search_call.searching",
+                ):
+                    yield {"type": "web_search", "status": "searching"}
+                elif evt_type == "response.web_search_call.completed":
+                    yield {"type": "web_search", "status": "completed"}
+                elif evt_type == "response.completed":
+                    r = evt.get("response", {})
+                    usage = r.get("usage")
+                    model_id = r.get("model")
+                    # Extract URL citations from output annotations
+                    url_citations = _extract_url_citations(r)
+
         done_payload: dict = {"type": "done", "usage": usage, "model": model_id}
         if url_citations:
             done_payload["url_citations"] = url_citations
@@ -1,5 +1,6 @@
 import json
 import re
+from pathlib import Path
 from typing import Dict, Optional
 
 import requests
@@ -9,6 +10,7 @@ from llm_provider import call_llm
 OBSIDIAN_API_URL = "https://127.0.0.1:27124"
 MANAGED_START = "<!-- BRAIN_MANAGED_START -->"
 MANAGED_END = "<!-- BRAIN_MANAGED_END -->"
+PATCH_DIR = Path(__file__).parent / "data" / "obsidian_patches"
 
 
 def read_existing_note(path: str) -> str:
@@ -93,6 +95,7 @@ def add_concept_links(content: str, course: Optional[str] = None, vault_index: O
         provider="openrouter",
         model="google/gemini-2.5-flash-lite",
         timeout=30,
+        cache="concept_links",
     )
     if not result.get("success"):
         return content
@@ -193,6 +196,7 @@ def _semantic_merge(existing_body: str, new_body: str) -> str:
         provider="openrouter",
         model="google/gemini-2.5-flash-lite",
         timeout=45,
+        cache="semantic_merge",
     )
     if not result.get("success"):
         return _deterministic_merge(existing_body, new_body)
@@ -246,7 +250,6 @@ def generate_obsidian_patch(session_id: str, note_path: str, new_content: str, e
     """
     import os
     from datetime import datetime
-    from pathlib import Path
     
     existing = existing_content if existing_content is not None else read_existing_note(note_path)
     if existing and diff_content(existing, new_content).get("is_duplicate"):
@@ -258,7 +261,7 @@ def generate_obsidian_patch(session_id: str, note_path: str, new_content: str, e
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     patch_filename = f"{session_id}_{timestamp}.diff"
-    patch_dir = Path(__file__).parent / "data" / "obsidian_patches"
+    patch_dir = PATCH_DIR
     patch_dir.mkdir(parents=True, exist_ok=True)
     patch_path = patch_dir / patch_filename
     
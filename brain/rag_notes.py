@@ -8,8 +8,8 @@ Responsibilities (RAG MVP for notes):
 - Provide a simple search API that returns matching notes with short snippets.
 
 This module deliberately stays dependency-light (sqlite3 + stdlib only).
-Embeddings/vector search can be layered on later; for now we use basic
-full-text search over the `content` column and keep the schema stable.
+Embeddings/vector search live in tutor_rag.py; here we use SQLite FTS5
+(`rag_docs_fts`, BM25-ranked) over content, topic tags and source path.
 """
 
 from __future__ import annotations
@@ -24,7 +24,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Iterable, List, Optional
 
-from db_setup import DB_PATH, init_database
+from db_setup import DB_PATH, get_connection
 
 
 @dataclass
@@ -48,9 +48,8 @@ class RagNote:
 
 
 def _connect() -> sqlite3.Connection:
-    """Ensure DB and rag_docs table exist, then return a connection."""
-    init_database()
-    conn = sqlite3.connect(DB_PATH)
+    """Pooled connection; the schema is created once per process."""
+    conn = get_connection(DB_PATH)
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -122,6 +121,7 @@ def _upsert_rag_doc(
             ),
         )
         conn.commit()
+        refresh_rag_chunks(conn)
         conn.close()
         return existing_id
 
@@ -158,6 +158,7 @@ def _upsert_rag_doc(
     )
     doc_id = cur.lastrowid
     conn.commit()
+    refresh_rag_chunks(conn)
     conn.close()
     return doc_id
 
@@ -286,6 +287,7 @@ def _ingest_document(
             ),
         )
         conn.commit()
+        refresh_rag_chunks(conn)
         conn.close()
         return existing_id
 
@@ -317,6 +319,7 @@ def _ingest_document(
     )
     note_id = cur.lastrowid
     conn.commit()
+    refresh_rag_chunks(conn)
     conn.close()
     return note_id
 
@@ -708,76 +711,360 @@ def index_repo_to_rag(repo_root: str) -> dict:
     }
 
 
+# Stop words dropped from free-text tutor queries before keyword matching.
+STOP_WORDS = frozenset(
+    {"the", "a", "an", "is", "are", "was", "were", "in", "on", "at", "to", "for", "of", "and", "or", "it"}
+)
+
+# BM25 column weights for rag_docs_fts(content, topic_tags, source_path).
+_FTS_WEIGHTS = (1.0, 2.0, 0.5)
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def build_fts_query(
+    text: str,
+    *,
+    columns: Optional[Iterable[str]] = None,
+    match_all: bool = False,
+    max_terms: int = 8,
+    min_len: int = 1,
+    drop_stop_words: bool = False,
+) -> str:
+    """Turn free text into a safe FTS5 MATCH expression.
+
+    Each term is quoted and prefix-matched (``"hip"*`` also hits "hips"), so
+    user punctuation can never produce an FTS syntax error. Terms are OR'ed
+    unless ``match_all`` is set. Returns "" when nothing searchable remains.
+    """
+    terms: list[str] = []
+    for term in _TERM_RE.findall((text or "").lower()):
+        if len(term) < min_len or term in terms:
+            continue
+        if drop_stop_words and term in STOP_WORDS:
+            continue
+        terms.append(term)
+        if len(terms) >= max_terms:
+            break
+
+    if not terms:
+        return ""
+
+    col_filter = ""
+    if columns:
+        col_filter = "{" + " ".join(columns) + "} : "
+    joiner = " AND " if match_all else " OR "
+    return joiner.join(f'{col_filter}"{term}"*' for term in terms)
+
+
+def _doc_filters(
+    *,
+    corpus: Optional[str] = None,
+    doc_type: Optional[str] = None,
+    course_id: Optional[int] = None,
+    folder_paths: Optional[List[str]] = None,
+    material_ids: Optional[List[int]] = None,
+    enabled_only: bool = True,
+) -> tuple[list[str], list]:
+    """WHERE conditions/params on rag_docs aliased as ``d``."""
+    conditions: list[str] = []
+    params: list = []
+
+    if enabled_only:
+        conditions.append("COALESCE(d.enabled, 1) = 1")
+    if corpus:
+        conditions.append("d.corpus = ?")
+        params.append(corpus)
+    if doc_type:
+        conditions.append("d.doc_type = ?")
+        params.append(doc_type)
+    if course_id is not None:
+        conditions.append("(d.course_id = ? OR d.course_id IS NULL)")
+        params.append(course_id)
+    if folder_paths:
+        fp_conditions = ["d.folder_path LIKE ?" for _ in folder_paths]
+        conditions.append(f"({' OR '.join(fp_conditions)})")
+        params.extend(f"%{fp}%" for fp in folder_paths)
+    if material_ids:
+        placeholders = ",".join("?" * len(material_ids))
+        conditions.append(f"d.id IN ({placeholders})")
+        params.extend(material_ids)
+
+    return conditions, params
+
+
+def fts_search_rag_docs(
+    conn: sqlite3.Connection,
+    match_query: str,
+    *,
+    corpus: Optional[str] = None,
+    doc_type: Optional[str] = None,
+    course_id: Optional[int] = None,
+    folder_paths: Optional[List[str]] = None,
+    material_ids: Optional[List[int]] = None,
+    enabled_only: bool = True,
+    include_content: bool = True,
+    limit: int = 6,
+    snippet_tokens: int = 24,
+    highlight: tuple[str, str] = ("**", "**"),
+) -> List[dict]:
+    """BM25-ranked search over rag_docs via the rag_docs_fts index.
+
+    ``match_query`` is an FTS5 expression (see ``build_fts_query``). Results are
+    dicts ordered best-first with a positive ``score`` and a highlighted
+    ``snippet`` from the content column.
+
+    Raises sqlite3.OperationalError when the FTS5 index is unavailable so
+    callers can fall back to LIKE scans.
+    """
+    if not match_query:
+        return []
+
+    conditions, params = _doc_filters(
+        corpus=corpus,
+        doc_type=doc_type,
+        course_id=course_id,
+        folder_paths=folder_paths,
+        material_ids=material_ids,
+        enabled_only=enabled_only,
+    )
+    conditions.insert(0, "rag_docs_fts MATCH ?")
+    params.insert(0, match_query)
+
+    weights = ", ".join(str(w) for w in _FTS_WEIGHTS)
+    content_col = "d.content" if include_content else "NULL"
+    cur = conn.execute(
+        f"""
+        SELECT d.id, d.source_path, {content_col} AS content, d.doc_type, d.corpus,
+               d.topic_tags, d.course_id, d.folder_path,
+               -bm25(rag_docs_fts, {weights}) AS score,
+               snippet(rag_docs_fts, 0, ?, ?, '...', ?) AS snippet
+        FROM rag_docs_fts
+        JOIN rag_docs d ON d.id = rag_docs_fts.rowid
+        WHERE {' AND '.join(conditions)}
+        ORDER BY bm25(rag_docs_fts, {weights})
+        LIMIT ?
+        """,
+        [highlight[0], highlight[1], snippet_tokens, *params, limit],
+    )
+    cols = [c[0] for c in cur.description]
+    return [dict(zip(cols, row)) for row in cur.fetchall()]
+
+
+def chunk_spans(text: str, chunk_size: int = 1000, overlap: int = 150) -> List[tuple[int, int]]:
+    """Split text into overlapping passages, preferring paragraph/sentence/word breaks.
+
+    Returns (char_start, char_end) offsets into ``text``.
+    """
+    n = len(text)
+    spans: List[tuple[int, int]] = []
+    start = 0
+    while start < n:
+        end = min(start + chunk_size, n)
+        if end < n:
+            floor = start + chunk_size // 2
+            for sep in ("\n\n", "\n", ". ", " "):
+                cut = text.rfind(sep, floor, end)
+                if cut != -1:
+                    end = cut + len(sep)
+                    break
+        spans.append((start, end))
+        if end >= n:
+            break
+        next_start = max(end - overlap, start + 1)
+        # Begin the overlap on a word boundary.
+        ws = text.find(" ", next_start, end)
+        start = ws + 1 if ws != -1 else next_start
+    return spans
+
+
+def sync_rag_chunks(
+    conn: sqlite3.Connection,
+    *,
+    chunk_size: int = 1000,
+    overlap: int = 150,
+) -> int:
+    """Re-chunk every document queued in rag_chunk_queue. Returns docs processed.
+
+    The rag_docs triggers enqueue a doc id on insert or content change; writers
+    drain the queue through refresh_rag_chunks() right after committing. Raises sqlite3.OperationalError when
+    the chunk tables are missing (SQLite without FTS5).
+    """
+    queued = [row[0] for row in conn.execute("SELECT rag_doc_id FROM rag_chunk_queue").fetchall()]
+    for doc_id in queued:
+        # Delete first so the read below happens under the write lock and
+        # cannot race a concurrent content update.
+        conn.execute("DELETE FROM rag_chunks WHERE rag_doc_id = ?", (doc_id,))
+        row = conn.execute("SELECT content FROM rag_docs WHERE id = ?", (doc_id,)).fetchone()
+        content = (row[0] if row else "") or ""
+        conn.executemany(
+            """
+            INSERT INTO rag_chunks (rag_doc_id, chunk_index, char_start, char_end, chunk_text)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [
+                (doc_id, i, start, end, content[start:end])
+                for i, (start, end) in enumerate(chunk_spans(content, chunk_size, overlap))
+                if content[start:end].strip()
+            ],
+        )
+        conn.execute("DELETE FROM rag_chunk_queue WHERE rag_doc_id = ?", (doc_id,))
+        conn.commit()
+    return len(queued)
+
+
+def refresh_rag_chunks(conn: sqlite3.Connection) -> int:
+    """Chunk whatever the rag_docs triggers queued; call after committing a content write.
+
+    Keyword retrieval only reads rag_chunks, so every writer of rag_docs.content
+    calls this. Returns 0 when the chunk tables are missing (SQLite without FTS5).
+    """
+    try:
+        return sync_rag_chunks(conn)
+    except sqlite3.OperationalError as e:
+        conn.rollback()
+        if "no such table" not in str(e):
+            print(f"[WARN] rag_chunks sync failed: {e}")
+        return 0
+
+
+def fts_search_rag_chunks(
+    conn: sqlite3.Connection,
+    match_query: str,
+    *,
+    corpus: Optional[str] = None,
+    doc_type: Optional[str] = None,
+    course_id: Optional[int] = None,
+    folder_paths: Optional[List[str]] = None,
+    material_ids: Optional[List[int]] = None,
+    enabled_only: bool = True,
+    limit: int = 6,
+    snippet_tokens: int = 24,
+    highlight: tuple[str, str] = ("**", "**"),
+) -> List[dict]:
+    """BM25-ranked passage search over rag_chunks (same filters as fts_search_rag_docs).
+
+    Each result carries the passage text as ``content`` plus ``rag_doc_id``,
+    ``chunk_index``, ``char_start`` and ``char_end``. Only chunk-sized rows are
+    read; the parent document blob is never loaded.
+    """
+    if not match_query:
+        return []
+
+    conditions, params = _doc_filters(
+        corpus=corpus,
+        doc_type=doc_type,
+        course_id=course_id,
+        folder_paths=folder_paths,
+        material_ids=material_ids,
+        enabled_only=enabled_only,
+    )
+    conditions.insert(0, "rag_chunks_fts MATCH ?")
+    params.insert(0, match_query)
+
+    cur = conn.execute(
+        f"""
+        SELECT c.rag_doc_id, c.chunk_index, c.char_start, c.char_end,
+               c.chunk_text AS content, d.source_path, d.course_id, d.folder_path,
+               d.corpus, d.doc_type,
+               -bm25(rag_chunks_fts) AS score,
+               snippet(rag_chunks_fts, 0, ?, ?, '...', ?) AS snippet
+        FROM rag_chunks_fts
+        JOIN rag_chunks c ON c.id = rag_chunks_fts.rowid
+        JOIN rag_docs d ON d.id = c.rag_doc_id
+        WHERE {' AND '.join(conditions)}
+        ORDER BY bm25(rag_chunks_fts)
+        LIMIT ?
+        """,
+        [highlight[0], highlight[1], snippet_tokens, *params, limit],
+    )
+    cols = [c[0] for c in cur.description]
+    return [dict(zip(cols, row)) for row in cur.fetchall()]
+
+
+def _like_snippet(content: str, query: str) -> str:
+    """Create a plain snippet around the first literal match of ``query``."""
+    content_lower = content.lower()
+    query_lower = query.lower()
+    idx = content_lower.find(query_lower)
+    if idx >= 0:
+        start = max(0, idx - 100)
+        end = min(len(content), idx + len(query) + 100)
+        snippet = content[start:end].replace("\n", " ").strip()
+        if start > 0:
+            snippet = "..." + snippet
+        if end < len(content):
+            snippet = snippet + "..."
+    else:
+        snippet = content[:200].replace("\n", " ").strip() + "..."
+    return snippet
+
+
 def search_rag_docs(query: str, limit: int = 5, corpus: Optional[str] = None) -> List[dict]:
     """Search RAG documents for relevant content.
-    
+
+    Ranked by BM25 over content, topic tags and source path (all query terms
+    must match). Falls back to a LIKE scan when the FTS5 index is missing.
+
     Returns list of dicts with id, source_path, content, doc_type, corpus, snippet.
     """
     if not query:
         return []
-    
+
     conn = _connect()
+    try:
+        rows = fts_search_rag_docs(
+            conn,
+            build_fts_query(query, match_all=True),
+            corpus=corpus,
+            limit=limit,
+        )
+        conn.close()
+        return [
+            {
+                "id": row["id"],
+                "source_path": row["source_path"],
+                "content": row["content"] or "",
+                "doc_type": row["doc_type"],
+                "corpus": row["corpus"],
+                "topic_tags": row["topic_tags"],
+                "snippet": (row["snippet"] or "").replace("\n", " ").strip(),
+            }
+            for row in rows
+        ]
+    except sqlite3.OperationalError:
+        pass
+
     cur = conn.cursor()
     like = f"%{query}%"
-    
+    sql = """
+        SELECT id, source_path, content, doc_type, corpus, topic_tags
+        FROM rag_docs
+        WHERE (content LIKE ? OR topic_tags LIKE ? OR source_path LIKE ?)
+          AND enabled = 1
+    """
+    params: list = [like, like, like]
     if corpus:
-        cur.execute(
-            """
-            SELECT id, source_path, content, doc_type, corpus, topic_tags
-            FROM rag_docs
-            WHERE (content LIKE ? OR topic_tags LIKE ? OR source_path LIKE ?)
-              AND corpus = ?
-              AND enabled = 1
-            ORDER BY id DESC
-            LIMIT ?
-            """,
-            (like, like, like, corpus, limit),
-        )
-    else:
-        cur.execute(
-            """
-            SELECT id, source_path, content, doc_type, corpus, topic_tags
-            FROM rag_docs
-            WHERE (content LIKE ? OR topic_tags LIKE ? OR source_path LIKE ?)
-              AND enabled = 1
-            ORDER BY id DESC
-            LIMIT ?
-            """,
-            (like, like, like, limit),
-        )
-    
+        sql += " AND corpus = ?"
+        params.append(corpus)
+    sql += " ORDER BY id DESC LIMIT ?"
+    params.append(limit)
+    cur.execute(sql, params)
     rows = cur.fetchall()
     conn.close()
-    
-    results = []
-    for row in rows:
-        content = row[2] or ""
-        # Create snippet around query match
-        content_lower = content.lower()
-        query_lower = query.lower()
-        idx = content_lower.find(query_lower)
-        if idx >= 0:
-            start = max(0, idx - 100)
-            end = min(len(content), idx + len(query) + 100)
-            snippet = content[start:end].replace("\n", " ").strip()
-            if start > 0:
-                snippet = "..." + snippet
-            if end < len(content):
-                snippet = snippet + "..."
-        else:
-            snippet = content[:200].replace("\n", " ").strip() + "..."
-        
-        results.append({
+
+    return [
+        {
             "id": row[0],
             "source_path": row[1],
-            "content": content,
+            "content": row[2] or "",
             "doc_type": row[3],
             "corpus": row[4],
             "topic_tags": row[5],
-            "snippet": snippet,
-        })
-    
-    return results
+            "snippet": _like_snippet(row[2] or "", query),
+        }
+        for row in rows
+    ]
 
 
 def ingest_markdown_note(
@@ -836,30 +1123,42 @@ def ingest_transcript_text(
 
 def search_notes(query: str, limit: int = 5) -> List[RagNote]:
     """
-    Simple text search over note content and topic tags.
+    Full-text search over note content and topic tags.
 
-    This uses LIKE-based search for now; it is enough for a first-pass
-    \"search my notes\" flow and can be upgraded to embeddings later
-    without changing the external API.
+    Ranked by BM25 via the rag_docs_fts index (all query terms must match);
+    falls back to a LIKE scan when FTS5 is unavailable.
     """
     if not query:
         return []
 
     conn = _connect()
-    cur = conn.cursor()
-    like = f"%{query}%"
-    cur.execute(
-        """
-        SELECT id, source_path, course_id, topic_tags, content
-        FROM rag_docs
-        WHERE doc_type = 'note'
-          AND (content LIKE ? OR topic_tags LIKE ?)
-        ORDER BY id DESC
-        LIMIT ?
-        """,
-        (like, like, limit),
-    )
-    rows = cur.fetchall()
+    try:
+        rows = fts_search_rag_docs(
+            conn,
+            build_fts_query(query, columns=("content", "topic_tags"), match_all=True),
+            doc_type="note",
+            enabled_only=False,
+            limit=limit,
+        )
+        rows = [
+            (row["id"], row["source_path"], row["course_id"], row["topic_tags"], row["content"])
+            for row in rows
+        ]
+    except sqlite3.OperationalError:
+        cur = conn.cursor()
+        like = f"%{query}%"
+        cur.execute(
+            """
+            SELECT id, source_path, course_id, topic_tags, content
+            FROM rag_docs
+            WHERE doc_type = 'note'
+              AND (content LIKE ? OR topic_tags LIKE ?)
+            ORDER BY id DESC
+            LIMIT ?
+            """,
+            (like, like, limit),
+        )
+        rows = cur.fetchall()
     conn.close()
 
     return [
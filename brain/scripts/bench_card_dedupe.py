@@ -0,0 +1,102 @@
+"""Benchmark card duplicate detection: pairwise SequenceMatcher scan vs bulk clusters.
+
+Generates synthetic decks of anatomy-style fronts in which ~10% of cards are
+lightly edited copies of earlier ones ("origin" -> "origins", an extra
+"the", a dropped word). For each deck size it reports wall time for:
+  - pairwise: card_dedupe.pairwise_duplicates (the clean_old_duplicates loop)
+  - bulk:     card_dedupe.bulk_duplicate_clusters (blocked cosine, greedy
+              grouping; --verify confirms edges with SequenceMatcher like
+              clean --bulk)
+and how far the two agree on which cards are redundant (Jaccard of the flagged
+sets; cosine edges nominate slightly different pairs than SequenceMatcher,
+and --verify only misses pairs below the cosine floor). The pairwise path is O(N^2) Python, so it only runs up to
+--pairwise-max cards.
+
+Usage:
+    python brain/scripts/bench_card_dedupe.py [--sizes 1000,5000,20000] [--pairwise-max 1000] [--verify]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import card_dedupe  # noqa: E402
+
+MUSCLES = [
+    "gluteus maximus", "gluteus medius", "biceps femoris", "rectus femoris",
+    "supraspinatus", "infraspinatus", "teres minor", "subscapularis", "deltoid",
+    "latissimus dorsi", "psoas major", "sartorius", "tibialis anterior",
+    "gastrocnemius", "piriformis", "quadratus lumborum",
+]
+ATTRS = ["origin", "insertion", "innervation", "action", "blood supply", "nerve root"]
+TEMPLATES = [
+    "What is the {a} of the {m} in {w}?",
+    "Describe the {a} of {m} ({w}).",
+    "{m}: {a} relevant to {w}?",
+    "Which structure is the {a} of the {m} {w}?",
+]
+
+
+def _synthetic_deck(n: int, rng: random.Random) -> list[dict]:
+    vocab = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 10)))
+             for _ in range(max(n, 1000))]
+    fronts: list[str] = []
+    for _ in range(n):
+        if fronts and rng.random() < 0.1:
+            words = rng.choice(fronts).split()
+            edit = rng.random()
+            if edit < 0.4:
+                words[-1] = words[-1] + "s"
+            elif edit < 0.7:
+                words.insert(rng.randrange(len(words)), "the")
+            elif len(words) > 4:
+                del words[rng.randrange(len(words))]
+            fronts.append(" ".join(words))
+        else:
+            fronts.append(rng.choice(TEMPLATES).format(
+                a=rng.choice(ATTRS),
+                m=rng.choice(MUSCLES),
+                w=" ".join(rng.choice(vocab) for _ in range(rng.randint(1, 3))),
+            ))
+    return [{"id": i + 1, "front": front} for i, front in enumerate(fronts)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,5000,20000,50000", help="comma-separated deck sizes")
+    parser.add_argument("--pairwise-max", type=int, default=1000,
+                        help="largest deck to run the O(N^2) pairwise path on")
+    parser.add_argument("--verify", action="store_true", help="bulk edges use SequenceMatcher")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        cards = _synthetic_deck(size, random.Random(args.seed))
+
+        t0 = time.perf_counter()
+        clusters = card_dedupe.bulk_duplicate_clusters(cards, verify=args.verify)
+        bulk_s = time.perf_counter() - t0
+        bulk_ids = {d["id"] for d in card_dedupe.cluster_duplicates(clusters, cards)}
+        line = f"N={size:<6} bulk {bulk_s:7.2f}s  clusters={len(clusters):<5} redundant={len(bulk_ids):<5}"
+
+        if size <= args.pairwise_max:
+            t0 = time.perf_counter()
+            pairwise_ids = {d["id"] for d in card_dedupe.pairwise_duplicates(cards)}
+            pairwise_s = time.perf_counter() - t0
+            union = bulk_ids | pairwise_ids
+            agreement = len(bulk_ids & pairwise_ids) / len(union) if union else 1.0
+            line += (
+                f"  pairwise {pairwise_s:7.2f}s redundant={len(pairwise_ids):<5}"
+                f"  speedup {pairwise_s / bulk_s:6.1f}x  agreement={agreement:.3f}"
+            )
+        else:
+            line += "  pairwise skipped (--pairwise-max)"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Benchmark request latency with per-call SQLite connections vs the pooled WAL layer.
+
+Builds a synthetic Brain DB (sessions + RAG docs) and times, through the
+Flask test client and rag_notes directly:
+  - GET /api/sessions (a few days' range)
+  - GET /api/tutor/materials
+  - rag_notes.search_rag_docs()
+in two modes:
+  - per-call: the old behaviour -- every get_connection() opens a fresh
+              connection and probes the sessions table, and rag_notes
+              re-runs init_database() before each connection
+  - pooled:   db_setup.get_connection() / db_pool as shipped
+Reports mean and p95 latency per case.
+
+Usage:
+    python brain/scripts/bench_db_pool.py [--sessions 2000] [--docs 300] [--requests 300]
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import db_pool  # noqa: E402
+import db_setup  # noqa: E402
+import rag_notes  # noqa: E402
+from dashboard.app import create_app  # noqa: E402
+
+WORDS = ["hip", "knee", "gait", "plexus", "rotator", "cuff", "ligament", "nerve", "femur", "spine"]
+
+
+def _build_db(path: str, sessions: int, docs: int) -> None:
+    db_setup.DB_PATH = path
+    rag_notes.DB_PATH = path
+    db_setup.init_database()
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        """INSERT INTO sessions (session_date, session_time, study_mode, main_topic,
+               time_spent_minutes, created_at)
+           VALUES (?, ?, 'Core', ?, 30, ?)""",
+        [
+            (f"2026-{1 + i % 9:02d}-{1 + i % 28:02d}", f"{i % 24:02d}:00", WORDS[i % len(WORDS)],
+             f"2026-01-01T00:00:{i % 60:02d}")
+            for i in range(sessions)
+        ],
+    )
+    conn.commit()
+    conn.close()
+    for i in range(docs):
+        body = " ".join(WORDS[(i + k) % len(WORDS)] for k in range(200))
+        rag_notes._upsert_rag_doc(
+            source_path=f"doc_{i}.md", doc_type="txt", course_id=None, topic_tags="",
+            content=body, checksum=rag_notes._checksum(body), metadata={}, corpus="materials",
+        )
+
+
+def _legacy_connect(path, readonly=False):
+    conn = sqlite3.connect(path, timeout=15)
+    conn.execute("PRAGMA busy_timeout = 5000")
+    conn.execute("SELECT 1 FROM sessions LIMIT 1")
+    return conn
+
+
+def _legacy_rag_connect():
+    db_setup.init_database()
+    conn = sqlite3.connect(rag_notes.DB_PATH)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _time(fn, n):
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return statistics.mean(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def _run(client, n):
+    cases = {
+        "GET /api/sessions?start&end": lambda: client.get(
+            "/api/sessions?start=2026-03-01&end=2026-03-03"
+        ).status_code,
+        "GET /api/tutor/materials": lambda: client.get("/api/tutor/materials").status_code,
+        "search_rag_docs": lambda: rag_notes.search_rag_docs("hip gait", limit=5),
+    }
+    return {name: _time(fn, n) for name, fn in cases.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--docs", type=int, default=300)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    path = os.path.join(tmp.name, "bench.db")
+    _build_db(path, args.sessions, args.docs)
+    client = create_app().test_client()
+
+    # Silence init_database()'s banner, which the per-call mode prints per RAG query.
+    devnull = open(os.devnull, "w")
+    stdout, sys.stdout = sys.stdout, devnull
+    try:
+        original_connect, original_rag = db_pool.connect, rag_notes._connect
+        db_pool.connect, rag_notes._connect = _legacy_connect, _legacy_rag_connect
+        try:
+            before = _run(client, args.requests)
+        finally:
+            db_pool.connect, rag_notes._connect = original_connect, original_rag
+        _run(client, 5)  # warm the pool
+        after = _run(client, args.requests)
+    finally:
+        sys.stdout = stdout
+        devnull.close()
+
+    print(f"{'case':28} {'per-call mean/p95 ms':>22} {'pooled mean/p95 ms':>20} {'speedup':>8}")
+    for name in before:
+        (b_mean, b_p95), (a_mean, a_p95) = before[name], after[name]
+        print(f"{name:28} {b_mean:10.2f} / {b_p95:7.2f} {a_mean:9.2f} / {a_p95:7.2f} {b_mean / a_mean:7.1f}x")
+    print(f"pool: {db_pool.pool_stats()}")
+    db_pool.close_all()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
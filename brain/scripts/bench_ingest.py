@@ -0,0 +1,105 @@
+"""Benchmark session-log ingestion: per-file ingest_file() vs bulk ingest_paths().
+
+Writes a synthetic semester of markdown session logs and times, each on a
+fresh scratch DB:
+  - first import:  ingest_file() per file  vs  ingest_paths(directory)
+  - re-import with nothing changed (the common Brain Sync case)
+  - re-import after editing 10% of the files
+
+Usage:
+    python brain/scripts/bench_ingest.py [--files 300] [--workers N]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import db_pool  # noqa: E402
+import db_setup  # noqa: E402
+import ingest_session  # noqa: E402
+
+TOPICS = ["Gluteal region", "Brachial plexus", "Knee ligaments", "Gait cycle", "Rotator cuff"]
+
+
+def _write_logs(directory: str, n: int, revision: int = 0) -> list:
+    paths = []
+    start = date(2025, 8, 25)
+    for i in range(n):
+        day = (start + timedelta(days=i // 2)).isoformat()
+        path = os.path.join(directory, f"{day}_session_{i}.md")
+        body = (
+            f"# Session Log - {day}\n\n## Session Info\n- Date: {day}\n- Time: {9 + i % 8:02d}:00\n"
+            f"- Main Topic: {TOPICS[i % len(TOPICS)]}\n- Study Mode: Core\n- Time Spent: 45 Minutes\n\n"
+            f"## Ratings\n- Understanding Level: {1 + i % 5}\n- Retention Confidence: {1 + (i + revision) % 5}\n"
+            f"- System Performance: 4\n\n## Reflection\n### What Worked\nRevision {revision}.\n"
+            + "Notes line.\n" * 40
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(body)
+        paths.append(path)
+    return paths
+
+
+def _fresh_db(tmp: str, name: str) -> str:
+    path = os.path.join(tmp, name)
+    db_setup.DB_PATH = ingest_session.DB_PATH = path
+    with contextlib.redirect_stdout(io.StringIO()):
+        db_setup.init_database()
+    return path
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        logs = os.path.join(tmp, "session_logs")
+        os.mkdir(logs)
+        paths = _write_logs(logs, args.files)
+        edited = paths[:: 10]
+
+        def legacy():
+            for p in paths:
+                ingest_session.ingest_file(p)
+
+        def bulk():
+            ingest_session.ingest_paths([logs], workers=args.workers)
+
+        def edit():
+            for p in edited:
+                with open(p, "a", encoding="utf-8") as f:
+                    f.write("Edited.\n")
+
+        rows = []
+        for label, run in (("per-file ingest_file", legacy), ("bulk ingest_paths", bulk)):
+            _fresh_db(tmp, label.split()[0] + ".db")
+            first = _timed(run)
+            again = _timed(run)
+            edit()
+            changed = _timed(run)
+            rows.append((label, first, again, changed))
+            db_pool.close_all()
+
+    print(f"{args.files} session logs, {len(edited)} edited before the last pass")
+    print(f"{'mode':24} {'first import':>13} {'re-import':>10} {'10% edited':>11}")
+    for label, first, again, changed in rows:
+        print(f"{label:24} {first:12.2f}s {again:9.2f}s {changed:10.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Benchmark Scholar friction alerts: per-session brain_reader calls vs one BrainReader session.
+
+Builds a synthetic Brain DB (default 50k tutor turns spread over ~5k sessions
+in the last 30 days) and times two ways of producing the same alerts:
+  - per-session: the old generate_alerts loop -- get_recent_sessions, then
+                 get_session_by_id per session, get_all_sessions for topic
+                 struggles, and calculate_session_metrics twice per session
+                 with turns (each call opens its own connection)
+  - reader:      friction_alerts.generate_alerts, which runs a fixed handful
+                 of grouped queries on one shared read-only connection
+It reports wall time, connections opened / statements executed, and whether
+both paths produced the same alerts.
+
+Usage:
+    python brain/scripts/bench_scholar_reader.py [--turns 50000] [--turns-per-session 10] [--db PATH]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "scholar"))
+
+import db_setup  # noqa: E402
+import brain_reader  # noqa: E402
+import friction_alerts  # noqa: E402
+
+TOPICS = ["Brachial plexus", "Rotator cuff", "Gait", "Knee ligaments", "Spinal cord", "Cranial nerves"]
+CITATIONS = [None, "", "[]", json.dumps([{"source": "lecture.pdf"}]), json.dumps([1, 2, 3]), "not json"]
+
+
+def _build_db(path: str, turns: int, per_session: int, seed: int = 7) -> int:
+    db_setup.DB_PATH = path
+    db_setup.init_database()
+    rng = random.Random(seed)
+    now = datetime.now()
+    n_sessions = max(1, turns // per_session)
+    sessions, turn_rows = [], []
+    for i in range(n_sessions):
+        stamp = now - timedelta(minutes=int(30 * 24 * 60 * i / n_sessions))
+        sessions.append((
+            stamp.strftime("%Y-%m-%d"), stamp.strftime("%H:%M:%S.%f"),
+            rng.choice([5, 30, 60, 120]), rng.choice(["Core", "Sprint", "Drill"]),
+            rng.choice(TOPICS), rng.choice([None, "No", "Yes"]),
+            rng.choice([None, 1, 2, 3, 4, 5]),
+            rng.choice([None, "none", "Drifted to pharmacology"]),
+            stamp.isoformat(),
+        ))
+        for t in range(per_session):
+            turn_rows.append((
+                f"sess-{i}", t + 1, "q" * rng.randint(10, 200), "a" * rng.randint(20, 800),
+                rng.choice(CITATIONS), rng.random() < 0.3,
+                (stamp + timedelta(seconds=t)).isoformat(),
+            ))
+    conn = db_setup.get_connection()
+    conn.executemany(
+        """INSERT INTO sessions (session_date, session_time, duration_minutes, study_mode,
+               main_topic, wrap_phase_reached, understanding_level, off_source_drift, created_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        sessions,
+    )
+    conn.executemany(
+        """INSERT INTO tutor_turns (session_id, turn_number, question, answer,
+               citations_json, unverified, created_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        turn_rows,
+    )
+    conn.commit()
+    conn.close()
+    return n_sessions
+
+
+def _per_session_alerts(days: int) -> list:
+    alerts = []
+    for s in brain_reader.get_recent_sessions(days):
+        record = brain_reader.get_session_by_id(s["id"])
+        alerts.extend(friction_alerts.check_session_duration(record))
+        for check in (friction_alerts.check_understanding_level,
+                      friction_alerts.check_no_wrap_phase,
+                      friction_alerts.check_source_drift):
+            alerts.append(check(record))
+    alerts.extend(friction_alerts.check_repeated_topic_struggle(brain_reader.get_all_sessions()))
+    for sid in {t["session_id"] for t in brain_reader.get_recent_tutor_turns(days)}:
+        alerts.append(friction_alerts.check_unverified_ratio(sid))
+        alerts.append(friction_alerts.check_low_citations(sid))
+    return alerts
+
+
+def _comparable(alerts: list) -> list:
+    out = []
+    for a in alerts:
+        if a is not None:
+            d = a.to_dict()
+            d.pop("created_at")
+            out.append(json.dumps(d, sort_keys=True))
+    return sorted(out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=50000)
+    parser.add_argument("--turns-per-session", type=int, default=10)
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--db", default=None, help="Existing DB to reuse (skips generation)")
+    args = parser.parse_args()
+
+    tmp = None
+    if args.db:
+        path = args.db
+    else:
+        tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp.name, "bench.db")
+        t0 = time.perf_counter()
+        n = _build_db(path, args.turns, args.turns_per_session)
+        print(f"built {n} sessions / {args.turns} turns in {time.perf_counter() - t0:.1f}s")
+    brain_reader._DB_PATH_STR = path
+
+    opened = [0]
+    original = brain_reader._get_connection
+
+    def counting_connection():
+        opened[0] += 1
+        return original()
+
+    brain_reader._get_connection = counting_connection
+    t0 = time.perf_counter()
+    legacy = _per_session_alerts(args.days)
+    legacy_s = time.perf_counter() - t0
+    brain_reader._get_connection = original
+    print(f"per-session: {legacy_s:7.2f}s  connections={opened[0]}")
+
+    with brain_reader.BrainReader() as reader:
+        t0 = time.perf_counter()
+        fast = friction_alerts.generate_alerts(args.days)
+        fast_s = time.perf_counter() - t0
+        print(f"reader:      {fast_s:7.2f}s  connections=1 statements={reader.query_count}")
+
+    print(f"speedup {legacy_s / fast_s:.1f}x  alerts={len(fast)}  "
+          f"same={_comparable(legacy) == _comparable(fast)}")
+    if tmp:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
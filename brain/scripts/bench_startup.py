@@ -0,0 +1,116 @@
+"""Dashboard cold-start benchmark with a time budget.
+
+Starts fresh interpreters (python -X importtime) that import the dashboard,
+build the app and serve one request (GET /api/db/health against a scratch
+DB), and reports:
+  - time to first response, measured inside the child from interpreter start
+  - the slowest imports (cumulative, from -X importtime)
+  - which heavy dependencies were actually executed during startup
+A warm-up run goes first so bytecode caches are written, as they would be
+after the first Start_Dashboard.bat launch.
+
+Exits 1 if the median time to first response exceeds --budget-ms or if any
+heavy dependency loads at startup.
+
+Usage:
+    python brain/scripts/bench_startup.py [--runs 5] [--budget-ms 1500] [--top 15]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BRAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Only needed by specific handlers; none of them should load at startup.
+HEAVY_MODULES = [
+    "langchain_core", "langchain_community", "langchain_openai", "chromadb",
+    "googleapiclient", "google_auth_oauthlib", "pdfplumber", "docx", "pptx",
+    "openai", "numpy", "requests",
+    "tutor_engine", "tutor_rag", "rag_notes", "ingest_session", "dashboard.scholar",
+]
+
+CHILD = r"""
+import time
+t0 = time.perf_counter()
+import json, sys
+sys.path.insert(0, {brain!r})
+import config, db_setup
+config.DB_PATH = db_setup.DB_PATH = {db!r}
+from dashboard.app import create_app
+app = create_app()
+t_app = time.perf_counter()
+status = app.test_client().get("/api/db/health").status_code
+t_first = time.perf_counter()
+from lazy_imports import is_loaded
+print(json.dumps({{
+    "app_ms": (t_app - t0) * 1000,
+    "first_response_ms": (t_first - t0) * 1000,
+    "status": status,
+    "heavy": [m for m in {heavy!r} if is_loaded(m)],
+}}))
+"""
+
+
+def _parse_importtime(stderr: str) -> dict:
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            _, cum, name = line[len("import time:"):].split("|")
+            cumulative[name.strip()] = int(cum)
+        except ValueError:
+            continue  # header line
+    return cumulative
+
+
+def _run_child(db_path: str) -> tuple:
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         CHILD.format(brain=BRAIN_DIR, db=db_path, heavy=HEAVY_MODULES)],
+        cwd=BRAIN_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    return result, _parse_importtime(proc.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        _run_child(db_path)  # warm-up: creates the DB and writes .pyc files
+        runs = [_run_child(db_path) for _ in range(args.runs)]
+
+    first = [r["first_response_ms"] for r, _ in runs]
+    app_ms = [r["app_ms"] for r, _ in runs]
+    median = statistics.median(first)
+    result, imports = runs[-1]
+
+    print(f"create_app():    median {statistics.median(app_ms):7.1f} ms")
+    print(f"first response:  median {median:7.1f} ms  (min {min(first):.1f}, max {max(first):.1f}, "
+          f"status {result['status']})")
+    print("\nslowest imports (cumulative, last run):")
+    for name, us in sorted(imports.items(), key=lambda kv: kv[1], reverse=True)[: args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    heavy = sorted({m for r, _ in runs for m in r["heavy"]})
+    print(f"\nheavy modules loaded at startup: {', '.join(heavy) or 'none'}")
+
+    ok = median <= args.budget_ms and not heavy
+    print(f"\n{'[OK]' if ok else '[FAIL]'} budget {args.budget_ms:.0f} ms")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
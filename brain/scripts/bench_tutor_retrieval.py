@@ -0,0 +1,134 @@
+"""Benchmark tutor retrieval: offline local embeddings vs BM25 keyword fallback.
+
+Builds a query set from the existing rag_docs corpus: for each sampled
+passage in rag_chunks the query is a few of its distinctive words, and the
+relevant answer is that passage's document. Reports recall@k and per-query
+latency for:
+  - keyword: tutor_rag._keyword_rows (FTS5 BM25 over passages)
+  - local:   HashingEmbeddings + brute-force cosine over the same passages
+             (NumPy; what the "local" Chroma store ranks, minus HNSW error)
+  - hybrid:  reciprocal-rank fusion of the two (tutor_rag.reciprocal_rank_fusion),
+             latency = max of the two searches as they run concurrently
+
+Usage:
+    python brain/scripts/bench_tutor_retrieval.py [--db PATH] [--queries 200] [--k 5] [--corpus materials]
+"""
+import argparse
+import os
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import config  # noqa: E402
+import rag_notes  # noqa: E402
+import tutor_rag  # noqa: E402
+from tutor_embeddings import HashingEmbeddings  # noqa: E402
+
+WORD_RE = re.compile(r"[A-Za-z]{5,}")
+
+
+def _load_passages(conn: sqlite3.Connection, corpus: str | None) -> list[tuple[int, str]]:
+    rag_notes.sync_rag_chunks(conn)
+    sql = """
+        SELECT c.rag_doc_id, c.chunk_text
+        FROM rag_chunks c JOIN rag_docs d ON d.id = c.rag_doc_id
+        WHERE COALESCE(d.enabled, 1) = 1
+    """
+    params: list = []
+    if corpus:
+        sql += " AND d.corpus = ?"
+        params.append(corpus)
+    return [(row[0], row[1]) for row in conn.execute(sql, params).fetchall()]
+
+
+def _make_queries(passages, n: int, words_per_query: int, rng: random.Random):
+    queries = []
+    for doc_id, text in rng.sample(passages, min(n, len(passages))):
+        words = sorted({w.lower() for w in WORD_RE.findall(text)} - rag_notes.STOP_WORDS)
+        if len(words) < words_per_query:
+            continue
+        queries.append((" ".join(rng.sample(words, words_per_query)), doc_id))
+    return queries
+
+
+def _summary(name: str, hits: list[bool], latencies: list[float], k: int) -> str:
+    lat = sorted(latencies)
+    p95 = lat[min(len(lat) - 1, int(len(lat) * 0.95))]
+    return (
+        f"{name:<8} recall@{k}={sum(hits) / len(hits):.3f}  "
+        f"p50={statistics.median(lat):.2f}ms  p95={p95:.2f}ms  mean={statistics.fmean(lat):.2f}ms"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=str(config.DB_PATH), help="SQLite DB (default: brain DB_PATH)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--words", type=int, default=3, help="words sampled per query")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--corpus", default=None, help="restrict to one corpus (e.g. materials)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    import numpy as np
+
+    tutor_rag.DB_PATH = args.db
+    conn = sqlite3.connect(args.db)
+    passages = _load_passages(conn, args.corpus)
+    conn.close()
+    if not passages:
+        print("[WARN] No passages in rag_chunks for this corpus; nothing to benchmark.")
+        return 1
+
+    queries = _make_queries(passages, args.queries, args.words, random.Random(args.seed))
+    print(f"Corpus: {len(passages)} passages from {len({d for d, _ in passages})} docs; {len(queries)} queries")
+
+    emb = HashingEmbeddings()
+    t0 = time.perf_counter()
+    matrix = np.asarray(emb.embed_documents([text for _, text in passages]), dtype=np.float32)
+    doc_ids = np.array([doc_id for doc_id, _ in passages])
+    print(f"Local index build: {(time.perf_counter() - t0) * 1000:.0f}ms ({emb.model_name})")
+
+    fetch_k = args.k * 2
+    kw_hits, kw_lat, local_hits, local_lat, hy_hits, hy_lat = [], [], [], [], [], []
+    for query, expected in queries:
+        t0 = time.perf_counter()
+        rows = tutor_rag._keyword_rows(query, k=fetch_k, corpus=args.corpus)
+        kw_ms = (time.perf_counter() - t0) * 1000
+        kw_lat.append(kw_ms)
+        kw_ranked = [row["rag_doc_id"] for row in rows]
+        kw_hits.append(expected in kw_ranked[: args.k])
+
+        t0 = time.perf_counter()
+        scores = matrix @ np.asarray(emb.embed_query(query), dtype=np.float32)
+        top = np.argsort(-scores)[:fetch_k]
+        local_ms = (time.perf_counter() - t0) * 1000
+        local_lat.append(local_ms)
+        local_ranked = doc_ids[top].tolist()
+        local_hits.append(expected in local_ranked[: args.k])
+
+        t0 = time.perf_counter()
+        fused = tutor_rag.reciprocal_rank_fusion(
+            {
+                "vector": [SimpleNamespace(page_content="", metadata={"rag_doc_id": d}) for d in local_ranked],
+                "keyword": [SimpleNamespace(page_content="", metadata={"rag_doc_id": d}) for d in kw_ranked],
+            },
+            args.k,
+        )
+        hy_lat.append(max(kw_ms, local_ms) + (time.perf_counter() - t0) * 1000)
+        hy_hits.append(expected in {d.metadata["rag_doc_id"] for d in fused})
+
+    print(_summary("keyword", kw_hits, kw_lat, args.k))
+    print(_summary("local", local_hits, local_lat, args.k))
+    print(_summary("hybrid", hy_hits, hy_lat, args.k))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
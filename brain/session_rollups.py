@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Materialized dashboard rollups over the sessions table.
+
+Tables (created in db_setup.init_database):
+  session_rollup_daily      one row per session_date: counts, sums for averages,
+                            WRAP-field fill counts, glossary/error tallies
+  session_rollup_topic      one row per topic (main_topic, falling back to topic)
+  session_rollup_mode       one row per study_mode
+  session_rollup_framework  framework token counts per session_date
+  session_rollup_meta       version stamp + last update time
+
+Triggers on sessions enqueue the affected (day, topic, mode) keys into
+session_rollup_queue; sync_rollups() recomputes just those keys from the
+indexed session rows. Writers call sync_after_session_write() right after
+committing and init_database drains whatever raw SQL writers left queued, so
+readers never write. A missing or stale version stamp triggers a full
+rebuild.
+
+Usage:
+    python session_rollups.py rebuild
+    python session_rollups.py check
+"""
+
+import argparse
+import re
+import sqlite3
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+# Bump when the rollup columns or their semantics change; readers rebuild.
+ROLLUP_VERSION = "1"
+
+WRAP_FIELDS = ["anki_cards_text", "glossary_entries", "wrap_watchlist", "clinical_links", "spaced_reviews"]
+ERROR_FIELDS = ["errors_conceptual", "errors_discrimination", "errors_recall"]
+
+_SESSION_COLUMNS = [
+    "session_date", "session_time", "main_topic", "topic", "study_mode",
+    "duration_minutes", "time_spent_minutes", "anki_cards_count",
+    "understanding_level", "retention_confidence", "system_performance",
+    "frameworks_used",
+] + WRAP_FIELDS + ERROR_FIELDS
+
+DAILY_COLUMNS = [
+    "sessions", "minutes", "duration_sum", "anki_cards",
+    "understanding_sum", "understanding_n",
+    "retention_sum", "retention_n",
+    "performance_sum", "performance_n",
+    "wrap_filled", "wrap_full", "wrap_empty",
+    "sessions_with_errors", "glossary_terms",
+] + [f"{f}_filled" for f in WRAP_FIELDS]
+TOPIC_COLUMNS = ["sessions", "last_date", "latest_key", "understanding_sum", "understanding_n", "last_rated_date"]
+MODE_COLUMNS = ["sessions", "latest_key"]
+FRAMEWORK_COLUMNS = ["uses", "latest_key"]
+
+# table -> (key columns, value columns)
+_TABLES = {
+    "session_rollup_daily": (["session_date"], DAILY_COLUMNS),
+    "session_rollup_topic": (["topic"], TOPIC_COLUMNS),
+    "session_rollup_mode": (["study_mode"], MODE_COLUMNS),
+    "session_rollup_framework": (["session_date", "framework"], FRAMEWORK_COLUMNS),
+}
+
+
+def session_topic(row) -> str:
+    """Dashboard topic of a session: main_topic, falling back to topic."""
+    return row["main_topic"] or row["topic"] or ""
+
+
+def _number(value):
+    """Numeric column value; None for NULL, '' and other non-numeric text."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value) if "." in str(value) else int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _filled(value) -> bool:
+    return bool(value) and bool(str(value).strip())
+
+
+def glossary_term_count(glossary: Optional[str]) -> int:
+    """Entries separated by semicolons/newlines, ignoring '#' headings."""
+    glossary = glossary or ""
+    if not glossary.strip():
+        return 0
+    entries = re.split(r"[;\n]", glossary)
+    return sum(1 for e in entries if e.strip() and not e.strip().startswith("#"))
+
+
+def framework_tokens(frameworks_used: Optional[str]) -> List[str]:
+    tokens = (t.strip() for t in re.split(r"[;,/]", frameworks_used or ""))
+    return [t for t in tokens if t]
+
+
+def _fold(rows: Iterable) -> Dict[str, dict]:
+    """Fold session rows into {table: {key tuple: {column: value}}}."""
+    daily: dict = {}
+    topics: dict = {}
+    modes: dict = {}
+    frameworks: dict = {}
+
+    for row in rows:
+        date = row["session_date"] or ""
+        latest_key = f"{date} {row['session_time'] or ''}"
+
+        d = daily.get((date,))
+        if d is None:
+            d = daily[(date,)] = dict.fromkeys(DAILY_COLUMNS, 0)
+        duration = _number(row["duration_minutes"])
+        spent = _number(row["time_spent_minutes"])
+        understanding = _number(row["understanding_level"])
+        d["sessions"] += 1
+        d["minutes"] += duration or spent or 0
+        if duration is not None:
+            d["duration_sum"] += duration
+        elif spent is not None:
+            d["duration_sum"] += spent
+        d["anki_cards"] += _number(row["anki_cards_count"]) or 0
+        for value, prefix in (
+            (understanding, "understanding"),
+            (_number(row["retention_confidence"]), "retention"),
+            (_number(row["system_performance"]), "performance"),
+        ):
+            if value is not None:
+                d[f"{prefix}_sum"] += value
+                d[f"{prefix}_n"] += 1
+        filled = 0
+        for field in WRAP_FIELDS:
+            if _filled(row[field]):
+                filled += 1
+                d[f"{field}_filled"] += 1
+        d["wrap_filled"] += filled
+        if filled == len(WRAP_FIELDS):
+            d["wrap_full"] += 1
+        elif filled == 0:
+            d["wrap_empty"] += 1
+        if any(row[f] for f in ERROR_FIELDS):
+            d["sessions_with_errors"] += 1
+        d["glossary_terms"] += glossary_term_count(row["glossary_entries"])
+
+        for token in framework_tokens(row["frameworks_used"]):
+            fw = frameworks.get((date, token))
+            if fw is None:
+                fw = frameworks[(date, token)] = {"uses": 0, "latest_key": latest_key}
+            fw["uses"] += 1
+            fw["latest_key"] = max(fw["latest_key"], latest_key)
+
+        topic = session_topic(row)
+        t = topics.get((topic,))
+        if t is None:
+            t = topics[(topic,)] = {
+                "sessions": 0, "last_date": "", "latest_key": "",
+                "understanding_sum": 0, "understanding_n": 0, "last_rated_date": None,
+            }
+        t["sessions"] += 1
+        t["last_date"] = max(t["last_date"], date)
+        t["latest_key"] = max(t["latest_key"], latest_key)
+        if understanding is not None:
+            t["understanding_sum"] += understanding
+            t["understanding_n"] += 1
+            t["last_rated_date"] = max(t["last_rated_date"] or "", date)
+
+        mode = row["study_mode"]
+        if mode:
+            m = modes.get((mode,))
+            if m is None:
+                m = modes[(mode,)] = {"sessions": 0, "latest_key": ""}
+            m["sessions"] += 1
+            m["latest_key"] = max(m["latest_key"], latest_key)
+
+    return {
+        "session_rollup_daily": daily,
+        "session_rollup_topic": topics,
+        "session_rollup_mode": modes,
+        "session_rollup_framework": frameworks,
+    }
+
+
+def _select_sessions(conn: sqlite3.Connection, where: str = "", params: Iterable = ()):
+    cur = conn.cursor()
+    cur.row_factory = sqlite3.Row
+    return cur.execute(f"SELECT {', '.join(_SESSION_COLUMNS)} FROM sessions {where}", tuple(params))
+
+
+def compute_rollups(conn: sqlite3.Connection) -> Dict[str, dict]:
+    """Full recompute from the sessions table (one streaming pass)."""
+    return _fold(_select_sessions(conn))
+
+
+def _write_rows(conn: sqlite3.Connection, table: str, rows: dict) -> None:
+    key_cols, value_cols = _TABLES[table]
+    columns = key_cols + value_cols
+    conn.executemany(
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+        [key + tuple(values[c] for c in value_cols) for key, values in rows.items()],
+    )
+
+
+def _stamp(conn: sqlite3.Connection, **values) -> None:
+    conn.executemany(
+        "INSERT OR REPLACE INTO session_rollup_meta (name, value) VALUES (?, ?)",
+        list(values.items()),
+    )
+
+
+def rebuild_rollups(conn: sqlite3.Connection) -> dict:
+    """Recompute every rollup table from scratch and stamp the current version."""
+    for table in _TABLES:
+        conn.execute(f"DELETE FROM {table}")
+    conn.execute("DELETE FROM session_rollup_queue")
+    computed = compute_rollups(conn)
+    for table, rows in computed.items():
+        _write_rows(conn, table, rows)
+    now = datetime.now().isoformat(timespec="seconds")
+    _stamp(conn, version=ROLLUP_VERSION, rebuilt_at=now, updated_at=now)
+    conn.commit()
+    return {table: len(rows) for table, rows in computed.items()}
+
+
+def rollup_version(conn: sqlite3.Connection) -> Optional[str]:
+    row = conn.execute("SELECT value FROM session_rollup_meta WHERE name = 'version'").fetchone()
+    return row[0] if row else None
+
+
+def _refresh(conn: sqlite3.Connection, kind: str, keys: List[str]) -> None:
+    placeholders = ",".join("?" * len(keys))
+    if kind == "day":
+        # Delete first so the reads below happen under the write lock.
+        conn.execute(f"DELETE FROM session_rollup_daily WHERE session_date IN ({placeholders})", keys)
+        conn.execute(f"DELETE FROM session_rollup_framework WHERE session_date IN ({placeholders})", keys)
+        folded = _fold(_select_sessions(conn, f"WHERE session_date IN ({placeholders})", keys))
+        _write_rows(conn, "session_rollup_daily", folded["session_rollup_daily"])
+        _write_rows(conn, "session_rollup_framework", folded["session_rollup_framework"])
+    elif kind == "topic":
+        conn.execute(f"DELETE FROM session_rollup_topic WHERE topic IN ({placeholders})", keys)
+        where = f"WHERE main_topic IN ({placeholders}) OR topic IN ({placeholders})"
+        if "" in keys:
+            where += " OR (COALESCE(main_topic, '') = '' AND COALESCE(topic, '') = '')"
+        folded = _fold(_select_sessions(conn, where, keys + keys))
+        wanted = set(keys)
+        _write_rows(conn, "session_rollup_topic", {
+            k: v for k, v in folded["session_rollup_topic"].items() if k[0] in wanted
+        })
+    elif kind == "mode":
+        conn.execute(f"DELETE FROM session_rollup_mode WHERE study_mode IN ({placeholders})", keys)
+        folded = _fold(_select_sessions(conn, f"WHERE study_mode IN ({placeholders})", keys))
+        _write_rows(conn, "session_rollup_mode", folded["session_rollup_mode"])
+
+
+def sync_rollups(conn: sqlite3.Connection, batch_size: int = 500) -> int:
+    """Bring the rollups up to date. Returns queued keys processed.
+
+    Rebuilds everything when the version stamp is missing or stale; otherwise
+    only the keys queued by the sessions triggers are recomputed. Raises sqlite3.OperationalError if
+    the rollup tables are missing.
+    """
+    if rollup_version(conn) != ROLLUP_VERSION:
+        rebuild_rollups(conn)
+        return 0
+
+    processed = 0
+    while True:
+        queued = [
+            tuple(row)
+            for row in conn.execute(
+                "SELECT kind, key FROM session_rollup_queue LIMIT ?", (batch_size,)
+            ).fetchall()
+        ]
+        if not queued:
+            return processed
+        by_kind: Dict[str, List[str]] = {}
+        for kind, key in queued:
+            by_kind.setdefault(kind, []).append(key)
+        for kind, keys in by_kind.items():
+            _refresh(conn, kind, keys)
+        conn.executemany(
+            "DELETE FROM session_rollup_queue WHERE kind = ? AND key = ?", queued
+        )
+        _stamp(conn, updated_at=datetime.now().isoformat(timespec="seconds"))
+        conn.commit()
+        processed += len(queued)
+
+
+def sync_after_session_write(conn: sqlite3.Connection) -> None:
+    """Apply queued rollup and term-count updates after committing a sessions write.
+
+    A failure (locked database, tables missing) is logged, not raised: the
+    session is already committed and the keys stay queued for the next writer.
+    """
+    from session_terms import sync_terms
+
+    try:
+        sync_rollups(conn)
+        sync_terms(conn)
+    except sqlite3.OperationalError as e:
+        conn.rollback()
+        print(f"[WARN] Dashboard rollups not updated: {e}")
+
+
+def _stored_rollups(conn: sqlite3.Connection) -> Dict[str, dict]:
+    stored = {}
+    for table, (key_cols, value_cols) in _TABLES.items():
+        cur = conn.cursor()
+        cur.row_factory = sqlite3.Row
+        stored[table] = {
+            tuple(row[c] for c in key_cols): {c: row[c] for c in value_cols}
+            for row in cur.execute(f"SELECT * FROM {table}")
+        }
+    return stored
+
+
+def check_rollups(conn: sqlite3.Connection, sync: bool = True) -> dict:
+    """Diff the stored rollups against a full recompute.
+
+    Returns {"ok": bool, "version": str, "tables": {table: {"missing": [...],
+    "extra": [...], "mismatched": [{key, stored, expected}]}}}. With sync=True
+    pending queue entries are applied first, so only real drift is reported.
+    """
+    if sync:
+        sync_rollups(conn)
+    expected = compute_rollups(conn)
+    stored = _stored_rollups(conn)
+
+    tables = {}
+    ok = True
+    for table in _TABLES:
+        want, have = expected[table], stored[table]
+        diff = {
+            "missing": sorted(k for k in want if k not in have),
+            "extra": sorted(k for k in have if k not in want),
+            "mismatched": [
+                {"key": k, "stored": have[k], "expected": want[k]}
+                for k in sorted(want)
+                if k in have and have[k] != want[k]
+            ],
+        }
+        if diff["missing"] or diff["extra"] or diff["mismatched"]:
+            ok = False
+        tables[table] = diff
+    return {"ok": ok, "version": rollup_version(conn), "tables": tables}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from db_setup import get_connection
+
+    parser = argparse.ArgumentParser(description="Dashboard rollup maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="Recompute all rollup tables from sessions")
+    check = sub.add_parser("check", help="Diff rollups against a full recompute")
+    check.add_argument("--no-sync", action="store_true", help="Do not apply queued updates first")
+    args = parser.parse_args(argv)
+
+    conn = get_connection()
+    try:
+        if args.command == "rebuild":
+            counts = rebuild_rollups(conn)
+            for table, n in counts.items():
+                print(f"[OK] {table}: {n} rows")
+            return 0
+
+        report = check_rollups(conn, sync=not args.no_sync)
+        for table, diff in report["tables"].items():
+            print(
+                f"{table}: {len(diff['missing'])} missing, {len(diff['extra'])} extra, "
+                f"{len(diff['mismatched'])} mismatched"
+            )
+            for item in diff["mismatched"][:5]:
+                print(f"  {item['key']}: stored={item['stored']} expected={item['expected']}")
+        print("[OK] Rollups consistent" if report["ok"] else "[WARN] Rollups drifted; run 'rebuild'")
+        return 0 if report["ok"] else 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
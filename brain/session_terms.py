@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Term-frequency tables for the Brain metrics endpoint.
+
+/brain/metrics reports the most frequent confusions, weak anchors, concepts
+and issues across every session. Rather than re-reading and re-parsing the
+free-text columns of all sessions per request, each session's items are
+parsed once into postings and rolled up into per-term counts.
+
+Tables (created in db_setup.init_database):
+  session_term_postings  one row per parsed item: (session_id, kind, pos) ->
+                         normalized key, original text, session course
+  session_term_freq      one row per (kind, key): count, plus the text and
+                         course of its first occurrence (lowest session id)
+  session_term_queue     session ids touched since the last sync
+
+Triggers on sessions queue the ids whose text or topic columns changed;
+sync_terms() re-parses only those sessions and recounts only the keys they
+touched. Like the dashboard rollups, writers call it after committing (see
+session_rollups.sync_after_session_write) and init_database drains anything
+left queued; /brain/metrics only reads. A missing or stale version stamp
+(kept in session_rollup_meta) triggers a full rebuild.
+
+Usage:
+    python session_terms.py rebuild
+    python session_terms.py check
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Bump when parsing or keying changes; readers rebuild.
+TERMS_VERSION = "1"
+
+# kind -> columns tried in order (first non-empty wins)
+TERM_SOURCES = {
+    "confusion": ("confusions", "errors_conceptual", "gaps_identified"),
+    "weak_anchor": ("weak_anchors",),
+    "concept": ("concepts", "subtopics"),
+    "issue": ("issues", "what_needs_fixing"),
+}
+TEXT_COLUMNS = sorted({c for cols in TERM_SOURCES.values() for c in cols})
+
+_SESSION_COLUMNS = ["id", "main_topic", "topic"] + TEXT_COLUMNS
+
+
+def parse_json_array(value) -> List[str]:
+    """Parse a list-ish column: JSON array, else comma-separated text."""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(v) for v in value if v is not None]
+    if isinstance(value, str):
+        trimmed = value.strip()
+        if not trimmed:
+            return []
+        try:
+            parsed = json.loads(trimmed)
+            if isinstance(parsed, list):
+                return [str(v) for v in parsed if v is not None]
+        except Exception:
+            pass
+        return [v.strip() for v in trimmed.split(",") if v.strip()]
+    return [str(value)]
+
+
+def session_course(row) -> str:
+    return row["main_topic"] or row["topic"] or "General"
+
+
+def _postings(rows: Iterable) -> List[Tuple]:
+    """(session_id, kind, pos, key, text, course) for every item in `rows`."""
+    out = []
+    for row in rows:
+        course = session_course(row)
+        for kind, columns in TERM_SOURCES.items():
+            value = None
+            for column in columns:
+                value = value or row[column]
+            for pos, item in enumerate(parse_json_array(value)):
+                key = item.lower().strip()
+                if key:
+                    out.append((row["id"], kind, pos, key, item, course))
+    return out
+
+
+def _select_sessions(conn: sqlite3.Connection, where: str = "", params: Iterable = ()):
+    cur = conn.cursor()
+    cur.row_factory = sqlite3.Row
+    return cur.execute(f"SELECT {', '.join(_SESSION_COLUMNS)} FROM sessions {where}", tuple(params))
+
+
+def _insert_postings(conn: sqlite3.Connection, postings: List[Tuple]) -> None:
+    conn.executemany(
+        """
+        INSERT INTO session_term_postings (session_id, kind, pos, key, text, course)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        postings,
+    )
+
+
+# First occurrence = lowest (session_id, pos), i.e. the order a full scan of
+# sessions would meet it in.
+_FREQ_SELECT = """
+    SELECT kind, key, n, session_id, pos, text, course FROM (
+        SELECT p.*,
+               COUNT(*) OVER w AS n,
+               ROW_NUMBER() OVER (w ORDER BY session_id, pos) AS rn
+        FROM session_term_postings p
+        {where}
+        WINDOW w AS (PARTITION BY kind, key)
+    ) WHERE rn = 1
+"""
+_FREQ_INSERT = """
+    INSERT INTO session_term_freq
+        (kind, key, count, first_session_id, first_pos, text, course)
+"""
+
+
+def _stamp(conn: sqlite3.Connection, **values) -> None:
+    conn.executemany(
+        "INSERT OR REPLACE INTO session_rollup_meta (name, value) VALUES (?, ?)",
+        [(f"terms_{k}", v) for k, v in values.items()],
+    )
+
+
+def terms_version(conn: sqlite3.Connection) -> Optional[str]:
+    row = conn.execute(
+        "SELECT value FROM session_rollup_meta WHERE name = 'terms_version'"
+    ).fetchone()
+    return row[0] if row else None
+
+
+def rebuild_terms(conn: sqlite3.Connection, batch_size: int = 1000) -> dict:
+    """Re-parse every session and recount all terms."""
+    conn.execute("DELETE FROM session_term_postings")
+    conn.execute("DELETE FROM session_term_freq")
+    conn.execute("DELETE FROM session_term_queue")
+    cur = _select_sessions(conn)
+    postings = 0
+    while True:
+        rows = cur.fetchmany(batch_size)
+        if not rows:
+            break
+        batch = _postings(rows)
+        _insert_postings(conn, batch)
+        postings += len(batch)
+    conn.execute(_FREQ_INSERT + _FREQ_SELECT.format(where=""))
+    terms = conn.execute("SELECT COUNT(*) FROM session_term_freq").fetchone()[0]
+    now = datetime.now().isoformat(timespec="seconds")
+    _stamp(conn, version=TERMS_VERSION, rebuilt_at=now, updated_at=now)
+    conn.commit()
+    return {"postings": postings, "terms": terms}
+
+
+def _refresh_sessions(conn: sqlite3.Connection, ids: List[int]) -> None:
+    """Re-parse the given sessions and recount every key they had or have."""
+    placeholders = ",".join("?" * len(ids))
+    affected: Set[Tuple[str, str]] = {
+        tuple(r)
+        for r in conn.execute(
+            f"SELECT DISTINCT kind, key FROM session_term_postings WHERE session_id IN ({placeholders})",
+            ids,
+        )
+    }
+    conn.execute(f"DELETE FROM session_term_postings WHERE session_id IN ({placeholders})", ids)
+    postings = _postings(_select_sessions(conn, f"WHERE id IN ({placeholders})", ids).fetchall())
+    _insert_postings(conn, postings)
+    affected.update((p[1], p[3]) for p in postings)
+
+    keys = [list(k) for k in affected]
+    conn.executemany("DELETE FROM session_term_freq WHERE kind = ? AND key = ?", keys)
+    conn.executemany(
+        _FREQ_INSERT + _FREQ_SELECT.format(where="WHERE kind = ? AND key = ?"),
+        keys,
+    )
+
+
+def sync_terms(conn: sqlite3.Connection, batch_size: int = 500) -> int:
+    """Bring the term tables up to date. Returns queued sessions processed.
+
+    Rebuilds everything when the version stamp is missing or stale. Raises
+    sqlite3.OperationalError if the term tables are missing.
+    """
+    if terms_version(conn) != TERMS_VERSION:
+        rebuild_terms(conn)
+        return 0
+
+    processed = 0
+    while True:
+        ids = [
+            row[0]
+            for row in conn.execute(
+                "SELECT session_id FROM session_term_queue LIMIT ?", (batch_size,)
+            ).fetchall()
+        ]
+        if not ids:
+            return processed
+        _refresh_sessions(conn, ids)
+        conn.executemany(
+            "DELETE FROM session_term_queue WHERE session_id = ?", [(i,) for i in ids]
+        )
+        _stamp(conn, updated_at=datetime.now().isoformat(timespec="seconds"))
+        conn.commit()
+        processed += len(ids)
+
+
+def top_terms(conn: sqlite3.Connection, kind: str, limit: int = 10) -> List[sqlite3.Row]:
+    """Most frequent terms of a kind; ties keep first-occurrence order."""
+    cur = conn.cursor()
+    cur.row_factory = sqlite3.Row
+    return cur.execute(
+        """
+        SELECT key, text, course, count
+        FROM session_term_freq
+        WHERE kind = ?
+        ORDER BY count DESC, first_session_id, first_pos
+        LIMIT ?
+        """,
+        (kind, limit),
+    ).fetchall()
+
+
+def _count_terms(conn: sqlite3.Connection) -> Dict[Tuple[str, str], Tuple]:
+    """(kind, key) -> (count, text, course) from a fresh parse of sessions."""
+    counts: Dict[Tuple[str, str], Tuple] = {}
+    for _, kind, _, key, text, course in _postings(_select_sessions(conn, "ORDER BY id")):
+        if (kind, key) in counts:
+            n, text, course = counts[(kind, key)]
+            counts[(kind, key)] = (n + 1, text, course)
+        else:
+            counts[(kind, key)] = (1, text, course)
+    return counts
+
+
+def check_terms(conn: sqlite3.Connection, sync: bool = True) -> dict:
+    """Diff session_term_freq against a full re-parse of sessions."""
+    if sync:
+        sync_terms(conn)
+    expected = _count_terms(conn)
+    stored = {
+        (r[0], r[1]): (r[2], r[3], r[4])
+        for r in conn.execute("SELECT kind, key, count, text, course FROM session_term_freq")
+    }
+    diff = {
+        "missing": sorted(k for k in expected if k not in stored),
+        "extra": sorted(k for k in stored if k not in expected),
+        "mismatched": [
+            {"key": k, "stored": stored[k], "expected": expected[k]}
+            for k in sorted(expected)
+            if k in stored and stored[k] != expected[k]
+        ],
+    }
+    ok = not (diff["missing"] or diff["extra"] or diff["mismatched"])
+    return {"ok": ok, "version": terms_version(conn), **diff}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from db_setup import get_connection
+
+    parser = argparse.ArgumentParser(description="Brain metrics term-table maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="Re-parse all sessions into the term tables")
+    check = sub.add_parser("check", help="Diff term counts against a full re-parse")
+    check.add_argument("--no-sync", action="store_true", help="Do not apply queued updates first")
+    args = parser.parse_args(argv)
+
+    conn = get_connection()
+    try:
+        if args.command == "rebuild":
+            counts = rebuild_terms(conn)
+            print(f"[OK] {counts['terms']} term(s) from {counts['postings']} item(s)")
+            return 0
+        report = check_terms(conn, sync=not args.no_sync)
+        if report["ok"]:
+            print("[OK] Term counts match sessions")
+            return 0
+        print(
+            f"[WARN] {len(report['missing'])} missing, {len(report['extra'])} extra, "
+            f"{len(report['mismatched'])} mismatched term(s)"
+        )
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
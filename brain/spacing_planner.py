@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Spaced-repetition review tasks from session weak_anchors.
+
+Each weak anchor from a recent session (last 30 days) gets four review
+tasks in study_tasks (source='spacing'), scheduled 1-3-7-21 days after the
+newest session that mentions it (1-4-9-21 for 'rsr-adaptive').
+
+Anchors are parsed once and de-duplicated in memory, then all tasks go in
+with one executemany against the unique idx_study_tasks_anchor_review index
+(ON CONFLICT DO NOTHING), so existing reviews are never duplicated and the
+write transaction only lasts for that insert. Incremental runs only scan
+sessions whose change stamp is newer than planner_settings.spacing_watermark.
+
+Usage:
+    python spacing_planner.py          # incremental
+    python spacing_planner.py --full   # rescan the whole 30-day window
+"""
+
+import argparse
+import re
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Tuple
+
+SPACING_INTERVALS = {
+    "standard": [1, 3, 7, 21],
+    "rsr-adaptive": [1, 4, 9, 21],  # slightly longer gaps for RSR-adaptive
+}
+WINDOW_DAYS = 30
+
+_ANCHOR_SPLIT = re.compile(r"[;\n]")
+_CHANGED = "COALESCE(updated_at, created_at)"
+
+
+def parse_anchors(text: str) -> List[str]:
+    """Split a weak_anchors field on ';' and newlines."""
+    return [a.strip() for a in _ANCHOR_SPLIT.split(text or "") if a.strip()]
+
+
+def collect_anchors(rows: Iterable[Tuple[str, str]]) -> Dict[str, str]:
+    """
+    Map each anchor to the session_date it should be scheduled from.
+
+    `rows` are (session_date, weak_anchors) newest first; the first (newest)
+    session mentioning an anchor wins.
+    """
+    anchors: Dict[str, str] = {}
+    for session_date, text in rows:
+        for anchor in parse_anchors(text):
+            anchors.setdefault(anchor, session_date)
+    return anchors
+
+
+def generate_spacing_tasks(conn: sqlite3.Connection, incremental: bool = True) -> Dict:
+    """
+    Insert missing spacing review tasks and commit.
+
+    Returns counts plus elapsed_ms. Falls back to a full scan when no
+    watermark has been recorded yet.
+    """
+    start = time.perf_counter()
+    settings = conn.execute(
+        """
+        SELECT spacing_strategy, default_session_minutes, spacing_watermark
+        FROM planner_settings WHERE id = 1
+        """
+    ).fetchone() or (None, None, None)
+    strategy, default_minutes, watermark = settings
+    intervals = SPACING_INTERVALS.get(strategy, SPACING_INTERVALS["standard"])
+    default_minutes = default_minutes if default_minutes is not None else 45
+
+    # Read the new watermark first; rows written during the run are rescanned next time.
+    new_watermark = conn.execute(f"SELECT MAX({_CHANGED}) FROM sessions").fetchone()[0]
+
+    incremental = bool(incremental and watermark)
+    where = f"AND {_CHANGED} > ?" if incremental else ""
+    params = (f"-{WINDOW_DAYS} days",) + ((watermark,) if incremental else ())
+    rows = conn.execute(
+        f"""
+        SELECT session_date, weak_anchors
+        FROM sessions
+        WHERE weak_anchors IS NOT NULL AND weak_anchors != ''
+          AND session_date >= date('now', ?)
+          {where}
+        ORDER BY session_date DESC, id DESC
+        """,
+        params,
+    ).fetchall()
+    anchors = collect_anchors(rows)
+
+    tasks = [
+        (
+            session_date, str(days), default_minutes,
+            f"Review R{i + 1}: {anchor} (from {session_date})",
+            4 - i,  # R1 = priority 4 ... R4 = 1
+            i + 1, anchor,
+        )
+        for anchor, session_date in anchors.items()
+        for i, days in enumerate(intervals)
+    ]
+
+    before = conn.total_changes
+    conn.executemany(
+        """
+        INSERT INTO study_tasks (
+            scheduled_date, planned_minutes,
+            status, notes, source, priority, review_number,
+            anchor_text, created_at
+        ) VALUES (
+            date(?, '+' || ? || ' days'), ?,
+            'pending', ?, 'spacing', ?, ?,
+            ?, datetime('now')
+        )
+        ON CONFLICT DO NOTHING
+        """,
+        tasks,
+    )
+    created = conn.total_changes - before
+    if new_watermark:
+        conn.execute(
+            "UPDATE planner_settings SET spacing_watermark = ? WHERE id = 1",
+            (new_watermark,),
+        )
+    conn.commit()
+
+    return {
+        "tasks_created": created,
+        "sessions_scanned": len(rows),
+        "anchors": len(anchors),
+        "incremental": incremental,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate spaced-repetition review tasks")
+    parser.add_argument("--full", action="store_true", help="Ignore the watermark and rescan")
+    args = parser.parse_args(argv)
+
+    from db_setup import get_connection, init_database
+
+    init_database()
+    conn = get_connection()
+    try:
+        result = generate_spacing_tasks(conn, incremental=not args.full)
+    finally:
+        conn.close()
+    print(
+        f"[OK] {result['tasks_created']} task(s) from {result['anchors']} anchor(s) "
+        f"in {result['sessions_scanned']} session(s), {result['elapsed_ms']} ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
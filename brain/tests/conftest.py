@@ -1,5 +1,80 @@
-"""Ensure brain/ is on sys.path so tests can import brain packages."""
+"""Ensure brain/ and scholar/ are on sys.path; fixtures shared across test modules."""
+import json
+import random
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scholar"))
+
+import brain_reader  # noqa: E402
+import db_setup  # noqa: E402
+
+
+@pytest.fixture
+def reader_db(tmp_path, monkeypatch):
+    """Fresh database that both db_setup and scholar's brain_reader point at."""
+    db_path = str(tmp_path / "pt_study.db")
+    monkeypatch.setattr(db_setup, "DB_PATH", db_path)
+    monkeypatch.setattr(brain_reader, "_DB_PATH_STR", db_path)
+    db_setup.init_database()
+    yield
+
+
+def _seed_sessions(n_sessions=60, seed=5):
+    rng = random.Random(seed)
+    topics = ["Brachial plexus", "brachial plexus ", "Gait", "Knee ligaments", None]
+    now = datetime.now()
+    sessions, turns = [], []
+    for i in range(n_sessions):
+        stamp = now - timedelta(hours=9 * i)
+        sessions.append((
+            stamp.strftime("%Y-%m-%d"),
+            stamp.strftime("%H:%M"),
+            rng.choice([0, 10, 45, 120]),
+            rng.choice(["Core", "Sprint"]),
+            rng.choice(topics),
+            rng.choice([None, "No", "yes", ""]),
+            rng.choice([None, 1, 2, 4]),
+            rng.choice([None, "", "none", "Wandered into pharmacology"]),
+            stamp.isoformat(),
+        ))
+        for t in range(rng.choice([0, 0, 1, 3])):
+            turns.append((
+                f"sess-{i}",
+                t + 1,
+                "q" * rng.randint(1, 40),
+                rng.choice([None, "a" * rng.randint(1, 80)]),
+                rng.choice([None, "", "not json", "{}", json.dumps([{"s": 1}]), json.dumps([1, 2, 3])]),
+                rng.choice([0, 1, None]),
+                (stamp + timedelta(minutes=t)).isoformat(),
+            ))
+    conn = db_setup.get_connection()
+    conn.executemany(
+        """
+        INSERT INTO sessions (
+            session_date, session_time, duration_minutes, study_mode, main_topic,
+            wrap_phase_reached, understanding_level, off_source_drift, created_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        sessions,
+    )
+    conn.executemany(
+        """
+        INSERT INTO tutor_turns (
+            session_id, turn_number, question, answer, citations_json, unverified, created_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        turns,
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def seed_sessions(reader_db):
+    """seed_sessions(n_sessions=60, seed=5): random sessions plus tutor turns."""
+    return _seed_sessions
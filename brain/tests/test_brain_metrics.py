@@ -0,0 +1,158 @@
+import json
+import random
+import sqlite3
+import time
+
+import pytest
+
+import db_setup
+from dashboard.app import create_app
+from session_rollups import sync_after_session_write
+from session_terms import check_terms, parse_json_array
+
+ITEMS = ["Brachial plexus", "brachial plexus ", "Rotator cuff", "Gait", "Knee, ACL", "", "MCL"]
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_setup, "DB_PATH", str(tmp_path / "pt_study.db"))
+    db_setup.init_database()
+    yield
+
+
+def _text(rng):
+    picked = rng.sample(ITEMS, rng.randint(0, 4))
+    return rng.choice([json.dumps(picked), ", ".join(picked), None, ""])
+
+
+def _seed(n=120, seed=5):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        rows.append((
+            f"2026-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}", f"{i // 60:02d}:{i % 60:02d}",
+            rng.choice(["Core", "Sprint", ""]), rng.choice(["Anatomy", "", None]),
+            rng.choice(["Neuro", None]), rng.choice(["", 0, 30, 45]), rng.choice([None, 0, 25, 60]),
+            rng.choice([None, 0, 12]), rng.choice([None, 3, 4]), rng.choice([None, 2, 5]),
+            _text(rng), _text(rng), _text(rng), _text(rng), _text(rng),
+            _text(rng), _text(rng), _text(rng), "2026-10-01T00:00:00",
+        ))
+    conn = db_setup.get_connection()
+    conn.executemany(
+        """INSERT INTO sessions (session_date, session_time, study_mode, main_topic, topic,
+               time_spent_minutes, duration_minutes, anki_cards_count, understanding_level,
+               retention_confidence, confusions, errors_conceptual, gaps_identified,
+               weak_anchors, concepts, subtopics, issues, what_needs_fixing, created_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        rows,
+    )
+    conn.commit()
+    sync_after_session_write(conn)
+    conn.close()
+
+
+def _legacy_metrics():
+    """The full-table Python fold the endpoint replaced (sans averages/staleTopics)."""
+    conn = db_setup.get_connection()
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute("SELECT * FROM sessions").fetchall()
+    conn.close()
+    courses, modes, maps = {}, {}, {k: {} for k in ("c", "w", "k", "i")}
+    total_minutes = total_cards = 0
+    for row in rows:
+        course = row["main_topic"] or row["topic"] or "General"
+        minutes = row["time_spent_minutes"]
+        duration = row["duration_minutes"]
+        if minutes in (None, "") or (minutes == 0 and duration not in (None, "", 0)):
+            minutes = duration
+        minutes = minutes or 0
+        total_minutes += minutes
+        total_cards += row["anki_cards_count"] or 0
+        c = courses.setdefault(course, {"course": course, "count": 0, "minutes": 0})
+        c["count"] += 1
+        c["minutes"] += minutes
+        mode = row["study_mode"] or "study"
+        m = modes.setdefault(mode, {"mode": mode, "count": 0, "minutes": 0})
+        m["count"] += 1
+        m["minutes"] += minutes
+        for name, value, label in (
+            ("c", row["confusions"] or row["errors_conceptual"] or row["gaps_identified"], "text"),
+            ("w", row["weak_anchors"], "text"),
+            ("k", row["concepts"] or row["subtopics"], None),
+            ("i", row["issues"] or row["what_needs_fixing"], "issue"),
+        ):
+            for item in parse_json_array(value):
+                key = item.lower().strip()
+                if not key:
+                    continue
+                if key in maps[name]:
+                    maps[name][key]["count"] += 1
+                elif label:
+                    maps[name][key] = {label: item, "count": 1, "course": course}
+                else:
+                    maps[name][key] = {"concept": key, "count": 1}
+
+    def top(values, limit=None):
+        return sorted(values, key=lambda x: x["count"], reverse=True)[:limit]
+
+    return {
+        "sessionsPerCourse": top(courses.values()),
+        "modeDistribution": top(modes.values()),
+        "recentConfusions": top(maps["c"].values(), 10),
+        "recentWeakAnchors": top(maps["w"].values(), 10),
+        "conceptFrequency": top(maps["k"].values(), 10),
+        "issuesLog": top(maps["i"].values(), 10),
+        "totalMinutes": total_minutes,
+        "totalSessions": len(rows),
+        "totalCards": total_cards,
+    }
+
+
+def _metrics(client):
+    body = client.get("/api/brain/metrics").get_json()
+    return {k: body[k] for k in _legacy_metrics()}
+
+
+def test_metrics_match_full_scan_after_edits(temp_db):
+    _seed()
+    client = create_app().test_client()
+    assert _metrics(client) == _legacy_metrics()
+
+    conn = db_setup.get_connection()
+    conn.execute("UPDATE sessions SET confusions = '[\"Gait\", \"gait\"]', main_topic = 'Ortho' WHERE id % 7 = 0")
+    conn.execute("UPDATE sessions SET weak_anchors = NULL WHERE id % 5 = 0")
+    conn.execute("DELETE FROM sessions WHERE id % 11 = 0")
+    conn.commit()
+    # The endpoint only reads; raw writes wait in the queue for the next writer.
+    queued = conn.execute("SELECT COUNT(*) FROM session_term_queue").fetchone()[0]
+    assert queued
+    _metrics(client)
+    assert conn.execute("SELECT COUNT(*) FROM session_term_queue").fetchone()[0] == queued
+
+    sync_after_session_write(conn)
+    assert _metrics(client) == _legacy_metrics()
+    assert check_terms(conn)["ok"]
+    conn.close()
+
+
+def test_metrics_conditional_requests(temp_db):
+    _seed(n=10)
+    client = create_app().test_client()
+    first = client.get("/api/brain/metrics")
+    etag = first.headers["ETag"]
+    stamp = first.get_json()["lastModified"]
+    assert first.headers["Last-Modified"]
+
+    assert client.get("/api/brain/metrics", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(f"/api/brain/metrics?since={stamp}").get_json() == {
+        "changed": False, "lastModified": stamp,
+    }
+
+    time.sleep(0.01)  # change stamps have millisecond resolution
+    conn = db_setup.get_connection()
+    conn.execute("DELETE FROM sessions WHERE id = 1")
+    conn.commit()
+    conn.close()
+    fresh = client.get("/api/brain/metrics", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200 and fresh.headers["ETag"] != etag
+    assert client.get(f"/api/brain/metrics?since={stamp}").get_json()["totalSessions"] == 9
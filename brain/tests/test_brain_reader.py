@@ -0,0 +1,69 @@
+import sqlite3
+
+import pytest
+
+import brain_reader
+import db_setup
+import friction_alerts
+
+
+def _record_fields(record):
+    d = dict(vars(record))
+    d.pop("_raw")
+    return d
+
+
+def test_batch_methods_match_single_row_lookups(reader_db, seed_sessions):
+    seed_sessions()
+    with brain_reader.BrainReader() as reader:
+        by_id = reader.get_sessions_by_ids([3, 1, 999, 2])
+        streamed = [r.id for r in reader.iter_sessions(batch_size=7)]
+        metrics = reader.get_turn_metrics_for_sessions(["sess-0", "sess-5", "missing"])
+
+    assert sorted(by_id) == [1, 2, 3]
+    for sid, record in by_id.items():
+        assert _record_fields(record) == _record_fields(brain_reader.get_session_by_id(sid))
+        assert "off_source_drift" in record._raw and "raw_input" not in record._raw
+
+    assert streamed == [s.id for s in brain_reader.get_all_sessions()]
+    assert "missing" not in metrics
+    for sid, row in metrics.items():
+        assert row == brain_reader.calculate_session_metrics(sid)
+
+
+def test_alert_run_issues_fixed_query_count(reader_db, seed_sessions):
+    counts = []
+    for n in (10, 120):
+        conn = db_setup.get_connection()
+        conn.execute("DELETE FROM sessions")
+        conn.execute("DELETE FROM tutor_turns")
+        conn.commit()
+        conn.close()
+        seed_sessions(n_sessions=n, seed=n)
+        with brain_reader.BrainReader() as reader:
+            friction_alerts.get_alert_summary(days=3650)
+            counts.append(reader.query_count)
+    assert counts[0] == counts[1]
+
+
+def test_module_functions_share_read_only_connection(reader_db, seed_sessions):
+    seed_sessions(n_sessions=5)
+    with brain_reader.BrainReader() as reader:
+        before = reader.query_count
+        assert brain_reader.get_session_count() == 5
+        assert brain_reader.get_audit_summary(3650)["sessions_count"] == 5
+        assert reader.query_count > before
+        with pytest.raises(sqlite3.OperationalError):
+            reader.conn.execute("DELETE FROM sessions")
+
+    conn = db_setup.get_connection()
+    assert conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 5
+    conn.close()
+
+
+def test_reader_degrades_without_database(tmp_path):
+    with brain_reader.BrainReader(tmp_path / "missing.db") as reader:
+        assert reader.get_sessions_by_ids([1]) == {}
+        assert list(reader.iter_sessions()) == []
+        assert reader.get_turn_metrics_for_sessions(["sess-1"]) == {}
+        assert reader.get_change_cursor() is None
@@ -0,0 +1,301 @@
+"""Tests for the MinHash LSH candidate index in card_dedupe."""
+
+import random
+import sqlite3
+import time
+from difflib import SequenceMatcher
+
+import pytest
+
+import card_dedupe
+import db_setup
+
+MUSCLES = [
+    "gluteus maximus", "gluteus medius", "biceps femoris", "supraspinatus",
+    "infraspinatus", "teres minor", "subscapularis", "deltoid", "psoas major",
+    "sartorius", "tibialis anterior", "gastrocnemius", "piriformis",
+]
+ATTRS = ["origin", "insertion", "innervation", "action", "blood supply"]
+TEMPLATES = [
+    "What is the {a} of the {m}?",
+    "What is the {a} of {m}?",
+    "Describe the {a} of the {m}.",
+    "{m}: {a}?",
+    "Name the {a} of {m}",
+]
+
+
+@pytest.fixture
+def card_db(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "pt_study.db")
+    monkeypatch.setattr(db_setup, "DB_PATH", db_path)
+    db_setup.init_database()
+    return db_path
+
+
+def _insert(db_path, fronts, deck="PT_Study", status="draft"):
+    conn = sqlite3.connect(db_path)
+    cur = conn.cursor()
+    ids = []
+    for front in fronts:
+        cur.execute(
+            """INSERT INTO card_drafts (deck_name, front, back, status, created_at)
+               VALUES (?, ?, 'back', ?, '2026-01-01T00:00:00')""",
+            (deck, front, status),
+        )
+        ids.append(cur.lastrowid)
+    conn.commit()
+    conn.close()
+    return ids
+
+
+def _raise_operational(*args):
+    raise sqlite3.OperationalError("no such table: card_minhash_bands")
+
+
+def _full_scan(db_path, front, threshold=0.85, limit=1000):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        # Index unavailable -> _find_similar scans every draft.
+        candidates = card_dedupe._candidate_rows
+        card_dedupe._candidate_rows = _raise_operational
+        return card_dedupe._find_similar(conn, front, threshold, limit=limit)
+    finally:
+        card_dedupe._candidate_rows = candidates
+        conn.close()
+
+
+def test_lsh_matches_full_scan_on_synthetic_deck(card_db):
+    rng = random.Random(3)
+
+    def gen():
+        return rng.choice(TEMPLATES).format(a=rng.choice(ATTRS), m=rng.choice(MUSCLES))
+
+    _insert(card_db, [gen() for _ in range(300)])
+    for _ in range(40):
+        query = gen()
+        assert card_dedupe.find_similar_cards(query, limit=1000) == _full_scan(card_db, query)
+
+
+def _queue_size(conn):
+    return conn.execute("SELECT COUNT(*) FROM card_minhash_queue").fetchone()[0]
+
+
+def test_index_follows_inserts_status_changes_and_deletes(card_db):
+    front = "What is the origin of the gluteus maximus?"
+    (card_id,) = _insert(card_db, [front])
+
+    # Raw inserts wait in the queue; lookups still see them and never write.
+    result = card_dedupe.check_card_duplicate("what is the ORIGIN of the gluteus maximus")
+    assert result["is_duplicate"] and result["similar_cards"][0]["match_type"] == "exact"
+    conn = sqlite3.connect(card_db)
+    assert _queue_size(conn) == 1
+    assert card_dedupe.refresh_card_index(conn) == 1
+    assert _queue_size(conn) == 0
+    assert card_dedupe.find_similar_cards(front)[0]["id"] == card_id
+
+    conn.execute("UPDATE card_drafts SET status = 'rejected' WHERE id = ?", (card_id,))
+    conn.commit()
+    assert card_dedupe.find_similar_cards(front) == []
+    card_dedupe.refresh_card_index(conn)
+    assert conn.execute("SELECT COUNT(*) FROM card_minhash_bands").fetchone()[0] == 0
+
+    conn.execute("UPDATE card_drafts SET status = 'draft' WHERE id = ?", (card_id,))
+    conn.commit()
+    assert card_dedupe.find_similar_cards(front)[0]["id"] == card_id
+
+    conn.execute("DELETE FROM card_drafts WHERE id = ?", (card_id,))
+    conn.commit()
+    assert conn.execute("SELECT COUNT(*) FROM card_minhash_bands").fetchone()[0] == 0
+    conn.close()
+
+
+def test_lookups_do_not_take_the_write_lock(card_db):
+    ids = _insert(card_db, ["What is the action of the deltoid?"])
+    blocker = sqlite3.connect(card_db)
+    blocker.execute("BEGIN IMMEDIATE")
+    started = time.perf_counter()
+    try:
+        similar = card_dedupe.find_similar_cards("what is the action of the deltoid")
+    finally:
+        blocker.rollback()
+        blocker.close()
+    # A lookup that synced the index would wait out the 5s busy timeout.
+    assert time.perf_counter() - started < 2
+    assert [c["id"] for c in similar] == ids
+    conn = sqlite3.connect(card_db)
+    assert _queue_size(conn) == 1
+    conn.close()
+
+
+def test_backfill_and_low_threshold_full_scan(card_db):
+    ids = _insert(card_db, ["Name the insertion of deltoid", "Deltoid insertion?"])
+    conn = sqlite3.connect(card_db)
+    conn.execute("DELETE FROM card_minhash_bands")
+    conn.execute("DELETE FROM card_minhash_queue")
+    conn.execute("DROP TABLE card_minhash_bands")
+    conn.commit()
+    conn.close()
+
+    db_setup.init_database()  # recreates the index and queues existing drafts
+    assert card_dedupe.find_similar_cards("Name the insertion of the deltoid")[0]["id"] == ids[0]
+
+    # Below LSH_MIN_RATIO the lookup is an exhaustive scan.
+    loose = card_dedupe.find_similar_cards("deltoid insertion site", threshold=0.3)
+    assert loose == _full_scan(card_db, "deltoid insertion site", 0.3, limit=10)
+
+
+def test_dedupe_batch_in_batch_and_db_duplicates(card_db):
+    (existing,) = _insert(card_db, ["What is the action of the piriformis?"])
+    cards = [
+        {"front": "What is the innervation of sartorius?"},
+        {"front": "What is the innervation of the sartorius?"},
+        {"front": "what is the action of the piriformis"},
+        {"front": "Describe the blood supply of the soleus."},
+        {"front": ""},
+    ]
+    unique, duplicates = card_dedupe.dedupe_batch(cards)
+
+    assert [c["front"] for c in unique] == [
+        "What is the innervation of sartorius?",
+        "Describe the blood supply of the soleus.",
+        "",
+    ]
+    assert duplicates[0]["duplicate_reason"] == "Duplicate within batch"
+    assert duplicates[1]["duplicate_of"] == f"db:{existing}"
+
+
+def test_ratio_upper_bound_matches_quick_ratio():
+    from collections import Counter
+
+    rng = random.Random(11)
+    for _ in range(500):
+        a = "".join(rng.choice("ab cd") for _ in range(rng.randint(1, 15)))
+        b = "".join(rng.choice("ab cd") for _ in range(rng.randint(0, 15)))
+        matcher = SequenceMatcher(None, a, b)
+        bound = card_dedupe.ratio_upper_bound(Counter(a), len(a), b)
+        assert bound == pytest.approx(matcher.quick_ratio())
+        assert bound >= matcher.ratio() - 1e-12
+
+
+def _deck(n, seed):
+    rng = random.Random(seed)
+    fronts = []
+    for _ in range(n):
+        if fronts and rng.random() < 0.2:
+            words = rng.choice(fronts).split()
+            words[-1] = words[-1] + "s"
+            fronts.append(" ".join(words))
+        else:
+            fronts.append(
+                rng.choice(TEMPLATES).format(a=rng.choice(ATTRS), m=rng.choice(MUSCLES))
+                + " " + "".join(rng.choice("abcdefghij") for _ in range(8))
+            )
+    return [{"id": i + 1, "front": f} for i, f in enumerate(fronts)]
+
+
+def _components(n, pairs):
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    for i, j, *_ in pairs:
+        parent[max(find(i), find(j))] = min(find(i), find(j))
+    groups = {}
+    for i in range(n):
+        groups.setdefault(find(i), []).append(i)
+    return sorted(g for g in groups.values() if len(g) > 1)
+
+
+def test_bulk_pairs_cluster_like_exhaustive_ratio_and_blocking():
+    cards = _deck(150, seed=5)
+    norm = [card_dedupe.normalize_text(c["front"]) for c in cards]
+    exhaustive = [
+        (i, j)
+        for i in range(len(norm))
+        for j in range(i + 1, len(norm))
+        if SequenceMatcher(None, norm[j], norm[i]).ratio() >= 0.85
+    ]
+    default = card_dedupe.bulk_similar_pairs(norm, verify=True)
+    tiny_blocks = card_dedupe.bulk_similar_pairs(norm, verify=True, block_size=16)
+
+    # Repeated fronts are scored once, so compare clusters rather than raw pairs.
+    assert _components(len(norm), default) == _components(len(norm), exhaustive)
+    assert sorted(default) == sorted(tiny_blocks)
+
+    cosine = card_dedupe.bulk_similar_pairs(norm)
+    assert cosine and all(sim >= 0.85 for _, _, sim in cosine)
+
+
+def test_bulk_clusters_keep_earliest():
+    cards = [
+        {"id": 10, "front": "What is the origin of the gluteus maximus?"},
+        {"id": 11, "front": "Describe the blood supply of the soleus."},
+        {"id": 12, "front": "what is the origin of the gluteus maximus"},
+        {"id": 13, "front": "What is the origins of the gluteus maximus muscle?"},
+        {"id": 14, "front": ""},
+        {"id": 15, "front": ""},
+    ]
+    clusters = card_dedupe.bulk_duplicate_clusters(cards)
+
+    assert [c["ids"] for c in clusters] == [[10, 12, 13], [14, 15]]
+    details = {d["id"]: d for d in card_dedupe.cluster_duplicates(clusters, cards)}
+    assert details[12]["match_type"] == "exact" and details[12]["duplicate_of"] == 10
+    assert details[13]["match_type"] == "near"
+    assert details[15]["duplicate_of"] == 14
+
+
+def test_clean_old_duplicates_bulk_agrees_with_pairwise(card_db):
+    fronts = [c["front"] for c in _deck(60, seed=9)]
+    conn = sqlite3.connect(card_db)
+    conn.executemany(
+        """INSERT INTO card_drafts (front, back, status, created_at)
+           VALUES (?, 'back', 'draft', ?)""",
+        [(f, f"2025-01-01T00:00:{i:02d}") for i, f in enumerate(fronts)],
+    )
+    conn.commit()
+    conn.close()
+
+    pairwise = card_dedupe.clean_old_duplicates(days=30)
+    bulk = card_dedupe.clean_old_duplicates(days=30, bulk=True)
+    assert bulk["found"] >= 1
+    assert sorted(bulk["details"], key=lambda d: d["id"]) == pairwise["details"]
+    assert sum(c["size"] - 1 for c in bulk["clusters"]) == bulk["found"]
+
+    audit = card_dedupe.audit_duplicates(verify=True)
+    assert audit["cards"] == 60 and audit["duplicates"] == bulk["found"]
+    assert card_dedupe.audit_duplicates()["clusters"]
+
+
+def test_bulk_chain_only_rejects_direct_matches_of_kept_card(card_db):
+    fronts = [
+        "origin of the gluteus maximus",
+        "origin of the gluteus maximus muscle",
+        "origin of the gluteus maximus muscle fibers",
+    ]
+    a, b, c = (card_dedupe.normalize_text(f) for f in fronts)
+    assert SequenceMatcher(None, b, a).ratio() >= 0.85
+    assert SequenceMatcher(None, c, b).ratio() >= 0.85
+    assert SequenceMatcher(None, c, a).ratio() < 0.85
+
+    cards = [{"id": i + 1, "front": f} for i, f in enumerate(fronts)]
+    clusters = card_dedupe.bulk_duplicate_clusters(cards, verify=True)
+    assert [c["ids"] for c in clusters] == [[1, 2]]
+    assert [d["id"] for d in card_dedupe.cluster_duplicates(clusters, cards)] == [2]
+
+    conn = sqlite3.connect(card_db)
+    conn.executemany(
+        """INSERT INTO card_drafts (id, front, back, status, created_at)
+           VALUES (?, ?, 'back', 'draft', ?)""",
+        [(c["id"], c["front"], f"2025-01-01T00:00:0{c['id']}") for c in cards],
+    )
+    conn.commit()
+    result = card_dedupe.clean_old_duplicates(days=30, apply=True, bulk=True)
+    statuses = dict(conn.execute("SELECT id, status FROM card_drafts").fetchall())
+    conn.close()
+    assert result["marked"] == 1
+    assert statuses == {1: "draft", 2: "rejected", 3: "draft"}
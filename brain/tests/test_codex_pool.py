@@ -0,0 +1,106 @@
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+import codex_pool
+from codex_pool import OUTPUT, WORK_DIR, CodexPool
+
+
+@pytest.fixture
+def fake_codex(tmp_path):
+    """Stand-in for `codex exec`: reads the prompt on stdin, writes the last message."""
+    script = tmp_path / "fake_codex.py"
+    script.write_text(textwrap.dedent("""
+        import os, sys, time
+        args = sys.argv[1:]
+        prompt = sys.stdin.read()
+        print("started", flush=True)
+        if prompt.startswith("sleep"):
+            time.sleep(float(prompt.split()[1]))
+        if prompt == "fail":
+            sys.stderr.write("boom")
+            sys.exit(2)
+        out = args[args.index("--output-last-message") + 1]
+        with open(out, "w", encoding="utf-8") as f:
+            f.write(f"pid={os.getpid()} cwd={os.getcwd()} files={os.listdir('.')} prompt={prompt}")
+        open("scratch.txt", "w").close()
+        print('{"type": "turn.completed"}')
+    """))
+    return [sys.executable, str(script), "exec", "--cd", WORK_DIR, "--output-last-message", OUTPUT, "-"]
+
+
+def test_scratch_dir_cleanup_and_failures(fake_codex):
+    pool = CodexPool(size=1)
+    try:
+        first = pool.run(fake_codex, "one", timeout=10, isolated=True)
+        second = pool.run(fake_codex, "two", timeout=10, isolated=True)
+        assert first["returncode"] == 0 and first["output"].endswith("prompt=one")
+        assert first["output"].split()[0] != second["output"].split()[0]  # fresh process per job
+        # Each job starts in an emptied scratch dir, reused rather than leaked.
+        assert "files=[]" in second["output"]
+        work_dir = second["output"].split("cwd=")[1].split(" files=")[0]
+        assert work_dir == first["output"].split("cwd=")[1].split(" files=")[0]
+        assert '"turn.completed"' in second["stdout"]
+
+        failed = pool.run(fake_codex, "fail", timeout=10, isolated=True)
+        assert (failed["returncode"], failed["stderr"], failed["output"]) == (2, "boom", None)
+        stats = pool.stats()
+        assert (stats["completed"], stats["errors"], stats["busy"]) == (3, 0, 0)
+    finally:
+        pool.shutdown()
+    assert not Path(work_dir).parent.exists()
+
+
+def test_queueing_timeouts_and_cancellation(fake_codex):
+    pool = CodexPool(size=1)
+    try:
+        slow = pool.submit(fake_codex, "sleep 30", timeout=0.5, isolated=True)
+        queued = pool.submit(fake_codex, "never", timeout=10, isolated=True)
+        assert queued.cancel()
+        assert queued.result(timeout=1)["cancelled"]
+
+        result = slow.result(timeout=10)
+        assert result["timed_out"] and result["output"] is None
+
+        running = pool.submit(fake_codex, "sleep 30", isolated=True)
+        deadline = time.time() + 10
+        while pool.stats()["busy"] == 0 and time.time() < deadline:
+            time.sleep(0.05)
+        t0 = time.perf_counter()
+        assert running.cancel()
+        assert running.result(timeout=10)["cancelled"]
+        assert time.perf_counter() - t0 < 5
+        assert pool.run(fake_codex, "after", timeout=10, isolated=True)["output"].endswith("prompt=after")
+    finally:
+        pool.shutdown()
+
+
+def test_log_streams_while_the_job_runs(fake_codex, tmp_path):
+    pool = CodexPool(size=1)
+    log_path = tmp_path / "agent.log"
+    try:
+        with open(log_path, "w", encoding="utf-8") as log:
+            log.write("[agent] start\n")
+            job = pool.submit(fake_codex, "sleep 30", isolated=True, log=log)
+            deadline = time.time() + 10
+            while "started" not in log_path.read_text() and time.time() < deadline:
+                time.sleep(0.05)
+            assert not job.done()
+            assert log_path.read_text() == "[agent] start\nstarted\n"
+            assert job.cancel()
+            result = job.result(timeout=10)
+        assert result["cancelled"] and result["stdout"] == ""
+    finally:
+        pool.shutdown()
+
+
+def test_pool_size_comes_from_audit_manifest(tmp_path):
+    manifest = tmp_path / "audit_manifest.json"
+    manifest.write_text('{"multi_agent": {"enabled": true, "max_concurrency": 3}}')
+    assert codex_pool.manifest_concurrency(manifest) == 3
+    manifest.write_text('{"multi_agent": {"max_concurrency": 50}}')
+    assert codex_pool.manifest_concurrency(manifest) == codex_pool.MAX_POOL_SIZE
+    assert codex_pool.manifest_concurrency(tmp_path / "missing.json") == codex_pool.DEFAULT_POOL_SIZE
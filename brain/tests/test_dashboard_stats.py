@@ -0,0 +1,80 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import db_setup
+import session_rollups
+from dashboard import cli
+from dashboard.stats import build_stats, build_stats_from_sessions
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_setup, "DB_PATH", str(tmp_path / "pt_study.db"))
+    db_setup.init_database()
+    yield
+
+
+def _insert_sessions(n, seed=3):
+    rng = random.Random(seed)
+    topics = ["Brachial plexus", "Rotator cuff", "Gait", "Knee ligaments", "Spinal cord", "Cranial nerves"]
+    modes = ["Core", "Sprint", "Drill", "", None]
+    today = datetime.now()
+    rows = []
+    # Unique (date, time) per session so newest-first ordering has no ties
+    for i in range(n):
+        stamp = today - timedelta(minutes=97 * i)
+        rows.append((
+            stamp.strftime("%Y-%m-%d"),
+            stamp.strftime("%H:%M"),
+            rng.choice([0, 0, 25, 40]),
+            rng.choice([0, 30, 45, 60]),
+            rng.choice(modes) or "",
+            rng.choice(topics + [None]),
+            rng.choice(topics + ["", None]),
+            rng.choice(["", None, "KWIK; Anatomy", "PEIRRO/KWIK", "Anatomy, Jim Kwik"]),
+            rng.choice([None, 0, 3, 12]),
+            rng.choice([None, 1, 2, 3, 4, 5]),
+            rng.choice([None, 2, 3, 4, 5]),
+            rng.choice([None, 1, 3, 5]),
+            rng.choice(["", None, "Drawing helped", "Spacing"]),
+            rng.choice(["", None, "Too long", "Need more recall"]),
+            rng.choice(["", None, "term a; term b\n# heading\nterm c", "  "]),
+            rng.choice(["", None, "cards"]),
+            rng.choice(["", None, "watch"]),
+            rng.choice(["", None, "  ", "2024-01-02, 2024-01-05"]),
+            rng.choice(["", None, "mixed up C5/C6"]),
+            stamp.isoformat(),
+        ))
+    conn = db_setup.get_connection()
+    conn.executemany(
+        """
+        INSERT INTO sessions (
+            session_date, session_time, duration_minutes, time_spent_minutes,
+            study_mode, topic, main_topic, frameworks_used, anki_cards_count,
+            understanding_level, retention_confidence, system_performance,
+            what_worked, what_needs_fixing, glossary_entries, anki_cards_text,
+            wrap_watchlist, spaced_reviews, errors_conceptual, created_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    conn.commit()
+    session_rollups.sync_after_session_write(conn)
+    conn.close()
+
+
+def test_build_stats_empty_db(temp_db):
+    assert build_stats() == build_stats_from_sessions([])
+
+
+def test_build_stats_matches_reference_implementation(temp_db):
+    _insert_sessions(400)
+    expected = build_stats_from_sessions(cli.get_all_sessions())
+    actual = build_stats()
+
+    assert actual["counts"]["sessions"] == 400
+    assert actual["weak_areas"] or actual["strong_areas"]
+    expected["modes"] = dict(expected["modes"])
+    assert actual == expected
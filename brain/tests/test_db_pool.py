@@ -0,0 +1,89 @@
+import sqlite3
+import threading
+
+import pytest
+
+import db_pool
+import db_setup
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "pt_study.db")
+    monkeypatch.setattr(db_setup, "DB_PATH", path)
+    yield path
+    db_pool.get_pool(path).close_all()
+
+
+def test_connections_are_reused_and_reset(temp_db):
+    conn = db_setup.get_connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    conn.row_factory = sqlite3.Row
+    conn.execute("INSERT INTO sessions (session_date, session_time, study_mode, created_at) "
+                 "VALUES ('2026-01-01', '09:00', 'Core', '2026-01-01T09:00:00')")
+    conn.close()  # uncommitted: rolled back like a real close
+
+    again = db_setup.get_connection()
+    assert again is conn
+    assert again.row_factory is None
+    assert again.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 0
+
+    nested = db_setup.get_connection()
+    assert nested is not again  # checked-out handles are never shared
+    nested.close()
+    again.close()
+    assert db_pool.get_pool(temp_db).stats()["idle_write"] == 2
+
+
+def test_closing_twice_leaves_the_pooled_handle_usable(temp_db):
+    conn = db_setup.get_connection()
+    conn.close()
+    conn.close()
+    assert db_pool.get_pool(temp_db).stats()["idle_write"] == 1
+
+    again = db_setup.get_connection()
+    assert again is conn
+    assert again.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] == 0
+    again.close()
+
+
+def test_read_handles_are_query_only(temp_db):
+    conn = db_setup.get_connection(readonly=True)
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM sessions")
+    conn.close()
+    writer = db_setup.get_connection()
+    assert writer.execute("PRAGMA query_only").fetchone()[0] == 0
+    writer.close()
+
+
+def test_schema_initialized_once_per_process(temp_db, monkeypatch):
+    calls = []
+    real_init = db_setup.init_database
+
+    def counting_init(db_path=None):
+        calls.append(db_path)
+        real_init(db_path)
+
+    monkeypatch.setattr(db_setup, "init_database", counting_init)
+    for _ in range(5):
+        db_setup.get_connection().close()
+    assert len(calls) == 1
+
+    # A connection checked out on one thread can be closed and reused on another.
+    conn = db_setup.get_connection()
+    errors = []
+
+    def use():
+        try:
+            conn.execute("SELECT 1 FROM sessions").fetchall()
+            conn.close()
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    t = threading.Thread(target=use)
+    t.start()
+    t.join()
+    assert not errors
+    assert db_setup.get_connection() is conn
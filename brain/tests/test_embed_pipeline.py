@@ -0,0 +1,153 @@
+"""Tests for the batched, incremental embed_rag_docs pipeline (offline fakes)."""
+
+import sqlite3
+import threading
+
+import pytest
+
+import db_setup
+import rag_notes
+import tutor_rag
+
+
+class FakeEmbeddings:
+    """Deterministic embedder that records every request."""
+
+    def __init__(self, fail_on=None):
+        self.calls: list[list[str]] = []
+        self.fail_on = fail_on
+        self._lock = threading.Lock()
+
+    def __call__(self, texts):
+        with self._lock:
+            self.calls.append(list(texts))
+        if self.fail_on and any(self.fail_on in t for t in texts):
+            raise RuntimeError("embedding backend down")
+        return [[float(len(t)), float(sum(map(ord, t)) % 97)] for t in texts]
+
+
+class FakeSink:
+    def __init__(self):
+        self.vectors: dict[str, dict[str, list[float]]] = {}
+
+    def upsert(self, collection_name, ids, embeddings, texts, metadatas):
+        assert len(ids) == len(embeddings) == len(texts) == len(metadatas)
+        self.vectors.setdefault(collection_name, {}).update(zip(ids, embeddings))
+
+    def delete(self, collection_name, ids):
+        for chroma_id in ids:
+            self.vectors.get(collection_name, {}).pop(chroma_id, None)
+
+
+@pytest.fixture
+def rag_db(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "pt_study.db")
+    monkeypatch.setattr(db_setup, "DB_PATH", db_path)
+    monkeypatch.setattr(rag_notes, "DB_PATH", db_path)
+    monkeypatch.setattr(tutor_rag, "DB_PATH", db_path)
+    db_setup.init_database()
+    return db_path
+
+
+def _paragraphs(label, n):
+    return "\n\n".join(f"{label} paragraph {i}. " + "lorem ipsum dolor " * 20 for i in range(n))
+
+
+def _add_doc(content, source, corpus="materials"):
+    return rag_notes._upsert_rag_doc(
+        source_path=source,
+        doc_type="txt",
+        course_id=None,
+        topic_tags="",
+        content=content,
+        checksum=rag_notes._checksum(content),
+        metadata={},
+        corpus=corpus,
+    )
+
+
+def _embedding_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute(
+        "SELECT rag_doc_id, chunk_index, content_hash FROM rag_embeddings ORDER BY rag_doc_id, chunk_index"
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def test_batches_across_docs_and_skips_unchanged_on_rerun(rag_db):
+    _add_doc(_paragraphs("Hip", 6), "hip.md")
+    _add_doc(_paragraphs("Knee", 6), "knee.md")
+    _add_doc("SOP rule: always cite sources.", "rules.md", corpus="instructions")
+    _add_doc("   ", "empty.md")
+    fake, sink = FakeEmbeddings(), FakeSink()
+
+    first = tutor_rag.embed_rag_docs(embed_fn=fake, sink=sink, max_batch_tokens=100_000)
+    rows = _embedding_rows(rag_db)
+    assert first["embedded"] == 3
+    assert first["skipped"] == 1
+    assert first["total_chunks"] == len(rows) > 3
+    assert first["batches"] == 2  # one per collection, chunks from both materials docs packed together
+    assert first["tokens"] > 0 and first["chunks_per_s"] > 0
+    assert all(r[2] for r in rows)
+    assert set(sink.vectors) == {tutor_rag.COLLECTION_MATERIALS, tutor_rag.COLLECTION_INSTRUCTIONS}
+
+    fake.calls.clear()
+    second = tutor_rag.embed_rag_docs(embed_fn=fake, sink=sink)
+    assert fake.calls == []
+    assert second["total_chunks"] == 0
+    assert second["reused_chunks"] == len(rows)
+    assert second["skipped"] == 4
+
+
+def test_token_budget_splits_batches(rag_db):
+    _add_doc(_paragraphs("Ankle", 8), "ankle.md")
+    fake = FakeEmbeddings()
+
+    result = tutor_rag.embed_rag_docs(embed_fn=fake, sink=FakeSink(), max_batch_tokens=300, max_workers=3)
+    assert result["batches"] == len(fake.calls) > 1
+    assert sum(len(c) for c in fake.calls) == result["total_chunks"]
+
+
+def test_only_changed_chunks_are_reembedded(rag_db):
+    content = _paragraphs("Shoulder", 8)
+    _add_doc(content, "shoulder.md")
+    sink = FakeSink()
+    first = tutor_rag.embed_rag_docs(embed_fn=FakeEmbeddings(), sink=sink)
+
+    _add_doc(content + "\n\nNew closing paragraph about the rotator cuff.", "shoulder.md")
+    fake = FakeEmbeddings()
+    second = tutor_rag.embed_rag_docs(embed_fn=fake, sink=sink)
+    assert 0 < second["total_chunks"] < first["total_chunks"]
+    assert second["reused_chunks"] > 0
+    assert any("rotator cuff" in t for call in fake.calls for t in call)
+
+
+def test_failed_batch_is_reported_and_resumed(rag_db):
+    _add_doc(_paragraphs("Elbow", 3), "elbow.md")
+    _add_doc("Wrist flexors originate at the medial epicondyle.", "wrist.md")
+
+    broken = FakeEmbeddings(fail_on="Wrist")
+    first = tutor_rag.embed_rag_docs(embed_fn=broken, sink=FakeSink(), max_batch_tokens=50, max_workers=2)
+    assert first["errors"]
+    assert first["embedded"] == 1
+    done_before = len(_embedding_rows(rag_db))
+    assert done_before > 0
+
+    resumed = tutor_rag.embed_rag_docs(embed_fn=FakeEmbeddings(), sink=FakeSink())
+    assert resumed["errors"] == []
+    assert resumed["embedded"] == 1
+    assert resumed["reused_chunks"] == done_before
+
+
+def test_shrunk_document_drops_stale_chunks(rag_db):
+    _add_doc(_paragraphs("Spine", 8), "spine.md")
+    sink = FakeSink()
+    tutor_rag.embed_rag_docs(embed_fn=FakeEmbeddings(), sink=sink)
+
+    _add_doc("Spine paragraph 0. short now", "spine.md")
+    tutor_rag.embed_rag_docs(embed_fn=FakeEmbeddings(), sink=sink)
+
+    rows = _embedding_rows(rag_db)
+    assert [r[1] for r in rows] == [0]
+    assert list(sink.vectors[tutor_rag.COLLECTION_MATERIALS]) == [f"rag-{rows[0][0]}-0"]
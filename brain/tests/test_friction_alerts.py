@@ -0,0 +1,101 @@
+import json
+import time
+from datetime import datetime
+
+import brain_reader
+import db_setup
+import friction_alerts
+
+
+def _legacy_alerts(days):
+    """Per-session rule path the set-based engine replaced."""
+    alerts = []
+    for s in brain_reader.get_recent_sessions(days):
+        record = brain_reader.get_session_by_id(s["id"])
+        alerts.extend(friction_alerts.check_session_duration(record))
+        for check in (
+            friction_alerts.check_understanding_level,
+            friction_alerts.check_no_wrap_phase,
+            friction_alerts.check_source_drift,
+        ):
+            alerts.append(check(record))
+    alerts.extend(friction_alerts.check_repeated_topic_struggle(brain_reader.get_all_sessions()))
+    for sid in {t["session_id"] for t in brain_reader.get_recent_tutor_turns(days)}:
+        alerts.append(friction_alerts.check_unverified_ratio(sid))
+        alerts.append(friction_alerts.check_low_citations(sid))
+    return alerts
+
+
+def _comparable(alerts):
+    rows = []
+    for a in alerts:
+        if a is None:
+            continue
+        d = a.to_dict()
+        d.pop("created_at")
+        rows.append(json.dumps(d, sort_keys=True))
+    return sorted(rows)
+
+
+def test_turn_metrics_match_per_session_metrics(reader_db, seed_sessions):
+    seed_sessions()
+    metrics = brain_reader.get_turn_metrics(days=365)
+
+    assert metrics
+    for sid, row in metrics.items():
+        assert row == brain_reader.calculate_session_metrics(sid)
+
+
+def test_generate_alerts_matches_per_session_rules(reader_db, seed_sessions):
+    seed_sessions()
+    for days in (3, 30):
+        expected = _comparable(_legacy_alerts(days))
+        assert expected
+        assert _comparable(friction_alerts.generate_alerts(days)) == expected
+
+
+def test_since_cursor_rechecks_only_changed_sessions(reader_db, seed_sessions):
+    seed_sessions()
+    summary = friction_alerts.get_alert_summary(days=30)
+    cursor = summary["cursor"]
+    assert cursor and summary["total_alerts"]
+
+    assert friction_alerts.generate_alerts(since=cursor) == []
+
+    time.sleep(0.01)
+    conn = db_setup.get_connection()
+    sid = conn.execute(
+        "SELECT id FROM sessions WHERE main_topic = 'Gait' ORDER BY id LIMIT 1"
+    ).fetchone()[0]
+    conn.execute(
+        "UPDATE sessions SET understanding_level = 1, duration_minutes = 45, "
+        "wrap_phase_reached = 'yes', off_source_drift = NULL WHERE id = ?",
+        (sid,),
+    )
+    conn.commit()
+    conn.close()
+
+    alerts = friction_alerts.generate_alerts(since=cursor)
+    assert {a.alert_type for a in alerts if a.session_id} == {"low_understanding"}
+    assert {a.session_id for a in alerts if a.session_id} == {sid}
+    # Topic struggles are re-reported only for the touched topic
+    assert {a.topic for a in alerts if a.alert_type == "repeated_topic_struggle"} <= {"gait"}
+
+    time.sleep(0.01)
+    conn = db_setup.get_connection()
+    conn.execute(
+        "INSERT INTO tutor_turns (session_id, question, answer, unverified, created_at) "
+        "VALUES ('sess-new', 'q', 'a', 1, ?)",
+        (datetime.now().isoformat(),),
+    )
+    conn.commit()
+    conn.close()
+
+    turn_alerts = [a for a in friction_alerts.generate_alerts(since=cursor) if a.alert_type in (
+        "high_unverified_ratio", "low_citations")]
+    assert len(turn_alerts) == 2
+    assert all(a.details["turns_count"] == 1 for a in turn_alerts)
+
+    next_cursor = friction_alerts.get_alert_summary(since=cursor)["cursor"]
+    assert next_cursor > cursor
+    assert friction_alerts.generate_alerts(since=next_cursor) == []
@@ -0,0 +1,444 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import db_setup
+from dashboard import gcal
+
+
+class FakeHttpError(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.resp = type("Resp", (), {"status": status})()
+
+
+class _Request:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self):
+        return self._fn()
+
+
+class FakeCalendarService:
+    """In-memory Calendar API: events.list with paging and syncTokens."""
+
+    PAGE_SIZE = 2
+
+    def __init__(self, calendars):
+        self.calendars = calendars
+        self.store = {}  # (calendar_id, event_id) -> event
+        self.seq = 0
+        self.expired_tokens = set()
+        self.list_calls = []
+        self.updates = []
+        self.inserts = []
+        self.batch_sizes = []
+        self.list_delay = 0.0
+        self.fail_updates = set()
+
+    # -- helpers -------------------------------------------------------------
+    def put(self, calendar_id, event_id, summary, date, status="confirmed"):
+        self.seq += 1
+        self.store[(calendar_id, event_id)] = {
+            "id": event_id,
+            "summary": summary,
+            "start": {"date": date},
+            "end": {"date": date},
+            "status": status,
+            "updated": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "_seq": self.seq,
+        }
+
+    def cancel(self, calendar_id, event_id):
+        event = self.store[(calendar_id, event_id)]
+        self.put(calendar_id, event_id, event["summary"], event["start"]["date"], status="cancelled")
+
+    def purge(self, calendar_id, event_id):
+        """Hard delete, invisible to change feeds (forces set-difference)."""
+        del self.store[(calendar_id, event_id)]
+
+    # -- API surface -----------------------------------------------------------
+    def calendarList(self):
+        service = self
+
+        class _CalendarList:
+            def list(self, **kwargs):
+                return _Request(lambda: {"items": service.calendars})
+
+        return _CalendarList()
+
+    def events(self):
+        service = self
+
+        class _Events:
+            def list(self, calendarId, pageToken=None, syncToken=None, **kwargs):
+                return _Request(lambda: service._list(calendarId, pageToken, syncToken, kwargs))
+
+            def insert(self, calendarId, body):
+                def run():
+                    event_id = f"local{len(service.inserts) + 1}"
+                    service.inserts.append(event_id)
+                    service.put(calendarId, event_id, body["summary"], body["start"].get("date", ""))
+                    return dict(service.store[(calendarId, event_id)])
+
+                return _Request(run)
+
+            def update(self, calendarId, eventId, body):
+                def run():
+                    if eventId in service.fail_updates:
+                        raise FakeHttpError(400)
+                    service.updates.append(eventId)
+                    service.put(calendarId, eventId, body["summary"], body["start"].get("date", ""))
+                    return dict(service.store[(calendarId, eventId)])
+
+                return _Request(run)
+
+        return _Events()
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def _list(self, calendar_id, page_token, sync_token, params):
+        assert params.get("singleEvents") is True
+        time.sleep(self.list_delay)
+        if sync_token is not None:
+            assert "timeMin" not in params and "orderBy" not in params
+            if sync_token in self.expired_tokens:
+                raise FakeHttpError(410)
+            since = int(sync_token)
+            items = [e for (cal, _), e in self.store.items() if cal == calendar_id and e["_seq"] > since]
+        else:
+            items = [
+                e for (cal, _), e in self.store.items()
+                if cal == calendar_id and e["status"] != "cancelled"
+            ]
+        self.list_calls.append({"calendar": calendar_id, "sync_token": sync_token, "page": page_token})
+
+        start = int(page_token or 0)
+        page = [dict(e) for e in items[start:start + self.PAGE_SIZE]]
+        result = {"items": page}
+        if start + self.PAGE_SIZE < len(items):
+            result["nextPageToken"] = str(start + self.PAGE_SIZE)
+        else:
+            result["nextSyncToken"] = str(self.seq)
+        return result
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        assert len(self.requests) < 50
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.service.batch_sizes.append(len(self.requests))
+        for request_id, request in self.requests:
+            try:
+                self.callback(request_id, request.execute(), None)
+            except Exception as exc:
+                self.callback(request_id, None, exc)
+
+
+class FakeCredentials:
+    valid = True
+
+
+@pytest.fixture
+def fake_service(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_setup, "DB_PATH", str(tmp_path / "pt_study.db"))
+    db_setup.init_database()
+
+    service = FakeCalendarService([
+        {"id": "cal1", "summary": "PT School", "accessRole": "owner", "timeZone": "UTC"},
+    ])
+    monkeypatch.setattr(gcal, "GOOGLE_API_AVAILABLE", True)
+    monkeypatch.setattr(gcal, "load_gcal_config", lambda: {"client_id": "x", "calendar_ids": ["cal1"]})
+    monkeypatch.setattr(gcal, "get_calendar_service", lambda: service)
+    # Parallel fetches build their own clients from the shared credentials.
+    service.token_loads = 0
+    service.built_with = []
+
+    def load_token():
+        service.token_loads += 1
+        return FakeCredentials()
+
+    def build(name, version, credentials):
+        service.built_with.append(credentials)
+        return service
+
+    monkeypatch.setattr(gcal, "load_token", load_token)
+    monkeypatch.setattr(gcal, "build", build)
+    return service
+
+
+def _local_events():
+    conn = db_setup.get_connection()
+    rows = conn.execute(
+        "SELECT google_event_id, title FROM course_events WHERE google_event_id IS NOT NULL"
+    ).fetchall()
+    conn.close()
+    return dict(rows)
+
+
+def _sync_calls(service):
+    calls = list(service.list_calls)
+    service.list_calls.clear()
+    return calls
+
+
+def test_incremental_sync_fetches_only_changes(fake_service):
+    day = (datetime.now() + timedelta(days=3)).strftime("%Y-%m-%d")
+    for i in range(5):
+        fake_service.put("cal1", f"e{i}", f"Lecture {i}", day)
+
+    first = gcal.sync_bidirectional()
+    assert first["success"] and first["imported"] == 5
+    assert first["calendars"][0]["mode"] == "full"
+    assert all(call["sync_token"] is None for call in _sync_calls(fake_service))
+
+    fake_service.put("cal1", "e1", "Lecture 1 (moved)", day)
+    fake_service.cancel("cal1", "e2")
+    fake_service.put("cal1", "e9", "Quiz 9", day)
+
+    second = gcal.sync_bidirectional()
+    assert second["calendars"][0]["mode"] == "incremental"
+    assert (second["imported"], second["updated"], second["deleted"]) == (1, 1, 1)
+    assert second["pushed"] == 0
+    calls = _sync_calls(fake_service)
+    assert calls and all(call["sync_token"] for call in calls)
+
+    local = _local_events()
+    assert local["e1"] == "Lecture 1 (moved)"
+    assert "e2" not in local and local["e9"] == "Quiz 9"
+
+
+def test_expired_sync_token_falls_back_to_full_resync(fake_service):
+    day = (datetime.now() + timedelta(days=3)).strftime("%Y-%m-%d")
+    for i in range(3):
+        fake_service.put("cal1", f"e{i}", f"Lab {i}", day)
+    gcal.sync_bidirectional()
+
+    conn = db_setup.get_connection()
+    token = conn.execute("SELECT sync_token FROM gcal_sync_state WHERE calendar_id = 'cal1'").fetchone()[0]
+    conn.close()
+    fake_service.expired_tokens.add(token)
+    fake_service.purge("cal1", "e0")
+
+    result = gcal.sync_bidirectional()
+    assert result["success"]
+    assert result["calendars"][0]["mode"] == "full"
+    assert result["deleted"] == 1
+    assert set(_local_events()) == {"e1", "e2"}
+
+
+def test_local_pushes_follow_the_updated_at_watermark(fake_service):
+    day = (datetime.now() + timedelta(days=3)).strftime("%Y-%m-%d")
+    fake_service.put("cal1", "e0", "Exam 1", day)
+    fake_service.put("cal1", "e1", "Exam 2", day)
+    gcal.sync_bidirectional()
+
+    conn = db_setup.get_connection()
+    # Edited after the last sync: at or above the watermark.
+    conn.execute(
+        "UPDATE course_events SET title = 'Exam 1 (room change)', google_updated_at = '2000-01-01T00:00:00Z', "
+        "updated_at = ? WHERE google_event_id = 'e0'",
+        (datetime.now().isoformat(timespec="seconds"),),
+    )
+    # Newer than Google's copy but older than the watermark: the old full
+    # table walk would push it, the watermark query never looks at it.
+    conn.execute(
+        "UPDATE course_events SET google_updated_at = '2000-01-01T00:00:00Z', updated_at = '2001-01-01T00:00:00' "
+        "WHERE google_event_id = 'e1'"
+    )
+    conn.commit()
+    conn.close()
+
+    result = gcal.sync_bidirectional()
+    assert result["pushed"] == 1
+    assert fake_service.updates == ["e0"]
+    assert fake_service.store[("cal1", "e0")]["summary"] == "Exam 1 (room change)"
+
+    again = gcal.sync_bidirectional()
+    assert again["pushed"] == 0
+    assert fake_service.updates == ["e0"]
+
+
+def _rewind_watermark_and_edit(assignments):
+    """Put the watermark in the past and edit rows after it but before now."""
+    conn = db_setup.get_connection()
+    conn.execute("UPDATE gcal_sync_state SET local_watermark = '2001-01-01T00:00:00'")
+    for google_event_id, course_id in assignments.items():
+        conn.execute(
+            "UPDATE course_events SET title = title || ' (edited)', course_id = COALESCE(?, course_id), "
+            "google_updated_at = '2000-01-01T00:00:00Z', updated_at = '2002-01-01T00:00:00' "
+            "WHERE google_event_id = ?",
+            (course_id, google_event_id),
+        )
+    conn.commit()
+    conn.close()
+
+
+def test_failed_push_keeps_the_local_watermark(fake_service):
+    day = (datetime.now() + timedelta(days=3)).strftime("%Y-%m-%d")
+    fake_service.put("cal1", "e0", "Exam 1", day)
+    gcal.sync_bidirectional()
+    _rewind_watermark_and_edit({"e0": None})
+
+    fake_service.fail_updates.add("e0")
+    failed = gcal.sync_bidirectional()
+    assert failed["pushed"] == 0 and failed["errors"]
+
+    fake_service.fail_updates.clear()
+    retried = gcal.sync_bidirectional()
+    assert retried["pushed"] == 1 and not retried["errors"]
+    assert fake_service.store[("cal1", "e0")]["summary"] == "Exam 1 (edited)"
+
+
+def test_course_scoped_sync_keeps_the_local_watermark(fake_service):
+    day = (datetime.now() + timedelta(days=3)).strftime("%Y-%m-%d")
+    fake_service.put("cal1", "e0", "Exam 1", day)
+    fake_service.put("cal1", "e1", "Exam 2", day)
+    gcal.sync_bidirectional()
+    _rewind_watermark_and_edit({"e0": 1, "e1": 2})
+
+    scoped = gcal.sync_bidirectional(course_id=1)
+    assert scoped["pushed"] == 1 and fake_service.updates == ["e0"]
+
+    result = gcal.sync_bidirectional()
+    assert result["pushed"] == 1 and fake_service.updates == ["e0", "e1"]
+
+
+def test_execute_batched_chunks_and_retries_rate_limited_items():
+    calls = {}
+
+    def make_request(i):
+        def run():
+            calls[i] = calls.get(i, 0) + 1
+            if i % 10 == 0 and calls[i] == 1:
+                raise FakeHttpError(429)
+            if i == 7:
+                raise FakeHttpError(400)
+            return {"id": f"g{i}"}
+        return _Request(run)
+
+    service = FakeCalendarService([])
+    sleeps = []
+    results = gcal.execute_batched(
+        service, [(str(i), make_request(i)) for i in range(120)], sleep=sleeps.append
+    )
+
+    assert service.batch_sizes == [50, 50, 20, 12]  # 12 rate-limited retried
+    assert len(sleeps) == 1
+    assert results["10"] == ({"id": "g10"}, None)
+    assert results["7"][0] is None and "400" in results["7"][1]
+    assert sum(1 for resp, err in results.values() if resp) == 119
+
+
+def test_execute_batched_never_resends_answered_requests():
+    service = FakeCalendarService([])
+    service.events().insert("cal1", {"summary": "warm-up", "start": {}}).execute()
+    failures = [FakeHttpError(503), FakeHttpError(429)]
+
+    class PartialBatch(FakeBatch):
+        def execute(self):
+            # The first two sub-requests run, then the batch call itself fails.
+            service.batch_sizes.append(len(self.requests))
+            answered = self.requests[:2] if failures else self.requests
+            for request_id, request in answered:
+                self.callback(request_id, request.execute(), None)
+            if failures:
+                raise failures.pop(0)
+
+    service.new_batch_http_request = lambda callback: PartialBatch(service, callback)
+    requests = [
+        (str(i), service.events().insert("cal1", {"summary": f"Lab {i}", "start": {}}))
+        for i in range(6)
+    ]
+    sleeps = []
+    results = gcal.execute_batched(service, requests, batch_size=3, sleep=sleeps.append)
+
+    # 503: the unanswered item is reported, not retried (it may have run).
+    # 429: the batch was rejected, so only its unanswered item is retried.
+    assert service.batch_sizes == [3, 3, 1]
+    assert len(service.inserts) == 1 + 5
+    assert "503" in results["2"][1]
+    assert [results[str(i)][1] for i in (0, 1, 3, 4, 5)] == [None] * 5
+    assert len(sleeps) == 1
+
+
+def test_execute_with_backoff_retries_only_transient_errors():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise FakeHttpError(503)
+        return "ok"
+
+    sleeps = []
+    assert gcal._execute_with_backoff(_Request(flaky), sleep=sleeps.append) == "ok"
+    assert len(sleeps) == 2 and sleeps[0] < sleeps[1] + gcal.GCAL_BACKOFF_BASE_SEC
+
+    def forbidden():
+        raise FakeHttpError(404)
+
+    with pytest.raises(FakeHttpError):
+        gcal._execute_with_backoff(_Request(forbidden), sleep=sleeps.append)
+    assert len(sleeps) == 2
+
+
+def test_sync_fetches_calendars_in_parallel_and_batches_pushes(fake_service, monkeypatch):
+    fake_service.calendars = [
+        {"id": f"cal{i}", "summary": f"Course {i}", "accessRole": "owner", "timeZone": "UTC"}
+        for i in range(1, 5)
+    ]
+    monkeypatch.setattr(
+        gcal, "load_gcal_config",
+        lambda: {"client_id": "x", "calendar_ids": [f"cal{i}" for i in range(1, 5)]},
+    )
+    day = (datetime.now() + timedelta(days=3)).strftime("%Y-%m-%d")
+    for i in range(1, 5):
+        fake_service.put(f"cal{i}", f"c{i}", f"Lecture {i}", day)
+
+    conn = db_setup.get_connection()
+    conn.execute("INSERT INTO courses (name, created_at) VALUES ('Neuro', '2024-01-01')")
+    conn.executemany(
+        "INSERT INTO course_events (course_id, type, title, date, created_at, updated_at) "
+        "VALUES (1, 'lecture', ?, ?, '2024-01-01', '2024-01-01T00:00:00')",
+        [(f"Syllabus {i}", day) for i in range(60)],
+    )
+    conn.commit()
+    conn.close()
+
+    fake_service.list_delay = 0.1
+    result = gcal.sync_bidirectional()
+
+    assert result["success"] and result["imported"] == 4
+    assert result["pushed"] == 60
+    assert fake_service.batch_sizes == [50, 10]
+    timings = result["timings"]
+    assert set(timings["per_calendar_ms"]) == {"cal1", "cal2", "cal3", "cal4"}
+    # One token load for the fetch; every worker client shares those credentials.
+    assert fake_service.token_loads == 1
+    assert 1 <= len(fake_service.built_with) <= gcal.GCAL_FETCH_WORKERS
+    assert len({id(creds) for creds in fake_service.built_with}) == 1
+    # Four 100ms listings overlap instead of running back to back.
+    assert timings["fetch_ms"] < 0.75 * sum(timings["per_calendar_ms"].values())
+    assert {"calendar_list_ms", "apply_ms", "push_ms", "total_ms"} <= set(timings)
+
+    conn = db_setup.get_connection()
+    unsynced = conn.execute(
+        "SELECT COUNT(*) FROM course_events WHERE title LIKE 'Syllabus%' AND google_event_id IS NULL"
+    ).fetchone()[0]
+    pushed_ids = {row[0] for row in conn.execute(
+        "SELECT google_event_id FROM course_events WHERE title LIKE 'Syllabus%'"
+    )}
+    conn.close()
+    assert unsynced == 0
+    assert pushed_ids == set(fake_service.inserts)
@@ -0,0 +1,110 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import http_pool
+import llm_provider
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server.peers.add(self.client_address)
+        status = 200
+        if self.path == "/sse":
+            events = [{"type": "response.output_text.delta", "delta": "Hi"},
+                      {"type": "response.completed", "response": {"model": "stub", "usage": {}}}]
+            out = "".join(f"data: {json.dumps(e)}\n\n" for e in events).encode()
+        elif self.headers.get("Authorization") == "Bearer bad":
+            status, out = 401, b'{"error": "nope"}'
+        else:
+            prompt = json.loads(body)["messages"][-1]["content"]
+            out = json.dumps({"choices": [{"message": {"content": f"echo: {prompt}"}}]}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+        if server.drop_after_response:
+            # Close without announcing it, like a server timing out an idle socket.
+            self.close_connection = True
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    server.peers = set()
+    server.drop_after_response = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    http_pool.close_all()
+
+
+def _post(url, content="x"):
+    body = json.dumps({"messages": [{"role": "user", "content": content}]})
+    with http_pool.request("POST", url, body=body, headers={"Content-Type": "application/json"}) as resp:
+        return resp.status, json.loads(resp.read()), resp.timings
+
+
+def test_sequential_calls_reuse_one_connection(stub):
+    server, base = stub
+    for i in range(5):
+        status, data, timings = _post(f"{base}/v1/chat", f"q{i}")
+        assert status == 200 and data["choices"][0]["message"]["content"] == f"echo: q{i}"
+        assert timings["reused"] == (i > 0)
+        assert 0 <= timings["ttfb_ms"] <= timings["total_ms"]
+    assert len(server.peers) == 1
+
+    stats = http_pool.stats()[base]
+    assert (stats["requests"], stats["connects"], stats["reused"], stats["idle"]) == (5, 1, 4, 1)
+    assert stats["avg_connect_ms"] is not None and stats["avg_total_ms"] is not None
+
+
+def test_stale_socket_is_retried_on_a_new_connection(stub):
+    server, base = stub
+    server.drop_after_response = True
+    for i in range(3):
+        assert _post(f"{base}/v1/chat", f"q{i}")[0] == 200
+    stats = http_pool.stats()[base]
+    assert stats["errors"] == 0
+    assert stats["retries"] == 2 and stats["connects"] == 3
+
+    # Pool size caps the idle connections kept per host.
+    pool = http_pool.get_pool(base, maxsize=1)
+    held = [pool.request("POST", "/v1/chat", body='{"messages": [{"content": "x"}]}') for _ in range(3)]
+    for resp in held:
+        resp.read()
+        resp.release()
+    assert pool.stats()["idle"] == 1
+
+
+def test_provider_calls_go_through_the_pool(stub, monkeypatch):
+    server, base = stub
+    monkeypatch.setattr(llm_provider, "OPENROUTER_CHAT_URL", f"{base}/api/v1/chat/completions")
+    monkeypatch.setattr(llm_provider, "OPENROUTER_API_KEY", "test-key")
+    for i in range(3):
+        result = llm_provider._call_openrouter_api("sys", f"p{i}", timeout=5)
+        assert result == {"success": True, "content": f"echo: p{i}", "error": None}
+    assert http_pool.stats()[base]["connects"] == 1
+
+    monkeypatch.setattr(llm_provider, "OPENROUTER_API_KEY", "bad")
+    result = llm_provider._call_openrouter_api("sys", "p", timeout=5)
+    assert result["error"] == 'OpenRouter API error (401): {"error": "nope"}'
+
+    monkeypatch.setattr(llm_provider, "_CHATGPT_RESPONSES_URL", f"{base}/sse")
+    monkeypatch.setattr(llm_provider, "_load_codex_auth", lambda: {"access_token": "t", "account_id": ""})
+    events = list(llm_provider.stream_chatgpt_responses("sys", "hi", timeout=5))
+    assert events == [{"type": "delta", "text": "Hi"}, {"type": "done", "usage": {}, "model": "stub"}]
+    assert http_pool.stats()[base]["connects"] == 1
@@ -0,0 +1,94 @@
+"""Tests for hybrid (vector + keyword) retrieval with reciprocal-rank fusion."""
+
+import time
+
+import pytest
+
+import tutor_rag
+
+
+class Doc:
+    """Minimal stand-in for langchain_core.documents.Document."""
+
+    def __init__(self, page_content, metadata=None):
+        self.page_content = page_content
+        self.metadata = metadata or {}
+
+
+def _doc(rag_doc_id, chunk_index=0):
+    return Doc(f"doc {rag_doc_id} chunk {chunk_index}", {"rag_doc_id": rag_doc_id, "chunk_index": chunk_index})
+
+
+def test_rrf_dedupes_by_doc_and_rewards_agreement():
+    vector = [_doc(1), _doc(1, 3), _doc(2), _doc(3)]
+    keyword = [_doc(4, 2), _doc(2, 5), _doc(1, 7)]
+
+    fused = tutor_rag.reciprocal_rank_fusion({"vector": vector, "keyword": keyword}, k=3)
+    ids = [d.metadata["rag_doc_id"] for d in fused]
+
+    assert ids == [1, 2, 4]
+    assert fused[0].metadata["retrievers"] == ["vector", "keyword"]
+    # Doc 2 is 2nd in both lists (after de-dupe); the tie keeps the first list's passage.
+    assert fused[1].metadata["chunk_index"] == 0
+    assert fused[2].metadata["retrievers"] == ["keyword"]
+    assert vector[0].metadata.get("rrf_score") is None  # inputs are not mutated
+
+
+@pytest.fixture
+def slow_stages(monkeypatch):
+    calls = []
+
+    def fake_keyword(query, course_id=None, folder_paths=None, material_ids=None, k=6, corpus=None):
+        calls.append(("keyword", corpus, k))
+        time.sleep(0.2)
+        return [_doc(10), _doc(11)], False
+
+    def fake_vector(query, course_id, folder_paths, material_ids, collection_name, k):
+        calls.append(("vector", collection_name, k))
+        time.sleep(0.2)
+        if collection_name == tutor_rag.COLLECTION_INSTRUCTIONS:
+            raise RuntimeError("chroma unavailable")
+        return [_doc(11), _doc(12)], True
+
+    monkeypatch.setattr(tutor_rag, "_keyword_search", fake_keyword)
+    monkeypatch.setattr(tutor_rag, "_vector_stage", fake_vector)
+    return calls
+
+
+def test_hybrid_search_runs_stages_concurrently(slow_stages):
+    t0 = time.perf_counter()
+    result = tutor_rag.hybrid_search("supraspinatus", k=2)
+    elapsed = time.perf_counter() - t0
+
+    assert elapsed < 0.35
+    assert [d.metadata["rag_doc_id"] for d in result["documents"]] == [11, 10]
+    assert set(result["timings"]) == {"vector_ms", "keyword_ms", "fusion_ms", "total_ms"}
+    assert result["timings"]["vector_ms"] >= 200
+    assert result["errors"] == {}
+    assert result["cache_hit"] is False
+    assert sorted(c[2] for c in slow_stages) == [4, 4]  # over-fetch 2k for fusion
+
+
+def test_dual_context_reports_stage_errors_and_keeps_keyword_results(slow_stages):
+    t0 = time.perf_counter()
+    dual = tutor_rag.get_dual_context("rotator cuff", material_ids=[10, 11], k_materials=3, k_instructions=2)
+    elapsed = time.perf_counter() - t0
+
+    assert elapsed < 0.35  # four stages in flight at once
+    assert len(slow_stages) == 4
+    assert [d.metadata["rag_doc_id"] for d in dual["instructions"]] == [10, 11]
+    assert "RuntimeError" in dual["errors"]["instructions"]["vector"]
+    assert "materials" not in dual["errors"]
+    assert dual["timings"]["materials"]["fusion_ms"] >= 0
+
+
+def test_keyword_dual_is_keyword_only_unless_local_embeddings(slow_stages, monkeypatch):
+    monkeypatch.setenv("TUTOR_EMBEDDINGS", "openai")
+    dual = tutor_rag.keyword_search_dual("hip", material_ids=[1], k_materials=2, k_instructions=2)
+    assert {c[0] for c in slow_stages} == {"keyword"}
+    assert "vector_ms" not in dual["timings"]["instructions"]
+
+    slow_stages.clear()
+    monkeypatch.setenv("TUTOR_EMBEDDINGS", "local")
+    tutor_rag.keyword_search_dual("hip", material_ids=[1], k_materials=2, k_instructions=2)
+    assert {c[0] for c in slow_stages} == {"keyword", "vector"}
@@ -174,3 +174,67 @@ def test_map_json_payload_to_session_sets_counts():
     assert data["duration_minutes"] == 20
     assert data["anki_cards_text"] == "rotator cuff; scapular rhythm"
     assert data["anki_cards_count"] == 2
+
+
+def _session_log(day, topic, understanding=4):
+    return (
+        f"# Session Log - {day}\n\n## Session Info\n- Date: {day}\n- Time: 09:00\n"
+        f"- Main Topic: {topic}\n- Study Mode: Core\n- Time Spent: 30 Minutes\n\n"
+        f"## Ratings\n- Understanding Level: {understanding}\n- Retention Confidence: 3\n"
+    )
+
+
+@pytest.fixture
+def bulk_db(tmp_path, monkeypatch):
+    import db_pool
+    import db_setup
+
+    path = str(tmp_path / "pt_study.db")
+    monkeypatch.setattr(db_setup, "DB_PATH", path)
+    monkeypatch.setattr(ingest_session, "DB_PATH", path)
+    db_setup.init_database()
+    yield path
+    db_pool.get_pool(path).close_all()
+
+
+def _session_count(path):
+    import sqlite3
+
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_bulk_ingest_skips_unchanged_and_replaces_modified(bulk_db, tmp_path, monkeypatch):
+    logs = tmp_path / "session_logs"
+    logs.mkdir()
+    for i in range(6):
+        (logs / f"2025-01-0{i + 1}_topic{i}.md").write_text(_session_log(f"2025-01-0{i + 1}", f"Topic {i}"))
+    (logs / "TEMPLATE.md").write_text("# template")
+    (logs / "broken.md").write_text("# Session Log\n- Topic: no date\n")
+
+    report = ingest_session.ingest_paths([str(logs)], workers=2)
+    by_status = {}
+    for entry in report:
+        by_status.setdefault(entry["status"], []).append(entry)
+    assert len(by_status["ingested"]) == 6 and len(by_status["invalid"]) == 1
+    assert sorted(e["session_id"] for e in by_status["ingested"]) == list(range(1, 7))
+    assert _session_count(bulk_db) == 6
+
+    # A second pass only stats: nothing is hashed or parsed.
+    def fail(*_):
+        raise AssertionError("unchanged file was re-read")
+
+    monkeypatch.setattr(ingest_session, "compute_file_checksum", fail)
+    report = ingest_session.ingest_paths([str(logs / "*.md")], workers=1)
+    assert [e["status"] for e in report] == ["unchanged"] * 7
+    monkeypatch.undo()
+    monkeypatch.setattr(ingest_session, "DB_PATH", bulk_db)
+
+    target = logs / "2025-01-03_topic2.md"
+    target.write_text(_session_log("2025-01-03", "Topic 2 revised", understanding=2))
+    report = ingest_session.ingest_paths([str(target)], workers=1)
+    assert [e["status"] for e in report] == ["reingested"]
+    assert _session_count(bulk_db) == 6
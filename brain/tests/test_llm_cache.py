@@ -0,0 +1,83 @@
+import pytest
+
+import db_pool
+import db_setup
+import llm_cache
+import llm_provider
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "pt_study.db")
+    monkeypatch.setattr(db_setup, "DB_PATH", path)
+    db_setup.init_database()
+    llm_cache.reset_counters()
+    yield path
+    llm_cache.reset_counters()
+    db_pool.get_pool(path).close_all()
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    calls = []
+
+    def fake(system_prompt, user_prompt, model, timeout, temperature):
+        calls.append((model, user_prompt, temperature))
+        if user_prompt == "fail":
+            return {"success": False, "error": "boom", "content": None}
+        return {"success": True, "content": f"answer {len(calls)}", "error": None}
+
+    monkeypatch.setattr(llm_provider, "_call_openrouter_api", fake)
+    return calls
+
+
+def test_call_llm_serves_repeats_from_cache_per_site_policy(temp_db, fake_api):
+    first = llm_provider.call_llm("sys", "issues", model="m", cache="wrap_classify")
+    again = llm_provider.call_llm("sys", "issues", model="m", cache="wrap_classify")
+    assert first == {"success": True, "content": "answer 1", "error": None}
+    assert again == {"success": True, "content": "answer 1", "error": None, "cached": True}
+
+    # Key covers model and temperature; no site or an unknown site bypasses the cache.
+    llm_provider.call_llm("sys", "issues", model="other", cache="wrap_classify")
+    llm_provider.call_llm("sys", "issues", model="m", temperature=0.2, cache="wrap_classify")
+    llm_provider.call_llm("sys", "issues", model="m")
+    llm_provider.call_llm("sys", "issues", model="m", cache="tutor_chat")
+    # Failures are not stored.
+    llm_provider.call_llm("sys", "fail", model="m", cache="wrap_classify")
+    llm_provider.call_llm("sys", "fail", model="m", cache="wrap_classify")
+    assert len(fake_api) == 7
+
+    site = llm_cache.stats()["sites"]["wrap_classify"]
+    assert (site["hits"], site["misses"], site["stores"], site["entries"]) == (1, 5, 3, 3)
+    assert site["hit_rate"] == round(1 / 6, 4)
+    assert site["lifetime_hits"] == 1
+
+
+def test_ttl_expiry_and_lru_byte_budget(temp_db, monkeypatch):
+    monkeypatch.setattr(llm_cache, "MAX_BYTES", 250)
+    for name in ("a", "b"):
+        llm_cache.store("chain_step", name, name * 100, "openrouter", "m")
+    assert llm_cache.lookup("chain_step", "a") == "a" * 100  # b is now least recently used
+    llm_cache.store("chain_step", "c", "c" * 100, "openrouter", "m")
+    assert llm_cache.lookup("chain_step", "b") is None
+    assert llm_cache.lookup("chain_step", "a") and llm_cache.lookup("chain_step", "c")
+
+    conn = db_setup.get_connection()
+    conn.execute("UPDATE llm_response_cache SET expires_at = 0 WHERE key = 'a'")
+    conn.commit()
+    conn.close()
+    assert llm_cache.lookup("chain_step", "a") is None
+    assert llm_cache.stats()["entries"] == 1
+    assert llm_cache.clear("chain_step") == 2  # expired row is still on disk until the next store
+
+
+def test_llm_status_reports_cache_stats(temp_db, fake_api):
+    from dashboard.app import create_app
+
+    llm_provider.call_llm("sys", "step", model="m", cache="chain_step")
+    llm_provider.call_llm("sys", "step", model="m", cache="chain_step")
+    client = create_app().test_client()
+    data = client.get("/api/brain/llm-status").get_json()
+    assert data["cache"]["hits"] == 1 and data["cache"]["hit_rate"] == 0.5
+    assert data["cache"]["sites"]["chain_step"]["entries"] == 1
+    assert "http_pools" in data
@@ -1,32 +1,35 @@
 import os
-import subprocess
 
 import llm_provider
+from codex_pool import WORK_DIR
 
 
 def _fake_completed_process(*, stdout: str, stderr: str = "", returncode: int = 0):
-    # Mimic subprocess.CompletedProcess shape used by llm_provider._codex_exec_json
-    # stdout/stderr are bytes because we removed text=True and decode manually
-    return subprocess.CompletedProcess(
-        args=["codex"],
-        returncode=returncode,
-        stdout=stdout.encode("utf-8"),
-        stderr=stderr.encode("utf-8"),
-    )
+    # Mimic the result dict CodexPool.run hands to llm_provider._codex_exec_json
+    return {
+        "returncode": returncode,
+        "stdout": stdout,
+        "stderr": stderr,
+        "output": None,
+        "timed_out": False,
+        "error": None,
+    }
+
+
+class _FakePool:
+    def __init__(self, run):
+        self.run = run
 
 
 def test_call_codex_json_parses_agent_message_and_usage(monkeypatch):
     codex_cmd = r"C:\Users\treyt\AppData\Roaming\npm\codex.cmd"
-    work_dir = r"C:\tmp\codex_isolated_test"
-
     monkeypatch.setattr(llm_provider, "find_codex_cli", lambda: codex_cmd)
-    monkeypatch.setattr(llm_provider.tempfile, "mkdtemp", lambda prefix="": work_dir)
-    monkeypatch.setattr(llm_provider.shutil, "rmtree", lambda *_args, **_kwargs: None)
 
     captured = {}
 
-    def fake_run(args, **kwargs):
+    def fake_run(args, prompt, **kwargs):
         captured["args"] = args
+        captured["prompt"] = prompt
         captured["kwargs"] = kwargs
         stdout = "\n".join(
             [
@@ -39,7 +42,7 @@ def test_call_codex_json_parses_agent_message_and_usage(monkeypatch):
         )
         return _fake_completed_process(stdout=stdout)
 
-    monkeypatch.setattr(llm_provider.subprocess, "run", fake_run)
+    monkeypatch.setattr(llm_provider, "get_codex_pool", lambda: _FakePool(fake_run))
 
     result = llm_provider.call_codex_json("sys", "user", timeout=5, isolated=True)
 
@@ -58,24 +61,25 @@ def test_call_codex_json_parses_agent_message_and_usage(monkeypatch):
     assert "--json" in captured["args"]
     assert "--ephemeral" in captured["args"]
     assert "--cd" in captured["args"]
-    assert work_dir in captured["args"]
+    # Isolated runs use the pool worker's scratch dir instead of a fresh mkdtemp
+    assert WORK_DIR in captured["args"]
+    assert captured["kwargs"]["isolated"] is True
     assert "--skip-git-repo-check" in captured["args"]
 
-    # Prompt is passed via stdin file handle, not as string input kwarg
-    assert "stdin" in captured["kwargs"]
+    # Prompt is fed to the worker's stdin
+    assert captured["args"][-1] == "-"
+    assert "User: user" in captured["prompt"]
 
 
 def test_call_codex_json_returns_error_on_nonzero_returncode(monkeypatch):
     codex_cmd = r"C:\Users\treyt\AppData\Roaming\npm\codex.cmd"
 
     monkeypatch.setattr(llm_provider, "find_codex_cli", lambda: codex_cmd)
-    monkeypatch.setattr(llm_provider.tempfile, "mkdtemp", lambda prefix="": r"C:\tmp\codex_isolated_test")
-    monkeypatch.setattr(llm_provider.shutil, "rmtree", lambda *_args, **_kwargs: None)
 
-    def fake_run(_args, **_kwargs):
+    def fake_run(_args, _prompt, **_kwargs):
         return _fake_completed_process(stdout="", stderr="boom", returncode=1)
 
-    monkeypatch.setattr(llm_provider.subprocess, "run", fake_run)
+    monkeypatch.setattr(llm_provider, "get_codex_pool", lambda: _FakePool(fake_run))
 
     result = llm_provider.call_codex_json("sys", "user", timeout=5, isolated=True)
     assert result["success"] is False
@@ -86,10 +90,8 @@ def test_call_codex_json_requires_agent_message(monkeypatch):
     codex_cmd = r"C:\Users\treyt\AppData\Roaming\npm\codex.cmd"
 
     monkeypatch.setattr(llm_provider, "find_codex_cli", lambda: codex_cmd)
-    monkeypatch.setattr(llm_provider.tempfile, "mkdtemp", lambda prefix="": r"C:\tmp\codex_isolated_test")
-    monkeypatch.setattr(llm_provider.shutil, "rmtree", lambda *_args, **_kwargs: None)
 
-    def fake_run(_args, **_kwargs):
+    def fake_run(_args, _prompt, **_kwargs):
         stdout = "\n".join(
             [
                 '{"type":"thread.started","thread_id":"t"}',
@@ -100,7 +102,7 @@ def test_call_codex_json_requires_agent_message(monkeypatch):
         )
         return _fake_completed_process(stdout=stdout)
 
-    monkeypatch.setattr(llm_provider.subprocess, "run", fake_run)
+    monkeypatch.setattr(llm_provider, "get_codex_pool", lambda: _FakePool(fake_run))
 
     result = llm_provider.call_codex_json("sys", "user", timeout=5, isolated=True)
     assert result["success"] is False
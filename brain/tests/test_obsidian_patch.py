@@ -3,10 +3,21 @@ Tests for Obsidian patch generation.
 """
 import os
 import tempfile
-from pathlib import Path
+
+import pytest
+
+import obsidian_merge
 from obsidian_merge import generate_obsidian_patch
 
 
+@pytest.fixture(autouse=True)
+def patch_dir(tmp_path, monkeypatch):
+    """Write patches under tmp_path instead of brain/data/obsidian_patches."""
+    path = tmp_path / "obsidian_patches"
+    monkeypatch.setattr(obsidian_merge, "PATCH_DIR", path)
+    return path
+
+
 def test_patch_generation_creates_file():
     session_id = "test_session_001"
     note_path = "Test Note.md"
@@ -67,13 +78,11 @@ def test_no_patch_for_duplicate_content():
     assert patch_path is None
 
 
-def test_patch_directory_created():
+def test_patch_directory_created(patch_dir):
     session_id = "test_session_005"
     note_path = "Test.md"
     new_content = "Content"
     
-    patch_dir = Path(__file__).parent.parent / "data" / "obsidian_patches"
-    
     generate_obsidian_patch(session_id, note_path, new_content)
     
     assert patch_dir.exists()
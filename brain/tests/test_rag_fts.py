@@ -0,0 +1,146 @@
+"""Tests for the rag_docs/rag_chunks FTS5 indexes and BM25 keyword retrieval."""
+
+import sqlite3
+
+import pytest
+
+import db_setup
+import rag_notes
+import tutor_rag
+
+
+@pytest.fixture
+def rag_db(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "pt_study.db")
+    monkeypatch.setattr(db_setup, "DB_PATH", db_path)
+    monkeypatch.setattr(rag_notes, "DB_PATH", db_path)
+    monkeypatch.setattr(tutor_rag, "DB_PATH", db_path)
+    db_setup.init_database()
+    return db_path
+
+
+def _add_doc(content, *, source, corpus="materials", course_id=None, folder="", doc_type="txt", tags=""):
+    return rag_notes._upsert_rag_doc(
+        source_path=source,
+        doc_type=doc_type,
+        course_id=course_id,
+        topic_tags=tags,
+        content=content,
+        checksum=rag_notes._checksum(content),
+        metadata={},
+        corpus=corpus,
+        folder_path=folder,
+    )
+
+
+def test_build_fts_query_quotes_and_filters_terms():
+    q = rag_notes.build_fts_query(
+        'What is the "gluteus" max? (hip)',
+        columns=("content",),
+        min_len=3,
+        drop_stop_words=True,
+    )
+    assert q == '{content} : "what"* OR {content} : "gluteus"* OR {content} : "max"* OR {content} : "hip"*'
+    assert rag_notes.build_fts_query("a an the", drop_stop_words=True) == ""
+    assert rag_notes.build_fts_query("hip knee", match_all=True) == '"hip"* AND "knee"*'
+
+
+def test_keyword_rows_rank_by_bm25_and_respect_filters(rag_db):
+    a = _add_doc("Gluteus maximus extends the hip. Gluteus medius abducts.", source="a.md", course_id=1, folder="w1")
+    b = _add_doc("The hip joint is a ball and socket joint.", source="b.md", course_id=2, folder="w2")
+    _add_doc("Gluteus medius weakness causes Trendelenburg gait.", source="c.md", corpus="instructions")
+
+    rows = tutor_rag._keyword_rows("gluteus hip", k=5, corpus="materials")
+    assert [r["rag_doc_id"] for r in rows] == [a, b]
+    assert rows[0]["score"] > rows[1]["score"]
+
+    assert [r["rag_doc_id"] for r in tutor_rag._keyword_rows("hip", course_id=2)] == [b]
+    assert [r["rag_doc_id"] for r in tutor_rag._keyword_rows("hip", folder_paths=["w1"])] == [a]
+    assert [r["rag_doc_id"] for r in tutor_rag._keyword_rows("hip", material_ids=[b])] == [b]
+    assert len(tutor_rag._keyword_rows("gluteus", corpus="instructions")) == 1
+
+
+def test_triggers_keep_index_in_sync(rag_db):
+    doc_id = _add_doc("Piriformis syndrome compresses the sciatic nerve.", source="p.md")
+    assert rag_notes.search_rag_docs("piriformis")[0]["id"] == doc_id
+
+    conn = sqlite3.connect(rag_db)
+    conn.execute("UPDATE rag_docs SET content = 'Quadratus femoris' WHERE id = ?", (doc_id,))
+    conn.commit()
+    assert rag_notes.search_rag_docs("piriformis") == []
+    assert rag_notes.search_rag_docs("quadratus")[0]["id"] == doc_id
+
+    conn.execute("DELETE FROM rag_docs WHERE id = ?", (doc_id,))
+    conn.commit()
+    conn.close()
+    assert rag_notes.search_rag_docs("quadratus") == []
+
+
+def test_init_database_backfills_existing_rows(rag_db):
+    # Simulate a pre-FTS database: no index, no triggers.
+    conn = sqlite3.connect(rag_db)
+    for trigger in ("rag_docs_fts_ai", "rag_docs_fts_ad", "rag_docs_fts_au"):
+        conn.execute(f"DROP TRIGGER {trigger}")
+    conn.execute("DROP TABLE rag_docs_fts")
+    conn.execute(
+        "INSERT INTO rag_docs (source_path, content, corpus, enabled, created_at) "
+        "VALUES ('old.md', 'Obturator internus laterally rotates', 'runtime', 1, datetime('now'))"
+    )
+    conn.commit()
+    conn.close()
+
+    db_setup.init_database()
+    results = rag_notes.search_rag_docs("obturator")
+    assert len(results) == 1
+    assert "**Obturator**" in results[0]["snippet"]
+
+
+def test_search_notes_matches_tags_and_skips_other_types(rag_db):
+    note_id = _add_doc("Shoulder girdle notes", source="n.md", doc_type="note", tags="rotator cuff")
+    _add_doc("Rotator cuff textbook chapter", source="t.md", doc_type="textbook")
+
+    notes = rag_notes.search_notes("rotator cuff")
+    assert [n.id for n in notes] == [note_id]
+
+
+def test_chunk_spans_cover_text_with_overlap():
+    text = ("word " * 700).strip()
+    spans = rag_notes.chunk_spans(text, chunk_size=1000, overlap=150)
+    assert spans[0][0] == 0
+    assert spans[-1][1] == len(text)
+    assert all(end - start <= 1000 for start, end in spans)
+    assert all(nxt[0] < prev[1] for prev, nxt in zip(spans, spans[1:]))
+
+
+def test_keyword_rows_return_deep_passage_with_offsets(rag_db):
+    filler = "General lower limb overview paragraph.\n\n" * 300
+    passage = "The sciatic nerve exits below the piriformis muscle."
+    content = filler + passage + "\n\n" + filler
+    doc_id = _add_doc(content, source="big.pdf")
+
+    rows = tutor_rag._keyword_rows("piriformis sciatic", k=3)
+    assert rows[0]["rag_doc_id"] == doc_id
+    assert passage in rows[0]["content"]
+    assert len(rows[0]["content"]) <= 1000
+    assert content[rows[0]["char_start"]:rows[0]["char_end"]] == rows[0]["content"]
+    assert rows[0]["chunk_index"] > 0
+
+
+def test_chunks_follow_content_updates_and_deletes(rag_db):
+    doc_id = _add_doc("Tibialis anterior dorsiflexes the ankle.", source="t.md")
+    assert tutor_rag._keyword_rows("tibialis")[0]["rag_doc_id"] == doc_id
+
+    conn = sqlite3.connect(rag_db)
+    conn.execute("UPDATE rag_docs SET content = 'Soleus plantarflexes the ankle.' WHERE id = ?", (doc_id,))
+    conn.commit()
+    # Raw writers leave the doc queued; retrieval stays read-only until a sync.
+    assert tutor_rag._keyword_rows("tibialis")[0]["rag_doc_id"] == doc_id
+    assert rag_notes.refresh_rag_chunks(conn) == 1
+    assert tutor_rag._keyword_rows("tibialis") == []
+    assert tutor_rag._keyword_rows("soleus")[0]["rag_doc_id"] == doc_id
+
+    conn.execute("DELETE FROM rag_docs WHERE id = ?", (doc_id,))
+    conn.commit()
+    assert conn.execute("SELECT COUNT(*) FROM rag_chunks").fetchone()[0] == 0
+    conn.close()
+    assert tutor_rag._keyword_rows("soleus") == []
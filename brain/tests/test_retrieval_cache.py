@@ -0,0 +1,121 @@
+"""Tests for the tutor retrieval / query-embedding caches."""
+
+import sqlite3
+
+import pytest
+
+import db_setup
+import rag_notes
+import tutor_embeddings
+import tutor_rag
+from ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def rag_db(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "pt_study.db")
+    for module in (db_setup, rag_notes, tutor_rag):
+        monkeypatch.setattr(module, "DB_PATH", db_path)
+    db_setup.init_database()
+    tutor_rag.clear_retrieval_cache()
+    yield db_path
+    tutor_rag.clear_retrieval_cache()
+
+
+def _add_doc(source_path, content):
+    return rag_notes._upsert_rag_doc(
+        source_path=source_path,
+        doc_type="txt",
+        course_id=None,
+        topic_tags="",
+        content=content,
+        checksum=rag_notes._checksum(content),
+        metadata={},
+        corpus="materials",
+    )
+
+
+def test_ttl_cache_lru_and_expiry():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=2, ttl_seconds=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used
+    assert cache.lookup("b") == (False, None)
+    assert cache.get("a") == 1
+
+    clock.now = 11
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["expirations"] == 1
+    assert stats["hits"] == 2
+
+
+def test_generation_bumps_on_corpus_writes(rag_db):
+    start = tutor_rag.corpus_generation()
+    db_setup.init_database()
+    assert tutor_rag.corpus_generation() == start
+
+    _add_doc("hip.md", "Gluteus medius abducts the hip.")
+    after_insert = tutor_rag.corpus_generation()
+    assert after_insert > start
+
+    conn = sqlite3.connect(rag_db)
+    conn.execute(
+        "INSERT INTO rag_embeddings (rag_doc_id, chunk_index, chunk_text, chroma_id) VALUES (1, 0, 'x', 'c0')"
+    )
+    conn.commit()
+    conn.close()
+    assert tutor_rag.corpus_generation() > after_insert
+
+
+def test_keyword_results_cached_until_corpus_changes(rag_db):
+    _add_doc("hip.md", "Gluteus medius abducts the hip and stabilises the pelvis.")
+
+    def run(query):
+        return tutor_rag._cached(
+            "keyword",
+            lambda: tutor_rag._keyword_rows(query, k=4, corpus="materials"),
+            query,
+            "materials",
+            k=4,
+        )
+
+    first, hit = run("gluteus abducts")
+    assert first and not hit
+    again, hit = run("  Gluteus   ABDUCTS ")
+    assert hit and again == first
+
+    _add_doc("shoulder.md", "Supraspinatus abducts the shoulder in the first 15 degrees.")
+    fresh, hit = run("gluteus abducts")
+    assert not hit
+
+    stats = tutor_rag.retrieval_cache_stats()
+    assert stats["retrieval"]["hits"] == 1
+    assert stats["corpus_generation"] == tutor_rag.corpus_generation()
+
+
+def test_query_embedding_cache_skips_repeat_calls():
+    calls = []
+
+    class CountingEmbeddings:
+        model_name = "counting"
+
+        def embed_query(self, text):
+            calls.append(text)
+            return [float(len(text))]
+
+    wrapped = tutor_embeddings.CachedQueryEmbeddings(CountingEmbeddings(), "test-provider")
+    assert wrapped.embed_query("hip  abduction") == wrapped.embed_query("hip abduction")
+    assert calls == ["hip  abduction"]
+    assert wrapped.model_name == "counting"
@@ -0,0 +1,112 @@
+import os
+import time
+
+import pytest
+
+from dashboard import scholar_cache
+from dashboard.app import create_app
+from dashboard.scholar import build_scholar_stats
+from dashboard.scholar_cache import FileStateCache
+
+
+def _counting_cache(tmp_path, background=True):
+    folder = tmp_path / "outputs"
+    folder.mkdir()
+    (folder / "a.md").write_text("one", encoding="utf-8")
+    calls = []
+
+    def build():
+        calls.append(1)
+        return sorted(p.read_text(encoding="utf-8") for p in folder.glob("*.md"))
+
+    cache = FileStateCache()
+    cache.register("notes", build, [folder, tmp_path / "missing.md"], background=background)
+    return cache, folder, calls
+
+
+def test_rebuilds_only_when_files_change(tmp_path):
+    cache, folder, calls = _counting_cache(tmp_path)
+
+    assert cache.get("notes") == ["one"]
+    assert cache.get("notes") == ["one"]
+    assert len(calls) == 1
+
+    # Same size, new mtime: an in-place edit must still be seen
+    (folder / "a.md").write_text("two", encoding="utf-8")
+    st = os.stat(folder / "a.md")
+    os.utime(folder / "a.md", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert cache.get("notes") == ["two"]
+
+    (folder / "b.md").write_text("three", encoding="utf-8")
+    (tmp_path / "missing.md").write_text("now here", encoding="utf-8")
+    assert cache.get("notes") == ["three", "two"]
+    assert len(calls) == 3
+
+    stats = cache.stats()["entries"]["notes"]
+    assert stats["rebuilds"] == 3 and stats["hits"] == 1
+    assert stats["age_seconds"] >= 0 and stats["rebuild_ms"] is not None
+
+    cache.invalidate()
+    cache.get("notes")
+    assert len(calls) == 4
+
+
+def test_watcher_rebuilds_in_background(tmp_path):
+    cache, folder, calls = _counting_cache(tmp_path)
+    lazy_calls = []
+    cache.register("lazy", lambda: lazy_calls.append(1), [folder], background=False)
+    cache.get("notes")
+    cache.start_watcher(interval=0.01)
+    try:
+        (folder / "b.md").write_text("fresh", encoding="utf-8")
+        deadline = time.monotonic() + 5
+        while len(calls) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert cache.get("notes") == ["fresh", "one"]
+        assert cache.stats()["watching"]
+        assert lazy_calls == []
+    finally:
+        cache.stop_watcher()
+    assert not cache.stats()["watching"]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Never sweep the repo's real orchestrator_runs from tests
+    monkeypatch.setattr(scholar_cache, "_cleanup_stale_pids_throttled", lambda: None)
+    scholar_cache.invalidate()
+    return create_app().test_client()
+
+
+def test_scholar_tab_data_is_cached(client):
+    stats = scholar_cache.cached_scholar_stats()
+    assert scholar_cache.cached_scholar_stats() is stats
+    assert stats == build_scholar_stats(cleanup_pids=False)
+
+    first = client.get("/api/scholar/insights").get_json()
+    assert client.get("/api/scholar/insights").get_json() == first
+
+    entries = client.get("/api/scholar/cache-stats").get_json()["entries"]
+    assert entries["scholar_stats"]["hits"] >= 1
+    assert entries["latest_insights"]["rebuilds"] >= 1 and entries["latest_insights"]["hits"] >= 1
+
+
+def test_weekly_digest_is_cached_but_failures_are_not(monkeypatch):
+    from dashboard import scholar
+
+    results = [{"ok": False, "error": "no API key"}, {"ok": True, "digest": "# Week"}]
+    calls = []
+
+    def fake_digest(days=7):
+        calls.append(days)
+        return results[min(len(calls), len(results)) - 1]
+
+    monkeypatch.setattr(scholar, "generate_weekly_digest", fake_digest)
+    scholar_cache.invalidate()
+    try:
+        assert not scholar_cache.cached_weekly_digest(days=3)["ok"]
+        assert scholar_cache.cached_weekly_digest(days=3) == {"ok": True, "digest": "# Week"}
+        assert scholar_cache.cached_weekly_digest(days=3)["ok"]
+        assert calls == [3, 3]
+    finally:
+        scholar_cache.invalidate()
@@ -0,0 +1,226 @@
+import sqlite3
+
+import pytest
+
+import db_setup
+import ingest_session
+import session_rollups
+from dashboard import cli
+from dashboard.app import create_app
+from dashboard.stats import build_stats, build_stats_from_sessions, get_trend_data, get_wrap_analytics
+
+from test_dashboard_stats import _insert_sessions
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "pt_study.db")
+    monkeypatch.setattr(db_setup, "DB_PATH", db_path)
+    monkeypatch.setattr(ingest_session, "DB_PATH", db_path)
+    db_setup.init_database()
+    yield db_path
+
+
+@pytest.fixture
+def client(temp_db):
+    app = create_app()
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+def _check():
+    conn = db_setup.get_connection()
+    try:
+        return session_rollups.check_rollups(conn, sync=False)
+    finally:
+        conn.close()
+
+
+def _assert_matches_reference():
+    expected = build_stats_from_sessions(cli.get_all_sessions())
+    expected["modes"] = dict(expected["modes"])
+    assert build_stats() == expected
+    assert _check()["ok"]
+
+
+def test_init_stamps_version_and_writers_keep_queue_empty(temp_db):
+    conn = db_setup.get_connection()
+    assert session_rollups.rollup_version(conn) == session_rollups.ROLLUP_VERSION
+    conn.close()
+    _insert_sessions(120)
+    conn = db_setup.get_connection()
+    assert conn.execute("SELECT COUNT(*) FROM session_rollup_queue").fetchone()[0] == 0
+    conn.close()
+    _assert_matches_reference()
+
+
+def test_reads_never_write_and_raw_writes_wait_in_the_queue(temp_db):
+    _insert_sessions(150)
+
+    conn = db_setup.get_connection()
+    conn.execute("UPDATE sessions SET main_topic = 'Gait', understanding_level = 1 WHERE id % 7 = 0")
+    conn.execute("UPDATE sessions SET session_date = '2020-01-01', study_mode = 'Review' WHERE id % 11 = 0")
+    conn.execute("DELETE FROM sessions WHERE id % 5 = 0")
+    conn.commit()
+    queued = conn.execute("SELECT COUNT(*) FROM session_rollup_queue").fetchone()[0]
+    assert queued
+
+    # Readers serve the existing rollups even while another writer holds the lock.
+    blocker = sqlite3.connect(temp_db)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        build_stats()
+        get_trend_data(days=30)
+        get_wrap_analytics()
+    finally:
+        blocker.rollback()
+        blocker.close()
+    assert conn.execute("SELECT COUNT(*) FROM session_rollup_queue").fetchone()[0] == queued
+    assert not _check()["ok"]
+
+    # The next session write (or init_database) applies the queue.
+    session_rollups.sync_after_session_write(conn)
+    conn.close()
+    _assert_matches_reference()
+
+
+def test_insert_session_and_api_writes_keep_rollups_current(temp_db, client):
+    _insert_sessions(40)
+
+    ok, _ = ingest_session.insert_session({
+        "session_date": "2024-03-01",
+        "session_time": "08:00",
+        "study_mode": "Core",
+        "main_topic": "Shoulder complex",
+        "duration_minutes": 45,
+        "understanding_level": 2,
+        "glossary_entries": "scapulohumeral rhythm; GH joint",
+        "created_at": "2024-03-01T08:00:00",
+    })
+    assert ok
+    assert _check()["ok"]
+
+    conn = db_setup.get_connection()
+    new_id = conn.execute("SELECT id FROM sessions WHERE main_topic = 'Shoulder complex'").fetchone()[0]
+    conn.close()
+
+    resp = client.patch(f"/api/sessions/{new_id}", json={"topic": "Elbow", "mode": "Sprint", "minutes": 30})
+    assert resp.status_code == 200
+    assert _check()["ok"]
+
+    assert client.delete("/api/sessions/1").status_code == 200
+    assert _check()["ok"]
+
+    resp = client.post("/api/sessions/bulk-delete", json={"ids": [2, 3, new_id]})
+    assert resp.get_json()["deleted"] == 3
+    assert _check()["ok"]
+
+    _assert_matches_reference()
+
+
+def test_session_json_ingest_keeps_rollups_current(temp_db, client):
+    _insert_sessions(40)
+
+    resp = client.post("/api/brain/session-json", json={
+        "session_id": 1,
+        "tracker_json": {
+            "schema_version": "9.4",
+            "duration_min": 95,
+            "understanding": 5,
+            "anchors": "rotator cuff; scapular plane",
+        },
+        "enhanced_json": {"glossary": "GH joint; AC joint"},
+    })
+    assert resp.status_code == 200 and resp.get_json()["ok"]
+
+    conn = db_setup.get_connection()
+    assert conn.execute("SELECT COUNT(*) FROM session_rollup_queue").fetchone()[0] == 0
+    conn.close()
+    _assert_matches_reference()
+
+
+def test_checker_reports_drift_and_rebuild_repairs_it(temp_db):
+    _insert_sessions(60)
+
+    conn = db_setup.get_connection()
+    conn.execute("UPDATE session_rollup_daily SET sessions = sessions + 1 WHERE rowid = 1")
+    conn.execute("DELETE FROM session_rollup_mode")
+    conn.commit()
+
+    report = session_rollups.check_rollups(conn)
+    assert not report["ok"]
+    assert len(report["tables"]["session_rollup_daily"]["mismatched"]) == 1
+    assert report["tables"]["session_rollup_mode"]["missing"]
+
+    session_rollups.rebuild_rollups(conn)
+    assert session_rollups.check_rollups(conn)["ok"]
+    conn.close()
+
+
+def test_stale_version_triggers_rebuild(temp_db):
+    _insert_sessions(30)
+    conn = db_setup.get_connection()
+    session_rollups.sync_rollups(conn)
+    conn.execute("UPDATE session_rollup_meta SET value = '0' WHERE name = 'version'")
+    conn.execute("DELETE FROM session_rollup_topic")
+    conn.commit()
+    session_rollups.sync_rollups(conn)
+    assert session_rollups.check_rollups(conn, sync=False)["ok"]
+    conn.close()
+
+
+def test_trend_and_wrap_analytics_match_raw_sessions(temp_db):
+    _insert_sessions(200)
+
+    trend = get_trend_data(days=30)
+    conn = sqlite3.connect(temp_db)
+    raw = {
+        date: (n, u)
+        for date, n, u in conn.execute(
+            "SELECT session_date, COUNT(*), AVG(understanding_level) FROM sessions GROUP BY session_date"
+        )
+    }
+    total, scheduled = conn.execute(
+        "SELECT COUNT(*), SUM(TRIM(COALESCE(spaced_reviews, '')) != '') FROM sessions"
+    ).fetchone()
+    conn.close()
+
+    for date, n, u in zip(trend["dates"], trend["sessions_per_day"], trend["avg_understanding_per_day"]):
+        expected_n, expected_u = raw.get(date, (0, None))
+        assert n == expected_n
+        assert u == (round(expected_u, 2) if expected_u is not None else None)
+
+    wrap = get_wrap_analytics()
+    assert wrap["error_tracking"]["total_sessions"] == total
+    assert wrap["spaced_review_stats"]["sessions_scheduled"] == scheduled
+    completeness = wrap["wrap_completeness"]
+    assert completeness["fully_complete"] + completeness["partially_complete"] + completeness["empty"] == total
+
+
+def test_cli_rebuild_and_check(temp_db, capsys):
+    _insert_sessions(20)
+    assert session_rollups.main(["rebuild"]) == 0
+    assert session_rollups.main(["check"]) == 0
+    assert "consistent" in capsys.readouterr().out
+
+
+def test_blank_numeric_columns_do_not_break_the_writer_sync(temp_db):
+    conn = db_setup.get_connection()
+    conn.execute(
+        "INSERT INTO sessions (session_date, session_time, study_mode, time_spent_minutes, "
+        "duration_minutes, understanding_level, created_at) "
+        "VALUES ('2024-02-01', '09:00', 'Core', '', '', '', '2024-02-01T09:00:00')"
+    )
+    conn.execute(
+        "INSERT INTO sessions (session_date, session_time, study_mode, time_spent_minutes, "
+        "understanding_level, created_at) "
+        "VALUES ('2024-02-01', '10:00', 'Core', '30', 4, '2024-02-01T10:00:00')"
+    )
+    conn.commit()
+    session_rollups.sync_after_session_write(conn)
+    row = conn.execute(
+        "SELECT sessions, minutes, understanding_n FROM session_rollup_daily WHERE session_date = '2024-02-01'"
+    ).fetchone()
+    assert tuple(row) == (2, 30, 1)
+    assert conn.execute("SELECT COUNT(*) FROM session_rollup_queue").fetchone()[0] == 0
+    conn.close()
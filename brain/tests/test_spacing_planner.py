@@ -0,0 +1,153 @@
+import random
+import re
+import time
+from datetime import date, timedelta
+
+import pytest
+
+import db_setup
+from dashboard.app import create_app
+from spacing_planner import generate_spacing_tasks
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_setup, "DB_PATH", str(tmp_path / "pt_study.db"))
+    db_setup.init_database()
+    yield
+
+
+def _insert(rows):
+    conn = db_setup.get_connection()
+    conn.executemany(
+        "INSERT INTO sessions (session_date, session_time, study_mode, main_topic, weak_anchors, created_at) "
+        "VALUES (?, ?, 'Core', ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+def _seed(n=80, seed=11):
+    rng = random.Random(seed)
+    anchors = [f"anchor {i}" for i in range(25)]
+    rows = []
+    for i in range(n):
+        day = (date.today() - timedelta(days=rng.randint(0, 45))).isoformat()
+        picked = rng.sample(anchors, rng.randint(0, 4))
+        text = rng.choice([";", "\n", " ; "]).join(picked) if picked else rng.choice(["", None])
+        rows.append((day, f"{i // 60:02d}:{i % 60:02d}", f"topic {i}", text, f"{day}T00:00:{i % 60:02d}"))
+    _insert(rows)
+
+
+def _legacy_generate(conn):
+    """The per-anchor SELECT + INSERT loop the engine replaced."""
+    intervals = [1, 3, 7, 21]
+    sessions = conn.execute(
+        """
+        SELECT session_date, weak_anchors FROM sessions
+        WHERE weak_anchors IS NOT NULL AND weak_anchors != ''
+          AND session_date >= date('now', '-30 days')
+        ORDER BY session_date DESC, id DESC
+        """
+    ).fetchall()
+    for session_date, text in sessions:
+        for anchor in [a.strip() for a in re.split(r"[;\n]", text or "") if a.strip()]:
+            for i, days in enumerate(intervals):
+                if conn.execute(
+                    "SELECT id FROM study_tasks WHERE anchor_text = ? AND review_number = ? AND source = 'spacing'",
+                    (anchor, i + 1),
+                ).fetchone():
+                    continue
+                conn.execute(
+                    """
+                    INSERT INTO study_tasks (scheduled_date, planned_minutes, status, notes, source,
+                                             priority, review_number, anchor_text, created_at)
+                    VALUES (date(?, '+' || ? || ' days'), 45, 'pending', ?, 'spacing', ?, ?, ?, datetime('now'))
+                    """,
+                    (session_date, str(days), f"Review R{i + 1}: {anchor} (from {session_date})", 4 - i, i + 1, anchor),
+                )
+    conn.commit()
+
+
+def _tasks(conn):
+    return sorted(conn.execute(
+        "SELECT anchor_text, review_number, scheduled_date, priority, notes, planned_minutes "
+        "FROM study_tasks WHERE source = 'spacing'"
+    ).fetchall())
+
+
+def test_matches_per_anchor_loop(temp_db):
+    _seed()
+    conn = db_setup.get_connection()
+    result = generate_spacing_tasks(conn)
+    engine = _tasks(conn)
+    conn.execute("DELETE FROM study_tasks")
+    conn.commit()
+    _legacy_generate(conn)
+    legacy = _tasks(conn)
+    conn.close()
+
+    assert engine == legacy
+    assert result["tasks_created"] == len(engine) == 4 * result["anchors"]
+    assert result["incremental"] is False and result["elapsed_ms"] >= 0
+
+
+def test_incremental_runs_scan_only_new_sessions(temp_db):
+    _seed()
+    conn = db_setup.get_connection()
+    first = generate_spacing_tasks(conn)
+    again = generate_spacing_tasks(conn)
+    assert again["incremental"] and again["sessions_scanned"] == 0 and again["tasks_created"] == 0
+
+    time.sleep(0.01)  # change stamps have millisecond resolution
+    today = date.today().isoformat()
+    _insert([(today, "23:59", "new", "anchor 0; brand new anchor", f"{today}T23:59:59")])
+    third = generate_spacing_tasks(conn)
+    assert third["sessions_scanned"] == 1
+    assert third["tasks_created"] == 4
+
+    full = generate_spacing_tasks(conn, incremental=False)
+    assert full["sessions_scanned"] > first["sessions_scanned"]
+    assert full["tasks_created"] == 0
+    conn.close()
+
+
+def test_planner_generate_endpoint(temp_db):
+    _seed(n=20)
+    client = create_app().test_client()
+    body = client.post("/api/planner/generate", json={}).get_json()
+    assert body["ok"] and body["tasks_created"] > 0 and "elapsed_ms" in body
+    assert client.post("/api/planner/generate", json={}).get_json()["tasks_created"] == 0
+    full = client.post("/api/planner/generate", json={"full": True}).get_json()
+    assert full["incremental"] is False and full["tasks_created"] == 0
+
+
+def test_init_dedupes_anchor_rows_before_creating_unique_index(temp_db):
+    conn = db_setup.get_connection()
+    conn.execute("DROP INDEX idx_study_tasks_anchor_review")
+    conn.executemany(
+        "INSERT INTO study_tasks (anchor_text, review_number, source, status, created_at) "
+        "VALUES (?, ?, ?, ?, '2024-01-01')",
+        [
+            ("brachial plexus", 1, "spacing", "completed"),
+            ("brachial plexus", 1, "spacing", "pending"),
+            ("brachial plexus", 2, "spacing", "pending"),
+            (None, None, None, "pending"),
+            (None, None, None, "pending"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    db_setup.init_database()
+    conn = db_setup.get_connection()
+    rows = conn.execute("SELECT id, review_number, status FROM study_tasks ORDER BY id").fetchall()
+    index = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'idx_study_tasks_anchor_review'"
+    ).fetchone()
+    conn.close()
+    assert [tuple(r) for r in rows] == [
+        (1, 1, "completed"), (3, 2, "pending"), (4, None, "pending"), (5, None, "pending")
+    ]
+    assert index is not None
@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+
+from lazy_imports import is_loaded, module_available
+
+BRAIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+DEFERRED = [
+    "requests", "tutor_engine", "tutor_rag", "rag_notes", "ingest_session",
+    "import_syllabus", "dashboard.scholar", "dashboard.gcal", "text_extractor",
+]
+
+
+def test_create_app_defers_heavy_modules(tmp_path):
+    script = f"""
+import json, sys
+sys.path.insert(0, {BRAIN_DIR!r})
+import config, db_setup
+config.DB_PATH = db_setup.DB_PATH = {str(tmp_path / "pt_study.db")!r}
+from dashboard.app import create_app
+client = create_app().test_client()
+from lazy_imports import is_loaded
+print(json.dumps([m for m in {DEFERRED!r} if is_loaded(m)]))
+"""
+    out = subprocess.run(
+        [sys.executable, "-c", script], cwd=BRAIN_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    assert json.loads(out.strip().splitlines()[-1]) == []
+
+
+def test_module_available_does_not_import():
+    assert not module_available("definitely_not_installed_xyz")
+    name = "colorsys"  # stdlib, never imported by the suite
+    sys.modules.pop(name, None)
+    assert module_available(name)
+    assert not is_loaded(name)
@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+import db_pool
+import db_setup
+import ingest_session
+from dashboard.stats import get_mastery_stats
+from topic_mastery import check_topic_mastery, recompute_topic_mastery, topic_key_sql
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "pt_study.db")
+    monkeypatch.setattr(db_setup, "DB_PATH", path)
+    monkeypatch.setattr(ingest_session, "DB_PATH", path)
+    db_setup.init_database()
+    yield path
+    db_pool.get_pool(path).close_all()
+
+
+TOPICS = ["Brachial Plexus", " brachial plexus ", "Gait", "gait\n", "Knee", "", None]
+
+
+def _random_session(rng, n):
+    main = rng.choice(TOPICS)
+    return (
+        f"2026-0{rng.randint(1, 9)}-{rng.randint(10, 28)}",
+        f"{n // 60:02d}:{n % 60:02d}",  # (date, time, main_topic) is unique
+        main,
+        rng.choice(TOPICS) if not main else None,
+        rng.choice([None, 1, 2, 3, 4, 5]),
+        rng.choice([None, "", 2, 4]),
+    )
+
+
+def test_triggers_track_inserts_updates_and_deletes(temp_db):
+    rng = random.Random(7)
+    conn = db_setup.get_connection()
+    insert = (
+        "INSERT INTO sessions (session_date, session_time, main_topic, topic, understanding_level, "
+        "retention_confidence, study_mode, created_at) VALUES (?, ?, ?, ?, ?, ?, 'Core', '2026-01-01')"
+    )
+    conn.executemany(insert, [_random_session(rng, n) for n in range(120)])
+    conn.commit()
+    assert check_topic_mastery(conn)["ok"]
+
+    ids = [r[0] for r in conn.execute("SELECT id FROM sessions")]
+    for sid in rng.sample(ids, 40):
+        conn.execute(
+            "UPDATE sessions SET session_date = ?, session_time = ?, main_topic = ?, topic = ?, "
+            "understanding_level = ?, retention_confidence = ? WHERE id = ?",
+            _random_session(rng, 1000 + sid) + (sid,),
+        )
+    conn.execute("DELETE FROM sessions WHERE id IN (SELECT id FROM sessions ORDER BY session_date LIMIT 30)")
+    conn.commit()
+    report = check_topic_mastery(conn)
+    assert report["ok"], report
+    assert report["version"] == "1"
+
+    # Boundary re-reads on delete go through the expression index.
+    plan = conn.execute(
+        f"EXPLAIN QUERY PLAN SELECT MIN(session_date) FROM sessions WHERE {topic_key_sql()} = 'gait'"
+    ).fetchall()
+    assert any("idx_sessions_mastery_key" in row[-1] for row in plan)
+    conn.close()
+
+
+def test_reingest_replaces_mastery_and_recompute_repairs_legacy_rows(temp_db, tmp_path):
+    log = tmp_path / "2026-02-01_knee.md"
+
+    def write(understanding):
+        log.write_text(
+            "# Session Log\n\n## Session Info\n- Date: 2026-02-01\n- Time: 09:00\n"
+            "- Main Topic: Knee Ligaments\n- Study Mode: Core\n- Time Spent: 30 Minutes\n\n"
+            f"## Ratings\n- Understanding Level: {understanding}\n- Retention Confidence: 3\n"
+        )
+
+    write(2)
+    assert ingest_session.ingest_file(str(log))
+    write(5)
+    assert ingest_session.ingest_file(str(log))  # modified: old session deleted, new inserted
+
+    conn = db_setup.get_connection()
+    row = conn.execute(
+        "SELECT study_count, avg_understanding FROM topic_mastery WHERE topic = 'knee ligaments'"
+    ).fetchone()
+    assert tuple(row) == (1, 5.0)
+
+    # Rows skewed by the old running average are rebuilt by one GROUP BY.
+    conn.execute("UPDATE topic_mastery SET study_count = 9, avg_understanding = 1.7")
+    conn.commit()
+    assert not check_topic_mastery(conn)["ok"]
+    assert recompute_topic_mastery(conn) == 1
+    assert check_topic_mastery(conn)["ok"]
+    conn.close()
+
+    stats = get_mastery_stats()
+    assert stats["lowest_understanding"][0]["avg_understanding"] == 5.0
@@ -0,0 +1,104 @@
+"""Tests for the pluggable tutor embedding providers."""
+
+import math
+import sqlite3
+
+import pytest
+
+import db_setup
+import rag_notes
+import tutor_embeddings
+import tutor_rag
+
+
+class NullSink:
+    def upsert(self, collection_name, ids, embeddings, texts, metadatas):
+        pass
+
+    def delete(self, collection_name, ids):
+        pass
+
+
+def _cos(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+@pytest.fixture
+def no_embedding_env(monkeypatch):
+    for var in (
+        "OPENAI_API_KEY",
+        "OPENROUTER_API_KEY",
+        "TUTOR_EMBEDDINGS",
+        "TUTOR_EMBEDDINGS_MATERIALS",
+        "TUTOR_EMBEDDINGS_INSTRUCTIONS",
+    ):
+        monkeypatch.delenv(var, raising=False)
+    return monkeypatch
+
+
+def test_resolve_provider_precedence(no_embedding_env):
+    mp = no_embedding_env
+    assert tutor_embeddings.resolve_provider("tutor_materials") == "local"
+
+    mp.setenv("OPENAI_API_KEY", "sk-test")
+    assert tutor_embeddings.resolve_provider("tutor_materials") == "openai"
+
+    mp.setenv("TUTOR_EMBEDDINGS", "local")
+    assert tutor_embeddings.resolve_provider("tutor_materials") == "local"
+
+    mp.setenv("TUTOR_EMBEDDINGS_INSTRUCTIONS", "openai")
+    assert tutor_embeddings.resolve_provider("tutor_instructions") == "openai"
+    assert tutor_embeddings.resolve_provider("tutor_materials") == "local"
+
+    with pytest.raises(ValueError):
+        tutor_embeddings.get_embeddings("word2vec")
+
+
+def test_hashing_embeddings_are_normalised_and_semantic():
+    emb = tutor_embeddings.HashingEmbeddings(dim=512)
+    docs = emb.embed_documents([
+        "Gluteus medius abducts the hip and stabilises the pelvis.",
+        "The brachial plexus supplies the upper limb.",
+        "",
+    ])
+    assert len(docs[0]) == 512
+    assert math.isclose(math.sqrt(_cos(docs[0], docs[0])), 1.0, rel_tol=1e-5)
+    assert not any(docs[2])
+
+    query = emb.embed_query("hip abduction gluteus")
+    assert _cos(query, docs[0]) > _cos(query, docs[1])
+    assert emb.embed_query("hip abduction gluteus") == query
+
+
+def test_pipeline_records_model_and_reembeds_on_provider_switch(tmp_path, no_embedding_env):
+    mp = no_embedding_env
+    db_path = str(tmp_path / "pt_study.db")
+    for module in (db_setup, rag_notes, tutor_rag):
+        mp.setattr(module, "DB_PATH", db_path)
+    db_setup.init_database()
+    content = "\n\n".join(f"Hip paragraph {i}. " + "lorem ipsum dolor " * 20 for i in range(3))
+    rag_notes._upsert_rag_doc(
+        source_path="hip.md",
+        doc_type="txt",
+        course_id=None,
+        topic_tags="",
+        content=content,
+        checksum=rag_notes._checksum(content),
+        metadata={},
+        corpus="materials",
+    )
+
+    local = tutor_embeddings.get_embeddings("local")
+    first = tutor_rag.embed_rag_docs(embed_fn=local.embed_documents, sink=NullSink())
+    assert first["total_chunks"] > 0
+
+    conn = sqlite3.connect(db_path)
+    models = {r[0] for r in conn.execute("SELECT embedding_model FROM rag_embeddings")}
+    conn.close()
+    assert models == {local.model_name}
+
+    assert tutor_rag.embed_rag_docs(embed_fn=local.embed_documents, sink=NullSink())["total_chunks"] == 0
+
+    mp.setenv("TUTOR_EMBEDDINGS", "openai")
+    switched = tutor_rag.embed_rag_docs(embed_fn=local.embed_documents, sink=NullSink())
+    assert switched["total_chunks"] == first["total_chunks"]
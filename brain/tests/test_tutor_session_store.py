@@ -0,0 +1,71 @@
+import pytest
+
+import db_pool
+import db_setup
+from tutor_session_store import SessionStore, estimate_tokens
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "pt_study.db")
+    monkeypatch.setattr(db_setup, "DB_PATH", path)
+    db_setup.init_database()
+    yield path
+    db_pool.get_pool(path).close_all()
+
+
+def test_history_stays_within_token_budget(temp_db):
+    store = SessionStore(token_budget=200, summary_budget=60)
+    for i in range(50):
+        store.append_exchange("s1", f"question {i} about the brachial plexus", "answer " * 40)
+    history = store.get("s1")
+    assert history.turn_count == 100
+    assert history.tokens == sum(estimate_tokens(t["content"]) for t in history.turns) <= 200
+    assert history.messages()[-1]["role"] == "assistant"
+    # Older questions survive only as a bounded digest, newest last.
+    assert history.summary and estimate_tokens(history.summary_text()) <= 60
+    assert "question" in history.summary[-1]
+
+
+def test_write_through_survives_restart_and_seeds_from_turns(temp_db):
+    store = SessionStore()
+    store.append_exchange("s1", "What innervates deltoid?", "The axillary nerve.")
+    fresh = SessionStore()  # new process: empty cache
+    assert [t["content"] for t in fresh.get("s1").messages()] == [
+        "What innervates deltoid?", "The axillary nerve."
+    ]
+    assert fresh.stats()["misses"] == 1
+
+    conn = db_setup.get_connection()
+    conn.executemany(
+        "INSERT INTO tutor_turns (session_id, tutor_session_id, turn_number, question, answer, created_at) "
+        "VALUES ('old', 'old', ?, ?, ?, '2026-01-01')",
+        [(n, f"q{n}", f"a{n}") for n in range(1, 31)],
+    )
+    conn.commit()
+    conn.close()
+    seeded = fresh.get("old").messages()
+    # The most recent turns, oldest first (tutor_turns is read newest-first).
+    assert seeded[-1]["content"] == "a30" and seeded[0]["content"] == "q11"
+
+    fresh.drop("s1")
+    assert SessionStore().get("s1").messages() == []
+
+
+def test_lru_eviction_caps_sessions_and_bytes(temp_db):
+    store = SessionStore(max_sessions=3, max_bytes=10_000)
+    for i in range(10):
+        store.append_exchange(f"s{i}", "q", "a" * 100)
+    stats = store.stats()
+    assert stats["sessions"] == 3 and stats["evictions"] == 7
+    store.get("s7")  # touch: s8 becomes least recently used
+    store.append("s10", "user", "x")
+    assert "s8" not in store._cache and "s7" in store._cache
+
+    small = SessionStore(max_sessions=100, max_bytes=1_000)
+    for i in range(50):
+        small.append_exchange(f"s{i}", "q" * 100, "a" * 100)
+    assert small.stats()["bytes"] <= 1_000
+    assert small.stats()["bytes"] == sum(h.nbytes for h in small._cache.values())
+    # Evicted sessions reload intact from SQLite.
+    assert small.get("s0").messages()[1]["content"] == "a" * 100
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Set-based maintenance of the topic_mastery table.
+
+topic_mastery holds one row per normalized topic (main_topic, else topic,
+trimmed and lowercased): how many sessions covered it, first/last study
+date and the average understanding/retention ratings. It used to be kept as
+a running average updated from Python after each insert, which drifted as
+soon as a session was edited, deleted or re-ingested.
+
+Now every row also stores the rating sums and counts, and triggers on
+sessions (installed by db_setup.init_database via create_mastery_triggers)
+apply an exact delta for each INSERT, UPDATE and DELETE inside the same
+transaction as the session write:
+  - insert: count+1, add ratings, widen first/last dates
+  - delete: count-1, subtract ratings, drop the row at zero; first/last are
+            re-read (via an expression index) only if the deleted session
+            was on the boundary
+  - update: delete the old contribution, then add the new one
+recompute_topic_mastery() rebuilds the whole table with one GROUP BY; it runs
+once when the stamp in session_rollup_meta is missing or stale, which also
+repairs tables written by the old running average.
+
+Usage:
+    python topic_mastery.py rebuild
+    python topic_mastery.py check
+"""
+
+import argparse
+import sqlite3
+import sys
+from typing import List, Optional
+
+# Bump when the key or columns change; init_database recomputes.
+MASTERY_VERSION = "1"
+
+
+def topic_key_sql(row: str = "") -> str:
+    """SQL for a session's mastery key; row is 'NEW', 'OLD' or '' (bare columns)."""
+    p = f"{row}." if row else ""
+    return f"lower(trim(COALESCE(NULLIF({p}main_topic, ''), {p}topic), char(32, 9, 10, 13)))"
+
+
+def _rating_sql(row: str, column: str) -> str:
+    return f"NULLIF({row}.{column}, '')"
+
+
+def _add_sql(row: str) -> str:
+    u = _rating_sql(row, "understanding_level")
+    r = _rating_sql(row, "retention_confidence")
+    return f"""
+        INSERT INTO topic_mastery
+            (topic, study_count, first_studied, last_studied,
+             understanding_sum, understanding_n, retention_sum, retention_n,
+             avg_understanding, avg_retention)
+        SELECT k, 1, {row}.session_date, {row}.session_date,
+               COALESCE({u}, 0), {u} IS NOT NULL, COALESCE({r}, 0), {r} IS NOT NULL,
+               {u} * 1.0, {r} * 1.0
+        FROM (SELECT {topic_key_sql(row)} AS k)
+        WHERE k <> ''
+        ON CONFLICT(topic) DO UPDATE SET
+            study_count = study_count + 1,
+            first_studied = CASE WHEN first_studied IS NULL OR excluded.first_studied < first_studied
+                                 THEN excluded.first_studied ELSE first_studied END,
+            last_studied = CASE WHEN last_studied IS NULL OR excluded.last_studied > last_studied
+                                THEN excluded.last_studied ELSE last_studied END,
+            understanding_sum = understanding_sum + excluded.understanding_sum,
+            understanding_n = understanding_n + excluded.understanding_n,
+            retention_sum = retention_sum + excluded.retention_sum,
+            retention_n = retention_n + excluded.retention_n,
+            avg_understanding = (understanding_sum + excluded.understanding_sum) * 1.0
+                                / NULLIF(understanding_n + excluded.understanding_n, 0),
+            avg_retention = (retention_sum + excluded.retention_sum) * 1.0
+                            / NULLIF(retention_n + excluded.retention_n, 0);
+    """
+
+
+def _remove_sql(row: str) -> str:
+    u = _rating_sql(row, "understanding_level")
+    r = _rating_sql(row, "retention_confidence")
+    key = topic_key_sql(row)
+    return f"""
+        UPDATE topic_mastery SET
+            study_count = study_count - 1,
+            understanding_sum = understanding_sum - COALESCE({u}, 0),
+            understanding_n = understanding_n - ({u} IS NOT NULL),
+            retention_sum = retention_sum - COALESCE({r}, 0),
+            retention_n = retention_n - ({r} IS NOT NULL),
+            avg_understanding = (understanding_sum - COALESCE({u}, 0)) * 1.0
+                                / NULLIF(understanding_n - ({u} IS NOT NULL), 0),
+            avg_retention = (retention_sum - COALESCE({r}, 0)) * 1.0
+                            / NULLIF(retention_n - ({r} IS NOT NULL), 0)
+        WHERE topic = {key};
+        DELETE FROM topic_mastery WHERE topic = {key} AND study_count <= 0;
+        UPDATE topic_mastery SET
+            first_studied = (SELECT MIN(session_date) FROM sessions
+                             WHERE {topic_key_sql()} = topic_mastery.topic),
+            last_studied = (SELECT MAX(session_date) FROM sessions
+                            WHERE {topic_key_sql()} = topic_mastery.topic)
+        WHERE topic = {key}
+          AND (first_studied = {row}.session_date OR last_studied = {row}.session_date);
+    """
+
+
+def create_mastery_triggers(cursor) -> None:
+    """Install the topic_mastery delta triggers and the key index on sessions."""
+    cursor.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_sessions_mastery_key ON sessions({topic_key_sql()})"
+    )
+    cursor.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS sessions_mastery_ai
+        AFTER INSERT ON sessions
+        BEGIN
+            {_add_sql("NEW")}
+        END;
+    """
+    )
+    cursor.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS sessions_mastery_au
+        AFTER UPDATE OF main_topic, topic, session_date, understanding_level, retention_confidence
+        ON sessions
+        BEGIN
+            {_remove_sql("OLD")}
+            {_add_sql("NEW")}
+        END;
+    """
+    )
+    cursor.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS sessions_mastery_ad
+        AFTER DELETE ON sessions
+        BEGIN
+            {_remove_sql("OLD")}
+        END;
+    """
+    )
+
+
+_GROUPED = f"""
+    SELECT k AS topic,
+           COUNT(*) AS study_count,
+           MIN(session_date) AS first_studied,
+           MAX(session_date) AS last_studied,
+           COALESCE(SUM(u), 0) AS understanding_sum,
+           COUNT(u) AS understanding_n,
+           COALESCE(SUM(r), 0) AS retention_sum,
+           COUNT(r) AS retention_n,
+           AVG(u) AS avg_understanding,
+           AVG(r) AS avg_retention
+    FROM (
+        SELECT {topic_key_sql()} AS k,
+               NULLIF(understanding_level, '') AS u,
+               NULLIF(retention_confidence, '') AS r,
+               session_date
+        FROM sessions
+    )
+    WHERE k <> ''
+    GROUP BY k
+"""
+
+_COLUMNS = (
+    "topic, study_count, first_studied, last_studied, understanding_sum, understanding_n, "
+    "retention_sum, retention_n, avg_understanding, avg_retention"
+)
+
+
+def mastery_version(conn: sqlite3.Connection) -> Optional[str]:
+    row = conn.execute(
+        "SELECT value FROM session_rollup_meta WHERE name = 'mastery_version'"
+    ).fetchone()
+    return row[0] if row else None
+
+
+def recompute_topic_mastery(conn: sqlite3.Connection, commit: bool = True) -> int:
+    """Rebuild topic_mastery from sessions in one statement; returns the topic count."""
+    conn.execute("DELETE FROM topic_mastery")
+    conn.execute(f"INSERT INTO topic_mastery ({_COLUMNS}) {_GROUPED}")
+    conn.execute(
+        "INSERT OR REPLACE INTO session_rollup_meta (name, value) VALUES ('mastery_version', ?)",
+        (MASTERY_VERSION,),
+    )
+    if commit:
+        conn.commit()
+    return conn.execute("SELECT COUNT(*) FROM topic_mastery").fetchone()[0]
+
+
+def check_topic_mastery(conn: sqlite3.Connection) -> dict:
+    """Diff topic_mastery against a fresh GROUP BY over sessions."""
+
+    def rows(sql):
+        out = {}
+        for row in conn.execute(sql):
+            out[row[0]] = tuple(round(v, 9) if isinstance(v, float) else v for v in row[1:])
+        return out
+
+    expected = rows(_GROUPED)
+    stored = rows(f"SELECT {_COLUMNS} FROM topic_mastery")
+    diff = {
+        "missing": sorted(k for k in expected if k not in stored),
+        "extra": sorted(k for k in stored if k not in expected),
+        "mismatched": [
+            {"topic": k, "stored": stored[k], "expected": expected[k]}
+            for k in sorted(expected)
+            if k in stored and stored[k] != expected[k]
+        ],
+    }
+    ok = not (diff["missing"] or diff["extra"] or diff["mismatched"])
+    return {"ok": ok, "version": mastery_version(conn), **diff}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from db_setup import get_connection
+
+    parser = argparse.ArgumentParser(description="topic_mastery maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="Recompute topic_mastery from sessions")
+    sub.add_parser("check", help="Diff topic_mastery against sessions")
+    args = parser.parse_args(argv)
+
+    conn = get_connection()
+    try:
+        if args.command == "rebuild":
+            print(f"[OK] {recompute_topic_mastery(conn)} topic(s) recomputed")
+            return 0
+        report = check_topic_mastery(conn)
+        if report["ok"]:
+            print("[OK] topic_mastery matches sessions")
+            return 0
+        print(
+            f"[WARN] {len(report['missing'])} missing, {len(report['extra'])} extra, "
+            f"{len(report['mismatched'])} mismatched topic(s)"
+        )
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Tutor Embeddings — pluggable embedding providers for the tutor vectorstores.
+
+Providers:
+  - "openai" — OpenAI-compatible `text-embedding-3-small` (network, API key)
+  - "local"  — CPU-only hashed word + character n-gram embedder (NumPy, offline)
+
+Selection is per collection via env:
+  TUTOR_EMBEDDINGS_MATERIALS / TUTOR_EMBEDDINGS_INSTRUCTIONS  (per collection)
+  TUTOR_EMBEDDINGS                                           (global default)
+When nothing is set, "openai" is used if an API key exists, otherwise "local".
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import zlib
+from typing import Optional
+
+from ttl_cache import TTLCache
+
+PROVIDER_OPENAI = "openai"
+PROVIDER_LOCAL = "local"
+PROVIDERS = (PROVIDER_OPENAI, PROVIDER_LOCAL)
+
+OPENAI_EMBEDDING_MODEL = "text-embedding-3-small"
+
+_embeddings: dict[str, object] = {}
+_lock = threading.Lock()
+
+# Re-asked / regenerated questions skip the embedding round trip entirely.
+_query_cache = TTLCache(maxsize=1024, ttl_seconds=3600)
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _get_openai_api_key() -> str:
+    """Resolve OpenAI API key from env (supports OpenRouter-compatible keys)."""
+    return (
+        os.environ.get("OPENAI_API_KEY")
+        or os.environ.get("OPENROUTER_API_KEY")
+        or ""
+    )
+
+
+def resolve_provider(collection_name: Optional[str] = None) -> str:
+    """Pick the embedding provider for a collection (see module docstring)."""
+    candidates = []
+    if collection_name:
+        suffix = collection_name.replace("tutor_", "").upper()
+        candidates.append(os.environ.get(f"TUTOR_EMBEDDINGS_{suffix}", ""))
+    candidates.append(os.environ.get("TUTOR_EMBEDDINGS", ""))
+
+    for value in candidates:
+        value = value.strip().lower()
+        if value in PROVIDERS:
+            return value
+
+    return PROVIDER_OPENAI if _get_openai_api_key() else PROVIDER_LOCAL
+
+
+class HashingEmbeddings:
+    """Offline embedder: signed feature hashing of words and char n-grams.
+
+    Words carry topical signal; fastText-style n-grams of ``<word>`` make
+    inflections ("abducts"/"abduction") land near each other. Features use
+    sublinear term frequency and vectors are L2-normalised, so Chroma's
+    distance ranks like cosine similarity. CRC32 keeps hashes stable across
+    processes (Python's hash() is salted). Implements the LangChain
+    Embeddings duck type: embed_documents / embed_query.
+    """
+
+    def __init__(self, dim: int = 1024, ngram_range: tuple[int, int] = (3, 5), word_weight: float = 2.0):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.word_weight = word_weight
+
+    @property
+    def model_name(self) -> str:
+        lo, hi = self.ngram_range
+        return f"local-hash-ngram{lo}{hi}-{self.dim}"
+
+    def _features(self, text: str) -> dict[int, float]:
+        counts: dict[int, float] = {}
+        lo, hi = self.ngram_range
+        for word in _WORD_RE.findall(text.lower()):
+            keys = [("w:" + word, self.word_weight)]
+            padded = f"<{word}>"
+            for n in range(lo, hi + 1):
+                for i in range(len(padded) - n + 1):
+                    keys.append((padded[i:i + n], 1.0))
+            for key, weight in keys:
+                h = zlib.crc32(key.encode("utf-8"))
+                slot = h % self.dim
+                sign = 1.0 if (h >> 31) & 1 else -1.0
+                counts[slot] = counts.get(slot, 0.0) + sign * weight
+        return counts
+
+    def _embed(self, texts: list[str]):
+        import numpy as np
+
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            feats = self._features(text or "")
+            if not feats:
+                continue
+            idx = np.fromiter(feats.keys(), dtype=np.int64, count=len(feats))
+            vals = np.fromiter(feats.values(), dtype=np.float32, count=len(feats))
+            matrix[row, idx] = np.sign(vals) * np.log1p(np.abs(vals))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self._embed(list(texts)).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed([text])[0].tolist()
+
+
+class CachedQueryEmbeddings:
+    """Wraps an embeddings object and memoises embed_query per provider + text."""
+
+    def __init__(self, inner, provider: str):
+        self._inner = inner
+        self._provider = provider
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self._inner.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        key = (self._provider, " ".join((text or "").split()))
+        hit, vector = _query_cache.lookup(key)
+        if hit:
+            return list(vector)
+        vector = self._inner.embed_query(text)
+        _query_cache.set(key, tuple(vector))
+        return vector
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+
+def query_embedding_cache_stats() -> dict:
+    return _query_cache.stats()
+
+
+def _build_openai_embeddings():
+    from langchain_openai import OpenAIEmbeddings
+
+    embed_kwargs: dict = {
+        "model": OPENAI_EMBEDDING_MODEL,
+        "api_key": _get_openai_api_key(),
+    }
+    base_url = os.environ.get("OPENAI_BASE_URL")
+    if base_url:
+        embed_kwargs["base_url"] = base_url
+
+    return OpenAIEmbeddings(**embed_kwargs)
+
+
+def get_embeddings(provider: str):
+    """Return the (cached) embeddings object for a provider."""
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unknown embedding provider: {provider!r} (expected one of {PROVIDERS})")
+    with _lock:
+        if provider not in _embeddings:
+            if provider == PROVIDER_LOCAL:
+                inner = HashingEmbeddings()
+            else:
+                inner = _build_openai_embeddings()
+            _embeddings[provider] = CachedQueryEmbeddings(inner, provider)
+        return _embeddings[provider]
+
+
+def embedding_model_name(provider: str) -> str:
+    """Model identifier recorded in rag_embeddings.embedding_model."""
+    if provider == PROVIDER_LOCAL:
+        return get_embeddings(PROVIDER_LOCAL).model_name
+    return OPENAI_EMBEDDING_MODEL
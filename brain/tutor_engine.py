@@ -16,17 +16,15 @@ import os
 import re
 import json
 import sqlite3
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Literal, Optional, cast
 
-# Check if requests library is available
-try:
-    import requests
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    REQUESTS_AVAILABLE = False
+from lazy_imports import module_available
+
+# Check if requests library is available (only call_openrouter imports it)
+REQUESTS_AVAILABLE = module_available("requests")
 
 # Import our types
 import sys
@@ -36,6 +34,7 @@ from tutor_api_types import (
     TutorCitation, TutorTurnResponse
 )
 from db_setup import DB_PATH, init_database
+from tutor_session_store import get_session_store
 
 # API config path (same as used by dashboard.utils)
 API_CONFIG_PATH = Path(__file__).parent / "data" / "api_config.json"
@@ -421,44 +420,39 @@ def build_rag_context(docs: list[RAGDocument], max_chars: int = MAX_CONTEXT_CHAR
 
 @dataclass
 class SessionContext:
-    """Manages conversation history for a session."""
+    """Conversation history for a session, backed by the shared session store."""
     session_id: str
-    turns: list[dict[str, str]] = field(default_factory=lambda: [])  # [{"role": "user"|"assistant", "content": "..."}]
-    
+
+    @property
+    def turns(self) -> list[dict[str, str]]:
+        return get_session_store().get(self.session_id).messages()
+
     def add_turn(self, role: str, content: str):
-        """Add a turn, maintaining size limits."""
-        # Truncate content if too long
+        """Add a turn (truncated) and persist it."""
         if len(content) > MAX_HISTORY_CHARS_PER_TURN:
             content = content[:MAX_HISTORY_CHARS_PER_TURN] + "..."
-        
-        self.turns.append({"role": role, "content": content})
-        
-        # Keep only recent turns
-        if len(self.turns) > MAX_HISTORY_TURNS * 2:  # *2 for user+assistant pairs
-            self.turns = self.turns[-MAX_HISTORY_TURNS * 2:]
-    
+        get_session_store().append(self.session_id, role, content)
+
     def get_history_prompt(self) -> str:
         """Format history for inclusion in prompt."""
-        if not self.turns:
+        history = get_session_store().get(self.session_id)
+        turns = history.messages()[-MAX_HISTORY_TURNS * 2:]  # *2 for user+assistant pairs
+        if not turns:
             return ""
-        
+
         history_lines = ["Previous conversation:"]
-        for turn in self.turns[-MAX_HISTORY_TURNS * 2:]:
+        if history.summary:
+            history_lines.append(f"(Earlier: {'; '.join(history.summary)})")
+        for turn in turns:
             role = "Student" if turn["role"] == "user" else "Tutor"
             history_lines.append(f"{role}: {turn['content']}")
-        
-        return "\n".join(history_lines)
 
-
-# In-memory session store (TODO: persist to DB for long sessions)
-_sessions: dict[str, SessionContext] = {}
+        return "\n".join(history_lines)
 
 
 def get_or_create_session(session_id: str) -> SessionContext:
-    """Get existing session or create new one."""
-    if session_id not in _sessions:
-        _sessions[session_id] = SessionContext(session_id=session_id)
-    return _sessions[session_id]
+    """Get a handle on a session's history (LRU-cached, persisted to SQLite)."""
+    return SessionContext(session_id=session_id)
 
 
 # -----------------------------------------------------------------------------
@@ -496,6 +490,7 @@ def call_openrouter(prompt: str, system_prompt: str, timeout: int = 30) -> tuple
     """
     if not REQUESTS_AVAILABLE:
         return None, "requests library not installed. Install with: pip install requests"
+    import requests
     
     config = load_api_config()
     api_provider = config.get("api_provider", "openrouter")
@@ -758,6 +753,9 @@ def create_card_draft_from_turn(
     
     card_id = cur.lastrowid
     conn.commit()
+
+    from card_dedupe import refresh_card_index
+    refresh_card_index(conn)
     conn.close()
     if card_id is None:
         raise RuntimeError("Failed to insert card_drafts row")
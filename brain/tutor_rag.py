@@ -5,19 +5,38 @@ Supports two named collections:
   - "tutor_materials"    — user-uploaded study materials
   - "tutor_instructions" — SOP library teaching rules/methods/frameworks
 
-Falls back to keyword search when ChromaDB is empty.
+Each collection embeds with the provider chosen in tutor_embeddings
+(OpenAI or the offline local hashing embedder).
+
+Retrieval is hybrid by default: Chroma vector search and BM25 keyword search
+(SQLite FTS5) run concurrently and are merged with reciprocal-rank fusion.
+Plain vector search falls back to keyword search when ChromaDB is empty.
 """
 
 from __future__ import annotations
 
-import pydantic_v1_patch  # noqa: F401  — must be first (fixes PEP 649 on Python 3.14)
-
+import hashlib
+import itertools
 import os
 import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from config import DB_PATH, load_env
+from db_setup import get_connection
+from tutor_embeddings import (
+    OPENAI_EMBEDDING_MODEL,
+    PROVIDER_LOCAL,
+    PROVIDER_OPENAI,
+    embedding_model_name,
+    get_embeddings,
+    query_embedding_cache_stats,
+    resolve_provider,
+)
+from ttl_cache import TTLCache
 
 load_env()
 
@@ -27,48 +46,74 @@ _vectorstores: dict[str, object] = {}
 COLLECTION_MATERIALS = "tutor_materials"
 COLLECTION_INSTRUCTIONS = "tutor_instructions"
 
-
-def _get_openai_api_key() -> str:
-    """Resolve OpenAI API key from env (supports OpenRouter-compatible keys)."""
-    return (
-        os.environ.get("OPENAI_API_KEY")
-        or os.environ.get("OPENROUTER_API_KEY")
-        or ""
-    )
+def _vectorstore_dir(collection_name: str, provider: str) -> str:
+    """Chroma persist dir; non-OpenAI providers get their own store (different vector dims)."""
+    name = collection_name.replace("tutor_", "")
+    if provider != PROVIDER_OPENAI:
+        name = f"{name}-{provider}"
+    return str(_CHROMA_BASE / name)
 
 
 def init_vectorstore(collection_name: str = COLLECTION_MATERIALS, persist_dir: Optional[str] = None):
-    """Initialize or return cached ChromaDB vectorstore for a named collection."""
-    if collection_name in _vectorstores:
-        return _vectorstores[collection_name]
+    """Initialize or return cached ChromaDB vectorstore for a named collection.
 
-    from langchain_openai import OpenAIEmbeddings
+    The embedding provider is resolved per collection (see tutor_embeddings).
+    """
+    provider = resolve_provider(collection_name)
+    cache_key = f"{collection_name}:{provider}"
+    if cache_key in _vectorstores:
+        return _vectorstores[cache_key]
+
+    # Chroma defines pydantic.v1 models on import; patch first (PEP 649 on 3.14).
+    import pydantic_v1_patch  # noqa: F401
     from langchain_community.vectorstores import Chroma
 
-    persist = persist_dir or str(_CHROMA_BASE / collection_name.replace("tutor_", ""))
+    persist = persist_dir or _vectorstore_dir(collection_name, provider)
     os.makedirs(persist, exist_ok=True)
 
-    api_key = _get_openai_api_key()
-    base_url = os.environ.get("OPENAI_BASE_URL")
-
-    embed_kwargs: dict = {
-        "model": "text-embedding-3-small",
-        "api_key": api_key,
-    }
-    if base_url:
-        embed_kwargs["base_url"] = base_url
-
-    embeddings = OpenAIEmbeddings(**embed_kwargs)
-
     vs = Chroma(
         collection_name=collection_name,
-        embedding_function=embeddings,
+        embedding_function=get_embeddings(provider),
         persist_directory=persist,
     )
-    _vectorstores[collection_name] = vs
+    _vectorstores[cache_key] = vs
     return vs
 
 
+def _split_text(content: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> list[str]:
+    """Split text for embedding (LangChain splitter, stdlib chunker if not installed)."""
+    try:
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+    except ImportError:
+        from rag_notes import chunk_spans
+
+        return [content[a:b] for a, b in chunk_spans(content, chunk_size, chunk_overlap)]
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n## ", "\n### ", "\n\n", "\n", ". ", " "],
+    )
+    return splitter.split_text(content)
+
+
+_token_encoder = None
+
+
+def _count_tokens(text: str) -> int:
+    """Token count for embedding budgets (tiktoken when available, else chars/4)."""
+    global _token_encoder
+    if _token_encoder is None:
+        try:
+            import tiktoken
+            _token_encoder = tiktoken.encoding_for_model(OPENAI_EMBEDDING_MODEL)
+        except Exception:
+            _token_encoder = False
+    if _token_encoder:
+        return len(_token_encoder.encode(text))
+    return len(text) // 4
+
+
 def chunk_document(
     content: str,
     source_path: str,
@@ -81,48 +126,185 @@ def chunk_document(
     corpus: Optional[str] = None,
 ):
     """Split document content into LangChain Documents with metadata."""
-    from langchain_text_splitters import RecursiveCharacterTextSplitter
     from langchain_core.documents import Document
 
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        separators=["\n## ", "\n### ", "\n\n", "\n", ". ", " "],
-    )
+    chunks = _split_text(content, chunk_size, chunk_overlap)
+
+    return [
+        Document(
+            page_content=chunk_text,
+            metadata=_chunk_metadata(
+                source_path,
+                i,
+                course_id=course_id,
+                folder_path=folder_path,
+                rag_doc_id=rag_doc_id,
+                corpus=corpus,
+            ),
+        )
+        for i, chunk_text in enumerate(chunks)
+    ]
 
-    chunks = splitter.split_text(content)
 
-    docs = []
-    for i, chunk_text in enumerate(chunks):
-        metadata = {
-            "source": source_path,
-            "chunk_index": i,
-        }
-        if course_id is not None:
-            metadata["course_id"] = course_id
-        if folder_path:
-            metadata["folder_path"] = folder_path
-        if rag_doc_id is not None:
-            metadata["rag_doc_id"] = rag_doc_id
-        if corpus:
-            metadata["corpus"] = corpus
+def _chunk_metadata(
+    source_path: str,
+    chunk_index: int,
+    *,
+    course_id: Optional[int] = None,
+    folder_path: Optional[str] = None,
+    rag_doc_id: Optional[int] = None,
+    corpus: Optional[str] = None,
+) -> dict:
+    """Chroma metadata for one chunk (Chroma rejects None values, so omit them)."""
+    metadata: dict = {
+        "source": source_path,
+        "chunk_index": chunk_index,
+    }
+    if course_id is not None:
+        metadata["course_id"] = course_id
+    if folder_path:
+        metadata["folder_path"] = folder_path
+    if rag_doc_id is not None:
+        metadata["rag_doc_id"] = rag_doc_id
+    if corpus:
+        metadata["corpus"] = corpus
+    return metadata
+
+
+class _ChromaSink:
+    """Writes precomputed embeddings straight into the Chroma collections."""
+
+    def upsert(self, collection_name, ids, embeddings, texts, metadatas):
+        vs = init_vectorstore(collection_name)
+        vs._collection.upsert(ids=ids, embeddings=embeddings, documents=texts, metadatas=metadatas)
+
+    def delete(self, collection_name, ids):
+        vs = init_vectorstore(collection_name)
+        vs._collection.delete(ids=ids)
+
+
+def _plan_embedding_batches(
+    cur: sqlite3.Cursor,
+    docs: list,
+    max_batch_tokens: int,
+    max_batch_chunks: int,
+    models: dict[str, str],
+) -> tuple[list[dict], dict]:
+    """Chunk docs, drop chunks already embedded with the same hash and model, and pack the rest.
 
-        docs.append(Document(page_content=chunk_text, metadata=metadata))
+    Batches never mix collections and stay under ``max_batch_tokens`` (a single
+    oversized chunk still gets its own batch). Returns (batches, stats).
+    """
+    pending: dict[str, list[dict]] = {}
+    stats = {"docs_skipped": 0, "docs_changed": set(), "chunks_reused": 0, "stale": []}
+
+    for doc in docs:
+        content = doc["content"] or ""
+        if not content.strip():
+            stats["docs_skipped"] += 1
+            continue
+
+        doc_corpus = doc["corpus"] or "materials"
+        collection = COLLECTION_INSTRUCTIONS if doc_corpus == "instructions" else COLLECTION_MATERIALS
+
+        cur.execute(
+            """SELECT chunk_index, chunk_text, content_hash, chroma_id, embedding_model
+               FROM rag_embeddings WHERE rag_doc_id = ?""",
+            (doc["id"],),
+        )
+        existing = {row["chunk_index"]: row for row in cur.fetchall()}
+
+        chunks = _split_text(content)
+        changed = False
+        for i, text in enumerate(chunks):
+            digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            prev = existing.get(i)
+            if prev is not None and prev["chroma_id"] and prev["embedding_model"] == models[collection] and (
+                prev["content_hash"] == digest
+                or (prev["content_hash"] is None and prev["chunk_text"] == text)
+            ):
+                stats["chunks_reused"] += 1
+                continue
+            changed = True
+            pending.setdefault(collection, []).append(
+                {
+                    "rag_doc_id": doc["id"],
+                    "chunk_index": i,
+                    "text": text,
+                    "hash": digest,
+                    "tokens": _count_tokens(text),
+                    "chroma_id": f"rag-{doc['id']}-{i}",
+                    "model": models[collection],
+                    "metadata": _chunk_metadata(
+                        doc["source_path"] or "",
+                        i,
+                        course_id=doc["course_id"],
+                        folder_path=doc["folder_path"],
+                        rag_doc_id=doc["id"],
+                        corpus=doc_corpus,
+                    ),
+                }
+            )
 
-    return docs
+        # Document shrank: chunks past the new end must be dropped everywhere.
+        stale = [row for idx, row in existing.items() if idx >= len(chunks)]
+        if stale:
+            changed = True
+            stats["stale"].append((collection, doc["id"], len(chunks), [r["chroma_id"] for r in stale if r["chroma_id"]]))
+
+        if changed:
+            stats["docs_changed"].add(doc["id"])
+        else:
+            stats["docs_skipped"] += 1
+
+    batches: list[dict] = []
+    for collection, items in pending.items():
+        current: list[dict] = []
+        current_tokens = 0
+        for item in items:
+            if current and (
+                current_tokens + item["tokens"] > max_batch_tokens or len(current) >= max_batch_chunks
+            ):
+                batches.append({"collection": collection, "items": current, "tokens": current_tokens})
+                current, current_tokens = [], 0
+            current.append(item)
+            current_tokens += item["tokens"]
+        if current:
+            batches.append({"collection": collection, "items": current, "tokens": current_tokens})
+
+    return batches, stats
 
 
 def embed_rag_docs(
     course_id: Optional[int] = None,
     folder_path: Optional[str] = None,
     corpus: Optional[str] = None,
+    *,
+    embed_fn: Optional[Callable[[list[str]], list[list[float]]]] = None,
+    sink=None,
+    max_batch_tokens: int = 8000,
+    max_batch_chunks: int = 256,
+    max_workers: int = 4,
 ) -> dict:
     """
     Embed rag_docs from SQLite into ChromaDB. Tracks chunks in rag_embeddings table.
     Routes to correct collection based on corpus.
-    Returns {embedded: int, skipped: int, total_chunks: int}.
+
+    Incremental: each chunk is hashed and only new/changed chunks (or chunks
+    embedded by a different provider's model) are embedded.
+    Chunks from many documents are packed into requests of up to
+    ``max_batch_tokens`` and embedded on a pool of ``max_workers`` threads;
+    rag_embeddings is committed after every batch so an interrupted run resumes
+    where it stopped. ``embed_fn``/``sink`` override the embedding client and
+    the Chroma writer (used by tests and offline runs).
+
+    Returns {embedded, skipped, total_chunks, reused_chunks, batches, tokens,
+    elapsed_s, chunks_per_s, tokens_per_s, errors}.
     """
-    conn = sqlite3.connect(DB_PATH)
+    started = time.perf_counter()
+    sink = sink or _ChromaSink()
+
+    conn = get_connection(DB_PATH)
     conn.row_factory = sqlite3.Row
     cur = conn.cursor()
 
@@ -146,68 +328,195 @@ def embed_rag_docs(
     )
     docs = cur.fetchall()
 
-    embedded = 0
-    skipped = 0
-    total_chunks = 0
+    models = {
+        name: embedding_model_name(resolve_provider(name))
+        for name in (COLLECTION_MATERIALS, COLLECTION_INSTRUCTIONS)
+    }
+    batches, plan = _plan_embedding_batches(cur, docs, max_batch_tokens, max_batch_chunks, models)
 
-    for doc in docs:
-        # Skip if already embedded (check rag_embeddings)
+    for collection, doc_id, keep, chroma_ids in plan["stale"]:
+        if chroma_ids:
+            sink.delete(collection, chroma_ids)
         cur.execute(
-            "SELECT COUNT(*) FROM rag_embeddings WHERE rag_doc_id = ?",
-            (doc["id"],),
+            "DELETE FROM rag_embeddings WHERE rag_doc_id = ? AND chunk_index >= ?",
+            (doc_id, keep),
         )
-        if cur.fetchone()[0] > 0:
-            skipped += 1
-            continue
+    conn.commit()
 
-        content = doc["content"] or ""
-        if not content.strip():
-            skipped += 1
-            continue
+    # Resolve embedding clients up front so worker threads never race on init.
+    embedders: dict[str, Callable] = {}
+    for collection in {batch["collection"] for batch in batches}:
+        embedders[collection] = embed_fn or init_vectorstore(collection)._embedding_function.embed_documents
 
-        doc_corpus = doc["corpus"] or "materials"
-        collection = COLLECTION_INSTRUCTIONS if doc_corpus == "instructions" else COLLECTION_MATERIALS
+    def _embed(batch: dict) -> list[list[float]]:
+        return embedders[batch["collection"]]([item["text"] for item in batch["items"]])
 
-        chunks = chunk_document(
-            content,
-            doc["source_path"] or "",
-            course_id=doc["course_id"],
-            folder_path=doc["folder_path"],
-            rag_doc_id=doc["id"],
-            corpus=doc_corpus,
-        )
+    total_chunks = 0
+    total_tokens = 0
+    errors: list[str] = []
+    failed_docs: set[int] = set()
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        queue = iter(batches)
+        in_flight = {}
+        # Keep at most 2x workers batches in memory at once.
+        for batch in itertools.islice(queue, max(1, max_workers) * 2):
+            in_flight[pool.submit(_embed, batch)] = batch
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = in_flight.pop(future)
+                items = batch["items"]
+                try:
+                    vectors = future.result()
+                    sink.upsert(
+                        batch["collection"],
+                        [item["chroma_id"] for item in items],
+                        vectors,
+                        [item["text"] for item in items],
+                        [item["metadata"] for item in items],
+                    )
+                except Exception as exc:
+                    errors.append(f"{batch['collection']} batch of {len(items)} chunks: {exc}")
+                    failed_docs.update(item["rag_doc_id"] for item in items)
+                else:
+                    cur.executemany(
+                        """INSERT INTO rag_embeddings
+                           (rag_doc_id, chunk_index, chunk_text, embedding_model, chroma_id,
+                            token_count, content_hash, created_at)
+                           VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now'))
+                           ON CONFLICT(rag_doc_id, chunk_index) DO UPDATE SET
+                               chunk_text = excluded.chunk_text,
+                               embedding_model = excluded.embedding_model,
+                               chroma_id = excluded.chroma_id,
+                               token_count = excluded.token_count,
+                               content_hash = excluded.content_hash,
+                               created_at = excluded.created_at""",
+                        [
+                            (
+                                item["rag_doc_id"],
+                                item["chunk_index"],
+                                item["text"],
+                                item["model"],
+                                item["chroma_id"],
+                                item["tokens"],
+                                item["hash"],
+                            )
+                            for item in items
+                        ],
+                    )
+                    conn.commit()
+                    total_chunks += len(items)
+                    total_tokens += batch["tokens"]
+
+                for nxt in itertools.islice(queue, 1):
+                    in_flight[pool.submit(_embed, nxt)] = nxt
 
-        if not chunks:
-            skipped += 1
-            continue
+    conn.close()
 
-        # Add to correct ChromaDB collection
-        vs = init_vectorstore(collection)
-        ids = [f"rag-{doc['id']}-{i}" for i in range(len(chunks))]
-        vs.add_documents(chunks, ids=ids)
-
-        # Record in rag_embeddings
-        for i, chunk in enumerate(chunks):
-            try:
-                import tiktoken
-                enc = tiktoken.encoding_for_model("text-embedding-3-small")
-                token_count = len(enc.encode(chunk.page_content))
-            except Exception:
-                token_count = len(chunk.page_content) // 4
-
-            cur.execute(
-                """INSERT OR IGNORE INTO rag_embeddings
-                   (rag_doc_id, chunk_index, chunk_text, chroma_id, token_count, created_at)
-                   VALUES (?, ?, ?, ?, ?, datetime('now'))""",
-                (doc["id"], i, chunk.page_content, ids[i], token_count),
-            )
+    elapsed = time.perf_counter() - started
+    return {
+        "embedded": len(plan["docs_changed"] - failed_docs),
+        "skipped": plan["docs_skipped"],
+        "total_chunks": total_chunks,
+        "reused_chunks": plan["chunks_reused"],
+        "batches": len(batches),
+        "tokens": total_tokens,
+        "elapsed_s": round(elapsed, 3),
+        "chunks_per_s": round(total_chunks / elapsed, 1) if elapsed > 0 else 0.0,
+        "tokens_per_s": round(total_tokens / elapsed, 1) if elapsed > 0 else 0.0,
+        "errors": errors,
+    }
 
-        embedded += 1
-        total_chunks += len(chunks)
 
-    conn.commit()
-    conn.close()
-    return {"embedded": embedded, "skipped": skipped, "total_chunks": total_chunks}
+# ---------------------------------------------------------------------------
+# Retrieval result cache
+# ---------------------------------------------------------------------------
+# Keyed on (kind, normalised query, collection/corpus, filters, k, corpus
+# generation). The generation is bumped by DB triggers on every rag_docs /
+# rag_embeddings write, so a corpus change makes old entries unreachable.
+
+_retrieval_cache = TTLCache(maxsize=256, ttl_seconds=600)
+_turn_stats = {"turns": 0, "turns_fully_cached": 0}
+_turn_stats_lock = threading.Lock()
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join((query or "").lower().split())
+
+
+def corpus_generation() -> Optional[int]:
+    """Current rag corpus generation, or None if the counter table is missing."""
+    try:
+        conn = get_connection(DB_PATH, readonly=True)
+        try:
+            row = conn.execute("SELECT generation FROM rag_corpus_state WHERE id = 1").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.OperationalError:
+        return None
+    return int(row[0]) if row else None
+
+
+def _cached(
+    kind: str,
+    compute: Callable[[], list],
+    query: str,
+    scope: Optional[str],
+    course_id: Optional[int] = None,
+    folder_paths: Optional[list[str]] = None,
+    material_ids: Optional[list[int]] = None,
+    k: int = 6,
+) -> tuple[list, bool]:
+    """Return (results, cache_hit) for a retrieval, computing on miss."""
+    generation = corpus_generation()
+    if generation is None:
+        return compute(), False
+
+    key = (
+        kind,
+        _normalize_query(query),
+        scope,
+        course_id,
+        tuple(sorted(folder_paths or ())),
+        tuple(sorted(material_ids or ())),
+        k,
+        generation,
+    )
+    hit, value = _retrieval_cache.lookup(key)
+    if hit:
+        return list(value), True
+
+    value = compute()
+    _retrieval_cache.set(key, list(value))
+    return value, False
+
+
+def _record_turn(fully_cached: bool) -> None:
+    with _turn_stats_lock:
+        _turn_stats["turns"] += 1
+        if fully_cached:
+            _turn_stats["turns_fully_cached"] += 1
+
+
+def retrieval_cache_stats() -> dict:
+    """Hit/miss counters for the retrieval and query-embedding caches."""
+    with _turn_stats_lock:
+        turns = dict(_turn_stats)
+    turns["fully_cached_rate"] = (
+        round(turns["turns_fully_cached"] / turns["turns"], 4) if turns["turns"] else 0.0
+    )
+    return {
+        "retrieval": _retrieval_cache.stats(),
+        "query_embeddings": query_embedding_cache_stats(),
+        "turns": turns,
+        "corpus_generation": corpus_generation(),
+    }
+
+
+def clear_retrieval_cache() -> None:
+    _retrieval_cache.clear()
 
 
 def search_with_embeddings(
@@ -221,17 +530,67 @@ def search_with_embeddings(
     """
     Vector search via ChromaDB. Returns list of LangChain Documents.
     Falls back to keyword search if vectorstore is empty.
+    Results are served from the retrieval cache when the corpus is unchanged.
     """
-    vs = init_vectorstore(collection_name)
+    return _vector_search(query, course_id, folder_paths, material_ids, collection_name, k)[0]
+
 
+def _vector_search(
+    query: str,
+    course_id: Optional[int],
+    folder_paths: Optional[list[str]],
+    material_ids: Optional[list[int]],
+    collection_name: str,
+    k: int,
+) -> tuple[list, bool]:
+    return _cached(
+        "vector",
+        lambda: _search_with_embeddings_uncached(
+            query, course_id, folder_paths, material_ids, collection_name, k
+        ),
+        query,
+        collection_name,
+        course_id,
+        folder_paths,
+        material_ids,
+        k,
+    )
+
+
+def _search_with_embeddings_uncached(
+    query: str,
+    course_id: Optional[int] = None,
+    folder_paths: Optional[list[str]] = None,
+    material_ids: Optional[list[int]] = None,
+    collection_name: str = COLLECTION_MATERIALS,
+    k: int = 6,
+):
+    """Vector search via ChromaDB; keyword fallback when the store is empty or errors."""
     try:
-        collection = vs._collection
-        if collection.count() == 0:
-            return _keyword_fallback(query, course_id, folder_paths, material_ids, k,
-                                     corpus="instructions" if collection_name == COLLECTION_INSTRUCTIONS else None)
+        results = _similarity_search(query, course_id, folder_paths, material_ids, collection_name, k)
     except Exception:
-        return _keyword_fallback(query, course_id, folder_paths, material_ids, k,
-                                 corpus="instructions" if collection_name == COLLECTION_INSTRUCTIONS else None)
+        results = []
+    if results:
+        return results
+
+    fallback_corpus = "instructions" if collection_name == COLLECTION_INSTRUCTIONS else None
+    return _rows_to_documents(
+        _keyword_rows(query, course_id, folder_paths, material_ids, k, fallback_corpus)
+    )
+
+
+def _similarity_search(
+    query: str,
+    course_id: Optional[int],
+    folder_paths: Optional[list[str]],
+    material_ids: Optional[list[int]],
+    collection_name: str,
+    k: int,
+) -> list:
+    """Raw Chroma similarity search. Empty store -> []; errors propagate."""
+    vs = init_vectorstore(collection_name)
+    if vs._collection.count() == 0:
+        return []
 
     # Build metadata filter
     where_filter = None
@@ -248,19 +607,7 @@ def search_with_embeddings(
     elif len(conditions) > 1:
         where_filter = {"$and": conditions}
 
-    try:
-        results = vs.similarity_search(
-            query,
-            k=k,
-            filter=where_filter,
-        )
-        if results:
-            return results
-    except Exception:
-        pass
-
-    return _keyword_fallback(query, course_id, folder_paths, material_ids, k,
-                             corpus="instructions" if collection_name == COLLECTION_INSTRUCTIONS else None)
+    return vs.similarity_search(query, k=k, filter=where_filter)
 
 
 def _keyword_fallback(
@@ -271,15 +618,117 @@ def _keyword_fallback(
     k: int = 6,
     corpus: Optional[str] = None,
 ):
-    """Fallback to SQL keyword search when ChromaDB is empty/unavailable."""
+    """Fallback to SQL keyword search when ChromaDB is empty/unavailable.
+
+    Returns the best-matching passages (not document heads), each tagged with
+    its chunk index and character offsets in the source document.
+    """
+    return _keyword_search(query, course_id, folder_paths, material_ids, k, corpus)[0]
+
+
+def _keyword_search(
+    query: str,
+    course_id: Optional[int] = None,
+    folder_paths: Optional[list[str]] = None,
+    material_ids: Optional[list[int]] = None,
+    k: int = 6,
+    corpus: Optional[str] = None,
+) -> tuple[list, bool]:
+    rows, hit = _cached(
+        "keyword",
+        lambda: _keyword_rows(query, course_id, folder_paths, material_ids, k, corpus),
+        query,
+        corpus,
+        course_id,
+        folder_paths,
+        material_ids,
+        k,
+    )
+    return _rows_to_documents(rows), hit
+
+
+def _rows_to_documents(rows: list[dict]) -> list:
     from langchain_core.documents import Document
 
-    conn = sqlite3.connect(DB_PATH)
+    results = []
+    for row in rows:
+        content = row["content"] or ""
+        if len(content) > 1000:
+            content = content[:1000] + "..."
+        results.append(
+            Document(
+                page_content=content,
+                metadata={
+                    "source": row["source_path"] or "",
+                    "course_id": row["course_id"],
+                    "folder_path": row["folder_path"],
+                    "rag_doc_id": row["rag_doc_id"],
+                    "chunk_index": row["chunk_index"],
+                    "char_start": row["char_start"],
+                    "char_end": row["char_end"],
+                    "score": row["score"],
+                    "snippet": row["snippet"],
+                },
+            )
+        )
+    return results
+
+
+def _keyword_rows(
+    query: str,
+    course_id: Optional[int] = None,
+    folder_paths: Optional[list[str]] = None,
+    material_ids: Optional[list[int]] = None,
+    k: int = 6,
+    corpus: Optional[str] = None,
+) -> list[dict]:
+    """Rank passages for a query: BM25 over rag_chunks_fts, LIKE scan if FTS5 is missing."""
+    from rag_notes import build_fts_query, fts_search_rag_chunks
+
+    match = build_fts_query(
+        query,
+        max_terms=5,
+        min_len=3,
+        drop_stop_words=True,
+    )
+    if not match:
+        return []
+
+    conn = get_connection(DB_PATH)
+    try:
+        try:
+            return fts_search_rag_chunks(
+                conn,
+                match,
+                corpus=corpus,
+                course_id=course_id,
+                folder_paths=folder_paths,
+                material_ids=material_ids,
+                limit=k,
+                highlight=("", ""),
+            )
+        except sqlite3.OperationalError:
+            return _keyword_like_rows(conn, query, course_id, folder_paths, material_ids, k, corpus)
+    finally:
+        conn.close()
+
+
+def _keyword_like_rows(
+    conn: sqlite3.Connection,
+    query: str,
+    course_id: Optional[int],
+    folder_paths: Optional[list[str]],
+    material_ids: Optional[list[int]],
+    k: int,
+    corpus: Optional[str],
+) -> list[dict]:
+    """Legacy full-scan keyword scoring (one LIKE per keyword) for SQLite without FTS5."""
+    from rag_notes import STOP_WORDS
+
     conn.row_factory = sqlite3.Row
     cur = conn.cursor()
 
-    stop_words = {"the", "a", "an", "is", "are", "was", "were", "in", "on", "at", "to", "for", "of", "and", "or", "it"}
-    keywords = [w for w in query.lower().split() if w not in stop_words and len(w) > 2]
+    keywords = [w for w in query.lower().split() if w not in STOP_WORDS and len(w) > 2]
 
     conditions = ["COALESCE(enabled, 1) = 1"]
     params: list = []
@@ -317,34 +766,245 @@ def _keyword_fallback(
     query_params = keyword_params + params + keyword_params + [k]
 
     cur.execute(
-        f"""SELECT id, source_path, content, course_id, folder_path,
-                   ({score_expr}) as relevance
+        f"""SELECT id AS rag_doc_id, source_path, content, course_id, folder_path,
+                   NULL AS chunk_index, 0 AS char_start, LENGTH(content) AS char_end,
+                   ({score_expr}) as score, NULL as snippet
             FROM rag_docs
             WHERE {where} AND ({score_expr}) > 0
-            ORDER BY relevance DESC
+            ORDER BY score DESC
             LIMIT ?""",
         query_params,
     )
+    return [dict(row) for row in cur.fetchall()]
 
-    results = []
-    for row in cur.fetchall():
-        content = row["content"] or ""
-        if len(content) > 1000:
-            content = content[:1000] + "..."
-        results.append(
-            Document(
-                page_content=content,
+
+# ---------------------------------------------------------------------------
+# Hybrid retrieval: vector + keyword in parallel, reciprocal-rank fusion
+# ---------------------------------------------------------------------------
+# Embeddings miss exact anatomical terms ("supraspinatus", "C5-C6") that BM25
+# nails; BM25 misses paraphrases. Both searches run concurrently so a turn
+# waits for the slower one, not the sum, and RRF merges the rankings without
+# having to calibrate cosine distance against BM25 scores.
+
+RRF_K = 60
+
+_search_pool: Optional[ThreadPoolExecutor] = None
+_search_pool_lock = threading.Lock()
+
+
+def _get_search_pool() -> ThreadPoolExecutor:
+    global _search_pool
+    with _search_pool_lock:
+        if _search_pool is None:
+            _search_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tutor-search")
+        return _search_pool
+
+
+def _vector_stage(
+    query: str,
+    course_id: Optional[int],
+    folder_paths: Optional[list[str]],
+    material_ids: Optional[list[int]],
+    collection_name: str,
+    k: int,
+) -> tuple[list, bool]:
+    """Cached vector search with no keyword fallback (errors propagate)."""
+    return _cached(
+        "vector_only",
+        lambda: _similarity_search(query, course_id, folder_paths, material_ids, collection_name, k),
+        query,
+        collection_name,
+        course_id,
+        folder_paths,
+        material_ids,
+        k,
+    )
+
+
+def _run_stages(stages: dict[str, Callable[[], tuple[list, bool]]]) -> dict[str, dict]:
+    """Run retrieval stages concurrently. Each result: docs, cache_hit, ms, error."""
+
+    def timed(fn):
+        t0 = time.perf_counter()
+        try:
+            docs, hit = fn()
+            error = None
+        except Exception as e:
+            docs, hit, error = [], False, f"{type(e).__name__}: {e}"
+        return {
+            "docs": docs,
+            "cache_hit": hit,
+            "ms": round((time.perf_counter() - t0) * 1000, 2),
+            "error": error,
+        }
+
+    pool = _get_search_pool()
+    futures = {name: pool.submit(timed, fn) for name, fn in stages.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def _doc_key(doc) -> tuple:
+    meta = doc.metadata or {}
+    if meta.get("rag_doc_id") is not None:
+        return ("doc", meta["rag_doc_id"])
+    return ("source", meta.get("source") or doc.page_content[:200])
+
+
+def reciprocal_rank_fusion(ranked: dict[str, list], k: int, rrf_k: int = RRF_K) -> list:
+    """Fuse ranked Document lists into the top-k, one passage per rag_doc_id.
+
+    A document scores sum(1 / (rrf_k + rank)) over the lists it appears in,
+    ranked by its best chunk in each list. The returned passage is the one
+    from the list that ranked the document highest; its metadata gains
+    ``rrf_score`` and ``retrievers`` (which searches found it).
+    """
+    scores: dict[tuple, float] = {}
+    best: dict[tuple, tuple[int, object]] = {}
+    found_by: dict[tuple, list[str]] = {}
+
+    for name, docs in ranked.items():
+        rank = 0
+        seen: set[tuple] = set()
+        for doc in docs:
+            key = _doc_key(doc)
+            if key in seen:
+                continue
+            seen.add(key)
+            rank += 1
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            found_by.setdefault(key, []).append(name)
+            if key not in best or rank < best[key][0]:
+                best[key] = (rank, doc)
+
+    fused = []
+    for key in sorted(scores, key=scores.get, reverse=True)[:k]:
+        doc = best[key][1]
+        fused.append(
+            type(doc)(
+                page_content=doc.page_content,
                 metadata={
-                    "source": row["source_path"] or "",
-                    "course_id": row["course_id"],
-                    "folder_path": row["folder_path"],
-                    "rag_doc_id": row["id"],
+                    **(doc.metadata or {}),
+                    "rrf_score": round(scores[key], 6),
+                    "retrievers": found_by[key],
                 },
             )
         )
+    return fused
 
-    conn.close()
-    return results
+
+def _hybrid_stages(
+    prefix: str,
+    query: str,
+    course_id: Optional[int],
+    folder_paths: Optional[list[str]],
+    material_ids: Optional[list[int]],
+    collection_name: str,
+    k: int,
+    use_vector: bool,
+) -> dict[str, Callable[[], tuple[list, bool]]]:
+    keyword_corpus = "instructions" if collection_name == COLLECTION_INSTRUCTIONS else None
+    # Over-fetch when fusing so de-duplication still leaves k distinct documents.
+    fetch_k = k * 2 if use_vector else k
+    stages = {
+        f"{prefix}keyword": lambda: _keyword_search(
+            query, course_id, folder_paths, material_ids, fetch_k, keyword_corpus
+        ),
+    }
+    if use_vector:
+        stages[f"{prefix}vector"] = lambda: _vector_stage(
+            query, course_id, folder_paths, material_ids, collection_name, fetch_k
+        )
+    return stages
+
+
+def _fuse_stages(results: dict[str, dict], prefix: str, k: int) -> tuple[list, dict, dict, bool]:
+    """Combine one collection's stage results -> (docs, timings, errors, all_cached)."""
+    keyword = results[f"{prefix}keyword"]
+    vector = results.get(f"{prefix}vector")
+
+    timings = {"keyword_ms": keyword["ms"]}
+    errors = {}
+    if keyword["error"]:
+        errors["keyword"] = keyword["error"]
+
+    if vector is None:
+        return keyword["docs"][:k], timings, errors, keyword["cache_hit"]
+
+    timings["vector_ms"] = vector["ms"]
+    if vector["error"]:
+        errors["vector"] = vector["error"]
+    t0 = time.perf_counter()
+    docs = reciprocal_rank_fusion({"vector": vector["docs"], "keyword": keyword["docs"]}, k)
+    timings["fusion_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+    return docs, timings, errors, keyword["cache_hit"] and vector["cache_hit"]
+
+
+def hybrid_search(
+    query: str,
+    course_id: Optional[int] = None,
+    folder_paths: Optional[list[str]] = None,
+    material_ids: Optional[list[int]] = None,
+    collection_name: str = COLLECTION_MATERIALS,
+    k: int = 6,
+    *,
+    use_vector: bool = True,
+) -> dict:
+    """
+    Run vector and keyword search concurrently and fuse them with RRF.
+
+    Returns: {
+        documents: list[Document],
+        timings: {vector_ms, keyword_ms, fusion_ms, total_ms},
+        errors: {stage: message},   # e.g. Chroma unavailable
+        cache_hit: bool,
+    }
+    """
+    t0 = time.perf_counter()
+    stages = _hybrid_stages(
+        "", query, course_id, folder_paths, material_ids, collection_name, k, use_vector
+    )
+    docs, timings, errors, hit = _fuse_stages(_run_stages(stages), "", k)
+    timings["total_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+    return {"documents": docs, "timings": timings, "errors": errors, "cache_hit": hit}
+
+
+def _dual_hybrid(
+    query: str,
+    course_id: Optional[int],
+    material_ids: Optional[list[int]],
+    k_materials: int,
+    k_instructions: int,
+    use_vector_materials: bool,
+    use_vector_instructions: bool,
+) -> dict:
+    """Materials + instructions retrieval with every stage in flight at once."""
+    t0 = time.perf_counter()
+    stages: dict[str, Callable[[], tuple[list, bool]]] = {}
+    if material_ids:
+        stages.update(_hybrid_stages(
+            "materials.", query, course_id, None, material_ids,
+            COLLECTION_MATERIALS, k_materials, use_vector_materials,
+        ))
+    stages.update(_hybrid_stages(
+        "instructions.", query, None, None, None,
+        COLLECTION_INSTRUCTIONS, k_instructions, use_vector_instructions,
+    ))
+    results = _run_stages(stages)
+
+    out: dict = {"materials": [], "instructions": [], "timings": {}, "errors": {}}
+    all_cached = True
+    for name, k in (("materials", k_materials), ("instructions", k_instructions)):
+        if f"{name}.keyword" not in results:
+            continue
+        docs, timings, errors, hit = _fuse_stages(results, f"{name}.", k)
+        out[name] = docs
+        out["timings"][name] = timings
+        if errors:
+            out["errors"][name] = errors
+        all_cached = all_cached and hit
+    out["timings"]["total_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+    _record_turn(all_cached)
+    return out
 
 
 def get_retriever(
@@ -353,8 +1013,9 @@ def get_retriever(
     material_ids: Optional[list[int]] = None,
     collection_name: str = COLLECTION_MATERIALS,
     k: int = 6,
+    hybrid: bool = True,
 ):
-    """Return a LangChain BaseRetriever wrapping our search logic."""
+    """Return a LangChain BaseRetriever wrapping our search logic (hybrid RRF by default)."""
     from langchain_core.retrievers import BaseRetriever
     from langchain_core.documents import Document
     from langchain_core.callbacks import CallbackManagerForRetrieverRun
@@ -368,18 +1029,33 @@ def get_retriever(
         material_ids_filter: Optional[list[int]] = Field(default=None)
         collection: str = Field(default=COLLECTION_MATERIALS)
         top_k: int = Field(default=6)
+        hybrid: bool = Field(default=True)
 
         def _get_relevant_documents(
             self, query: str, *, run_manager: CallbackManagerForRetrieverRun
         ) -> list[Document]:
-            return search_with_embeddings(
+            if self.hybrid:
+                result = hybrid_search(
+                    query,
+                    self.course_id_filter,
+                    self.folder_paths_filter,
+                    self.material_ids_filter,
+                    self.collection,
+                    self.top_k,
+                )
+                _record_turn(result["cache_hit"])
+                return result["documents"]
+
+            docs, hit = _vector_search(
                 query,
-                course_id=self.course_id_filter,
-                folder_paths=self.folder_paths_filter,
-                material_ids=self.material_ids_filter,
-                collection_name=self.collection,
-                k=self.top_k,
+                self.course_id_filter,
+                self.folder_paths_filter,
+                self.material_ids_filter,
+                self.collection,
+                self.top_k,
             )
+            _record_turn(hit)
+            return docs
 
     return TutorRetriever(
         course_id_filter=course_id,
@@ -387,6 +1063,7 @@ def get_retriever(
         material_ids_filter=material_ids,
         collection=collection_name,
         top_k=k,
+        hybrid=hybrid,
     )
 
 
@@ -396,28 +1073,32 @@ def get_dual_context(
     material_ids: Optional[list[int]] = None,
     k_materials: int = 6,
     k_instructions: int = 4,
+    hybrid: bool = True,
 ) -> dict:
     """
     Query both collections and return structured context.
 
+    With ``hybrid`` (default) every vector and keyword search runs
+    concurrently and each collection is RRF-fused (see hybrid_search).
+
     Returns: {
         materials: list[Document],
         instructions: list[Document],
+        timings: {materials: {...}, instructions: {...}, total_ms},  # hybrid only
+        errors: {collection: {stage: message}},                      # hybrid only
     }
     """
-    materials = search_with_embeddings(
-        query,
-        course_id=course_id,
-        material_ids=material_ids,
-        collection_name=COLLECTION_MATERIALS,
-        k=k_materials,
-    ) if material_ids else []
+    if hybrid:
+        return _dual_hybrid(query, course_id, material_ids, k_materials, k_instructions, True, True)
 
-    instructions = search_with_embeddings(
-        query,
-        collection_name=COLLECTION_INSTRUCTIONS,
-        k=k_instructions,
+    materials, materials_hit = _vector_search(
+        query, course_id, None, material_ids, COLLECTION_MATERIALS, k_materials,
+    ) if material_ids else ([], True)
+
+    instructions, instructions_hit = _vector_search(
+        query, None, None, None, COLLECTION_INSTRUCTIONS, k_instructions,
     )
+    _record_turn(materials_hit and instructions_hit)
 
     return {
         "materials": materials,
@@ -448,21 +1129,23 @@ def keyword_search_dual(
     material_ids: Optional[list[int]] = None,
     k_materials: int = 6,
     k_instructions: int = 4,
+    hybrid: Optional[bool] = None,
 ) -> dict:
     """
-    Keyword-only dual search (no embeddings). For Codex/ChatGPT provider.
+    Dual search without embedding API calls. For Codex/ChatGPT provider.
 
-    Returns: { materials: list[Document], instructions: list[Document] }
-    """
-    materials = _keyword_fallback(
-        query, course_id, material_ids=material_ids, k=k_materials,
-    ) if material_ids else []
+    A collection is searched hybrid (keyword + vector, RRF-fused) when its
+    embeddings come from the offline local provider, so no API key is
+    needed; otherwise it is keyword-only. Pass ``hybrid`` to force either.
 
-    instructions = _keyword_fallback(
-        query, k=k_instructions, corpus="instructions",
+    Returns: { materials, instructions, timings, errors } (see get_dual_context)
+    """
+    if hybrid is None:
+        use_materials = resolve_provider(COLLECTION_MATERIALS) == PROVIDER_LOCAL
+        use_instructions = resolve_provider(COLLECTION_INSTRUCTIONS) == PROVIDER_LOCAL
+    else:
+        use_materials = use_instructions = hybrid
+    return _dual_hybrid(
+        query, course_id, material_ids, k_materials, k_instructions,
+        use_materials, use_instructions,
     )
-
-    return {
-        "materials": materials,
-        "instructions": instructions,
-    }
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Bounded, write-through store for tutor conversation history.
+
+Each tutor session keeps a rolling history: the most recent turns verbatim,
+up to a token budget, plus a short extractive summary of the turns that fell
+out of that window. Appending a turn is O(1) -- older turns are folded into
+the summary as they leave the window -- and the whole history is upserted
+into tutor_session_context (created in db_setup.init_database) on every
+append, so nothing is lost on restart.
+
+In memory the store is an LRU of at most MAX_SESSIONS histories and roughly
+MAX_BYTES of text; evicted sessions are simply reloaded from SQLite on next
+use. Sessions that predate the table are seeded once from tutor_turns.
+
+Token counts are estimates (about four characters per token), which is all
+the budget needs.
+"""
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+MAX_SESSIONS = 64
+MAX_BYTES = 4 * 1024 * 1024
+HISTORY_TOKEN_BUDGET = 2000  # recent turns kept verbatim
+SUMMARY_TOKEN_BUDGET = 300  # digest of older turns
+MAX_TURN_CHARS = 4000
+SEED_TURNS = 20  # tutor_turns rows (question + answer) read for an unseen session
+SUMMARY_SNIPPET_CHARS = 120
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 chars/token)."""
+    return (len(text) + 3) // 4
+
+
+class SessionHistory:
+    """Recent turns plus a rolling summary of older ones for one session."""
+
+    __slots__ = ("session_id", "turns", "summary", "turn_count", "tokens", "token_budget", "summary_budget")
+
+    def __init__(
+        self,
+        session_id: str,
+        token_budget: int = HISTORY_TOKEN_BUDGET,
+        summary_budget: int = SUMMARY_TOKEN_BUDGET,
+    ):
+        self.session_id = session_id
+        self.turns: Deque[Dict[str, str]] = deque()  # {"role": "user"|"assistant", "content": ...}
+        self.summary: List[str] = []
+        self.turn_count = 0
+        self.tokens = 0
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+
+    def append(self, role: str, content: str) -> None:
+        content = content or ""
+        if len(content) > MAX_TURN_CHARS:
+            content = content[:MAX_TURN_CHARS] + "..."
+        self.turns.append({"role": role, "content": content})
+        self.tokens += estimate_tokens(content)
+        self.turn_count += 1
+        # Always keep the newest turn, even if it alone exceeds the budget.
+        while self.tokens > self.token_budget and len(self.turns) > 1:
+            self._fold(self.turns.popleft())
+
+    def _fold(self, turn: Dict[str, str]) -> None:
+        self.tokens -= estimate_tokens(turn["content"])
+        # Only the student's side is summarized: it carries the topics covered.
+        if turn["role"] != "user":
+            return
+        snippet = " ".join(turn["content"].split())
+        if len(snippet) > SUMMARY_SNIPPET_CHARS:
+            snippet = snippet[:SUMMARY_SNIPPET_CHARS] + "..."
+        self.summary.append(f"Student asked: {snippet}")
+        while len(self.summary) > 1 and estimate_tokens("\n".join(self.summary)) > self.summary_budget:
+            self.summary.pop(0)
+
+    def messages(self) -> List[Dict[str, str]]:
+        return list(self.turns)
+
+    def summary_text(self) -> str:
+        return "\n".join(self.summary)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(t["content"]) for t in self.turns) + sum(len(s) for s in self.summary)
+
+    def to_row(self) -> tuple:
+        return (
+            self.session_id,
+            json.dumps(list(self.turns)),
+            json.dumps(self.summary),
+            self.turn_count,
+            self.tokens,
+            datetime.now().isoformat(),
+        )
+
+    @classmethod
+    def from_row(cls, row, **budgets) -> "SessionHistory":
+        history = cls(row[0], **budgets)
+        history.summary = json.loads(row[2] or "[]")
+        history.turn_count = row[3] or 0
+        for turn in json.loads(row[1] or "[]"):
+            history.turns.append(turn)
+            history.tokens += estimate_tokens(turn["content"])
+        # Re-apply the budget in case it shrank since the row was written.
+        while history.tokens > history.token_budget and len(history.turns) > 1:
+            history._fold(history.turns.popleft())
+        return history
+
+
+class SessionStore:
+    """LRU of SessionHistory objects, written through to tutor_session_context."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_sessions: int = MAX_SESSIONS,
+        max_bytes: int = MAX_BYTES,
+        token_budget: int = HISTORY_TOKEN_BUDGET,
+        summary_budget: int = SUMMARY_TOKEN_BUDGET,
+    ):
+        self.db_path = db_path
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self._budgets = {"token_budget": token_budget, "summary_budget": summary_budget}
+        self._cache: "OrderedDict[str, SessionHistory]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _connect(self):
+        from db_setup import DB_PATH, get_connection
+
+        return get_connection(self.db_path or DB_PATH)
+
+    def get(self, session_id: str) -> SessionHistory:
+        """Return the session's history, loading or seeding it on a miss."""
+        with self._lock:
+            history = self._cache.get(session_id)
+            if history is not None:
+                self._cache.move_to_end(session_id)
+                self.hits += 1
+                return history
+            self.misses += 1
+            history = self._load(session_id)
+            self._cache[session_id] = history
+            self._bytes += history.nbytes
+            self._evict()
+            return history
+
+    def append(self, session_id: str, role: str, content: str) -> SessionHistory:
+        return self.append_many(session_id, [(role, content)])
+
+    def append_exchange(self, session_id: str, question: str, answer: str) -> SessionHistory:
+        return self.append_many(session_id, [("user", question), ("assistant", answer)])
+
+    def append_many(self, session_id: str, turns) -> SessionHistory:
+        """Append (role, content) turns and persist the session in one write."""
+        with self._lock:
+            history = self.get(session_id)
+            before = history.nbytes
+            for role, content in turns:
+                history.append(role, content)
+            self._bytes += history.nbytes - before
+            self._save(history)
+            self._evict()
+            return history
+
+    def drop(self, session_id: str) -> None:
+        """Forget a session in memory and on disk."""
+        with self._lock:
+            history = self._cache.pop(session_id, None)
+            if history is not None:
+                self._bytes -= history.nbytes
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM tutor_session_context WHERE session_id = ?", (session_id,))
+                conn.commit()
+            finally:
+                conn.close()
+
+    def clear(self) -> None:
+        """Empty the in-memory cache (persisted histories are kept)."""
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": len(self._cache),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _evict(self) -> None:
+        # Keep the most recently used session even if it alone is over the byte cap.
+        while len(self._cache) > 1 and (
+            len(self._cache) > self.max_sessions or self._bytes > self.max_bytes
+        ):
+            _, history = self._cache.popitem(last=False)
+            self._bytes -= history.nbytes
+            self.evictions += 1
+
+    def _load(self, session_id: str) -> SessionHistory:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                """SELECT session_id, turns_json, summary_json, turn_count, token_estimate
+                   FROM tutor_session_context WHERE session_id = ?""",
+                (session_id,),
+            ).fetchone()
+            if row:
+                return SessionHistory.from_row(row, **self._budgets)
+
+            history = SessionHistory(session_id, **self._budgets)
+            rows = conn.execute(
+                """SELECT question, answer FROM tutor_turns
+                   WHERE tutor_session_id = ?
+                   ORDER BY turn_number DESC
+                   LIMIT ?""",
+                (session_id, SEED_TURNS),
+            ).fetchall()
+            for question, answer in reversed(rows):
+                if question:
+                    history.append("user", question)
+                if answer:
+                    history.append("assistant", answer)
+            if rows:
+                self._write(conn, history)
+            return history
+        except sqlite3.OperationalError as e:
+            print(f"[WARN] tutor session context unavailable for {session_id}: {e}")
+            return SessionHistory(session_id, **self._budgets)
+        finally:
+            conn.close()
+
+    def _save(self, history: SessionHistory) -> None:
+        conn = self._connect()
+        try:
+            self._write(conn, history)
+        except sqlite3.OperationalError as e:
+            print(f"[WARN] could not persist tutor session {history.session_id}: {e}")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _write(conn, history: SessionHistory) -> None:
+        conn.execute(
+            """INSERT INTO tutor_session_context
+               (session_id, turns_json, summary_json, turn_count, token_estimate, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(session_id) DO UPDATE SET
+                   turns_json = excluded.turns_json,
+                   summary_json = excluded.summary_json,
+                   turn_count = excluded.turn_count,
+                   token_estimate = excluded.token_estimate,
+                   updated_at = excluded.updated_at""",
+            history.to_row(),
+        )
+        conn.commit()
+
+
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Process-wide store shared by the tutor engine and the tutor API."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore()
+        return _store
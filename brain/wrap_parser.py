@@ -250,6 +250,7 @@ def _fallback_parse_sections(raw_text: str) -> Dict[str, str]:
         provider="openrouter",
         model="deepseek/deepseek-v3",
         timeout=45,
+        cache="wrap_sections",
     )
     if not result.get("success"):
         return {}
@@ -389,6 +390,7 @@ def _classify_issues_with_llm(issues: List[str]) -> List[Dict[str, str]]:
         provider="openrouter",
         model="deepseek/deepseek-v3",
         timeout=30,
+        cache="wrap_classify",
     )
     if not result.get("success"):
         return []
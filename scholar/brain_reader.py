@@ -18,15 +18,17 @@ import json
 import os
 import sqlite3
 import sys
+import threading
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Generator, Optional, List, Dict
+from typing import Any, Generator, Iterable, Iterator, Optional, List, Dict, Sequence
 
 # Import canonical DB_PATH from brain/config.py
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "brain"))
 from config import DB_PATH as _DB_PATH_STR
+from db_pool import connect as pool_connect
 
 
 def get_db_path() -> Path:
@@ -34,21 +36,31 @@ def get_db_path() -> Path:
     return Path(_DB_PATH_STR)
 
 
+_local = threading.local()
+
+
 @contextmanager
 def _get_connection() -> Generator[Optional[sqlite3.Connection], None, None]:
     """
     Context manager for read-only database connections.
-    
+
     Uses Row factory for dict-like access.
-    Yields None if DB missing.
+    Yields None if DB missing. Inside an open BrainReader on this thread,
+    yields the reader's shared connection instead of opening a new one.
     """
+    active = getattr(_local, "reader", None)
+    if active is not None:
+        yield active.conn
+        return
+
     db_path = get_db_path()
     
     if not db_path.exists():
         yield None
         return
     
-    conn = sqlite3.connect(str(db_path))
+    # Pooled query_only handle; close() returns it to the pool.
+    conn = pool_connect(str(db_path), readonly=True)
     conn.row_factory = sqlite3.Row
     try:
         yield conn
@@ -136,6 +148,307 @@ class SessionRecord:
         )
 
 
+# Columns SessionRecord reads (topic/time_spent_minutes are its fallbacks).
+SESSION_COLUMNS = (
+    "id", "session_date", "session_time", "duration_minutes", "time_spent_minutes",
+    "study_mode", "main_topic", "topic", "target_exam", "source_lock",
+    "wrap_phase_reached", "anki_cards_count", "understanding_level",
+    "retention_confidence", "system_performance", "off_source_drift",
+    "source_snippets_used", "what_worked", "what_needs_fixing",
+    "gaps_identified", "weak_anchors", "created_at",
+)
+
+# Per-session turn aggregates in one grouped pass. Mirrors
+# calculate_session_metrics(): malformed or non-array citations_json count as 0.
+_TURN_METRICS_SQL = """
+    SELECT session_id,
+           COUNT(*) AS turns_count,
+           SUM(LENGTH(COALESCE(question, ''))) AS q_len,
+           SUM(LENGTH(COALESCE(answer, ''))) AS a_len,
+           SUM(CASE WHEN unverified THEN 1 ELSE 0 END) AS unverified_count,
+           SUM(CASE WHEN json_valid(citations_json)
+                    THEN json_array_length(citations_json) ELSE 0 END) AS citations_count
+    FROM tutor_turns
+    WHERE session_id IN ({sessions})
+    GROUP BY session_id
+"""
+
+
+# ---------------------------------------------------------------------------
+# Reader session: one connection, batch queries
+# ---------------------------------------------------------------------------
+
+class BrainReader:
+    """
+    Reader session holding one read-only connection for a whole Scholar run.
+
+    Batch methods take id lists or date windows and return everything in a
+    single query, so a run costs a fixed number of queries however long the
+    history is. Use as a context manager: while open, the module-level
+    get_* functions on this thread share its connection too.
+
+        with BrainReader() as reader:
+            sessions = reader.get_sessions_by_ids([1, 2, 3])
+            metrics = reader.get_turn_metrics_for_sessions(["sess-1"])
+
+    `query_count` counts statements executed on the connection.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else get_db_path()
+        self.conn: Optional[sqlite3.Connection] = None
+        self.query_count = 0
+        self._tables: Optional[set] = None
+        self._columns: Dict[str, set] = {}
+        self._previous: Optional["BrainReader"] = None
+
+        if self.db_path.exists():
+            self.conn = pool_connect(str(self.db_path), readonly=True)
+            self.conn.row_factory = sqlite3.Row
+            self.conn.set_trace_callback(self._count_query)
+
+    def _count_query(self, _statement: str) -> None:
+        self.query_count += 1
+
+    def __enter__(self) -> "BrainReader":
+        self._previous = getattr(_local, "reader", None)
+        _local.reader = self
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _local.reader = self._previous
+        self.close()
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    # -- schema helpers ----------------------------------------------------
+
+    def has_table(self, name: str) -> bool:
+        """Check for a table; sqlite_master is read once per session."""
+        if self.conn is None:
+            return False
+        if self._tables is None:
+            rows = self.conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            self._tables = {row[0] for row in rows}
+        return name in self._tables
+
+    def columns(self, table: str) -> set:
+        if table not in self._columns:
+            rows = self.conn.execute(f"PRAGMA table_info({table})")
+            self._columns[table] = {row[1] for row in rows}
+        return self._columns[table]
+
+    def _select(self, table: str, columns: Sequence[str]) -> str:
+        """SELECT list of the requested columns that exist in this DB."""
+        available = self.columns(table)
+        picked = [c for c in columns if c in available] or ["*"]
+        return ", ".join(picked)
+
+    def _changed_expr(self) -> str:
+        if "updated_at" in self.columns("sessions"):
+            return "COALESCE(updated_at, created_at)"
+        return "created_at"
+
+    # -- sessions ----------------------------------------------------------
+
+    def get_sessions_by_ids(
+        self, ids: Iterable[int], columns: Sequence[str] = SESSION_COLUMNS
+    ) -> Dict[int, SessionRecord]:
+        """Fetch many sessions in one query. Returns id -> SessionRecord."""
+        ids = list(ids)
+        if not ids or not self.has_table("sessions"):
+            return {}
+        cursor = self.conn.execute(
+            f"""
+            SELECT {self._select("sessions", ("id",) + tuple(columns))}
+            FROM sessions
+            WHERE id IN (SELECT value FROM json_each(?))
+            """,
+            (json.dumps(ids),)
+        )
+        records = (SessionRecord.from_row(row) for row in cursor)
+        return {r.id: r for r in records}
+
+    def get_sessions_in_range(
+        self, start_date: str, end_date: str, columns: Sequence[str] = SESSION_COLUMNS
+    ) -> List[SessionRecord]:
+        """Fetch sessions within a date range (inclusive), newest first."""
+        if not self.has_table("sessions"):
+            return []
+        cursor = self.conn.execute(
+            f"""
+            SELECT {self._select("sessions", columns)}
+            FROM sessions
+            WHERE session_date >= ? AND session_date <= ?
+            ORDER BY session_date DESC, session_time DESC
+            """,
+            (start_date, end_date)
+        )
+        return [SessionRecord.from_row(row) for row in cursor]
+
+    def iter_sessions(
+        self, columns: Sequence[str] = SESSION_COLUMNS, batch_size: int = 500
+    ) -> Iterator[SessionRecord]:
+        """Stream all sessions newest first without loading the table."""
+        if not self.has_table("sessions"):
+            return
+        cursor = self.conn.execute(
+            f"""
+            SELECT {self._select("sessions", columns)}
+            FROM sessions
+            ORDER BY session_date DESC, session_time DESC
+            """
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield SessionRecord.from_row(row)
+
+    def get_changed_sessions(
+        self, days: int = 7, since: Optional[str] = None,
+        columns: Sequence[str] = SESSION_COLUMNS,
+    ) -> List[SessionRecord]:
+        """
+        Fetch sessions from the last N days, or those changed after `since`.
+
+        `since` is compared against sessions.updated_at (falling back to
+        created_at on databases that predate the column).
+        """
+        if not self.has_table("sessions"):
+            return []
+        if since:
+            where, params = f"{self._changed_expr()} > ?", (since,)
+        else:
+            where, params = "session_date >= ?", (_date_n_days_ago(days),)
+        cursor = self.conn.execute(
+            f"""
+            SELECT {self._select("sessions", columns)}
+            FROM sessions
+            WHERE {where}
+            ORDER BY session_date DESC, session_time DESC
+            """,
+            params
+        )
+        return [SessionRecord.from_row(row) for row in cursor]
+
+    def get_low_understanding_history(self, threshold: int = 2) -> List[SessionRecord]:
+        """Slim newest-first history for topic-struggle checks."""
+        if not self.has_table("sessions"):
+            return []
+        cursor = self.conn.execute(
+            f"""
+            SELECT {self._select("sessions", ("id", "session_date", "session_time",
+                                              "main_topic", "topic", "understanding_level"))}
+            FROM sessions
+            WHERE understanding_level IS NOT NULL AND understanding_level <= ?
+            ORDER BY session_date DESC, session_time DESC
+            """,
+            (threshold,)
+        )
+        return [SessionRecord.from_row(row) for row in cursor]
+
+    def get_session_count(self) -> int:
+        if not self.has_table("sessions"):
+            return 0
+        return self.conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    # -- tutor turns -------------------------------------------------------
+
+    def _turn_metrics(self, sessions_sql: str, params: tuple) -> Dict[str, Dict[str, Any]]:
+        if not self.has_table("tutor_turns"):
+            return {}
+        cursor = self.conn.execute(_TURN_METRICS_SQL.format(sessions=sessions_sql), params)
+        result = {}
+        for row in cursor:
+            n = row["turns_count"]
+            result[row["session_id"]] = {
+                "session_id": row["session_id"],
+                "turns_count": n,
+                "avg_question_length": round(row["q_len"] / n, 1),
+                "avg_answer_length": round(row["a_len"] / n, 1),
+                "unverified_ratio": round(row["unverified_count"] / n, 3),
+                "duration_minutes": None,
+                "citations_count": row["citations_count"],
+            }
+        return result
+
+    def get_turn_metrics_for_sessions(self, session_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """calculate_session_metrics() for many sessions in one grouped query."""
+        session_ids = list(session_ids)
+        if not session_ids:
+            return {}
+        return self._turn_metrics("SELECT value FROM json_each(?)", (json.dumps(session_ids),))
+
+    def get_turn_metrics(self, days: int = 7, since: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        calculate_session_metrics() for every session with recent turns.
+
+        A session qualifies with a turn in the last N days, or, when `since`
+        is given, a turn created after it. Metrics cover all its turns.
+        """
+        if since:
+            where, params = "created_at > ?", (since,)
+        else:
+            where, params = "DATE(created_at) >= ?", (_date_n_days_ago(days),)
+        return self._turn_metrics(
+            f"SELECT DISTINCT session_id FROM tutor_turns WHERE {where}", params
+        )
+
+    def count_activity(self, days: int = 7) -> Dict[str, int]:
+        """Session, turn and unverified-turn counts for the last N days."""
+        cutoff = _date_n_days_ago(days)
+        counts = {"sessions_count": 0, "turns_count": 0, "unverified_count": 0}
+        if self.has_table("sessions"):
+            counts["sessions_count"] = self.conn.execute(
+                "SELECT COUNT(*) FROM sessions WHERE session_date >= ?", (cutoff,)
+            ).fetchone()[0]
+        if self.has_table("tutor_turns"):
+            row = self.conn.execute(
+                """
+                SELECT COUNT(*), SUM(CASE WHEN unverified = 1 THEN 1 ELSE 0 END)
+                FROM tutor_turns WHERE DATE(created_at) >= ?
+                """,
+                (cutoff,)
+            ).fetchone()
+            counts["turns_count"] = row[0]
+            counts["unverified_count"] = row[1] or 0
+        return counts
+
+    def get_change_cursor(self) -> Optional[str]:
+        """
+        Newest change timestamp across sessions and tutor_turns.
+
+        Pass it back as `since` on the next run to re-check only what changed.
+        """
+        stamps = []
+        if self.has_table("sessions"):
+            stamps.append(self.conn.execute(
+                f"SELECT MAX({self._changed_expr()}) FROM sessions"
+            ).fetchone()[0])
+        if self.has_table("tutor_turns"):
+            stamps.append(self.conn.execute(
+                "SELECT MAX(created_at) FROM tutor_turns"
+            ).fetchone()[0])
+        stamps = [s for s in stamps if s]
+        return max(stamps) if stamps else None
+
+
+@contextmanager
+def reader_session() -> Generator[BrainReader, None, None]:
+    """Yield this thread's open BrainReader, or open one for the block."""
+    active = getattr(_local, "reader", None)
+    if active is not None:
+        yield active
+        return
+    with BrainReader() as reader:
+        yield reader
+
+
 # ---------------------------------------------------------------------------
 # Public API: Session queries
 # ---------------------------------------------------------------------------
@@ -453,10 +766,38 @@ def calculate_session_metrics(session_id: str) -> Dict[str, Any]:
     metrics["avg_answer_length"] = round(total_a_len / n, 1)
     metrics["unverified_ratio"] = round(unverified_count / n, 3)
     metrics["citations_count"] = total_citations
-    
+
     return metrics
 
 
+def get_turn_metrics(days: int = 7, since: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Calculate calculate_session_metrics() for every active session at once.
+
+    See BrainReader.get_turn_metrics(). Returns session_id -> metrics dict.
+    """
+    with reader_session() as reader:
+        return reader.get_turn_metrics(days, since=since)
+
+
+def get_changed_sessions(days: int = 7, since: Optional[str] = None) -> List[SessionRecord]:
+    """Fetch sessions from the last N days, or those changed after `since`."""
+    with reader_session() as reader:
+        return reader.get_changed_sessions(days, since=since)
+
+
+def get_low_understanding_history(threshold: int = 2) -> List[SessionRecord]:
+    """Fetch the slim history needed for topic-struggle checks, newest first."""
+    with reader_session() as reader:
+        return reader.get_low_understanding_history(threshold)
+
+
+def get_change_cursor() -> Optional[str]:
+    """Return the newest change timestamp across sessions and tutor_turns."""
+    with reader_session() as reader:
+        return reader.get_change_cursor()
+
+
 # ---------------------------------------------------------------------------
 # Utility: Summary for Scholar workflows
 # ---------------------------------------------------------------------------
@@ -488,13 +829,8 @@ def get_audit_summary(days: int = 7) -> Dict[str, Any]:
     if not summary["db_exists"]:
         return summary
     
-    sessions = get_recent_sessions(days)
-    turns = get_recent_tutor_turns(days)
-    unverified = get_unverified_answers(days)
-    
-    summary["sessions_count"] = len(sessions)
-    summary["turns_count"] = len(turns)
-    summary["unverified_count"] = len(unverified)
+    with reader_session() as reader:
+        summary.update(reader.count_activity(days))
     
     return summary
 
@@ -675,10 +1011,12 @@ def get_method_anomalies() -> Optional[Dict[str, List[Dict[str, Any]]]]:
 
         # High variance (std dev > 1.5, min 3 ratings)
         hv_rows = conn.execute("""
-            SELECT method_block_id, GROUP_CONCAT(effectiveness) as ratings
-            FROM method_ratings
-            WHERE method_block_id IS NOT NULL
-            GROUP BY method_block_id
+            SELECT mr.method_block_id, GROUP_CONCAT(mr.effectiveness) as ratings,
+                   mb.id AS block_id, mb.name, mb.category
+            FROM method_ratings mr
+            LEFT JOIN method_blocks mb ON mb.id = mr.method_block_id
+            WHERE mr.method_block_id IS NOT NULL
+            GROUP BY mr.method_block_id
             HAVING COUNT(*) >= 3
         """).fetchall()
         for r in hv_rows:
@@ -687,14 +1025,10 @@ def get_method_anomalies() -> Optional[Dict[str, List[Dict[str, Any]]]]:
                 from statistics import stdev as _stdev
                 sd = _stdev(ratings)
                 if sd > 1.5:
-                    block_row = conn.execute(
-                        "SELECT name, category FROM method_blocks WHERE id = ?",
-                        (r["method_block_id"],)
-                    ).fetchone()
                     anomalies["high_variance"].append({
                         "id": r["method_block_id"],
-                        "name": block_row["name"] if block_row else "Unknown",
-                        "category": block_row["category"] if block_row else "Unknown",
+                        "name": r["name"] if r["block_id"] is not None else "Unknown",
+                        "category": r["category"] if r["block_id"] is not None else "Unknown",
                         "std_dev": round(sd, 2),
                     })
 
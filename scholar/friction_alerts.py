@@ -19,6 +19,7 @@ Usage:
     python friction_alerts.py           # Generate alerts for last 7 days
     python friction_alerts.py --days 30 # Generate alerts for last 30 days
     python friction_alerts.py --json    # Output as JSON
+    python friction_alerts.py --since 2026-01-09T14:30:00  # Only re-check changes
 """
 
 from __future__ import annotations
@@ -95,14 +96,18 @@ THRESHOLDS = {
 # Alert Detection Functions
 # ---------------------------------------------------------------------------
 
-def check_unverified_ratio(session_id: str) -> Optional[FrictionAlert]:
+def check_unverified_ratio(
+    session_id: str, metrics: Optional[Dict[str, Any]] = None
+) -> Optional[FrictionAlert]:
     """
     Check if a session has high ratio of unverified answers.
     
     Unverified answers aren't grounded in RAG sources - this can
     indicate hallucination risk or missing course materials.
+    Pass precomputed `metrics` to skip the per-session query.
     """
-    metrics = brain_reader.calculate_session_metrics(session_id)
+    if metrics is None:
+        metrics = brain_reader.calculate_session_metrics(session_id)
     
     if metrics["turns_count"] == 0:
         return None
@@ -125,7 +130,9 @@ def check_unverified_ratio(session_id: str) -> Optional[FrictionAlert]:
     return None
 
 
-def check_low_citations(session_id: str) -> Optional[FrictionAlert]:
+def check_low_citations(
+    session_id: str, metrics: Optional[Dict[str, Any]] = None
+) -> Optional[FrictionAlert]:
     """
     Check if session has low citation usage.
     
@@ -133,8 +140,10 @@ def check_low_citations(session_id: str) -> Optional[FrictionAlert]:
     - Missing RAG content for topic
     - Student asking off-topic questions
     - System not finding relevant sources
+    Pass precomputed `metrics` to skip the per-session query.
     """
-    metrics = brain_reader.calculate_session_metrics(session_id)
+    if metrics is None:
+        metrics = brain_reader.calculate_session_metrics(session_id)
     
     if metrics["turns_count"] == 0:
         return None
@@ -334,83 +343,65 @@ def check_repeated_topic_struggle(sessions: List[brain_reader.SessionRecord]) ->
 # Main Alert Generation
 # ---------------------------------------------------------------------------
 
-def generate_alerts(days: int = 7) -> List[FrictionAlert]:
-    """
-    Generate all friction alerts for the specified time period.
-    
-    Args:
-        days: Number of days to look back (default 7)
-        
-    Returns:
-        List of FrictionAlert objects, sorted by severity and date
-    """
+def _evaluate_alerts(
+    sessions: List[brain_reader.SessionRecord],
+    struggle_history: List[brain_reader.SessionRecord],
+    turn_metrics: Dict[str, Dict[str, Any]],
+) -> List[FrictionAlert]:
+    """Run every rule in memory over prefetched sessions and turn metrics."""
     alerts = []
-    
-    # Check database availability
+
+    for session in sessions:
+        alerts.extend(check_session_duration(session))
+        for check in (check_understanding_level, check_no_wrap_phase, check_source_drift):
+            alert = check(session)
+            if alert:
+                alerts.append(alert)
+
+    alerts.extend(check_repeated_topic_struggle(struggle_history))
+
+    for session_id, metrics in turn_metrics.items():
+        for check in (check_unverified_ratio, check_low_citations):
+            alert = check(session_id, metrics)
+            if alert:
+                alerts.append(alert)
+
+    return alerts
+
+
+def _generate(days: int, since: Optional[str]) -> tuple:
+    """Return (alerts, cursor) for generate_alerts() and get_alert_summary()."""
     db_path = brain_reader.get_db_path()
     if not db_path.exists():
-        alerts.append(FrictionAlert(
+        return [FrictionAlert(
             alert_type=AlertType.DB_UNAVAILABLE.value,
             severity=AlertSeverity.CRITICAL.value,
             message=f"Brain database not found at {db_path}",
             details={"db_path": str(db_path)}
-        ))
-        return alerts
-    
-    # Get recent sessions
-    sessions = brain_reader.get_recent_sessions(days)
-    session_records = [brain_reader.SessionRecord.from_row(type('Row', (), s)()) 
-                       if isinstance(s, dict) else s 
-                       for s in sessions]
-    
-    # Actually, get_recent_sessions returns dicts, so we need to fetch SessionRecords
-    session_records = []
-    for s_dict in sessions:
-        s_id = s_dict.get("id")
-        if s_id:
-            record = brain_reader.get_session_by_id(s_id)
-            if record:
-                session_records.append(record)
-    
-    # Check each session for individual alerts
-    for session in session_records:
-        # Duration checks
-        alerts.extend(check_session_duration(session))
-        
-        # Understanding check
-        alert = check_understanding_level(session)
-        if alert:
-            alerts.append(alert)
-        
-        # WRAP phase check
-        alert = check_no_wrap_phase(session)
-        if alert:
-            alerts.append(alert)
-        
-        # Source drift check
-        alert = check_source_drift(session)
-        if alert:
-            alerts.append(alert)
-    
-    # Check for repeated topic struggles across all sessions
-    all_sessions = brain_reader.get_all_sessions()
-    alerts.extend(check_repeated_topic_struggle(all_sessions))
-    
-    # Check tutor turns for unverified ratio and citations
-    turns = brain_reader.get_recent_tutor_turns(days)
-    session_ids_with_turns = set(t.get("session_id") for t in turns if t.get("session_id"))
-    
-    for session_id in session_ids_with_turns:
-        # Unverified ratio check
-        alert = check_unverified_ratio(session_id)
-        if alert:
-            alerts.append(alert)
-        
-        # Low citations check
-        alert = check_low_citations(session_id)
-        if alert:
-            alerts.append(alert)
-    
+        )], since
+
+    # One reader session: the run costs the same few queries at any history size.
+    with brain_reader.reader_session() as reader:
+        # Read the cursor first: anything written while we run is re-checked next time.
+        cursor = reader.get_change_cursor() or since
+
+        sessions = reader.get_changed_sessions(days, since=since)
+        turn_metrics = reader.get_turn_metrics(days, since=since)
+
+        # Topic struggles count the whole history, but an incremental run only
+        # re-reports topics touched by a changed session.
+        struggle_history = reader.get_low_understanding_history(
+            THRESHOLDS["low_understanding_score"]
+        )
+    if since:
+        touched = {s.main_topic.lower().strip() for s in sessions if s.main_topic}
+        struggle_history = [
+            s for s in struggle_history
+            if s.main_topic and s.main_topic.lower().strip() in touched
+        ]
+
+    alerts = _evaluate_alerts(sessions, struggle_history, turn_metrics)
+
     # Sort by severity (critical first) then by date
     severity_order = {
         AlertSeverity.CRITICAL.value: 0,
@@ -420,20 +411,42 @@ def generate_alerts(days: int = 7) -> List[FrictionAlert]:
     
     alerts.sort(key=lambda a: (severity_order.get(a.severity, 99), a.created_at or ""))
     
-    return alerts
+    return alerts, cursor
+
+
+def generate_alerts(days: int = 7, since: Optional[str] = None) -> List[FrictionAlert]:
+    """
+    Generate all friction alerts for the specified time period.
+    
+    Sessions, topic history and per-session turn metrics are loaded with a
+    handful of set-based queries, then every rule runs in memory.
+
+    Args:
+        days: Number of days to look back (default 7)
+        since: Optional change cursor (see get_alert_summary()["cursor"]).
+            When set, only sessions updated and tutor turns created after it
+            are re-checked, and `days` is ignored.
+        
+    Returns:
+        List of FrictionAlert objects, sorted by severity and date
+    """
+    return _generate(days, since)[0]
 
 
-def get_alert_summary(days: int = 7) -> Dict[str, Any]:
+def get_alert_summary(days: int = 7, since: Optional[str] = None) -> Dict[str, Any]:
     """
     Generate a summary of all alerts for the time period.
     
     Returns:
         Dict with counts by severity and type, plus the alert list.
+        "cursor" is the value to pass as `since` on the next scheduled run.
     """
-    alerts = generate_alerts(days)
+    alerts, cursor = _generate(days, since)
     
     summary = {
         "period_days": days,
+        "since": since,
+        "cursor": cursor,
         "generated_at": datetime.now().isoformat(),
         "total_alerts": len(alerts),
         "by_severity": {
@@ -525,13 +538,21 @@ def main():
         action="store_true",
         help="Include summary statistics"
     )
+    parser.add_argument(
+        "--since",
+        default=None,
+        help="Only re-check sessions changed after this cursor (from a previous --json run)"
+    )
     
     args = parser.parse_args()
     
-    print(f"Analyzing last {args.days} days for friction patterns...\n")
+    if args.since:
+        print(f"Analyzing changes since {args.since} for friction patterns...\n")
+    else:
+        print(f"Analyzing last {args.days} days for friction patterns...\n")
     
     if args.json or args.summary:
-        summary = get_alert_summary(args.days)
+        summary = get_alert_summary(args.days, since=args.since)
         if args.json:
             print(json.dumps(summary, indent=2))
         else:
@@ -543,7 +564,7 @@ def main():
             alerts = [FrictionAlert(**a) for a in summary["alerts"]]
             print_alerts(alerts)
     else:
-        alerts = generate_alerts(args.days)
+        alerts = generate_alerts(args.days, since=args.since)
         print_alerts(alerts)
 
 
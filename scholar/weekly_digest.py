@@ -78,20 +78,22 @@ def generate_digest(days: int = 7) -> Dict[str, Any]:
     Returns:
         Dict with sections: meta, sessions, friction, methods (optional).
     """
-    digest: Dict[str, Any] = {
-        "meta": {
-            "generated_at": datetime.now().isoformat(),
-            "period_days": days,
-            "date_range_start": brain_reader._date_n_days_ago(days),
-            "date_range_end": datetime.now().strftime("%Y-%m-%d"),
-        },
-        "sessions": _build_session_section(days),
-        "friction": _build_friction_section(days),
-    }
-
-    method_data = _build_method_section()
-    if method_data is not None:
-        digest["methods"] = method_data
+    # All sections read through one shared Brain connection.
+    with brain_reader.reader_session():
+        digest: Dict[str, Any] = {
+            "meta": {
+                "generated_at": datetime.now().isoformat(),
+                "period_days": days,
+                "date_range_start": brain_reader._date_n_days_ago(days),
+                "date_range_end": datetime.now().strftime("%Y-%m-%d"),
+            },
+            "sessions": _build_session_section(days),
+            "friction": _build_friction_section(days),
+        }
+
+        method_data = _build_method_section()
+        if method_data is not None:
+            digest["methods"] = method_data
 
     return digest
 